@@ -0,0 +1,97 @@
+"""
+Benchmark: streaming AnomalyDetector vs recomputing statistics from full history.
+
+Streams synthetic agent messages (sentiment, persona consistency) for
+`--agents` agents in batches, as read from a message stream, and measures
+throughput of `observe_batch()`. The baseline keeps every agent's full
+sentiment history and recomputes variance, mean and window median per message.
+A few agents turn volatile or drift from their persona so the rules fire.
+
+Usage: python benchmarks/bench_anomaly.py [--agents N] [--messages N] [--batch N]
+
+Reference: chimera/anomaly.py, specs/openclaw_integration.md Section 3.4
+"""
+
+import argparse
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.anomaly import AnomalyDetector  # noqa: E402
+
+T0 = 1_770_000_000.0
+
+
+def make_stream(agents: int, messages: int, seed: int = 3):
+    rng = np.random.default_rng(seed)
+    idx = rng.integers(0, agents, messages)
+    base = rng.uniform(-0.5, 0.7, agents)
+    sentiment = base[idx] + rng.normal(0, 0.15, messages)
+    consistency = np.clip(rng.normal(0.92, 0.04, messages), 0, 1)
+    late = np.arange(messages) > messages // 2
+    volatile = idx % 1000 == 1
+    sentiment[volatile] = rng.choice([-0.95, 0.95], int(volatile.sum()))
+    drifting = (idx % 1000 == 2) & late
+    consistency[drifting] = rng.uniform(0.3, 0.6, int(drifting.sum()))
+    names = np.array([f"agent-{i}" for i in range(agents)], dtype=object)
+    timestamps = T0 + np.arange(messages) / 100_000.0
+    return names[idx], np.clip(sentiment, -1, 1), consistency, timestamps
+
+
+def naive(agent_ids, sentiment, consistency, timed: int, window: int = 32) -> float:
+    """Seconds to process the last `timed` messages with full histories kept."""
+    history = defaultdict(list)
+    cons = defaultdict(list)
+    split = len(agent_ids) - timed
+    for agent_id, x, c in zip(agent_ids[:split], sentiment[:split], consistency[:split]):
+        history[agent_id].append(x)
+        cons[agent_id].append(c)
+    fired = 0
+    start = time.perf_counter()
+    for agent_id, x, c in zip(agent_ids[split:], sentiment[split:], consistency[split:]):
+        h = history[agent_id]
+        h.append(x)
+        cons[agent_id].append(c)
+        values = np.asarray(h)
+        if len(values) >= 20:
+            var = values[-20:].var()
+            drift = abs(np.median(values[-window:]) - values.mean()) / max(values.std(), 0.05)
+            fired += var > 0.8 or np.mean(cons[agent_id][-20:]) < 0.7 or drift > 2.3
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=10_000)
+    parser.add_argument("--messages", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=5_000)
+    parser.add_argument("--naive-messages", type=int, default=50_000)
+    args = parser.parse_args(argv)
+    agent_ids, sentiment, consistency, timestamps = make_stream(args.agents, args.messages)
+
+    print(f"--- {args.messages:,} messages across {args.agents:,} agents, batches of {args.batch:,} ---")
+    detector = AnomalyDetector(capacity=args.agents)
+    triggers = []
+    start = time.perf_counter()
+    for lo in range(0, args.messages, args.batch):
+        hi = lo + args.batch
+        triggers += detector.observe_batch(agent_ids[lo:hi], sentiment[lo:hi], consistency[lo:hi], timestamps[lo:hi])
+    elapsed = time.perf_counter() - start
+    state = sum(getattr(detector, name).nbytes for name in vars(detector) if isinstance(getattr(detector, name), np.ndarray))
+    print(f"  {'AnomalyDetector':18} {args.messages / elapsed:11,.0f} msgs/s   "
+          f"{state / args.agents:5.0f} bytes/agent   triggers {len(triggers)} "
+          f"{dict(Counter(t['quarantine_reason'] for t in triggers))}")
+
+    n = min(args.naive_messages, args.messages)
+    elapsed = naive(agent_ids, sentiment, consistency, n)
+    print(f"  {'full history':18} {n / elapsed:11,.0f} msgs/s   (last {n:,} messages; slows as histories grow)")
+
+
+if __name__ == "__main__":
+    main()
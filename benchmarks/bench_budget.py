@@ -0,0 +1,132 @@
+"""
+Benchmark: per-spend remote budget checks vs BudgetLedger spend leases.
+
+Worker threads across several worker processes (one ledger each) spend for a
+set of agents against a shared Redis with simulated network latency, until
+every agent's daily limit is used up. Compares:
+
+- naive: GET the counter, compare, INCRBYFLOAT (racy)
+- atomic: WATCH / GET / MULTI INCRBYFLOAT / EXEC per spend
+- BudgetLedger: local reserve/commit against leases
+
+Reports throughput, Redis round trips per spend and overshoot of the limit.
+
+Usage: python benchmarks/bench_budget.py [--agents N] [--workers N] [--threads N] [--rtt-ms MS]
+
+Reference: chimera/budget.py, specs/functional.md FR 5.2
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.budget import BudgetExceeded, BudgetLedger, budget_date, to_micro  # noqa: E402
+from chimera.keys import redis_key  # noqa: E402
+from chimera.redis_store import InMemoryRedis, WatchError  # noqa: E402
+
+AMOUNTS = [0.01, 0.05, 0.1, 0.25, 0.5, 1.0]
+
+
+def naive_spend(client, agent_id: str, amount: float, limit: float) -> bool:
+    key = redis_key("daily_spend", agent_id=agent_id, date=budget_date(time.time()))
+    if float(client.get(key) or 0) + amount > limit:
+        return False
+    client.incrbyfloat(key, amount)
+    return True
+
+
+def atomic_spend(client, agent_id: str, amount: float, limit: float) -> bool:
+    key = redis_key("daily_spend", agent_id=agent_id, date=budget_date(time.time()))
+    with client.pipeline() as pipe:
+        while True:
+            try:
+                pipe.watch(key)
+                if to_micro(float(pipe.get(key) or 0)) + to_micro(amount) > to_micro(limit):
+                    return False
+                pipe.multi()
+                pipe.incrbyfloat(key, amount)
+                pipe.execute()
+                return True
+            except WatchError:
+                continue
+
+
+def run(label: str, spend_fns: List[Callable[[str, float], bool]], client, args, close=None) -> None:
+    done = [0]
+    lock = threading.Lock()
+
+    def thread(spend, seed):
+        rng = random.Random(seed)
+        agents = [f"agent-{i}" for i in range(args.agents)]
+        exhausted = set()
+        count = 0
+        while len(exhausted) < len(agents):
+            agent_id = rng.choice(agents)
+            if agent_id in exhausted:
+                continue
+            if spend(agent_id, rng.choice(AMOUNTS)):
+                count += 1
+            else:
+                exhausted.add(agent_id)
+        with lock:
+            done[0] += count
+
+    threads = [threading.Thread(target=thread, args=(spend_fns[i % len(spend_fns)], i))
+               for i in range(args.workers * args.threads)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    if close:
+        close()
+    elapsed = time.perf_counter() - start
+    date = budget_date(time.time())
+    spent = [float(client.get(redis_key("daily_spend", agent_id=f"agent-{i}", date=date)) or 0)
+             for i in range(args.agents)]
+    overshoot = sum(max(0.0, s - args.limit) for s in spent)
+    print(f"  {label:13} {done[0] / elapsed:9,.0f} spends/s   {client.round_trips / max(done[0], 1):5.2f} round trips/spend   "
+          f"overshoot {overshoot:7.2f} USDC over {sum(s > args.limit + 1e-9 for s in spent)} agents")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--workers", type=int, default=4, help="worker processes (one ledger each)")
+    parser.add_argument("--threads", type=int, default=4, help="threads per worker")
+    parser.add_argument("--limit", type=float, default=50.0, help="daily limit per agent (USDC)")
+    parser.add_argument("--rtt-ms", type=float, default=0.2)
+    args = parser.parse_args(argv)
+    rtt = args.rtt_ms / 1000
+
+    print(f"--- {args.agents} agents x ${args.limit:g}/day, {args.workers} workers x {args.threads} threads, "
+          f"{args.rtt_ms:g} ms RTT ---")
+    client = InMemoryRedis(round_trip_latency=rtt)
+    run("naive", [lambda a, x: naive_spend(client, a, x, args.limit)], client, args)
+    client = InMemoryRedis(round_trip_latency=rtt)
+    run("atomic", [lambda a, x: atomic_spend(client, a, x, args.limit)], client, args)
+
+    client = InMemoryRedis(round_trip_latency=rtt)
+    ledgers = [BudgetLedger(client, daily_limit_usdc=args.limit) for _ in range(args.workers)]
+
+    def ledger_spend(ledger):
+        def spend(agent_id, amount):
+            try:
+                ledger.commit(ledger.reserve(agent_id, amount))
+                return True
+            except BudgetExceeded:
+                return False
+        return spend
+
+    run("BudgetLedger", [ledger_spend(ledger) for ledger in ledgers], client, args,
+        close=lambda: [ledger.close() for ledger in ledgers])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: per-reply context assembly, full re-tokenization vs ContextBuilder.
+
+Simulates a conversation where each reply adds two messages to the history
+and retrieves episodic and semantic memories. The baseline renders the whole
+prompt, tokenizes it, and drops the oldest message and re-tokenizes until it
+fits the budget. ContextBuilder reuses the cached SOUL.md prefix and segment
+counts and packs by relevance.
+
+Usage: python benchmarks/bench_context_builder.py [--turns N] [--budget TOKENS] [--personas N]
+
+Reference: skills/engagement_manager/context.py, specs/functional.md FR 1.1
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skills.engagement_manager.context import SEPARATOR, ContextBuilder, approximate_encode  # noqa: E402
+
+WORDS = "sustainable fashion thrift addis merkato vintage denim style habesha kemis eco brand haul review drop".split()
+
+
+def make_persona(i: int) -> dict:
+    return {
+        "soul_md_hash": f"persona-{i}",
+        "backstory": " ".join(["Addis-based creator who loves vintage markets and slow fashion."] * 40),
+        "voice_traits": ["Witty", "Empathetic", "Gen-Z Slang"],
+        "core_beliefs": ["Sustainability-focused", "Inclusive and diverse"],
+        "directives": ["Never discuss politics", "Always disclose AI nature when asked"],
+    }
+
+
+def sentence(rng: random.Random, n: int) -> str:
+    return " ".join(rng.choices(WORDS, k=n))
+
+
+def naive(persona: dict, params: dict, episodic: list, semantic: list, budget: int) -> int:
+    history = list(params["context"]["conversation_history"])
+    while True:
+        parts = [
+            persona["backstory"],
+            "\n".join(persona["voice_traits"] + persona["core_beliefs"] + persona["directives"]),
+            "\n".join(params["persona_constraints"]),
+            *("[memory] " + m["content"] for m in semantic),
+            *("[recent] " + m["text"] for m in episodic),
+            *history,
+        ]
+        tokens = len(approximate_encode(SEPARATOR.join(parts)))
+        if tokens <= budget or not history:
+            return tokens
+        history.pop(0)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=400)
+    parser.add_argument("--budget", type=int, default=3072)
+    parser.add_argument("--personas", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(3)
+    personas = [make_persona(i) for i in range(args.personas)]
+    histories: List[List[str]] = [[] for _ in personas]
+    calls = []
+    for _ in range(args.turns):
+        i = rng.randrange(len(personas))
+        histories[i] += [f"User: {sentence(rng, 25)}", f"Agent: {sentence(rng, 30)}"]
+        params = {
+            "persona_constraints": ["Witty", "Keep replies short"],
+            "context": {
+                "conversation_history": list(histories[i]),
+                "user_profile": {"followers": 5000, "verified": False, "interests": ["fashion"]},
+                "trending_topics": ["Sustainable Fashion"],
+            },
+        }
+        episodic = [{"text": sentence(rng, 20)} for _ in range(10)]
+        semantic = [{"content": sentence(rng, 40), "score": rng.random()} for _ in range(5)]
+        calls.append((personas[i], params, episodic, semantic))
+
+    print(f"--- {args.turns} replies over {args.personas} personas, budget {args.budget} tokens ---")
+    builder = ContextBuilder(token_budget=args.budget)
+    for label in ("re-tokenize prompt", "ContextBuilder"):
+        latencies = []
+        for persona, params, episodic, semantic in calls:
+            t = time.perf_counter()
+            if label == "ContextBuilder":
+                tokens = builder.build(persona, params, episodic, semantic).tokens
+            else:
+                tokens = naive(persona, params, episodic, semantic, args.budget)
+            latencies.append(time.perf_counter() - t)
+            assert tokens <= args.budget
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+        print(f"  {label:20} p50 {p50:7.3f} ms   p99 {p99:7.3f} ms   total {sum(latencies):6.3f} s")
+    s = builder.counter.stats
+    print(f"  segment counts cached: {s['hits'] / max(1, s['hits'] + s['tokenized']):.0%}, "
+          f"prefix hits {builder.stats['prefix_hits']}/{builder.stats['builds']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: incremental FleetAggregator vs reading every agent status hash.
+
+Simulates a `--agents` fleet sending heartbeats (mostly liveness, some
+state / queue / wallet changes) and measures: bytes per heartbeat (binary
+delta frames vs JSON), ingest throughput, the cost of one dashboard refresh
+(publish + serve) against reading all status hashes per refresh (one round
+trip each, or pipelined, with `--rtt-ms` of simulated network latency) and
+recomputing the summary from scratch.
+
+Usage: python benchmarks/bench_fleet.py [--agents N] [--heartbeats N] [--rtt-ms 0.1]
+
+Reference: chimera/fleet.py, specs/functional.md US-1.2
+"""
+
+import argparse
+import heapq
+import json
+import random
+import sys
+import time
+import uuid
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.fleet import STATES, FleetAggregator, HeartbeatEncoder  # noqa: E402
+from chimera.keys import redis_key  # noqa: E402
+from chimera.redis_store import InMemoryRedis  # noqa: E402
+
+T0 = 1_770_000_000.0
+
+
+def summarize(rows: List[Dict[str, str]], k: int = 10) -> Dict[str, object]:
+    """Baseline: the dashboard summary recomputed from every status hash."""
+    return {
+        "by_state": Counter(row["state"] for row in rows),
+        "queue_depth": sum(int(row["queue_depth"]) for row in rows),
+        "hitl_depth": sum(int(row["hitl_depth"]) for row in rows),
+        "wallet": sum(float(row["wallet_balance"]) for row in rows),
+        "lowest_wallet": heapq.nsmallest(k, (float(row["wallet_balance"]) for row in rows)),
+        "deepest": heapq.nlargest(k, (int(row["queue_depth"]) for row in rows)),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=10_000)
+    parser.add_argument("--heartbeats", type=int, default=200_000)
+    parser.add_argument("--rtt-ms", type=float, default=0.1, help="simulated Redis round trip")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(1)
+    agent_ids = [str(uuid.uuid4()) for _ in range(args.agents)]
+    status = {a: {"state": rng.choice(STATES[:4]), "queue_depth": rng.randrange(20), "hitl_depth": rng.randrange(5),
+                  "wallet_balance": round(rng.uniform(1, 500), 6), "daily_spend": round(rng.uniform(0, 50), 6)}
+              for a in agent_ids}
+
+    now = [T0]
+    encoder = HeartbeatEncoder(keyframe_interval=300, clock=lambda: now[0])
+
+    def traffic(count: int) -> List[bytes]:
+        frames = []
+        for _ in range(count):
+            now[0] += 10.0 / args.agents  # every agent about every 10 s
+            agent_id = agent_ids[rng.randrange(args.agents)]
+            current = status[agent_id]
+            roll = rng.random()
+            if roll < 0.1:
+                current["state"] = rng.choice(STATES[:4])
+            elif roll < 0.3:
+                current["queue_depth"] = rng.randrange(20)
+            elif roll < 0.35:
+                current["wallet_balance"] = round(rng.uniform(1, 500), 6)
+            frames.append(encoder.encode(agent_id, **current))
+        return frames
+
+    frames = traffic(args.heartbeats)
+    json_bytes = sum(len(json.dumps({"agent_id": a, "last_heartbeat": now[0], **s})) for a, s in status.items())
+    binary_bytes = sum(map(len, frames))
+    print(f"--- {args.agents:,} agents, {args.heartbeats:,} heartbeats ---")
+    print(f"  JSON status:        {json_bytes / len(status):>8.1f} bytes/heartbeat")
+    print(f"  binary delta:       {binary_bytes / len(frames):>8.1f} bytes/heartbeat")
+
+    fleet = FleetAggregator(clock=lambda: now[0])
+    t = time.perf_counter()
+    for start in range(0, len(frames), 100):
+        fleet.apply(b"".join(frames[start:start + 100]))
+    elapsed = time.perf_counter() - t
+    print(f"  ingest:             {len(frames) / elapsed:>10,.0f} heartbeats/s")
+    fleet.publish()
+
+    print("--- one dashboard refresh ---")
+    redis = InMemoryRedis()
+    for agent_id, current in status.items():
+        redis.hset(redis_key("agent_status", agent_id=agent_id), mapping={**current, "last_heartbeat": now[0]})
+    redis.round_trip_latency = args.rtt_ms / 1000.0
+    keys = [redis_key("agent_status", agent_id=a) for a in agent_ids]
+
+    t = time.perf_counter()
+    rows = [redis.hgetall(key) for key in keys]
+    summarize(rows)
+    elapsed = time.perf_counter() - t
+    print(f"  HGETALL per agent:  {elapsed * 1000:>10.1f} ms  ({len(keys):,} round trips)")
+
+    t = time.perf_counter()
+    pipe = redis.pipeline(transaction=False)
+    for key in keys:
+        pipe.hgetall(key)
+    summarize(pipe.execute())
+    elapsed = time.perf_counter() - t
+    print(f"  pipelined HGETALL:  {elapsed * 1000:>10.1f} ms  (1 round trip)")
+
+    # A refresh window's worth of heartbeats (0.5 s of traffic), then publish.
+    fleet.apply(b"".join(traffic(max(1, args.agents // 20))))
+    t = time.perf_counter()
+    diff = fleet.publish()
+    elapsed = time.perf_counter() - t
+    print(f"  aggregator publish: {elapsed * 1000:>10.2f} ms  ({len(diff['agents']):,} changed rows pushed)")
+    t = time.perf_counter()
+    for _ in range(10_000):
+        fleet.snapshot_json()
+    elapsed = time.perf_counter() - t
+    print(f"  aggregator serve:   {elapsed / 10_000 * 1e6:>10.2f} us  ({len(fleet.snapshot_json()):,} bytes)")
+
+
+if __name__ == "__main__":
+    main()
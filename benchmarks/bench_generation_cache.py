@@ -0,0 +1,114 @@
+"""
+Benchmark: content_generator with and without GenerationCache.
+
+Simulates campaign waves: agents request assets for Zipf-distributed topics
+across platforms and content types, with retries and overlapping bursts. A
+paid generator stands in for the image/video MCP tools (fixed latency, fixed
+cost per content type). Reports paid calls, USDC spent versus USDC reported
+in result metadata, and per-request latency.
+
+Usage: python benchmarks/bench_generation_cache.py [--requests N] [--topics N] [--latency S]
+
+Reference: skills/content_generator/cache.py, skills/content_generator/README.md
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skills.content_generator import GenerationCache  # noqa: E402
+
+COST_USDC = {"text": 0.01, "image": 2.5, "video": 12.5, "multimodal": 15.0}
+PLATFORMS = ["twitter", "instagram", "threads", "tiktok"]
+
+
+class PaidGenerator:
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+        self.spent = 0.0
+
+    async def __call__(self, parameters):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        cost = COST_USDC[parameters["content_type"]]
+        self.spent += cost
+        return {
+            "content": {"text": parameters["topic"], "image_url": None, "video_url": None,
+                        "platform": parameters["platform"], "disclosure_level": "automated"},
+            "metadata": {"generated_at": "2026-02-04T10:05:00Z", "generation_cost_usdc": cost,
+                         "character_consistency_score": 0.95, "brand_alignment_score": 0.9},
+        }
+
+
+def make_requests(n: int, topics: int, seed: int = 3) -> List[List[dict]]:
+    """Waves of concurrent requests (one wave per campaign tick)."""
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(topics)]
+    waves, wave = [], []
+    for _ in range(n):
+        topic = rng.choices(range(topics), weights=weights)[0]
+        wave.append({
+            "content_type": rng.choice(["text", "image", "image", "video", "multimodal"]),
+            "platform": rng.choice(PLATFORMS),
+            "topic": f"Campaign topic {topic}" if rng.random() < 0.8 else f"  campaign TOPIC {topic} ",
+            "character_reference_id": f"brand-lora-{topic % 5}",
+            "tier": "daily",
+            "budget_limit_usdc": rng.choice([5.0, 25.0, 50.0]),
+        })
+        if len(wave) == 64:
+            waves.append(wave)
+            wave = []
+    return waves + ([wave] if wave else [])
+
+
+async def run(waves: List[List[dict]], latency: float, cache: Optional[GenerationCache]):
+    generator = PaidGenerator(latency)
+    latencies: List[float] = []
+
+    async def request(parameters):
+        start = time.perf_counter()
+        result = await (generator(parameters) if cache is None else cache.generate(parameters, generator))
+        latencies.append(time.perf_counter() - start)
+        return result["metadata"]["generation_cost_usdc"]
+
+    reported = 0.0
+    for wave in waves:
+        reported += sum(await asyncio.gather(*(request(p) for p in wave)))
+    return generator, reported, float(np.mean(latencies)), float(np.percentile(latencies, 50))
+
+
+def report(label: str, generator: PaidGenerator, reported: float, mean: float, p50: float) -> None:
+    print(f"  {label:18} paid calls {generator.calls:6}   spent {generator.spent:10,.2f} USDC   "
+          f"reported {reported:10,.2f}   latency mean {mean * 1000:5.1f} ms   p50 {p50 * 1000:5.1f} ms")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="paid tool latency (s)")
+    args = parser.parse_args(argv)
+    waves = make_requests(args.requests, args.topics)
+
+    print(f"--- {args.requests} requests in {len(waves)} waves, {args.topics} topics ---")
+    report("uncached", *asyncio.run(run(waves, args.latency, None)))
+    with tempfile.TemporaryDirectory() as directory:
+        cache = GenerationCache(directory)
+        report("GenerationCache", *asyncio.run(run(waves, args.latency, cache)))
+        s = cache.stats
+        print(f"  hits {s['hits']}, coalesced {s['coalesced']}, entries {len(cache)}, "
+              f"{cache.size_bytes / 1024:.0f} KiB on disk")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark: prefiltered HITL routing vs classifying every TaskResult.
+
+Routes synthetic TaskResults (a few percent touching sensitive topics) with
+the topic classifier run on every result, and through HITLRouter with the
+keyword automaton in front so only candidates are classified.
+The classifier knows the ground truth and costs `--model-ms` of simulated
+inference per text (a stand-in for a real topic model), so both runs must
+flag the same results; only the classifier bill differs. Also
+compares keyword matching (automaton vs one regex per keyword) and the
+"next most urgent review" retrieval (heap vs scanning the queue).
+
+Usage: python benchmarks/bench_hitl.py [--results N] [--sensitive 0.05] [--model-ms 0.5]
+
+Reference: chimera/hitl.py, specs/functional.md US-2.1, US-2.2
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.hitl import DEFAULT_SENSITIVE_KEYWORDS, HITLRouter, KeywordAutomaton, band_for  # noqa: E402
+
+BENIGN = ("new drop friday link in bio habesha kemis handmade weave coffee ceremony addis street style "
+          "sunset shoot behind the scenes collab giveaway thank you fam outfit of the day colour palette").split()
+SENSITIVE = {
+    "politics": "who are you voting for in the election this year",
+    "health_advice": "this supplement cures anxiety better than medication",
+    "financial_advice": "buy this token now for passive income and guaranteed returns",
+    "legal_claims": "clinically proven and fda approved or we will sue",
+}
+
+
+class TopicClassifier:
+    """Ground-truth topic model with simulated latency per text."""
+
+    def __init__(self, model_ms: float):
+        self.model_ms = model_ms
+        self.calls = 0
+
+    def __call__(self, texts: Sequence[str]) -> List[Dict[str, float]]:
+        self.calls += len(texts)
+        time.sleep(len(texts) * self.model_ms / 1000.0)
+        return [{topic: 0.95 if phrase in text else 0.05 for topic, phrase in SENSITIVE.items()} for text in texts]
+
+
+def classify_all(results: List[dict], classifier: TopicClassifier, batch: int) -> Dict[str, int]:
+    """Baseline: every result goes through the classifier before banding."""
+    counts = {"sensitive": 0, "review": 0}
+    for start in range(0, len(results), batch):
+        chunk = results[start:start + batch]
+        scores = classifier([r["content"]["text"] for r in chunk])
+        for result, topic_scores in zip(chunk, scores):
+            sensitive = any(p >= 0.5 for p in topic_scores.values())
+            counts["sensitive"] += sensitive
+            counts["review"] += sensitive or band_for(result["confidence_score"]) == "yellow"
+    return counts
+
+
+def make_results(n: int, sensitive: float, seed: int = 11) -> List[dict]:
+    rng = random.Random(seed)
+    topics = list(SENSITIVE)
+    results = []
+    for i in range(n):
+        words = rng.choices(BENIGN, k=rng.randint(8, 20))
+        if rng.random() < sensitive:
+            words.append(SENSITIVE[rng.choice(topics)])
+        results.append({
+            "task_id": f"task-{i}",
+            "worker_id": "worker-1",
+            "status": "success",
+            "content": {"type": "text", "text": " ".join(words)},
+            "confidence_score": round(rng.betavariate(8, 1.5), 3),
+        })
+    return results
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--results", type=int, default=20_000)
+    parser.add_argument("--sensitive", type=float, default=0.05, help="fraction of sensitive results")
+    parser.add_argument("--model-ms", type=float, default=0.5, help="simulated classifier latency per text")
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    results = make_results(args.results, args.sensitive)
+    bands = {band: sum(band_for(r["confidence_score"]) == band for r in results) for band in ("green", "yellow", "red")}
+    print(f"--- {args.results:,} results ({args.sensitive:.0%} sensitive), bands {bands} ---")
+
+    classifier = TopicClassifier(args.model_ms)
+    t = time.perf_counter()
+    counts = classify_all(results, classifier, args.batch)
+    elapsed = time.perf_counter() - t
+    print(f"  classify all:       {len(results) / elapsed:>10,.0f} results/s  "
+          f"({classifier.calls:,} classified, {counts['sensitive']:,} sensitive, {counts['review']:,} queued)")
+
+    classifier = TopicClassifier(args.model_ms)
+    prefiltered = HITLRouter(classifier=classifier)
+    t = time.perf_counter()
+    for start in range(0, len(results), args.batch):
+        prefiltered.route_batch(results[start:start + args.batch])
+    elapsed = time.perf_counter() - t
+    stats = prefiltered.stats
+    print(f"  keyword prefilter:  {len(results) / elapsed:>10,.0f} results/s  "
+          f"({classifier.calls:,} classified, {stats['sensitive']:,} sensitive, {stats['review']:,} queued)")
+
+    print(f"--- keyword matching ({sum(map(len, DEFAULT_SENSITIVE_KEYWORDS.values()))} keywords) ---")
+    texts = [r["content"]["text"] for r in results]
+    automaton = KeywordAutomaton(DEFAULT_SENSITIVE_KEYWORDS)
+    patterns = [(topic, re.compile(r"\b" + r"\W+".join(map(re.escape, phrase.split())) + r"\b", re.I))
+                for topic, phrases in DEFAULT_SENSITIVE_KEYWORDS.items() for phrase in phrases]
+    t = time.perf_counter()
+    hits = sum(bool(automaton.labels(text)) for text in texts)
+    elapsed = time.perf_counter() - t
+    print(f"  automaton:          {len(texts) / elapsed:>10,.0f} texts/s  ({hits:,} candidates)")
+    t = time.perf_counter()
+    hits = sum(bool({topic for topic, pattern in patterns if pattern.search(text)}) for text in texts)
+    elapsed = time.perf_counter() - t
+    print(f"  regex per keyword:  {len(texts) / elapsed:>10,.0f} texts/s  ({hits:,} candidates)")
+
+    depth = len(prefiltered.index)
+    print(f"--- next most urgent review, {depth:,} queued ---")
+    queued = [(0 if d.sensitive_topics else 1, d.confidence_score, i)
+              for i, d in enumerate(HITLRouter().route_batch(results)) if d.action == "review"]
+    pops = min(1_000, depth)
+    t = time.perf_counter()
+    for _ in range(pops):
+        prefiltered.next_review()
+    elapsed = time.perf_counter() - t
+    print(f"  heap pop:           {elapsed / pops * 1e6:>10.1f} us/review")
+    t = time.perf_counter()
+    for _ in range(pops):
+        queued.remove(min(queued))
+    elapsed = time.perf_counter() - t
+    print(f"  scan for min:       {elapsed / pops * 1e6:>10.1f} us/review")
+
+
+if __name__ == "__main__":
+    main()
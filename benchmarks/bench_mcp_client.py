@@ -0,0 +1,97 @@
+"""
+Benchmark: session-per-call MCP client vs pooled, multiplexed sessions.
+
+Runs `--calls` resource reads and tool calls against the local stub MCP
+server with `--concurrency` callers. The server adds `--handshake-ms` to
+each `initialize` (standing in for TLS + auth on a remote server) and
+`--latency-ms` to every call. The baseline connects, initializes, calls
+and disconnects each time; the pool reuses long-lived sessions.
+
+Usage: python benchmarks/bench_mcp_client.py [--calls N] [--concurrency N] [--handshake-ms F] [--latency-ms F]
+
+Reference: chimera/mcp_client.py, specs/_meta.md Section 2.3
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.mcp_client import MCPClientPool  # noqa: E402
+from chimera.mcp_stub import StubMCPServer  # noqa: E402
+from chimera.metrics import LatencyHistogram  # noqa: E402
+
+
+def news(uri: str) -> dict:
+    return {"trends": [{"topic": "Sustainable Fashion", "engagement_score": 0.87, "relevance_score": 0.92}]}
+
+
+def post_tweet(text: str) -> dict:
+    return {"tweet_id": str(hash(text))}
+
+
+async def run(args: argparse.Namespace) -> None:
+    server = StubMCPServer(
+        tools={"post_tweet": post_tweet},
+        resources=news,
+        latency=args.latency_ms / 1000.0,
+        handshake_latency=args.handshake_ms / 1000.0,
+    )
+    await server.start()
+    print(f"--- {args.calls} calls, {args.concurrency} concurrent callers, "
+          f"handshake {args.handshake_ms} ms, call {args.latency_ms} ms ---")
+
+    async def drive(label: str, call) -> None:
+        histogram = LatencyHistogram()
+        semaphore = asyncio.Semaphore(args.concurrency)
+
+        async def one(i: int) -> None:
+            async with semaphore:
+                t = time.perf_counter()
+                await call(i)
+                histogram.observe(time.perf_counter() - t)
+
+        handshakes = server.stats["handshakes"]
+        t = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(args.calls)))
+        elapsed = time.perf_counter() - t
+        s = histogram.snapshot()
+        print(f"  {label:20} {args.calls / elapsed:8.0f} calls/s   p50 {s['p50'] * 1e3:7.2f} ms   "
+              f"p99 {s['p99'] * 1e3:7.2f} ms   handshakes {server.stats['handshakes'] - handshakes}")
+
+    async def per_call(i: int) -> None:
+        async with MCPClientPool({"news": server.connector(), "twitter": server.connector()}) as pool:
+            await invoke(pool, i)
+
+    async def invoke(pool: MCPClientPool, i: int) -> None:
+        if i % 4:
+            await pool.read_resource("mcp://news/ethiopia/fashion/trends?hours=24")
+        else:
+            await pool.call_tool("twitter", "post_tweet", {"text": f"post {i}"})
+
+    await drive("session per call", per_call)
+    pool = MCPClientPool({"news": server.connector(), "twitter": server.connector()})
+    await drive("MCPClientPool", lambda i: invoke(pool, i))
+    for name, m in pool.metrics().items():
+        print(f"    {name}: {m['sessions']} sessions, " + ", ".join(
+            f"{label} p50 {h['p50'] * 1e3:.2f} ms / p99 {h['p99'] * 1e3:.2f} ms" for label, h in m["latency"].items()))
+    await pool.close()
+    await server.stop()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--calls", type=int, default=4000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--handshake-ms", type=float, default=20.0)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: context-assembly latency with and without the L1 memory cache.
+
+Each conversation turn assembles context (last hour of episodic memory +
+semantic memories for the conversation topic) and then writes the new
+interaction. Another worker writes to the same agents now and then. Remote
+tiers are simulated: Redis with `--rtt-ms` per round trip, the semantic
+memory resource with `--semantic-ms` per query.
+
+Usage: python benchmarks/bench_memory.py [--turns N] [--agents N] [--rtt-ms F] [--semantic-ms F]
+
+Reference: chimera/memory.py, specs/functional.md FR 1.1
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.memory import MEMORY_SEMANTIC_URI, TieredMemory  # noqa: E402
+from chimera.redis_store import InMemoryRedis  # noqa: E402
+
+
+def make_reader(latency: float):
+    def reader(uri: str) -> dict:
+        time.sleep(latency)
+        return {"memories": [{"content": f"memory {i} for {uri}", "engagement_score": 0.5} for i in range(5)]}
+    return reader
+
+
+def workload(args: argparse.Namespace) -> List[tuple]:
+    rng = random.Random(7)
+    weights = [1.0 / (rank + 1) for rank in range(args.agents)]
+    agents = rng.choices([f"agent-{i}" for i in range(args.agents)], weights=weights, k=args.turns)
+    return [(agent, f"topic {rng.randrange(3)} of {agent}", rng.random() < args.foreign) for agent in agents]
+
+
+def seed(client: InMemoryRedis, args: argparse.Namespace) -> None:
+    writer = TieredMemory(client)
+    for i in range(args.agents):
+        for n in range(args.history):
+            writer.write_episodic(f"agent-{i}", {"role": "user", "text": f"message {n}"})
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=600)
+    parser.add_argument("--agents", type=int, default=20)
+    parser.add_argument("--history", type=int, default=60, help="episodic entries per agent")
+    parser.add_argument("--foreign", type=float, default=0.1, help="share of turns preceded by another worker's write")
+    parser.add_argument("--rtt-ms", type=float, default=0.5)
+    parser.add_argument("--semantic-ms", type=float, default=5.0)
+    args = parser.parse_args(argv)
+
+    turns = workload(args)
+    print(f"--- {args.turns} turns over {args.agents} agents (Zipf), {args.history} episodic entries each, "
+          f"Redis RTT {args.rtt_ms} ms, semantic query {args.semantic_ms} ms ---")
+
+    for label in ("direct (no L1)", "TieredMemory L1"):
+        client = InMemoryRedis(round_trip_latency=args.rtt_ms / 1000.0)
+        seed(client, args)
+        reader = make_reader(args.semantic_ms / 1000.0)
+        other = TieredMemory(client)
+        memory = TieredMemory(client, semantic_reader=reader)
+        latencies = []
+        for agent, topic, foreign in turns:
+            if foreign:
+                other.write_episodic(agent, {"role": "user", "text": "from another worker"})
+            t = time.perf_counter()
+            if label.startswith("direct"):
+                raw = client.lrange(f"chimera:memory:{agent}:episodic", 0, -1)
+                recent = [json.loads(item) for item in raw]
+                memories = reader(MEMORY_SEMANTIC_URI.format(agent_id=agent, query=topic, limit=5))["memories"]
+            else:
+                recent = memory.recent(agent)
+                memories = memory.semantic(agent, topic)
+            latencies.append(time.perf_counter() - t)
+            assert recent and memories
+            memory.write_episodic(agent, {"role": "assistant", "text": "reply"})
+        p50, p99 = np.percentile(latencies, [50, 99]) * 1e3
+        line = f"  {label:16} context assembly p50 {p50:7.3f} ms   p99 {p99:7.3f} ms"
+        if not label.startswith("direct"):
+            m = memory.metrics()
+            line += f"   episodic hit {m['episodic_hit_rate']:.0%}, semantic hit {m['semantic_hit_rate']:.0%}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
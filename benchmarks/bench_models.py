@@ -0,0 +1,120 @@
+"""
+Benchmark: binary AgentTask / TaskResult frames vs JSON dicts.
+
+Builds `--count` synthetic tasks and results shaped like the spec schemas
+and compares the current representation (JSON strings parsed into dicts)
+with the slotted models and binary codec: bytes on the wire, encode and
+decode throughput (full decode, and the Judge's routing read of
+`confidence_score` only), and memory held per decoded object.
+
+Usage: python benchmarks/bench_models.py [--count N]
+
+Reference: chimera/models.py, specs/technical.md Section 1.1, Section 1.2
+"""
+
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+import uuid
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.models import AgentTask, TaskResult, decode, encode  # noqa: E402
+
+WORDS = "habesha kemis handmade weave coffee ceremony addis street style sunset drop collab giveaway".split()
+
+
+def make_tasks(n: int, rng: random.Random) -> List[dict]:
+    return [{
+        "task_id": str(uuid.uuid4()),
+        "task_type": rng.choice(["generate_content", "reply_comment", "fetch_trends"]),
+        "priority": rng.choice(["high", "medium", "low"]),
+        "context": {
+            "goal_description": " ".join(rng.choices(WORDS, k=12)),
+            "persona_constraints": ["warm tone", "no pricing claims"],
+            "required_resources": [f"mcp://twitter/mentions/{rng.randrange(10**6)}"],
+            "budget_limit": round(rng.uniform(0.1, 5), 2),
+        },
+        "assigned_worker_id": None,
+        "created_at": "2026-02-04T10:00:00Z",
+        "status": "pending",
+        "state_version": str(rng.randrange(1000)),
+    } for _ in range(n)]
+
+
+def make_results(n: int, rng: random.Random) -> List[dict]:
+    return [{
+        "task_id": str(uuid.uuid4()),
+        "worker_id": f"worker-{rng.randrange(64)}",
+        "result_type": "content",
+        "content": {"text": " ".join(rng.choices(WORDS, k=30)), "platform": "instagram",
+                    "image_url": f"https://cdn.example.com/{uuid.uuid4().hex}.png"},
+        "confidence_score": round(rng.random(), 3),
+        "reasoning_trace": " ".join(rng.choices(WORDS, k=40)),
+        "created_at": "2026-02-04T10:00:05Z",
+        "sensitive_topics_detected": [],
+    } for _ in range(n)]
+
+
+def rate(fn: Callable[[], Any], n: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return n / (time.perf_counter() - start)
+
+
+def retained(build: Callable[[], Any]) -> int:
+    """Bytes still allocated by what `build()` returns."""
+    gc.collect()
+    tracemalloc.start()
+    kept = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=50_000)
+    args = parser.parse_args(argv)
+    rng = random.Random(2)
+    n = args.count
+
+    for name, dicts, model in (("AgentTask", make_tasks(n, rng), AgentTask),
+                               ("TaskResult", make_results(n, rng), TaskResult)):
+        texts = [json.dumps(d, separators=(",", ":")) for d in dicts]
+        models = [model.from_dict(d) for d in dicts]
+        frames = [encode(m) for m in models]
+        print(f"--- {n:,} x {name} ---")
+        print(f"  size:       JSON {sum(map(len, texts)) / n:>6.0f} B   binary {sum(map(len, frames)) / n:>6.0f} B")
+        print(f"  encode:     JSON {rate(lambda: [json.dumps(d, separators=(',', ':')) for d in dicts], n):>10,.0f}/s"
+              f"   binary {rate(lambda: [encode(m) for m in models], n):>10,.0f}/s")
+        if model is TaskResult:
+            full = lambda: [(r.content, r.reasoning_trace) for r in map(decode, frames)]  # noqa: E731
+            print(f"  decode:     JSON {rate(lambda: [json.loads(t) for t in texts], n):>10,.0f}/s"
+                  f"   binary {rate(full, n):>10,.0f}/s (content + trace materialized)")
+            print(f"  route read: JSON {rate(lambda: [json.loads(t)['confidence_score'] for t in texts], n):>10,.0f}/s"
+                  f"   binary {rate(lambda: [decode(f).confidence_score for f in frames], n):>10,.0f}/s")
+            forward = rate(lambda: [encode(decode(f)) for f in frames], n)
+            print(f"  forward:    JSON {rate(lambda: [json.dumps(json.loads(t)) for t in texts], n):>10,.0f}/s"
+                  f"   binary {forward:>10,.0f}/s (decode + re-encode untouched)")
+        else:
+            print(f"  decode:     JSON {rate(lambda: [json.loads(t) for t in texts], n):>10,.0f}/s"
+                  f"   binary {rate(lambda: [decode(f) for f in frames], n):>10,.0f}/s")
+
+        as_dicts = retained(lambda: [json.loads(t) for t in texts])
+        if model is TaskResult:
+            as_models = retained(lambda: [(r, r.content, r.reasoning_trace) for r in map(decode, frames)])
+        else:
+            as_models = retained(lambda: [decode(f) for f in frames])
+        print(f"  memory:     dict {as_dicts / n:>6.0f} B   model {as_models / n:>6.0f} B per decoded object")
+
+
+if __name__ == "__main__":
+    main()
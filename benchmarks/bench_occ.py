@@ -0,0 +1,114 @@
+"""
+Benchmark: Judge commit throughput, lock-per-commit vs batched CAS.
+
+Several Judge threads commit results for one busy agent. Each result writes
+one of `--fields` GlobalState fields and was produced against a version that
+is a few commits old (Workers run concurrently with Judges).
+
+- lock + version check: SET NX on `chimera:state:{agent_id}:lock`, compare
+  the result's state_version with the current version, write, release;
+  any mismatch re-queues the whole task (FR 6.1 as written)
+- CommitEngine: one WATCH/MULTI/EXEC per batch, per-field conflict checks,
+  conflicting results revalidated against fresh state and retried
+
+Usage: python benchmarks/bench_occ.py [--results N] [--judges N] [--batch N] [--rtt-ms F]
+
+Reference: chimera/occ.py, specs/functional.md FR 6.1
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.occ import CommitEngine, Proposal  # noqa: E402
+from chimera.redis_store import InMemoryRedis  # noqa: E402
+
+AGENT = "busy-agent"
+VERSION_KEY = f"chimera:state:{AGENT}:version"
+LOCK_KEY = f"chimera:state:{AGENT}:lock"
+DATA_KEY = f"chimera:state:{AGENT}:data"
+
+
+def lock_judge(client: InMemoryRedis, results: int, args: argparse.Namespace, seed: int, counts: dict) -> None:
+    rng = random.Random(seed)
+    for i in range(results):
+        seen = max(0, int(client.get(VERSION_KEY) or 0) - rng.randint(0, args.lag))
+        while not client.set(LOCK_KEY, str(seed), px=5000, nx=True):
+            time.sleep(args.rtt_ms / 1000.0)
+        try:
+            current = int(client.get(VERSION_KEY) or 0)
+            if current != seen:
+                counts["requeued"] += 1
+                continue
+            with client.pipeline() as pipe:
+                pipe.hset(DATA_KEY, f"field-{rng.randrange(args.fields)}", json.dumps(i))
+                pipe.set(VERSION_KEY, current + 1)
+                pipe.execute()
+            counts["committed"] += 1
+        finally:
+            client.delete(LOCK_KEY)
+
+
+def occ_judge(client: InMemoryRedis, results: int, args: argparse.Namespace, seed: int, counts: dict) -> None:
+    rng = random.Random(seed)
+    engine = CommitEngine(client, revalidate=lambda proposal, fresh: proposal.writes)
+    for start in range(0, results, args.batch):
+        version = int(client.get(VERSION_KEY) or 0)
+        batch = [
+            Proposal(f"{seed}-{i}", max(0, version - rng.randint(0, args.lag)),
+                     {f"field-{rng.randrange(args.fields)}": i}, reads=(f"field-{rng.randrange(args.fields)}",))
+            for i in range(start, min(results, start + args.batch))
+        ]
+        outcome = engine.commit(AGENT, batch)
+        counts["committed"] += len(outcome.committed)
+        counts["requeued"] += len(outcome.rejected)
+    counts["conflicts"] = engine.stats["conflicts"]
+
+
+def run(label: str, judge, args: argparse.Namespace) -> None:
+    client = InMemoryRedis(round_trip_latency=args.rtt_ms / 1000.0)
+    per_judge = args.results // args.judges
+    counts = [{"committed": 0, "requeued": 0, "conflicts": 0} for _ in range(args.judges)]
+    threads = [threading.Thread(target=judge, args=(client, per_judge, args, n, counts[n])) for n in range(args.judges)]
+    t = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - t
+    committed = sum(c["committed"] for c in counts)
+    requeued = sum(c["requeued"] for c in counts)
+    conflicts = sum(c["conflicts"] for c in counts)
+    total = committed + requeued
+    line = (f"  {label:22} {committed / elapsed:>9,.0f} commits/s   re-queued to Planner {requeued / total:6.1%}   "
+            f"versions {client.get(VERSION_KEY)}")
+    if judge is occ_judge:
+        line += f"   conflicts/result {conflicts / total:.2f} (revalidated, retried)"
+    print(line)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--results", type=int, default=4_000)
+    parser.add_argument("--judges", type=int, default=4)
+    parser.add_argument("--batch", type=int, default=25)
+    parser.add_argument("--fields", type=int, default=200)
+    parser.add_argument("--lag", type=int, default=3, help="max commits a Worker's read is behind")
+    parser.add_argument("--rtt-ms", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    print(f"--- {args.results:,} results, {args.judges} Judges, {args.fields} state fields, "
+          f"batch {args.batch}, {args.rtt_ms} ms RTT ---")
+    run("lock + version check", lock_judge, args)
+    run("CommitEngine (CAS)", occ_judge, args)
+
+
+if __name__ == "__main__":
+    main()
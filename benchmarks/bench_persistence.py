@@ -0,0 +1,128 @@
+"""
+Benchmark: row-per-commit inserts vs the write-behind store.
+
+Concurrent Judge threads each persist `--rows` TaskResult rows, one row per
+call. The baseline commits every row to SQLite (synchronous=FULL, as a
+durable Postgres commit would); the write-behind store acknowledges a row
+once it is fsynced to its journal and flushes to SQLite in bulk. Reports
+rows/s, writer p99 latency, database transactions and journal fsyncs, then
+shows backpressure capping the backlog when the database is slow.
+
+Usage: python benchmarks/bench_persistence.py [--rows N] [--writers W]
+
+Reference: chimera/persistence.py, specs/technical.md Section 2.1
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.metrics import LatencyHistogram  # noqa: E402
+from chimera.persistence import TABLES, SQLiteBackend, WriteBehindStore  # noqa: E402
+
+
+def result_row(writer: int, n: int) -> Dict[str, Any]:
+    return {
+        "id": f"result-{writer}-{n}",
+        "task_id": f"task-{writer}-{n}",
+        "worker_id": f"worker-{writer}",
+        "result_type": "content",
+        "content": {"text": "Friday drop, Addis edition", "platform": "instagram"},
+        "confidence_score": 0.91,
+        "reasoning_trace": "on persona; no pricing claims",
+        "sensitive_topics_detected": [],
+        "created_at": "2026-02-04T10:00:05Z",
+    }
+
+
+def hammer(write: Callable[[Dict[str, Any]], None], writers: int, rows: int) -> Dict[str, float]:
+    latency = LatencyHistogram()
+    lock = threading.Lock()
+
+    def worker(w: int) -> None:
+        local = LatencyHistogram()
+        for n in range(rows):
+            start = time.perf_counter()
+            write(result_row(w, n))
+            local.observe(time.perf_counter() - start)
+        with lock:
+            latency.merge(local)
+
+    threads = [threading.Thread(target=worker, args=(w,)) for w in range(writers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return {"rate": writers * rows / elapsed, "p99": latency.percentile(99)}
+
+
+class SlowBackend:
+    """SQLite with a fixed delay per flush, i.e. a database that fell behind."""
+
+    def __init__(self, backend: SQLiteBackend, delay: float):
+        self.backend = backend
+        self.delay = delay
+
+    def write(self, batches: Dict[str, List[Any]]) -> None:
+        time.sleep(self.delay)
+        self.backend.write(batches)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000, help="rows per writer")
+    parser.add_argument("--writers", type=int, default=8)
+    args = parser.parse_args(argv)
+    total = args.rows * args.writers
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"--- {args.writers} writers x {args.rows:,} task_results rows, one row per call ---")
+        direct = SQLiteBackend(os.path.join(tmp, "direct.db"), synchronous="FULL")
+        columns = TABLES["task_results"]
+        result = hammer(lambda row: direct.write({"task_results": [tuple(row[c] for c in columns)]}),
+                        args.writers, args.rows)
+        print(f"  row per commit:          {result['rate']:>9,.0f} rows/s   p99 {result['p99'] * 1e3:>6.2f} ms"
+              f"   {direct.transactions:>6,} transactions")
+
+        for name, fsync in (("write-behind, fsync", True), ("write-behind, no fsync", False)):
+            backend = SQLiteBackend(os.path.join(tmp, f"{fsync}.db"), synchronous="FULL")
+            store = WriteBehindStore(backend, os.path.join(tmp, f"journal-{fsync}"), fsync=fsync).start()
+            result = hammer(lambda row: store.write("task_results", [row]), args.writers, args.rows)
+            store.close()
+            assert backend.count("task_results") == total
+            print(f"  {name + ':':<24} {result['rate']:>9,.0f} rows/s   p99 {result['p99'] * 1e3:>6.2f} ms"
+                  f"   {backend.transactions:>6,} transactions   {store.journal.syncs:,} fsyncs")
+
+        print("--- backpressure: 20 ms per flush, max_buffered=2,000 ---")
+        backend = SQLiteBackend(os.path.join(tmp, "slow.db"))
+        store = WriteBehindStore(SlowBackend(backend, 0.02), os.path.join(tmp, "journal-slow"), max_batch=500,
+                                 max_buffered=2_000, fsync=False).start()
+        peak = [0]
+        stop = threading.Event()
+
+        def watch() -> None:
+            while not stop.is_set():
+                peak[0] = max(peak[0], store.buffered)
+                time.sleep(0.001)
+
+        watcher = threading.Thread(target=watch)
+        watcher.start()
+        result = hammer(lambda row: store.write("task_results", [row]), args.writers, args.rows)
+        stop.set()
+        watcher.join()
+        store.close()
+        print(f"  accepted:                {result['rate']:>9,.0f} rows/s   p99 {result['p99'] * 1e3:>6.2f} ms"
+              f"   peak backlog {peak[0]:,} rows   {store.stats['backpressure_waits']:,} waits")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Benchmark: SOUL.md loading for a host's agents, naive parse vs PersonaStore.
+
+Writes `--agents` SOUL.md files (a share of them identical template copies)
+and measures: parsing every file with yaml.safe_load (what a per-agent
+loader at startup does), PersonaStore cold load, a refresh with nothing
+changed, and a refresh after `--changed` files were edited (the GitOps
+update path, instead of restarting and re-parsing everything).
+
+Usage: python benchmarks/bench_persona_store.py [--agents N] [--templates N] [--changed N]
+
+Reference: chimera/persona.py, specs/functional.md FR 1.0
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.persona import PersonaStore  # noqa: E402
+
+try:
+    import yaml
+except ImportError:
+    yaml = None
+
+TRAITS = ["Witty", "Empathetic", "Gen-Z Slang", "Technical", "Warm", "Playful", "Direct"]
+
+
+def soul_md(rng: random.Random, agent_id: str, paragraphs: int = 30) -> str:
+    traits = "\n".join(f'  - "{t}"' for t in rng.sample(TRAITS, 3))
+    directives = "\n".join(f'  - "Directive {i}: never do thing {rng.randrange(100)}"' for i in range(8))
+    beliefs = "\n".join(f'  - "Belief {i} about sustainability and community"' for i in range(8))
+    body = "\n\n".join(
+        " ".join(rng.choices("merkato addis vintage textile thrift denim eco market story family".split(), k=60))
+        for _ in range(paragraphs)
+    )
+    return (
+        f'---\nname: "Agent {agent_id}"\nid: "{agent_id}"\nversion: "1.0.0"\n'
+        f"voice_traits:\n{traits}\ndirectives:\n{directives}\ncore_beliefs:\n{beliefs}\n"
+        f'governance_model: "Human-Reviewed"\nwallet_address: "0x{rng.getrandbits(160):040x}"\n---\n\n'
+        f"# Backstory\n{body}\n"
+    )
+
+
+def naive_load(path: Path) -> dict:
+    text = path.read_text()
+    _, head, body = text.split("---\n", 2)
+    persona = yaml.safe_load(head)
+    persona["backstory"] = body.strip()
+    return persona
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=500)
+    parser.add_argument("--templates", type=int, default=50, help="agents beyond this many reuse a template file")
+    parser.add_argument("--changed", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(11)
+    with tempfile.TemporaryDirectory() as root:
+        templates = [soul_md(rng, f"template-{i}") for i in range(args.templates)]
+        paths = []
+        for i in range(args.agents):
+            path = Path(root) / f"agent-{i}" / "SOUL.md"
+            path.parent.mkdir()
+            # Half the fleet runs a shared template persona, half a persona of its own.
+            text = templates[i % args.templates] if i % 2 else soul_md(rng, f"agent-{i}")
+            path.write_text(text)
+            paths.append(path)
+
+        print(f"--- {args.agents} agents, {args.templates} shared templates, {args.changed} files changed ---")
+        if yaml is not None:
+            t = time.perf_counter()
+            for path in paths:
+                naive_load(path)
+            print(f"  {'yaml.safe_load per agent':28} {time.perf_counter() - t:8.3f} s")
+
+        store = PersonaStore()
+        t = time.perf_counter()
+        store.load_many(paths)
+        print(f"  {'PersonaStore cold load':28} {time.perf_counter() - t:8.3f} s   "
+              f"({store.stats['parses']} parses, {store.unique} distinct personas)")
+
+        t = time.perf_counter()
+        store.refresh()
+        print(f"  {'refresh, nothing changed':28} {time.perf_counter() - t:8.3f} s")
+
+        for path in rng.sample(paths, args.changed):
+            stat = path.stat()
+            path.write_text(path.read_text().replace('version: "1.0.0"', 'version: "1.1.0"'))
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        parses = store.stats["parses"]
+        t = time.perf_counter()
+        changed = store.refresh()
+        print(f"  {'refresh after edits':28} {time.perf_counter() - t:8.3f} s   "
+              f"({len(changed)} reloaded, {store.stats['parses'] - parses} parses)")
+
+
+if __name__ == "__main__":
+    main()
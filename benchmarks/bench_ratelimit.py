@@ -0,0 +1,154 @@
+"""
+Simulation: shared platform quota under naive checks vs the GCRA limiter.
+
+`--processes` worker processes publish to one platform account whose quota
+is `--limit` calls per `--period` seconds, enforced by the platform over a
+sliding window (a call over it gets a 429). Demand runs at `--load` times
+the quota for the first half of the run and a third of it afterwards, and
+is skewed across processes. Replayed on a simulated clock against:
+
+- fixed-window counter: one INCR per call on a shared per-window counter;
+  calls over it wait for the next window
+- static split: each process enforces limit / processes locally
+- RateLimiter: shared GCRA state with the local slot cache (`--prefetch-window`)
+
+Reports 429s, quota use while demand exceeds the quota, queueing delay and
+Redis round trips per call.
+
+Usage: python benchmarks/bench_ratelimit.py [--processes P] [--limit N] [--period S] [--load X]
+                                           [--prefetch-window S]
+
+Reference: chimera/ratelimit.py, specs/functional.md FR 4.0
+"""
+
+import argparse
+import heapq
+import random
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.ratelimit import Quota, RateLimiter, gcra_slots  # noqa: E402
+from chimera.redis_store import InMemoryRedis  # noqa: E402
+
+TOOL = "twitter.post_tweet"
+
+
+class SimClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def arrivals(processes: int, rate: float, duration: float, rng: random.Random) -> List[Tuple[float, int]]:
+    """(time, process) pairs: `rate` calls/s for the first half, a third of it after."""
+    weights = [2.0 ** -i for i in range(processes)]  # process 0 is the busiest
+    out = []
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate if t < duration / 2 else rate / 3)
+        if t >= duration:
+            return out
+        out.append((t, rng.choices(range(processes), weights)[0]))
+
+
+def platform(calls: List[float], limit: int, period: float) -> int:
+    """429s returned by a sliding-window platform limit."""
+    accepted: deque = deque()
+    rejected = 0
+    for t in sorted(calls):
+        while accepted and accepted[0] <= t - period:
+            accepted.popleft()
+        if len(accepted) < limit:
+            accepted.append(t)
+        else:
+            rejected += 1
+    return rejected
+
+
+def fixed_window(load: List[Tuple[float, int]], args: argparse.Namespace, clock: SimClock,
+                 redis: InMemoryRedis) -> List[Tuple[float, float]]:
+    runs = []
+    events = [(t, t, p) for t, p in load]
+    heapq.heapify(events)
+    while events:
+        t, arrived, p = heapq.heappop(events)
+        clock.now = t
+        window = int(t // args.period)
+        with redis.pipeline(transaction=False) as pipe:
+            pipe.incr(f"naive:{window}")
+            pipe.expire(f"naive:{window}", args.period * 2)
+            count = pipe.execute()[0]
+        if count <= args.limit:
+            runs.append((arrived, t))
+        else:
+            heapq.heappush(events, ((window + 1) * args.period, arrived, p))
+    return runs
+
+
+def static_split(load: List[Tuple[float, int]], args: argparse.Namespace, clock: SimClock,
+                 redis: InMemoryRedis) -> List[Tuple[float, float]]:
+    interval = args.period * args.processes / args.limit
+    tat = [0.0] * args.processes
+    runs = []
+    for t, p in load:
+        slots, tat[p] = gcra_slots(tat[p], t, 1, interval, 0.0)
+        runs.append((t, slots[0]))
+    return runs
+
+
+def limiter(load: List[Tuple[float, int]], args: argparse.Namespace, clock: SimClock,
+            redis: InMemoryRedis) -> List[Tuple[float, float]]:
+    quotas = {TOOL: Quota(args.limit, args.period)}
+    limiters = [RateLimiter(redis, quotas, prefetch_window=args.prefetch_window, clock=clock)
+                for _ in range(args.processes)]
+    runs = []
+    for t, p in load:
+        clock.now = t
+        runs.append((t, limiters[p].reserve(TOOL, "@chimera_ethiopia")))
+    clock.now = max(slot for _, slot in runs)
+    for rl in limiters:
+        rl.close()
+    limiter.wasted = sum(rl.stats["wasted"] for rl in limiters)  # type: ignore[attr-defined]
+    return runs
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=16)
+    parser.add_argument("--limit", type=int, default=300)
+    parser.add_argument("--period", type=float, default=900.0)
+    parser.add_argument("--load", type=float, default=1.5, help="demand / quota in the busy half")
+    parser.add_argument("--periods", type=int, default=8, help="run length in periods")
+    parser.add_argument("--prefetch-window", type=float, default=60.0, help="RateLimiter slot cache horizon (s)")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args(argv)
+    duration = args.periods * args.period
+    quota_rate = args.limit / args.period
+    load = arrivals(args.processes, args.load * quota_rate, duration, random.Random(args.seed))
+    busy_until = duration / 2
+
+    print(f"--- {len(load):,} calls from {args.processes} processes; quota {args.limit} per {args.period:.0f} s"
+          f" (sliding window); demand {args.load:.1f}x quota, then {args.load / 3:.1f}x ---")
+    strategies: Dict[str, Callable] = {"fixed-window INCR": fixed_window, "static split": static_split,
+                                       "RateLimiter": limiter}
+    for name, strategy in strategies.items():
+        clock = SimClock()
+        redis = InMemoryRedis(clock=clock)
+        runs = strategy(load, args, clock, redis)
+        rejected = platform([run for _, run in runs], args.limit, args.period)
+        used = sum(1 for _, run in runs if run < busy_until) / (busy_until * quota_rate)
+        delays = sorted(run - arrived for arrived, run in runs)
+        extra = f"   {limiter.wasted} slots wasted" if strategy is limiter else ""  # type: ignore[attr-defined]
+        print(f"  {name + ':':<19} {rejected:>5} x 429   quota use {used:>6.1%}   "
+              f"delay p50 {delays[len(delays) // 2]:>7.0f} s  max {delays[-1]:>7.0f} s   "
+              f"{redis.round_trips / len(runs):.3f} round trips/call{extra}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark: one Worker awaiting each video render vs RenderPipeline job handles.
+
+Simulates a campaign's video backlog with render times scaled down from
+minutes to milliseconds (`--scale`). The blocking baseline awaits each render
+in turn, as a synchronous skill call would. The pipeline submits everything at
+once and renders Tier 1 jobs in parallel slots while Tier 2 starts are
+rate-limited. Reports makespan, submit latency and per-tier queue wait.
+
+Usage: python benchmarks/bench_render_pipeline.py [--daily N] [--hero N] [--scale S]
+
+Reference: skills/content_generator/render.py, specs/functional.md FR 3.2
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skills.content_generator import RenderPipeline, TierConfig  # noqa: E402
+
+# Simulated render durations in "minutes"; scaled to seconds by --scale.
+RENDER_MINUTES = {"daily": (1.0, 3.0), "hero": (4.0, 8.0)}
+
+
+def make_jobs(daily: int, hero: int, seed: int = 11) -> List[dict]:
+    rng = random.Random(seed)
+    jobs = [{"tier": "daily", "topic": f"daily {i}"} for i in range(daily)]
+    jobs += [{"tier": "hero", "topic": f"hero {i}"} for i in range(hero)]
+    rng.shuffle(jobs)
+    for job in jobs:
+        job.update(content_type="video", platform="tiktok", minutes=rng.uniform(*RENDER_MINUTES[job["tier"]]))
+    return jobs
+
+
+def renderer(scale: float):
+    async def render(parameters):
+        await asyncio.sleep(parameters["minutes"] * scale)
+        return {"content": {"text": parameters["topic"], "platform": "tiktok", "disclosure_level": "automated"},
+                "metadata": {"generation_cost_usdc": 0.0}}
+    return render
+
+
+async def blocking(jobs: List[dict], scale: float) -> float:
+    render = renderer(scale)
+    start = time.perf_counter()
+    for job in jobs:
+        await render(job)
+    return time.perf_counter() - start
+
+
+async def pipelined(jobs: List[dict], scale: float, daily_slots: int, hero_slots: int, hero_per_minute: float):
+    render = renderer(scale)
+    pipeline = RenderPipeline(
+        {"daily": render, "hero": render},
+        tiers={
+            "daily": TierConfig(concurrency=daily_slots),
+            "hero": TierConfig(concurrency=hero_slots, rate=hero_per_minute / scale, burst=hero_slots),
+        },
+    )
+    start = time.perf_counter()
+    handles = [pipeline.submit(job) for job in jobs]
+    submitted = time.perf_counter() - start
+    await asyncio.gather(*(handle.wait() for handle in handles))
+    makespan = time.perf_counter() - start
+    metrics = pipeline.metrics()
+    await pipeline.close()
+    return makespan, submitted, metrics
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--daily", type=int, default=200)
+    parser.add_argument("--hero", type=int, default=20)
+    parser.add_argument("--scale", type=float, default=0.002, help="seconds per simulated render minute")
+    parser.add_argument("--daily-slots", type=int, default=16)
+    parser.add_argument("--hero-slots", type=int, default=2)
+    parser.add_argument("--hero-per-minute", type=float, default=1.0, help="Tier 2 starts per simulated minute")
+    args = parser.parse_args(argv)
+    jobs = make_jobs(args.daily, args.hero)
+    minutes = sum(job["minutes"] for job in jobs)
+
+    print(f"--- {args.daily} Tier 1 + {args.hero} Tier 2 renders, {minutes:.0f} render-minutes ---")
+    elapsed = asyncio.run(blocking(jobs, args.scale))
+    print(f"  {'blocking worker':18} makespan {elapsed / args.scale:7.1f} min")
+    makespan, submitted, metrics = asyncio.run(
+        pipelined(jobs, args.scale, args.daily_slots, args.hero_slots, args.hero_per_minute))
+    print(f"  {'RenderPipeline':18} makespan {makespan / args.scale:7.1f} min   "
+          f"submit {submitted / len(jobs) * 1e6:5.1f} us/job")
+    for tier in ("daily", "hero"):
+        wait = metrics[tier]["queue_wait"]
+        print(f"    {tier:6} queue wait p50 {wait['p50'] / args.scale:6.1f} min   p99 {wait['p99'] / args.scale:6.1f} min")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Benchmark: queue wait under load skew, FairScheduler vs FIFO layouts.
+
+Simulates a shared Worker Pool with fixed capacity. Every agent sends
+high-priority `reply_comment` tasks; one noisy agent also sends bursts of
+low-priority `fetch_trends` tasks at `skew` times its normal rate. Compares:
+
+- global FIFO: one list, workers take the oldest task
+- per-agent FIFO: the current `chimera:tasks:{agent_id}:pending` layout,
+  workers round-robin across agents
+- FairScheduler: priority lanes + weighted fair queuing + aging
+
+Usage: python benchmarks/bench_scheduler.py [--skews 1,5,10] [--seconds N] [--capacity N]
+
+Reference: chimera/scheduler.py, specs/technical.md Section 1.1
+"""
+
+import argparse
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.scheduler import FairScheduler  # noqa: E402
+
+DT = 0.01
+
+
+class SimClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def arrivals(args: argparse.Namespace, skew: float, seed: int = 7) -> List[List[tuple]]:
+    """Per tick: list of (agent_id, priority, submitted_at)."""
+    rng = np.random.default_rng(seed)
+    ticks = int(args.seconds / DT)
+    agents = [f"agent-{i}" for i in range(args.agents)]
+    out: List[List[tuple]] = []
+    burst_every = int(5.0 / DT)
+    for tick in range(ticks):
+        now = tick * DT
+        batch = []
+        replies = rng.poisson(args.reply_rate * DT, size=len(agents))
+        lows = rng.poisson(args.low_rate * DT, size=len(agents))
+        for agent, r, lo in zip(agents, replies, lows):
+            batch.extend([(agent, "high", now)] * int(r) + [(agent, "low", now)] * int(lo))
+        if tick % burst_every == 0:
+            # The noisy agent's Planner fans out a 5-second burst at once.
+            batch.extend([("agent-0", "low", now)] * int(args.noisy_rate * skew * 5.0))
+        out.append(batch)
+    return out
+
+
+def summarize(waits: List[float]) -> Dict[str, float]:
+    if not waits:
+        return {"count": 0, "p50": 0.0, "p99": 0.0}
+    p50, p99 = np.percentile(waits, [50, 99])
+    return {"count": len(waits), "p50": p50, "p99": p99}
+
+
+def fmt(stats: Dict[str, float]) -> str:
+    return f"{stats['p50'] * 1e3:7.0f}ms {stats['p99'] * 1e3:7.0f}ms"
+
+
+def run_fifo(ticks: List[List[tuple]], capacity: float, per_agent: bool) -> Dict[str, Dict[str, float]]:
+    waits: Dict[str, List[float]] = {"high": [], "low": []}
+    queues: Dict[str, deque] = {}
+    order: deque = deque()
+    budget = 0.0
+    for tick, batch in enumerate(ticks):
+        now = tick * DT
+        for agent, priority, at in batch:
+            key = agent if per_agent else "all"
+            if key not in queues:
+                queues[key] = deque()
+                order.append(key)
+            queues[key].append((priority, at))
+        budget += capacity * DT
+        while budget >= 1 and order:
+            key = order.popleft()
+            priority, at = queues[key].popleft()
+            waits[priority].append(now - at)
+            if queues[key]:
+                order.append(key)
+            else:
+                del queues[key]
+            budget -= 1
+    return {priority: summarize(samples) for priority, samples in waits.items()}
+
+
+def run_fair(ticks: List[List[tuple]], capacity: float, aging: float) -> Dict[str, Dict[str, float]]:
+    clock = SimClock()
+    scheduler = FairScheduler(aging_seconds=aging, clock=clock, wait_window=10_000_000)
+    budget = 0.0
+    for tick, batch in enumerate(ticks):
+        clock.now = tick * DT
+        for agent, priority, _ in batch:
+            scheduler.submit(agent, {"priority": priority})
+        budget += capacity * DT
+        served = scheduler.next_batch(int(budget))
+        budget -= len(served)
+    return scheduler.wait_stats()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--skews", default="1,5,10")
+    parser.add_argument("--seconds", type=float, default=120.0)
+    parser.add_argument("--agents", type=int, default=50)
+    parser.add_argument("--capacity", type=float, default=300.0, help="tasks/s the Worker Pool completes")
+    parser.add_argument("--reply-rate", type=float, default=1.0, help="high-priority replies/s per agent")
+    parser.add_argument("--low-rate", type=float, default=2.0, help="low-priority tasks/s per agent")
+    parser.add_argument("--noisy-rate", type=float, default=20.0, help="noisy agent's extra low tasks/s at skew 1")
+    parser.add_argument("--aging", type=float, default=30.0)
+    args = parser.parse_args(argv)
+
+    for skew in (float(s) for s in args.skews.split(",")):
+        ticks = arrivals(args, skew)
+        offered = sum(len(batch) for batch in ticks) / args.seconds
+        print(f"--- skew {skew:g}x: offered {offered:,.0f} tasks/s vs capacity {args.capacity:,.0f} tasks/s ---")
+        print(f"  {'':16} {'high p50':>9} {'high p99':>9} {'low p50':>9} {'low p99':>9}   low served")
+        for label, waits in (
+            ("global FIFO", run_fifo(ticks, args.capacity, per_agent=False)),
+            ("per-agent FIFO", run_fifo(ticks, args.capacity, per_agent=True)),
+            ("FairScheduler", run_fair(ticks, args.capacity, args.aging)),
+        ):
+            print(f"  {label:16} {fmt(waits['high'])} {fmt(waits['low'])}   {waits['low']['count']:>10,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Microbenchmark: compiled skill-schema validation vs jsonschema / pydantic.
+
+Usage: python benchmarks/bench_schema_validation.py [--iterations N]
+
+Reference: skills/schema_registry.py, skills/trend_fetcher/input_schema.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skills.schema_registry import SKILLS_DIR, SchemaRegistry  # noqa: E402
+
+try:
+    import jsonschema
+except ImportError:
+    jsonschema = None
+
+try:
+    from pydantic import BaseModel, Field, ValidationError
+    from typing import Literal
+except ImportError:
+    BaseModel = None
+
+PAYLOADS = [
+    {"skill_name": "trend_fetcher", "parameters": {"region": "ethiopia", "category": "fashion", "timeframe_hours": 24, "relevance_threshold": 0.75}},
+    {"skill_name": "trend_fetcher", "parameters": {"region": "kenya", "category": "technology"}},
+    {"skill_name": "trend_fetcher", "parameters": {"region": "global", "category": "crypto", "timeframe_hours": 200}},
+    {"skill_name": "trend_fetcher", "parameters": {"category": "fashion"}},
+]
+
+
+def bench(name: str, fn: Callable[[], None], iterations: int) -> float:
+    fn()
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    elapsed = time.perf_counter() - start
+    rate = iterations * len(PAYLOADS) / elapsed
+    print(f"  {name:<38} {rate:>14,.0f} validations/s")
+    return rate
+
+
+def pydantic_model() -> Optional[type]:
+    if BaseModel is None:
+        return None
+
+    class Parameters(BaseModel):
+        region: str
+        category: str
+        timeframe_hours: int = Field(24, ge=1, le=168)
+        relevance_threshold: float = Field(0.75, ge=0.0, le=1.0)
+
+    class TrendFetcherInput(BaseModel):
+        skill_name: Literal["trend_fetcher"]
+        parameters: Parameters
+
+    return TrendFetcherInput
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=20000)
+    args = parser.parse_args(argv)
+    n = args.iterations
+
+    schema_path = SKILLS_DIR / "trend_fetcher" / "input_schema.json"
+    registry = SchemaRegistry()
+    compiled = registry.get("trend_fetcher", "input")
+
+    print(f"--- trend_fetcher input validation ({n:,} x {len(PAYLOADS)} payloads) ---")
+    results = {}
+
+    results["compiled"] = bench("compiled (per payload)", lambda: [compiled.iter_errors(p) for p in PAYLOADS], n)
+    results["compiled_batch"] = bench("compiled (validate_many)", lambda: compiled.validate_many(PAYLOADS), n)
+
+    def reparse():
+        for p in PAYLOADS:
+            with open(schema_path, "r") as f:
+                schema = json.load(f)
+            if jsonschema is not None:
+                list(jsonschema.Draft7Validator(schema).iter_errors(p))
+    results["reparse"] = bench("re-read schema per call" + (" + jsonschema" if jsonschema else ""), reparse, max(n // 20, 1))
+
+    if jsonschema is not None:
+        with open(schema_path, "r") as f:
+            draft7 = jsonschema.Draft7Validator(json.load(f))
+        results["jsonschema"] = bench("jsonschema (prebuilt Draft7Validator)", lambda: [list(draft7.iter_errors(p)) for p in PAYLOADS], n // 4)
+    else:
+        print("  jsonschema not installed; skipping")
+
+    model = pydantic_model()
+    if model is not None:
+        def run_pydantic():
+            for p in PAYLOADS:
+                try:
+                    model.model_validate(p)
+                except ValidationError:
+                    pass
+        results["pydantic"] = bench("pydantic v2 model", run_pydantic, n)
+    else:
+        print("  pydantic not installed; skipping")
+
+    base = results["compiled"]
+    print("\n--- Relative to compiled ---")
+    for name, rate in results.items():
+        print(f"  {name:<38} {rate / base:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
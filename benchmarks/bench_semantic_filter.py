@@ -0,0 +1,86 @@
+"""
+Benchmark: batch Semantic Filter vs per-item scoring.
+
+Scores synthetic ingested items against an agent's interest vectors three ways:
+per item (embed one, dot against each interest), batched (one embed call and
+one matrix multiply), and batched with the lexical prefilter in front.
+
+Usage: python benchmarks/bench_semantic_filter.py [--sizes 1000,10000,100000] [--relevant 0.1]
+
+Reference: chimera/semantic_filter.py, specs/functional.md FR 2.1
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.semantic_filter import HashingEmbedder, SemanticFilter  # noqa: E402
+
+INTERESTS = [
+    "sustainable fashion trends in ethiopia",
+    "handmade ethiopian textiles and habesha kemis",
+    "addis ababa street style and local designers",
+]
+ON_TOPIC = "sustainable fashion ethiopia ethiopian textiles handmade habesha kemis addis ababa street style designers".split()
+OFF_TOPIC = [f"word{i}" for i in range(5_000)]
+
+
+def make_items(n: int, relevant: float, seed: int = 7) -> List[str]:
+    rng = random.Random(seed)
+    items = []
+    for _ in range(n):
+        words = rng.choices(OFF_TOPIC, k=rng.randint(8, 24))
+        if rng.random() < relevant:
+            words[: rng.randint(3, 6)] = rng.choices(ON_TOPIC, k=6)
+        items.append(" ".join(words))
+    return items
+
+
+def per_item(embedder: HashingEmbedder, interests: np.ndarray, texts: List[str], threshold: float) -> int:
+    passed = 0
+    for text in texts:
+        vector = embedder([text])[0]
+        best = max(float(vector @ interest) for interest in interests)
+        passed += best >= threshold
+    return passed
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--relevant", type=float, default=0.1, help="fraction of on-topic items")
+    parser.add_argument("--threshold", type=float, default=0.3)
+    args = parser.parse_args(argv)
+
+    embedder = HashingEmbedder()
+    for size in (int(s) for s in args.sizes.split(",")):
+        texts = make_items(size, args.relevant)
+        print(f"--- {size:,} items ({args.relevant:.0%} on-topic), threshold {args.threshold} ---")
+
+        if size <= 10_000:
+            semantic = SemanticFilter(INTERESTS, embedder=embedder, threshold=args.threshold)
+            t = time.perf_counter()
+            passed = per_item(embedder, semantic.interest_matrix, texts, args.threshold)
+            elapsed = time.perf_counter() - t
+            print(f"  per-item:          {size / elapsed:>12,.0f} items/s  ({passed:,} passed)")
+        else:
+            print("  per-item:          skipped above 10k items")
+
+        for label, prefilter in (("batch", False), ("batch + prefilter", True)):
+            semantic = SemanticFilter(INTERESTS, embedder=embedder, threshold=args.threshold, prefilter=prefilter)
+            t = time.perf_counter()
+            passed = int(semantic.mask(texts).sum())
+            elapsed = time.perf_counter() - t
+            print(f"  {label + ':':<18} {size / elapsed:>12,.0f} items/s  ({passed:,} passed, "
+                  f"{semantic.stats['prefiltered']:,} prefiltered)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,145 @@
+"""
+Benchmark: per-agent fixed-interval polling vs ResourceMonitor.
+
+Simulates `--hours` of FR 2.0 monitoring on a virtual clock. Every agent
+watches its own mentions resource plus `--news` shared news resources and
+one shared market resource. Resources receive items as Poisson arrivals
+(most mention feeds are quiet). The baseline has each agent poll each of its
+resources every `--interval` seconds; ResourceMonitor polls each distinct
+URI once with adaptive intervals. Reports upstream reads, the share of reads
+that returned nothing new, and item delivery delay.
+
+Usage: python benchmarks/bench_subscriptions.py [--agents 250,1000] [--hours H] [--interval S]
+
+Reference: chimera/subscriptions.py, specs/functional.md FR 2.0
+"""
+
+import argparse
+import asyncio
+import bisect
+import random
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.subscriptions import ResourceMonitor, canonical_uri  # noqa: E402
+
+REGIONS = ["ethiopia", "kenya", "nigeria", "ghana", "egypt", "morocco"]
+CATEGORIES = ["fashion", "music", "tech", "food", "sports"]
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class Feeds:
+    """Item arrival times per resource; a read returns the latest 20 items."""
+
+    def __init__(self, rates: Dict[str, float], seconds: float, rng: random.Random):
+        self.arrivals: Dict[str, List[float]] = {}
+        for uri, rate in rates.items():
+            t, times = 0.0, []
+            while rate > 0:
+                t += rng.expovariate(rate)
+                if t > seconds:
+                    break
+                times.append(t)
+            self.arrivals[uri] = times
+
+    def read(self, uri: str, now: float) -> dict:
+        times = self.arrivals[uri]
+        n = bisect.bisect_right(times, now)
+        return {"items": [{"id": i, "at": times[i]} for i in range(max(0, n - 20), n)]}
+
+
+def workload(agents: int, news: int, seconds: float, seed: int = 5):
+    rng = random.Random(seed)
+    news_uris = [f"mcp://news/{r}/{c}/trends?hours=24" for r in REGIONS for c in CATEGORIES]
+    market_uris = [f"mcp://market/crypto/{s}/price" for s in ("eth", "btc", "sol")]
+    rates: Dict[str, float] = {}
+    subscriptions = []
+    for i in range(agents):
+        mentions = f"mcp://twitter/mentions/recent?limit=20&agent_id=agent-{i}"
+        rates[mentions] = 1 / 60.0 if rng.random() < 0.1 else 1 / 3600.0
+        watched = [mentions] + rng.sample(news_uris, news) + [rng.choice(market_uris)]
+        subscriptions.extend((f"agent-{i}", uri) for uri in watched)
+    rates.update({uri: 1 / 600.0 for uri in news_uris})
+    rates.update({uri: 1 / 30.0 for uri in market_uris})
+    return Feeds({canonical_uri(u): r for u, r in rates.items()}, seconds, rng), subscriptions
+
+
+def fixed_polling(feeds: Feeds, subscriptions, seconds: float, interval: float, seed: int = 9):
+    """Each (agent, resource) polls at a random phase; delays are exact for fixed-interval polling."""
+    rng = random.Random(seed)
+    reads = empty = 0
+    delays: List[float] = []
+    polls = int(seconds // interval)
+    for _, uri in subscriptions:
+        phase = rng.uniform(0, interval)
+        times = feeds.arrivals[canonical_uri(uri)]
+        reads += polls
+        seen_polls = set()
+        for t in times:
+            k = int((t - phase) // interval) + 1
+            if phase + k * interval <= seconds:
+                delays.append(phase + k * interval - t)
+                seen_polls.add(k)
+        empty += polls - len(seen_polls)
+    return reads, empty, delays
+
+
+async def monitored(feeds: Feeds, subscriptions, seconds: float, interval: float):
+    clock = Clock()
+    monitor = ResourceMonitor(lambda uri: feeds.read(uri, clock.now), min_interval=5, base_interval=interval,
+                              max_interval=300, clock=clock, seed=1)
+    delays: List[float] = []
+
+    def deliver(uri: str, items: list) -> None:
+        delays.extend(clock.now - item["at"] for item in items)
+
+    for agent_id, uri in subscriptions:
+        monitor.subscribe(agent_id, uri, deliver)
+    await monitor.poll_due()  # initial snapshot: existing items are not "new" arrivals
+    delays.clear()
+    while True:
+        due = monitor.next_due()
+        if due is None or due > seconds:
+            break
+        clock.now = due
+        await monitor.poll_due()
+    s = monitor.stats
+    return len(monitor), s["reads"], s["unchanged"] + s["not_modified"], delays
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", default="250,1000")
+    parser.add_argument("--news", type=int, default=2, help="shared news resources per agent")
+    parser.add_argument("--hours", type=float, default=1.0)
+    parser.add_argument("--interval", type=float, default=30.0, help="baseline polling interval (s)")
+    args = parser.parse_args(argv)
+    seconds = args.hours * 3600
+
+    for agents in (int(a) for a in args.agents.split(",")):
+        feeds, subscriptions = workload(agents, args.news, seconds)
+        print(f"--- {agents} agents, {len(subscriptions)} subscriptions, {args.hours:g} h simulated ---")
+        reads, empty, delays = fixed_polling(feeds, subscriptions, seconds, args.interval)
+        p50, p99 = np.percentile(delays, [50, 99])
+        print(f"  {'poll every ' + format(args.interval, 'g') + ' s':22} reads {reads:9,}   empty {empty / reads:6.1%}   "
+              f"delay p50 {p50:6.1f} s   p99 {p99:6.1f} s")
+        distinct, reads, empty, delays = asyncio.run(monitored(feeds, subscriptions, seconds, args.interval))
+        p50, p99 = np.percentile(delays, [50, 99])
+        print(f"  {'ResourceMonitor':22} reads {reads:9,}   empty {empty / reads:6.1%}   "
+              f"delay p50 {p50:6.1f} s   p99 {p99:6.1f} s   ({distinct} distinct URIs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Benchmark: batched TaskQueue vs one-task-per-round-trip LPUSH/RPOP.
+
+Moves tasks through `chimera:tasks:{agent_id}:pending` with a simulated
+network round trip per command (InMemoryRedis) or against a real server.
+
+Usage: python benchmarks/bench_task_queue.py [--tasks N] [--batch N] [--workers N] [--rtt-ms F] [--redis-url URL]
+
+Reference: chimera/queues.py, specs/technical.md Section 2.3
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.queues import TaskQueue  # noqa: E402
+from chimera.redis_store import InMemoryRedis  # noqa: E402
+
+AGENT = "bench-agent"
+
+
+def make_tasks(n: int) -> List[dict]:
+    return [
+        {"task_id": str(uuid.uuid4()), "task_type": "reply_comment", "priority": "high",
+         "context": {"goal_description": f"reply {i}"}, "status": "pending"}
+        for i in range(n)
+    ]
+
+
+def run_workers(workers: int, consume: Callable[[], int]) -> None:
+    threads = [threading.Thread(target=lambda: [None for _ in iter(consume, 0)]) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def single(client: Any, tasks: List[dict], workers: int) -> tuple:
+    key = f"chimera:tasks:{AGENT}:pending"
+    t = time.perf_counter()
+    for item in tasks:
+        client.lpush(key, json.dumps(item))
+    produced = time.perf_counter() - t
+
+    def consume() -> int:
+        payload = client.rpop(key)
+        return 0 if payload is None else len(json.loads(payload))
+
+    t = time.perf_counter()
+    run_workers(workers, consume)
+    return produced, time.perf_counter() - t
+
+
+def batched(client: Any, tasks: List[dict], workers: int, batch: int) -> tuple:
+    queue = TaskQueue(client)
+    t = time.perf_counter()
+    for start in range(0, len(tasks), batch):
+        queue.enqueue(AGENT, tasks[start:start + batch])
+    produced = time.perf_counter() - t
+
+    def consume() -> int:
+        claimed = queue.claim(AGENT, threading.current_thread().name, count=batch)
+        if claimed:
+            queue.ack(AGENT, [item["task_id"] for item in claimed])
+        return len(claimed)
+
+    t = time.perf_counter()
+    run_workers(workers, consume)
+    return produced, time.perf_counter() - t
+
+
+def make_client(args: argparse.Namespace) -> Any:
+    if args.redis_url:
+        import redis
+
+        client = redis.Redis.from_url(args.redis_url, decode_responses=True)
+        client.delete(*client.keys(f"chimera:tasks:{AGENT}:*") or ["-"])
+        return client
+    return InMemoryRedis(round_trip_latency=args.rtt_ms / 1000.0)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=5_000)
+    parser.add_argument("--batch", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--rtt-ms", type=float, default=0.2, help="simulated round trip (in-memory backend)")
+    parser.add_argument("--redis-url", help="benchmark a real Redis server instead (needs redis-py)")
+    args = parser.parse_args(argv)
+
+    tasks = make_tasks(args.tasks)
+    backend = args.redis_url or f"in-memory, {args.rtt_ms} ms RTT"
+    print(f"--- {args.tasks:,} tasks, {args.workers} workers, batch {args.batch} ({backend}) ---")
+    produced, consumed = single(make_client(args), tasks, args.workers)
+    print(f"  single LPUSH/RPOP:   enqueue {args.tasks / produced:>10,.0f} tasks/s   "
+          f"dequeue {args.tasks / consumed:>10,.0f} tasks/s (no visibility tracking)")
+    produced, consumed = batched(make_client(args), tasks, args.workers, 1)
+    print(f"  TaskQueue, batch 1:  enqueue {args.tasks / produced:>10,.0f} tasks/s   "
+          f"claim+ack {args.tasks / consumed:>8,.0f} tasks/s (visibility + dead-letter tracking)")
+    produced, consumed = batched(make_client(args), tasks, args.workers, args.batch)
+    print(f"  TaskQueue, batch {args.batch}: enqueue {args.tasks / produced:>10,.0f} tasks/s   "
+          f"claim+ack {args.tasks / consumed:>8,.0f} tasks/s (visibility + dead-letter tracking)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark: incremental TrendSpotter vs recomputing the window from scratch.
+
+Streams synthetic news items (Zipf-distributed topics) through the spotter and
+compares a top-k query per simulated minute against rebuilding per-topic
+counts from the raw 4-hour window.
+
+Usage: python benchmarks/bench_trend_spotter.py [--items N] [--topics N] [--per-minute N]
+
+Reference: skills/trend_fetcher/spotter.py, specs/functional.md FR 2.2
+"""
+
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from skills.trend_fetcher.spotter import TrendSpotter  # noqa: E402
+
+T0 = 1_770_000_000.0
+
+
+def make_items(n: int, topics: int, per_minute: int, seed: int = 7) -> List[dict]:
+    rng = random.Random(seed)
+    weights = [1.0 / (rank + 1) for rank in range(topics)]
+    names = [f"topic-{i}" for i in range(topics)]
+    picks = rng.choices(names, weights=weights, k=n)
+    spacing = 60.0 / per_minute
+    return [
+        {
+            "topic": topic,
+            "timestamp": T0 + i * spacing,
+            "relevance_score": rng.random(),
+            "engagement_score": rng.random(),
+        }
+        for i, topic in enumerate(picks)
+    ]
+
+
+def naive_top_k(window: deque, k: int) -> List[tuple]:
+    sums = defaultdict(lambda: [0, 0.0])
+    for topic, _, relevance in window:
+        entry = sums[topic]
+        entry[0] += 1
+        entry[1] += relevance
+    return sorted(((s / c, t) for t, (c, s) in sums.items()), reverse=True)[:k]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=300_000)
+    parser.add_argument("--topics", type=int, default=5_000)
+    parser.add_argument("--per-minute", type=int, default=10_000)
+    parser.add_argument("--k", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    items = make_items(args.items, args.topics, args.per_minute)
+    minutes = args.items // args.per_minute
+    print(f"--- {args.items:,} items, {args.topics:,} topics, {args.per_minute:,} items/min ({minutes} simulated minutes) ---")
+
+    spotter = TrendSpotter(alert_min_items=500)
+    ingest_time = query_time = 0.0
+    for start in range(0, args.items, args.per_minute):
+        t = time.perf_counter()
+        for item in items[start:start + args.per_minute]:
+            spotter.ingest(item)
+        q = time.perf_counter()
+        spotter.top_k(args.k)
+        query_time += time.perf_counter() - q
+        ingest_time += q - t
+    print(f"  incremental: ingest {args.items / ingest_time:>10,.0f} items/s, "
+          f"top-{args.k} query {query_time / max(minutes, 1) * 1e3:8.3f} ms, {len(spotter):,} live topics")
+
+    tracemalloc.start()
+    spotter = TrendSpotter(alert_min_items=500)
+    for item in items:
+        spotter.ingest(item)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  incremental: {current / 1e6:.1f} MB retained, {current / max(len(spotter), 1) / 1e3:.1f} KB per topic "
+          f"(bounded by {spotter.buckets} buckets, independent of item volume)")
+
+    window = deque()
+    horizon = spotter.window_seconds
+    ingest_time = query_time = 0.0
+    for start in range(0, args.items, args.per_minute):
+        t = time.perf_counter()
+        for item in items[start:start + args.per_minute]:
+            window.append((item["topic"], item["timestamp"], item["relevance_score"]))
+            while window and window[0][1] <= item["timestamp"] - horizon:
+                window.popleft()
+        q = time.perf_counter()
+        naive_top_k(window, args.k)
+        query_time += time.perf_counter() - q
+        ingest_time += q - t
+    print(f"  recompute:   ingest {args.items / ingest_time:>10,.0f} items/s, "
+          f"top-{args.k} query {query_time / max(minutes, 1) * 1e3:8.3f} ms (O(window): {len(window):,} items retained)")
+
+
+if __name__ == "__main__":
+    main()
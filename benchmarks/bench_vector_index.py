@@ -0,0 +1,109 @@
+"""
+Benchmark: IVF index recall and latency against exact brute force.
+
+Synthetic memories are drawn from a Gaussian mixture (one cluster per topic)
+and spread over `--agents` agents; queries are perturbed memories. Exact
+top-k by brute-force cosine over the same vectors is the ground truth.
+Reports recall@k and per-query latency, unfiltered and with an `agent_id`
+filter, for each index size. The index is memory-mapped in a temp dir.
+
+Usage: python benchmarks/bench_vector_index.py [--sizes 10000,100000,1000000] [--dim D] [--queries N] [--nprobe 8,16,32]
+
+Reference: chimera/vector_index.py, specs/technical.md Section 2.2 (AgentMemory)
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.vector_index import IVFIndex  # noqa: E402
+
+
+def make_data(n: int, dim: int, topics: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    means = rng.normal(size=(topics, dim)).astype(np.float32)
+    data = means[rng.integers(0, topics, n)]
+    data += 1.0 * rng.normal(size=(n, dim)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+def timed(fn, queries) -> tuple:
+    results, latencies = [], []
+    for q in queries:
+        t = time.perf_counter()
+        results.append(fn(q))
+        latencies.append(time.perf_counter() - t)
+    return results, np.percentile(latencies, [50, 99]) * 1e3
+
+
+def recall(found: List[np.ndarray], truth: List[np.ndarray]) -> float:
+    hits = sum(len(np.intersect1d(f, t)) for f, t in zip(found, truth))
+    return hits / max(1, sum(len(t) for t in truth))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10000,100000,1000000")
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--nprobe", default="8,32,64")
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(1)
+    for n in (int(s) for s in args.sizes.split(",")):
+        data = make_data(n, args.dim, topics=max(10, n // 1000))
+        codes = rng.integers(0, args.agents, n)
+        agent_ids = [f"agent-{c}" for c in range(args.agents)]
+        picks = rng.choice(n, size=args.queries, replace=False)
+        queries = data[picks] + 0.1 * rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+        queries /= np.linalg.norm(queries, axis=1, keepdims=True)
+        query_agents = codes[picks]
+
+        print(f"--- {n:,} memories, dim {args.dim}, {args.agents} agents, recall@{args.k} over {args.queries} queries ---")
+        with tempfile.TemporaryDirectory() as path:
+            index = IVFIndex(path, dim=args.dim, train_threshold=min(n, 10_000))
+            t = time.perf_counter()
+            memories = [{"memory_id": str(i)} for i in range(n)]
+            for begin in range(0, n, 50_000):
+                stop = min(n, begin + 50_000)
+                index.add_many([agent_ids[c] for c in codes[begin:stop]], memories[begin:stop], data[begin:stop])
+            print(f"  build: {time.perf_counter() - t:6.2f} s ({index.nlist} cells)")
+
+            def brute(q):
+                return np.argsort(-(data @ q))[: args.k]
+
+            def brute_agent(item):
+                q, code = item
+                own = np.flatnonzero(codes == code)
+                return own[np.argsort(-(data[own] @ q))[: args.k]]
+
+            truth, (p50, p99) = timed(brute, queries)
+            print(f"  {'brute force':24} recall 1.000   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+            filtered = list(zip(queries, query_agents))
+            truth_agent, (p50, p99) = timed(brute_agent, filtered)
+            print(f"  {'brute force, agent_id':24} recall 1.000   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+
+            for nprobe in (int(s) for s in args.nprobe.split(",")):
+                found, (p50, p99) = timed(lambda q: index.search(q, args.k, nprobe=nprobe)[0], queries)
+                label = f"IVF nprobe={nprobe}"
+                print(f"  {label:24} recall {recall(found, truth):.3f}   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+                found, (p50, p99) = timed(
+                    lambda item: index.search(item[0], args.k, agent_id=agent_ids[item[1]], nprobe=nprobe)[0],
+                    filtered,
+                )
+                label = f"IVF nprobe={nprobe}, agent_id"
+                print(f"  {label:24} recall {recall(found, truth_agent):.3f}   p50 {p50:7.3f} ms   p99 {p99:7.3f} ms")
+            del index
+
+
+if __name__ == "__main__":
+    main()
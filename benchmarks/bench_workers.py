@@ -0,0 +1,86 @@
+"""
+Benchmark: fixed-size worker pools vs the elastic WorkerPool under a burst.
+
+Replays a quiet / burst / quiet arrival pattern of MCP-style tasks (an
+awaited I/O wait plus a short CPU step) through a small fixed pool, a large
+fixed pool and an elastic pool between the two, and reports end-to-end
+latency and worker-seconds (processes kept alive, i.e. cores reserved).
+
+Usage: python benchmarks/bench_workers.py [--burst-rate R] [--io-ms MS] [--slots N]
+
+Reference: chimera/workers.py, specs/functional.md FR 6.0
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from chimera.metrics import LatencyHistogram  # noqa: E402
+from chimera.workers import ScalingPolicy, WorkerPool  # noqa: E402
+
+
+async def mcp_task(task: Dict[str, float]) -> int:
+    await asyncio.sleep(task["io"])  # MCP call
+    deadline = time.perf_counter() + task["cpu"]  # scoring / validation
+    spins = 0
+    while time.perf_counter() < deadline:
+        spins += 1
+    return spins
+
+
+async def replay(pool: WorkerPool, phases: List[Tuple[float, float]], task: Dict[str, float]) -> LatencyHistogram:
+    latency = LatencyHistogram()
+
+    async def one() -> None:
+        start = time.perf_counter()
+        await pool.submit(task)
+        latency.observe(time.perf_counter() - start)
+
+    pending = []
+    for seconds, rate in phases:
+        end = time.perf_counter() + seconds
+        while time.perf_counter() < end:
+            pending.append(asyncio.ensure_future(one()))
+            await asyncio.sleep(1 / rate)
+    await asyncio.gather(*pending)
+    return latency
+
+
+async def run(name: str, policy: ScalingPolicy, phases: List[Tuple[float, float]], task: Dict[str, float]) -> None:
+    pool = WorkerPool(mcp_task, policy, control_interval=0.1)
+    await pool.start()
+    latency = await replay(pool, phases, task)
+    await pool.close()
+    snap = latency.snapshot()
+    print(f"  {name + ':':<22} p50 {snap['p50'] * 1e3:>7.0f} ms   p99 {snap['p99'] * 1e3:>7.0f} ms"
+          f"   worker-seconds {pool.stats['worker_seconds']:>6.1f}   peak workers {pool.stats['peak_workers']:>2}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--burst-rate", type=float, default=400.0, help="tasks/s during the burst")
+    parser.add_argument("--io-ms", type=float, default=100.0)
+    parser.add_argument("--cpu-ms", type=float, default=0.5)
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--max-workers", type=int, default=8)
+    args = parser.parse_args(argv)
+    task = {"io": args.io_ms / 1e3, "cpu": args.cpu_ms / 1e3}
+    phases = [(1.5, 20.0), (2.0, args.burst_rate), (3.0, 20.0)]
+    print(f"--- quiet 1.5 s @ 20/s, burst 2 s @ {args.burst_rate:.0f}/s, quiet 3 s; "
+          f"{args.io_ms:.0f} ms I/O + {args.cpu_ms} ms CPU per task, {args.slots} slots per worker ---")
+    for name, policy in (
+        ("fixed, 1 worker", ScalingPolicy(1, 1, args.slots)),
+        (f"fixed, {args.max_workers} workers", ScalingPolicy(args.max_workers, args.max_workers, args.slots)),
+        (f"elastic, 1..{args.max_workers}", ScalingPolicy(1, args.max_workers, args.slots, target_latency=0.5,
+                                                          scale_down_after=0.5)),
+    ):
+        asyncio.run(run(name, policy, phases, task))
+
+
+if __name__ == "__main__":
+    main()
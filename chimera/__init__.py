@@ -0,0 +1,5 @@
+"""
+Chimera runtime services shared by the Planner, Worker and Judge roles.
+
+Reference: specs/_meta.md Section 2.2 (FastRender Swarm Pattern), specs/functional.md FR 6.0
+"""
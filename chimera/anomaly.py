@@ -0,0 +1,284 @@
+"""
+Streaming anomaly detector for the Safety & Quarantine protocol.
+
+Protocol 4 quarantines an agent when its sentiment variance exceeds 0.8, its
+persona consistency drops below 0.7 or its anomaly score is high. Recomputing
+those over an agent's full message history on every message does not scale;
+this detector keeps constant-memory running statistics per agent and updates
+them in O(1) per message:
+
+- Welford mean / variance of sentiment over the agent's lifetime (baseline)
+- EWMA mean and exponentially weighted variance of sentiment
+  (`sentiment_variance`: recent volatility, sentiment in [-1, 1])
+- EWMA of per-message persona consistency (`persona_consistency_score`)
+- a ring buffer of the last `window` sentiments for sliding-window quantiles;
+  `anomaly_score` is 1 - exp(-z), where z is the distance of the window
+  median from the lifetime mean in lifetime standard deviations (0.9 at
+  z = 2.3; the median of a stationary window rarely strays past 1)
+
+State lives in numpy arrays indexed by agent slot, and `observe_batch()`
+updates a whole batch with vectorized operations (in rounds, so messages of
+one agent are applied in order). A triggered rule emits the Quarantine
+Trigger payload once per quarantine period.
+
+Reference: specs/openclaw_integration.md Section 3.4 (Protocol 4: Safety & Quarantine)
+"""
+
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SENTIMENT_VARIANCE_THRESHOLD = 0.8
+PERSONA_CONSISTENCY_THRESHOLD = 0.7
+ANOMALY_SCORE_THRESHOLD = 0.9
+DEFAULT_QUARANTINE_DURATION = 3600
+
+Trigger = Dict[str, Any]
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class AnomalyDetector:
+    """
+    Per-agent running statistics and quarantine rules.
+
+    `on_trigger(payload)` is called for every Quarantine Trigger emitted; the
+    payloads are also returned by `observe()` / `observe_batch()`.
+    """
+
+    def __init__(
+        self,
+        sentiment_threshold: float = SENTIMENT_VARIANCE_THRESHOLD,
+        consistency_threshold: float = PERSONA_CONSISTENCY_THRESHOLD,
+        anomaly_threshold: float = ANOMALY_SCORE_THRESHOLD,
+        alpha: float = 0.1,
+        window: int = 32,
+        min_messages: int = 20,
+        min_std: float = 0.05,
+        quarantine_duration: int = DEFAULT_QUARANTINE_DURATION,
+        capacity: int = 1024,
+        on_trigger: Optional[Callable[[Trigger], Any]] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        if not 0 < alpha <= 1:
+            raise ValueError("alpha must be in (0, 1]")
+        if window < 2:
+            raise ValueError("window must be >= 2")
+        self.sentiment_threshold = sentiment_threshold
+        self.consistency_threshold = consistency_threshold
+        self.anomaly_threshold = anomaly_threshold
+        self.alpha = alpha
+        self.window = window
+        self.min_messages = min_messages
+        self.min_std = min_std
+        self.quarantine_duration = quarantine_duration
+        self.on_trigger = on_trigger
+        self.clock = clock
+        self._slots: Dict[str, int] = {}
+        self._agents: List[str] = []
+        self._allocate(capacity)
+        self.stats = {"messages": 0, "triggers": 0, "suppressed": 0}
+
+    def _allocate(self, capacity: int) -> None:
+        def grow(name: str, dtype: Any, shape: tuple = ()) -> None:
+            fresh = np.zeros((capacity,) + shape, dtype=dtype)
+            old = getattr(self, name, None)
+            if old is not None:
+                fresh[: len(old)] = old
+            setattr(self, name, fresh)
+
+        grow("_count", np.int64)
+        grow("_mean", np.float64)  # Welford
+        grow("_m2", np.float64)
+        grow("_ew_mean", np.float64)
+        grow("_ew_var", np.float64)
+        grow("_consistency", np.float64)
+        grow("_anomaly", np.float64)
+        grow("_quarantined_until", np.float64)
+        grow("_ring", np.float64, (self.window,))
+        self._capacity = capacity
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    def _slot(self, agent_id: str) -> int:
+        slot = self._slots.get(agent_id)
+        if slot is None:
+            slot = len(self._agents)
+            if slot == self._capacity:
+                self._allocate(self._capacity * 2)
+            self._slots[agent_id] = slot
+            self._agents.append(agent_id)
+        return slot
+
+    # --- Ingest ---
+
+    def observe(
+        self,
+        agent_id: str,
+        sentiment: float,
+        persona_consistency: float,
+        timestamp: Optional[float] = None,
+    ) -> Optional[Trigger]:
+        """Records one message; returns the Quarantine Trigger if it fired."""
+        triggers = self.observe_batch([agent_id], [sentiment], [persona_consistency],
+                                      None if timestamp is None else [timestamp])
+        return triggers[0] if triggers else None
+
+    def observe_batch(
+        self,
+        agent_ids: Sequence[str],
+        sentiment: Sequence[float],
+        persona_consistency: Sequence[float],
+        timestamps: Optional[Sequence[float]] = None,
+    ) -> List[Trigger]:
+        """
+        Records messages in stream order: `sentiment` in [-1, 1], per-message
+        `persona_consistency` in [0, 1]. Returns the triggers fired.
+        """
+        n = len(agent_ids)
+        if not n:
+            return []
+        slot = self._slot
+        slots = np.fromiter((slot(a) for a in agent_ids), dtype=np.int64, count=n)
+        x = np.asarray(sentiment, dtype=np.float64)
+        c = np.asarray(persona_consistency, dtype=np.float64)
+        t = np.full(n, self.clock()) if timestamps is None else np.asarray(timestamps, dtype=np.float64)
+        if not (len(x) == len(c) == len(t) == n):
+            raise ValueError("agent_ids, sentiment, persona_consistency and timestamps must have the same length")
+
+        # Rank of each message among its agent's messages in this batch; round r
+        # applies every agent's r-th message, so each round has unique slots.
+        order = np.argsort(slots, kind="stable")
+        sorted_slots = slots[order]
+        starts = np.flatnonzero(np.r_[True, sorted_slots[1:] != sorted_slots[:-1]])
+        rank = np.empty(n, dtype=np.int64)
+        rank[order] = np.arange(n) - np.repeat(starts, np.diff(np.r_[starts, n]))
+
+        fired: List[Tuple[int, Trigger]] = []
+        rounds = int(rank.max()) + 1
+        for r in range(rounds):
+            picked = np.flatnonzero(rank == r) if rounds > 1 else np.arange(n)
+            fired.extend(self._apply(picked, slots[picked], x[picked], c[picked], t[picked]))
+        self.stats["messages"] += n
+        fired.sort(key=lambda item: item[0])  # stream order
+        triggers = [payload for _, payload in fired]
+        if self.on_trigger is not None:
+            for payload in triggers:
+                self.on_trigger(payload)
+        return triggers
+
+    def _apply(self, positions: np.ndarray, s: np.ndarray, x: np.ndarray, c: np.ndarray,
+               t: np.ndarray) -> List[Tuple[int, Trigger]]:
+        alpha = self.alpha
+        count = self._count[s] + 1
+        self._count[s] = count
+        first = count == 1
+
+        # Welford
+        delta = x - self._mean[s]
+        mean = self._mean[s] + delta / count
+        self._mean[s] = mean
+        m2 = self._m2[s] + delta * (x - mean)
+        self._m2[s] = m2
+
+        # EWMA mean / exponentially weighted variance (West 1979)
+        diff = x - self._ew_mean[s]
+        incr = alpha * diff
+        ew_var = np.where(first, 0.0, (1 - alpha) * (self._ew_var[s] + diff * incr))
+        self._ew_mean[s] = np.where(first, x, self._ew_mean[s] + incr)
+        self._ew_var[s] = ew_var
+        consistency = np.where(first, c, self._consistency[s] + alpha * (c - self._consistency[s]))
+        self._consistency[s] = consistency
+
+        # Sliding window: the last `window` sentiments per agent
+        self._ring[s, (count - 1) % self.window] = x
+        anomaly = np.zeros(len(s))
+        full = count >= self.window
+        if full.any():
+            fs = s[full]
+            median = np.median(self._ring[fs], axis=1)
+            std = np.maximum(np.sqrt(m2[full] / count[full]), self.min_std)
+            anomaly[full] = 1.0 - np.exp(-np.abs(median - mean[full]) / std)
+        self._anomaly[s] = anomaly
+
+        ready = count >= self.min_messages
+        variance_hit = ready & (ew_var > self.sentiment_threshold)
+        drift_hit = ready & (consistency < self.consistency_threshold)
+        anomaly_hit = ready & (anomaly > self.anomaly_threshold)
+        fired = variance_hit | drift_hit | anomaly_hit
+        if not fired.any():
+            return []
+        free = self._quarantined_until[s] <= t
+        self.stats["suppressed"] += int((fired & ~free).sum())
+        triggers = []
+        for i in np.flatnonzero(fired & free):
+            reasons = [reason for reason, hit in (("sentiment_variance", variance_hit[i]),
+                                                  ("persona_drift", drift_hit[i]),
+                                                  ("suspicious_behavior", anomaly_hit[i])) if hit]
+            payload = self._trigger(int(s[i]), reasons, float(ew_var[i]), float(consistency[i]),
+                                    float(anomaly[i]), float(t[i]))
+            triggers.append((int(positions[i]), payload))
+        return triggers
+
+    def _trigger(self, slot: int, reasons: List[str], variance: float, consistency: float,
+                 anomaly: float, now: float) -> Trigger:
+        self._quarantined_until[slot] = now + self.quarantine_duration
+        payload = {
+            "protocol": "safety_quarantine",
+            "version": "1.0",
+            "trigger_id": str(uuid.uuid4()),
+            "triggering_agent_id": self._agents[slot],
+            "quarantine_reason": reasons[0],
+            "metrics": {
+                "sentiment_variance": round(variance, 4),
+                "persona_consistency_score": round(consistency, 4),
+                "anomaly_score": round(anomaly, 4),
+            },
+            "detected_at": _iso(now),
+            "quarantine_duration": self.quarantine_duration,
+            # One rule alone is handled automatically; several at once need a human.
+            "escalation_level": "automatic" if len(reasons) == 1 else "human_review_required",
+        }
+        self.stats["triggers"] += 1
+        return payload
+
+    # --- Quarantine state ---
+
+    def is_quarantined(self, agent_id: str, now: Optional[float] = None) -> bool:
+        slot = self._slots.get(agent_id)
+        if slot is None:
+            return False
+        return bool(self._quarantined_until[slot] > (self.clock() if now is None else now))
+
+    def release(self, agent_id: str) -> None:
+        """Ends a quarantine early (human orchestrator approved resuming communication)."""
+        slot = self._slots.get(agent_id)
+        if slot is not None:
+            self._quarantined_until[slot] = 0.0
+
+    # --- Inspection ---
+
+    def metrics(self, agent_id: str, quantiles: Sequence[float] = (0.1, 0.5, 0.9)) -> Optional[Dict[str, Any]]:
+        """Current running statistics for `agent_id`, or None if never seen."""
+        slot = self._slots.get(agent_id)
+        if slot is None:
+            return None
+        count = int(self._count[slot])
+        recent = self._ring[slot, : min(count, self.window)]
+        return {
+            "messages": count,
+            "sentiment_variance": float(self._ew_var[slot]),
+            "persona_consistency_score": float(self._consistency[slot]),
+            "anomaly_score": float(self._anomaly[slot]),
+            "sentiment_mean": float(self._mean[slot]),
+            "lifetime_variance": float(self._m2[slot] / count) if count else 0.0,
+            "recent_mean": float(self._ew_mean[slot]),
+            "window_quantiles": {str(q): float(v) for q, v in zip(quantiles, np.quantile(recent, quantiles))}
+            if count else {},
+        }
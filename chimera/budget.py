@@ -0,0 +1,402 @@
+"""
+Budget ledger for the CFO Judge.
+
+Daily spend per agent is the spec counter `chimera:budget:{agent_id}:{date}`
+(USDC, reset at 00:00 UTC). Checking and incrementing it remotely for every
+cost-incurring step costs round trips, and a plain read-then-increment lets
+concurrent workers overshoot the limit. Instead each worker process runs a
+`BudgetLedger` that holds spend leases:
+
+- a lease is headroom granted to one worker; leases are recorded in
+  `chimera:budget:{agent_id}:{date}:leases` and every grant is one
+  WATCH/MULTI/EXEC that keeps `spend + sum(leases) <= daily limit`
+- `reserve()` / `commit()` / `release()` work against the local lease under
+  a per-agent lock, so most checks never leave the process; a reservation
+  that does not fit tops up the lease, or raises BudgetExceeded (REJECT);
+  once the budget is seen exhausted, rejections stay local until the next
+  `flush_interval`
+- committed amounts move from the lease to the spend counter when the ledger
+  syncs (every `flush_interval`, on top-up, `flush()` and `close()`)
+- a lease not refreshed within `lease_ttl` (crashed worker) is reclaimed by
+  the next grant and charged in full, since its unflushed spend is unknown;
+  the limit can be over-counted, never overshot
+- leases shrink as the budget runs out (`lease_fraction` of the remaining
+  headroom), so one worker cannot strand the last dollars
+- a fast-path anomaly check flags reservations (single spend above a share
+  of the limit, an amount far above the agent's running mean, bursts of
+  reservations) for human review without a remote call
+
+Amounts are tracked in integer micro-USDC (USDC has 6 decimals).
+
+Reference: specs/functional.md FR 5.2 (Budget Governance), specs/technical.md Section 2.3 (Redis Schema)
+"""
+
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+
+from chimera.keys import redis_key
+from chimera.redis_store import WatchError
+
+DEFAULT_DAILY_LIMIT_USDC = 50.0
+MICRO = 1_000_000
+KEY_TTL = 2 * 86400  # budget keys outlive their day for reporting
+
+HELD, COMMITTED, RELEASED = "held", "committed", "released"
+
+
+def to_micro(usdc: float) -> int:
+    return int(round(float(usdc) * MICRO))
+
+
+def to_usdc(micro: int) -> float:
+    return micro / MICRO
+
+
+def budget_date(ts: float) -> str:
+    """UTC day of `ts` (budgets reset at 00:00:00 UTC)."""
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%d")
+
+
+class BudgetExceeded(Exception):
+    """The reservation does not fit the agent's daily limit or the task's budget_limit."""
+
+    def __init__(self, agent_id: str, requested: float, available: float, reason: str = "daily_limit"):
+        super().__init__(f"{agent_id}: {requested:.6f} USDC requested, {available:.6f} USDC available ({reason})")
+        self.agent_id = agent_id
+        self.requested = requested
+        self.available = available
+        self.reason = reason
+
+
+class Reservation:
+    """Money set aside for one cost-incurring step until it is committed or released."""
+
+    __slots__ = ("reservation_id", "agent_id", "date", "amount", "task_id", "flags", "state", "_epoch")
+
+    def __init__(self, agent_id: str, date: str, amount: int, task_id: Optional[str], flags: Tuple[str, ...], epoch: int):
+        self.reservation_id = str(uuid.uuid4())
+        self.agent_id = agent_id
+        self.date = date
+        self.amount = amount
+        self.task_id = task_id
+        self.flags = flags
+        self.state = HELD
+        self._epoch = epoch
+
+    @property
+    def amount_usdc(self) -> float:
+        return to_usdc(self.amount)
+
+    @property
+    def requires_review(self) -> bool:
+        """True when the anomaly check flagged this spend (CFO Judge escalates to HITL)."""
+        return bool(self.flags)
+
+
+class _Account:
+    """This worker's view of one agent-day: its lease, split into available / held / unflushed."""
+
+    __slots__ = ("agent_id", "date", "limit", "lock", "available", "unflushed", "outstanding", "held",
+                 "task_spend", "remote_spent", "headroom", "synced_at", "epoch", "mean", "count", "recent")
+
+    def __init__(self, agent_id: str, date: str, limit: int):
+        self.agent_id = agent_id
+        self.date = date
+        self.limit = limit
+        self.lock = threading.Lock()
+        self.available = 0
+        self.unflushed = 0
+        self.outstanding = 0  # lease recorded in Redis = available + held + unflushed
+        self.held: Dict[str, Reservation] = {}
+        self.task_spend: Dict[str, int] = {}
+        self.remote_spent = 0
+        self.headroom = 0  # unleased budget seen at the last sync
+        self.synced_at = float("-inf")
+        self.epoch = 0
+        self.mean = 0.0
+        self.count = 0
+        self.recent: Deque[float] = deque()
+
+
+class BudgetLedger:
+    """
+    Per-process budget ledger over a redis-py compatible client
+    (`decode_responses=True`, see chimera.redis_store.InMemoryRedis).
+
+    `limits` overrides `daily_limit_usdc` per agent_id. Call `close()` on
+    shutdown to flush commits and hand unused leases back.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        daily_limit_usdc: float = DEFAULT_DAILY_LIMIT_USDC,
+        limits: Optional[Mapping[str, float]] = None,
+        worker_id: Optional[str] = None,
+        lease_usdc: float = 5.0,
+        lease_fraction: float = 0.25,
+        lease_ttl: float = 300.0,
+        flush_interval: float = 5.0,
+        max_single_fraction: float = 0.25,
+        anomaly_factor: float = 5.0,
+        velocity_window: float = 60.0,
+        max_velocity: int = 30,
+        clock: Callable[[], float] = time.time,
+    ):
+        if flush_interval >= lease_ttl:
+            raise ValueError("flush_interval must be shorter than lease_ttl")
+        self.client = client
+        self.daily_limit = to_micro(daily_limit_usdc)
+        self.limits = {agent_id: to_micro(limit) for agent_id, limit in (limits or {}).items()}
+        self.worker_id = worker_id or uuid.uuid4().hex
+        self.lease_size = to_micro(lease_usdc)
+        self.lease_fraction = lease_fraction
+        self.lease_ttl = lease_ttl
+        self.flush_interval = flush_interval
+        self.max_single_fraction = max_single_fraction
+        self.anomaly_factor = anomaly_factor
+        self.velocity_window = velocity_window
+        self.max_velocity = max_velocity
+        self.clock = clock
+        self._accounts: Dict[Tuple[str, str], _Account] = {}
+        self._lock = threading.Lock()
+        self.stats = {"reserved": 0, "local": 0, "syncs": 0, "rejected": 0, "flagged": 0,
+                      "committed_usdc": 0.0, "reclaimed_leases": 0, "lost_leases": 0}
+
+    def limit_for(self, agent_id: str) -> int:
+        return self.limits.get(agent_id, self.daily_limit)
+
+    # --- Reservations ---
+
+    def reserve(
+        self,
+        agent_id: str,
+        amount_usdc: float,
+        task_id: Optional[str] = None,
+        budget_limit: Optional[float] = None,
+    ) -> Reservation:
+        """
+        Sets aside `amount_usdc` from today's budget for `agent_id`.
+
+        `budget_limit` is the task's `budget_limit` / `budget_limit_usdc`:
+        reservations of one `task_id` may not sum above it. Raises
+        BudgetExceeded when the amount does not fit.
+        """
+        amount = to_micro(amount_usdc)
+        if amount <= 0:
+            raise ValueError("amount_usdc must be positive")
+        now = self.clock()
+        account = self._account(agent_id, now)
+        with account.lock:
+            if task_id is not None and budget_limit is not None:
+                task_total = account.task_spend.get(task_id, 0) + amount
+                if task_total > to_micro(budget_limit):
+                    self.stats["rejected"] += 1
+                    raise BudgetExceeded(agent_id, amount_usdc, budget_limit - to_usdc(task_total - amount), "task_budget")
+            flags = self._anomalies(account, amount, now)
+            if amount > account.available:
+                need = amount - account.available
+                # Recently seen exhausted: reject locally instead of asking Redis again.
+                if need > account.headroom and now - account.synced_at < self.flush_interval:
+                    self.stats["rejected"] += 1
+                    raise BudgetExceeded(agent_id, amount_usdc, to_usdc(account.available + account.headroom))
+                self._sync(account, now, need=need)
+                if amount > account.available:
+                    self.stats["rejected"] += 1
+                    raise BudgetExceeded(agent_id, amount_usdc, to_usdc(account.available + account.headroom))
+            else:
+                self.stats["local"] += 1
+            account.available -= amount
+            reservation = Reservation(agent_id, account.date, amount, task_id, flags, account.epoch)
+            account.held[reservation.reservation_id] = reservation
+            if task_id is not None:
+                account.task_spend[task_id] = account.task_spend.get(task_id, 0) + amount
+            self.stats["reserved"] += 1
+            if flags:
+                self.stats["flagged"] += 1
+            self._maybe_flush(account, now)
+        return reservation
+
+    def commit(self, reservation: Reservation, actual_usdc: Optional[float] = None) -> None:
+        """Records the spend; `actual_usdc` (<= reserved) returns the difference to the lease."""
+        actual = reservation.amount if actual_usdc is None else to_micro(actual_usdc)
+        if not 0 <= actual <= reservation.amount:
+            raise ValueError("actual_usdc must be between 0 and the reserved amount")
+        self._settle(reservation, actual, COMMITTED)
+
+    def release(self, reservation: Reservation) -> None:
+        """Returns a reservation that was not spent (failed or cancelled step)."""
+        self._settle(reservation, 0, RELEASED)
+
+    def _settle(self, reservation: Reservation, actual: int, state: str) -> None:
+        now = self.clock()
+        account = self._accounts.get((reservation.agent_id, reservation.date))
+        if account is None:
+            raise ValueError("Reservation does not belong to this ledger")
+        with account.lock:
+            if account.held.pop(reservation.reservation_id, None) is None:
+                raise ValueError(f"Reservation is already {reservation.state}")
+            reservation.state = state
+            unused = reservation.amount - actual
+            if reservation.task_id is not None and unused:
+                account.task_spend[reservation.task_id] -= unused
+            # A lease reclaimed while this was held was charged in full; nothing left to move.
+            if reservation._epoch == account.epoch:
+                account.unflushed += actual
+                account.available += unused
+            self.stats["committed_usdc"] += to_usdc(actual)
+            self._maybe_flush(account, now)
+
+    # --- Sync with Redis ---
+
+    def flush(self) -> None:
+        """Moves committed spend of every account into the Redis counters."""
+        now = self.clock()
+        for account in list(self._accounts.values()):
+            with account.lock:
+                if account.unflushed:
+                    self._sync(account, now)
+
+    def close(self) -> None:
+        """Flushes commits and returns unused headroom (shutdown)."""
+        now = self.clock()
+        for account in list(self._accounts.values()):
+            with account.lock:
+                if account.outstanding:
+                    self._sync(account, now, give_back=True)
+
+    def _maybe_flush(self, account: _Account, now: float) -> None:
+        if account.unflushed and now - account.synced_at >= self.flush_interval:
+            self._sync(account, now)
+
+    def _sync(self, account: _Account, now: float, need: int = 0, give_back: bool = False) -> None:
+        """
+        One compare-and-set round: reclaims expired leases, flushes this
+        worker's commits, returns or tops up its lease by at least `need`.
+        Caller holds `account.lock`.
+        """
+        fields = {"agent_id": account.agent_id, "date": account.date}
+        spend_key = redis_key("daily_spend", **fields)
+        leases_key = redis_key("budget_leases", **fields)
+        expiry_key = redis_key("budget_lease_expiry", **fields)
+        me = self.worker_id
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(spend_key, leases_key, expiry_key)
+                    # Reads share one round trip; the WATCH still guards them.
+                    with self.client.pipeline(transaction=False) as reads:
+                        reads.get(spend_key)
+                        reads.hgetall(leases_key)
+                        reads.zrangebyscore(expiry_key, "-inf", now)
+                        spent_raw, leases_raw, expired = reads.execute()
+                    spent = to_micro(float(spent_raw or 0))
+                    leases = {worker: int(value) for worker, value in leases_raw.items()}
+                    expired = [worker for worker in expired if worker != me]
+                    charged = sum(leases.pop(worker, 0) for worker in expired)
+                    lost = account.outstanding > 0 and me not in leases
+                    ours = 0 if lost else leases.pop(me, 0)
+                    flushed = 0 if lost else account.unflushed
+                    returned = account.available if give_back and not lost else 0
+                    spent_after = spent + charged + flushed
+                    remaining_lease = ours - flushed - returned
+                    headroom = account.limit - spent_after - sum(leases.values()) - remaining_lease
+                    grant = 0
+                    if need and headroom >= need:
+                        grant = min(headroom, max(need, min(self.lease_size, int(headroom * self.lease_fraction))))
+                    lease_after = remaining_lease + grant
+
+                    pipe.multi()
+                    if expired:
+                        pipe.hdel(leases_key, *expired)
+                        pipe.zrem(expiry_key, *expired)
+                    if charged or flushed or spent_raw is None:
+                        pipe.incrbyfloat(spend_key, to_usdc(charged + flushed))
+                    if lease_after > 0:
+                        pipe.hset(leases_key, me, lease_after)
+                        pipe.zadd(expiry_key, {me: now + self.lease_ttl})
+                    else:
+                        pipe.hdel(leases_key, me)
+                        pipe.zrem(expiry_key, me)
+                    for key in (spend_key, leases_key, expiry_key):
+                        pipe.expire(key, KEY_TTL)
+                    pipe.execute()
+                    break
+                except WatchError:
+                    continue
+        self.stats["syncs"] += 1
+        self.stats["reclaimed_leases"] += len(expired)
+        if lost:
+            # Another worker reclaimed and charged our lease; held reservations are already paid for.
+            self.stats["lost_leases"] += 1
+            account.epoch += 1
+            account.available = 0
+            account.unflushed = 0
+        account.unflushed -= flushed
+        account.available += grant - returned
+        account.outstanding = lease_after
+        account.remote_spent = spent_after
+        account.headroom = max(0, headroom - grant)
+        account.synced_at = now
+
+    # --- Accounts ---
+
+    def _account(self, agent_id: str, now: float) -> _Account:
+        date = budget_date(now)
+        account = self._accounts.get((agent_id, date))
+        if account is not None:
+            return account
+        with self._lock:
+            account = self._accounts.get((agent_id, date))
+            if account is None:
+                account = self._accounts[(agent_id, date)] = _Account(agent_id, date, self.limit_for(agent_id))
+                stale = [a for key, a in self._accounts.items() if key[1] < date]
+            else:
+                stale = []
+        for old in stale:
+            with old.lock:
+                if old.outstanding:
+                    self._sync(old, now, give_back=True)
+                if not old.held:
+                    with self._lock:
+                        self._accounts.pop((old.agent_id, old.date), None)
+        return account
+
+    def _anomalies(self, account: _Account, amount: int, now: float) -> Tuple[str, ...]:
+        flags: List[str] = []
+        if amount > self.max_single_fraction * account.limit:
+            flags.append("large_single_spend")
+        if account.count >= 5 and amount > self.anomaly_factor * account.mean:
+            flags.append("unusual_amount")
+        recent = account.recent
+        recent.append(now)
+        while recent and recent[0] <= now - self.velocity_window:
+            recent.popleft()
+        if len(recent) > self.max_velocity:
+            flags.append("spend_velocity")
+        account.count += 1
+        account.mean += (amount - account.mean) / min(account.count, 20)  # EWMA after 20 samples
+        return tuple(flags)
+
+    # --- Inspection ---
+
+    def status(self, agent_id: str) -> Dict[str, Any]:
+        """This worker's view of today's budget for `agent_id` (USDC)."""
+        account = self._account(agent_id, self.clock())
+        with account.lock:
+            return {
+                "date": account.date,
+                "limit": to_usdc(account.limit),
+                "spent": to_usdc(account.remote_spent + account.unflushed),
+                "held": to_usdc(sum(r.amount for r in account.held.values())),
+                "available_locally": to_usdc(account.available),
+                "lease": to_usdc(account.outstanding),
+            }
+
+    def spent(self, agent_id: str, date: Optional[str] = None) -> float:
+        """Committed spend in Redis (all workers' flushed commits plus charged leases)."""
+        return float(self.client.get(redis_key("daily_spend", agent_id=agent_id, date=date or budget_date(self.clock()))) or 0)
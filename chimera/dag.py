@@ -0,0 +1,451 @@
+"""
+Campaign DAG executor for the Planner.
+
+The Planner decomposes a campaign goal into a DAG of AgentTasks
+(`campaigns.task_tree`). `DagExecutor` runs it:
+
+- a task becomes ready the moment its last dependency completes; there are
+  no level barriers
+- ready tasks are served by upward rank (the task's estimated duration plus
+  the longest chain of successors after it), so tasks on the critical path
+  start first and the campaign's makespan shrinks
+- at most `agent_limit` tasks run per agent and `type_limits[task_type]`
+  per task type (e.g. a few `generate_content` renders at once); a ready
+  task blocked by a cap is parked under that agent or type and comes back
+  when a slot frees
+- `replan()` adds, updates and removes tasks while the campaign runs and
+  recomputes ranks only for the changed tasks and their ancestors
+- a failed task is retried or skips its descendants
+
+A task tree node is an AgentTask dict plus `depends_on` (task ids) and
+optionally `agent_id` and `estimated_seconds`.
+
+Reference: specs/functional.md US-4.1 (Goal Decomposition), specs/technical.md Section 3 (campaigns.task_tree)
+"""
+
+import asyncio
+import heapq
+import itertools
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+PENDING, READY, RUNNING, DONE, FAILED, SKIPPED = "pending", "ready", "running", "done", "failed", "skipped"
+DEFAULT_DURATION = 1.0
+
+
+class _Node:
+    __slots__ = ("task_id", "seq", "task", "agent_id", "task_type", "duration", "deps", "succs", "waiting", "rank",
+                 "state", "token", "attempts")
+
+    def __init__(self, task_id: str, seq: int):
+        self.task_id = task_id
+        self.seq = seq  # plan order; breaks rank ties
+        self.task: Dict[str, Any] = {}
+        self.agent_id = ""
+        self.task_type = ""
+        self.duration = DEFAULT_DURATION
+        self.deps: Set[str] = set()
+        self.succs: Set[str] = set()
+        self.waiting = 0  # unfinished dependencies
+        self.rank = 0.0
+        self.state = PENDING
+        self.token = 0  # bumps invalidate older ready-heap entries
+        self.attempts = 0
+
+
+class DagExecutor:
+    """
+    In-process DAG scheduler; thread-safe. Dispatchers take tasks with
+    `next_ready()` and report back with `complete()` / `fail()`, or let
+    `run()` drive an async `execute(task)`.
+    """
+
+    def __init__(
+        self,
+        agent_limit: Optional[int] = None,
+        agent_limits: Optional[Dict[str, int]] = None,
+        type_limits: Optional[Dict[str, int]] = None,
+        durations: Optional[Dict[str, float]] = None,
+        default_agent_id: str = "unassigned",
+        max_attempts: int = 1,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be >= 1")
+        self.agent_limit = agent_limit
+        self.agent_limits = dict(agent_limits or {})
+        self.type_limits = dict(type_limits or {})
+        self.durations = dict(durations or {})  # task_type -> estimated seconds
+        self.default_agent_id = default_agent_id
+        self.max_attempts = max_attempts
+        self._nodes: Dict[str, _Node] = {}
+        self._ready: List[Tuple[float, int, int, str]] = []  # (-rank, node seq, token, task_id)
+        self._parked: Dict[Tuple[str, str], List[str]] = {}
+        self._running_agent: Dict[str, int] = {}
+        self._running_type: Dict[str, int] = {}
+        self._counts = {state: 0 for state in (PENDING, READY, RUNNING, DONE, FAILED, SKIPPED)}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self.stats = {"dispatched": 0, "completed": 0, "failed": 0, "retried": 0, "skipped": 0, "reranked": 0,
+                      "parked": 0}
+
+    @classmethod
+    def from_task_tree(cls, task_tree: Any, **kwargs: Any) -> "DagExecutor":
+        """Executor for a `campaigns.task_tree` value: {"tasks": [node, ...]} or a list of nodes."""
+        executor = cls(**kwargs)
+        executor.replan(add=task_tree["tasks"] if isinstance(task_tree, dict) else task_tree)
+        return executor
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    @property
+    def finished(self) -> bool:
+        """No task is pending, ready or running."""
+        counts = self._counts
+        return not (counts[PENDING] or counts[READY] or counts[RUNNING])
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._counts)
+
+    def state(self, task_id: str) -> str:
+        return self._nodes[task_id].state
+
+    def rank(self, task_id: str) -> float:
+        return self._nodes[task_id].rank
+
+    # --- Planning ---
+
+    def replan(self, add: Iterable[Dict[str, Any]] = (), remove: Iterable[str] = ()) -> int:
+        """
+        Adds or updates task tree nodes and removes task ids. Only pending or
+        ready tasks can change; edges to removed tasks are dropped. Returns
+        the number of tasks whose rank was recomputed.
+        """
+        with self._lock:
+            nodes = self._nodes
+            add = list(add)
+            remove = set(remove)
+            for task_id in remove:
+                self._mutable(task_id)
+            added = {spec["task_id"] for spec in add}
+            for spec in add:
+                if spec["task_id"] in remove:
+                    raise ValueError(f"task {spec['task_id']} is both added and removed")
+                if spec["task_id"] in nodes:
+                    self._mutable(spec["task_id"])
+                for dep in spec.get("depends_on") or ():
+                    if dep in remove or (dep not in nodes and dep not in added):
+                        raise ValueError(f"{spec['task_id']} depends on unknown task {dep}")
+            self._check_acyclic({spec["task_id"]: set(spec.get("depends_on") or ()) for spec in add}, remove)
+
+            changed: Set[str] = set()
+            for task_id in remove:
+                node = nodes.pop(task_id)
+                self._counts[node.state] -= 1
+                node.token += 1
+                node.state = SKIPPED  # marks parked/heap references dead
+                for dep in node.deps:
+                    if dep in nodes:
+                        nodes[dep].succs.discard(task_id)
+                        changed.add(dep)
+                for succ in node.succs:
+                    if succ in nodes:
+                        nodes[succ].deps.discard(task_id)
+                        changed.add(succ)
+            for spec in add:
+                task_id = spec["task_id"]
+                node = nodes.get(task_id)
+                if node is None:
+                    node = nodes[task_id] = _Node(task_id, next(self._seq))
+                    self._counts[PENDING] += 1
+                for dep in node.deps:
+                    if dep in nodes:
+                        nodes[dep].succs.discard(task_id)
+                        changed.add(dep)  # its rank may have come through this edge
+                node.task = {k: v for k, v in spec.items() if k not in ("depends_on", "agent_id", "estimated_seconds")}
+                node.agent_id = spec.get("agent_id") or self.default_agent_id
+                node.task_type = spec.get("task_type", "")
+                node.duration = float(spec.get("estimated_seconds", self.durations.get(node.task_type, DEFAULT_DURATION)))
+                node.deps = set(spec.get("depends_on") or ())
+                changed.add(task_id)
+            for spec in add:
+                for dep in spec.get("depends_on") or ():
+                    nodes[dep].succs.add(spec["task_id"])
+
+            for task_id in changed:
+                if task_id in nodes:
+                    self._refresh_waiting(nodes[task_id])
+            return self._rerank(changed & nodes.keys())
+
+    def _mutable(self, task_id: str) -> None:
+        node = self._nodes.get(task_id)
+        if node is None:
+            raise KeyError(task_id)
+        if node.state not in (PENDING, READY):
+            raise ValueError(f"task {task_id} is {node.state} and can no longer be re-planned")
+
+    def _check_acyclic(self, new_deps: Dict[str, Set[str]], remove: Set[str]) -> None:
+        """
+        Raises if the graph after a re-plan would have a cycle. A new cycle
+        must pass through an added or updated task, so one DFS over their
+        descendants (with the planned edges) is enough.
+        """
+        nodes = self._nodes
+        new_succs: Dict[str, Set[str]] = {}
+        for task_id, deps in new_deps.items():
+            for dep in deps:
+                new_succs.setdefault(dep, set()).add(task_id)
+
+        def succs(task_id: str) -> Iterable[str]:
+            node = nodes.get(task_id)
+            # Edges into added/updated tasks are re-declared by new_deps.
+            old = () if node is None else (s for s in node.succs if s not in remove and s not in new_deps)
+            return itertools.chain(old, new_succs.get(task_id, ()))
+
+        done: Set[str] = set()
+        on_path: Set[str] = set()
+        for root in new_deps:
+            if root in done:
+                continue
+            stack = [(root, iter(succs(root)))]
+            on_path.add(root)
+            while stack:
+                task_id, children = stack[-1]
+                for child in children:
+                    if child in on_path:
+                        raise ValueError(f"dependency cycle through task {child}")
+                    if child not in done:
+                        on_path.add(child)
+                        stack.append((child, iter(succs(child))))
+                        break
+                else:
+                    stack.pop()
+                    on_path.discard(task_id)
+                    done.add(task_id)
+
+    def _refresh_waiting(self, node: _Node) -> None:
+        if node.state not in (PENDING, READY):
+            return
+        node.waiting = sum(1 for dep in node.deps if self._nodes[dep].state != DONE)
+        if any(self._nodes[dep].state in (FAILED, SKIPPED) for dep in node.deps):
+            self._skip(node)
+        elif node.waiting == 0 and node.state == PENDING:
+            self._set_state(node, READY)
+            self._push(node)
+        elif node.waiting and node.state == READY:
+            node.token += 1  # drop its heap entry
+            self._set_state(node, PENDING)
+
+    def _rerank(self, changed: Set[str]) -> int:
+        """Recomputes ranks of `changed` and their ancestors, successors first."""
+        nodes = self._nodes
+        affected: Set[str] = set()
+        frontier: Deque[str] = deque(changed)
+        while frontier:
+            task_id = frontier.popleft()
+            if task_id in affected:
+                continue
+            affected.add(task_id)
+            frontier.extend(dep for dep in nodes[task_id].deps if dep not in affected)
+        # Kahn's algorithm on the affected subgraph, sinks first.
+        remaining = {task_id: sum(1 for s in nodes[task_id].succs if s in affected) for task_id in affected}
+        order = deque(task_id for task_id, count in remaining.items() if count == 0)
+        while order:
+            node = nodes[order.popleft()]
+            rank = node.duration + max((nodes[s].rank for s in node.succs), default=0.0)
+            if rank != node.rank:
+                node.rank = rank
+                if node.state == READY:
+                    self._push(node)  # re-prioritize
+            for dep in node.deps:
+                remaining[dep] -= 1
+                if remaining[dep] == 0:
+                    order.append(dep)
+        self.stats["reranked"] += len(affected)
+        return len(affected)
+
+    # --- Dispatch ---
+
+    def _set_state(self, node: _Node, state: str) -> None:
+        self._counts[node.state] -= 1
+        self._counts[state] += 1
+        node.state = state
+
+    def _push(self, node: _Node) -> None:
+        node.token += 1
+        heapq.heappush(self._ready, (-node.rank, node.seq, node.token, node.task_id))
+
+    def _blocked_by(self, node: _Node) -> Optional[Tuple[str, str]]:
+        limit = self.agent_limits.get(node.agent_id, self.agent_limit)
+        if limit is not None and self._running_agent.get(node.agent_id, 0) >= limit:
+            return ("agent", node.agent_id)
+        limit = self.type_limits.get(node.task_type)
+        if limit is not None and self._running_type.get(node.task_type, 0) >= limit:
+            return ("type", node.task_type)
+        return None
+
+    def _unpark(self, key: Tuple[str, str]) -> None:
+        for task_id in self._parked.pop(key, ()):
+            node = self._nodes.get(task_id)
+            if node is not None and node.state == READY:
+                self._push(node)
+
+    def next_ready(self, max_tasks: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Marks up to `max_tasks` ready tasks running, highest rank first, within
+        the agent and task type caps. Each returned task carries `agent_id`.
+        """
+        dispatched: List[Dict[str, Any]] = []
+        with self._lock:
+            nodes, ready = self._nodes, self._ready
+            while ready and (max_tasks is None or len(dispatched) < max_tasks):
+                _, _, token, task_id = heapq.heappop(ready)
+                node = nodes.get(task_id)
+                if node is None or node.token != token or node.state != READY:
+                    continue
+                blocked = self._blocked_by(node)
+                if blocked is not None:
+                    self._parked.setdefault(blocked, []).append(task_id)
+                    node.token += 1
+                    self.stats["parked"] += 1
+                    continue
+                self._set_state(node, RUNNING)
+                node.attempts += 1
+                self._running_agent[node.agent_id] = self._running_agent.get(node.agent_id, 0) + 1
+                self._running_type[node.task_type] = self._running_type.get(node.task_type, 0) + 1
+                self.stats["dispatched"] += 1
+                dispatched.append({**node.task, "agent_id": node.agent_id})
+        return dispatched
+
+    def _release(self, node: _Node) -> None:
+        self._running_agent[node.agent_id] -= 1
+        self._running_type[node.task_type] -= 1
+        self._unpark(("agent", node.agent_id))
+        self._unpark(("type", node.task_type))
+
+    def complete(self, task_id: str) -> List[str]:
+        """Marks a running task done; returns the task ids it made ready."""
+        with self._lock:
+            node = self._running(task_id)
+            self._set_state(node, DONE)
+            self._release(node)
+            self.stats["completed"] += 1
+            released = []
+            for succ_id in node.succs:
+                succ = self._nodes[succ_id]
+                succ.waiting -= 1
+                if succ.waiting == 0 and succ.state == PENDING:
+                    self._set_state(succ, READY)
+                    self._push(succ)
+                    released.append(succ_id)
+            return released
+
+    def fail(self, task_id: str, retry: bool = True) -> bool:
+        """
+        Marks a running task failed. It is retried while `retry` and attempts
+        remain; otherwise its descendants are skipped. Returns True if retried.
+        """
+        with self._lock:
+            node = self._running(task_id)
+            self._release(node)
+            if retry and node.attempts < self.max_attempts:
+                self._set_state(node, READY)
+                self._push(node)
+                self.stats["retried"] += 1
+                return True
+            self._set_state(node, FAILED)
+            self.stats["failed"] += 1
+            for succ_id in node.succs:
+                self._skip(self._nodes[succ_id])
+            return False
+
+    def _skip(self, node: _Node) -> None:
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.state not in (PENDING, READY):
+                continue
+            node.token += 1
+            self._set_state(node, SKIPPED)
+            self.stats["skipped"] += 1
+            stack.extend(self._nodes[s] for s in node.succs)
+
+    def _running(self, task_id: str) -> _Node:
+        node = self._nodes.get(task_id)
+        if node is None or node.state != RUNNING:
+            raise ValueError(f"task {task_id} is not running")
+        return node
+
+    def critical_path(self) -> List[str]:
+        """The remaining chain of unfinished tasks with the highest total duration."""
+        with self._lock:
+            live = [n for n in self._nodes.values() if n.state in (PENDING, READY, RUNNING)]
+            roots = [n for n in live if not any(self._nodes[d].state in (PENDING, READY, RUNNING) for d in n.deps)]
+            path: List[str] = []
+            node = max(roots, key=lambda n: n.rank, default=None)
+            while node is not None:
+                path.append(node.task_id)
+                node = max((self._nodes[s] for s in node.succs), key=lambda n: n.rank, default=None)
+            return path
+
+    # --- Driver ---
+
+    async def run(
+        self,
+        execute: Callable[[Dict[str, Any]], Awaitable[Any]],
+        max_concurrency: Optional[int] = None,
+        stop: Optional[asyncio.Event] = None,
+    ) -> Dict[str, int]:
+        """
+        Executes the DAG with `execute(task)` until it finishes (or `stop` is
+        set; jobs already started are awaited and settled first); an
+        exception from `execute` fails the task. Returns counts().
+        """
+        running: Set[asyncio.Task] = set()
+        owners: Dict[asyncio.Task, str] = {}
+
+        def settle(done: Set[asyncio.Task]) -> None:
+            for job in done:
+                task_id = owners.pop(job)
+                if job.exception() is None:
+                    self.complete(task_id)
+                else:
+                    self.fail(task_id)
+
+        while not self.finished and (stop is None or not stop.is_set()):
+            room = None if max_concurrency is None else max_concurrency - len(running)
+            if room is None or room > 0:
+                for task in self.next_ready(room):
+                    job = asyncio.ensure_future(execute(task))
+                    running.add(job)
+                    owners[job] = task["task_id"]
+            if not running:
+                break  # everything left is blocked on caps held by nobody, or skipped
+            done, running = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            settle(done)
+        if running:
+            done, _ = await asyncio.wait(running)
+            settle(done)
+        return self.counts()
+
+
+def topological_levels(nodes: Sequence[Dict[str, Any]]) -> List[List[str]]:
+    """Task ids grouped by dependency depth (the level-by-level baseline)."""
+    depth: Dict[str, int] = {}
+    by_id = {node["task_id"]: node for node in nodes}
+
+    def level(task_id: str) -> int:
+        if task_id not in depth:
+            deps = by_id[task_id].get("depends_on") or ()
+            depth[task_id] = 1 + max((level(d) for d in deps), default=-1)
+        return depth[task_id]
+
+    levels: List[List[str]] = []
+    for task_id in by_id:
+        d = level(task_id)
+        while len(levels) <= d:
+            levels.append([])
+        levels[d].append(task_id)
+    return levels
@@ -0,0 +1,508 @@
+"""
+Fleet status aggregation for the Network Operator dashboard.
+
+US-1.2 shows every agent's state, wallet balance and the HITL queue depth.
+Reading each `chimera:agents:{agent_id}:status` hash on every refresh costs
+one round trip per agent. Instead workers send compact binary heartbeats,
+and one `FleetAggregator` keeps the fleet snapshot up to date incrementally:
+
+- a heartbeat frame carries the agent id (16 bytes when it is a UUID), the
+  timestamp and only the fields that changed since the agent's last frame
+  (`HeartbeatEncoder`); frames are self-delimiting, so a batch is plain
+  concatenation. A full frame is 52 bytes, a liveness-only one 27
+- applying a frame adjusts counts by state and fleet totals by the
+  difference, O(1), and keeps top-k outlier sets (lowest wallet, deepest
+  HITL and task queues, highest daily spend) that only rescan the fleet
+  when a member drops out
+- agents silent for `stale_after` seconds are flagged stale, found by
+  sweeping the agents in heartbeat order
+- `publish()` (every `interval` in `run()`) freezes the snapshot, so
+  `snapshot()` and `snapshot_json()` serve a prebuilt object in O(1), and
+  pushes a diff (changed agent rows plus the summary sections that changed)
+  to subscribers
+
+`load()` bootstraps from the status hashes with one pipelined round trip.
+
+Reference: specs/functional.md US-1.2 (Fleet Monitoring), specs/technical.md Section 2.3 (agent_status)
+"""
+
+import asyncio
+import heapq
+import json
+import struct
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from chimera.budget import to_micro, to_usdc
+from chimera.keys import redis_key
+
+STATES = ("planning", "working", "judging", "sleeping", "paused", "quarantined")
+_STATE_CODES = {state: code for code, state in enumerate(STATES)}
+# technical.md's agent_status uses "active" for an agent that is running tasks.
+_STATE_ALIASES = {"active": "working"}
+
+VERSION = 1
+FIELDS = ("state", "queue_depth", "hitl_depth", "wallet_balance", "daily_spend")
+_UUID_ID = 0x80  # mask bit: agent id packed as 16 raw bytes
+
+_HEADER = struct.Struct("<BBB")  # version, field mask, id length (0 for a packed UUID)
+_TIMESTAMP = struct.Struct("<d")
+_FORMATS = (struct.Struct("<B"), struct.Struct("<I"), struct.Struct("<I"), struct.Struct("<q"), struct.Struct("<q"))
+
+
+class Heartbeat(NamedTuple):
+    agent_id: str
+    timestamp: float
+    state: Optional[str] = None
+    queue_depth: Optional[int] = None
+    hitl_depth: Optional[int] = None
+    wallet_balance: Optional[float] = None  # USDC
+    daily_spend: Optional[float] = None  # USDC
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def normalize_state(state: str) -> str:
+    """Maps the spec spellings ("Working", "active", ...) onto STATES."""
+    if state in _STATE_CODES:
+        return state
+    folded = str(state).strip().lower()
+    folded = _STATE_ALIASES.get(folded, folded)
+    if folded not in _STATE_CODES:
+        raise ValueError(f"unknown agent state {state!r}; expected one of {STATES} or {tuple(_STATE_ALIASES)}")
+    return folded
+
+
+# --- Wire format ---
+
+def encode_heartbeat(heartbeat: Heartbeat) -> bytes:
+    """Packs the non-None fields of `heartbeat` into one frame."""
+    mask = 0
+    body = [_TIMESTAMP.pack(heartbeat.timestamp)]
+    values = (
+        None if heartbeat.state is None else _STATE_CODES[normalize_state(heartbeat.state)],
+        heartbeat.queue_depth,
+        heartbeat.hitl_depth,
+        None if heartbeat.wallet_balance is None else to_micro(heartbeat.wallet_balance),
+        None if heartbeat.daily_spend is None else to_micro(heartbeat.daily_spend),
+    )
+    for bit, (value, fmt) in enumerate(zip(values, _FORMATS)):
+        if value is not None:
+            mask |= 1 << bit
+            body.append(fmt.pack(value))
+    try:
+        raw_id = uuid.UUID(heartbeat.agent_id).bytes
+        if str(uuid.UUID(bytes=raw_id)) != heartbeat.agent_id:
+            raise ValueError(heartbeat.agent_id)  # only canonical UUIDs round-trip
+        mask |= _UUID_ID
+        id_length = 0
+    except ValueError:
+        raw_id = heartbeat.agent_id.encode()
+        id_length = len(raw_id)
+        if not 0 < id_length < 256:
+            raise ValueError("agent_id must be 1-255 bytes") from None
+    return _HEADER.pack(VERSION, mask, id_length) + raw_id + b"".join(body)
+
+
+def decode_heartbeats(data: bytes) -> Iterator[Heartbeat]:
+    """Decodes a buffer of concatenated frames."""
+    view = memoryview(data)
+    offset, end = 0, len(view)
+    while offset < end:
+        version, mask, id_length = _HEADER.unpack_from(view, offset)
+        if version != VERSION:
+            raise ValueError(f"unsupported heartbeat version {version}")
+        offset += _HEADER.size
+        if mask & _UUID_ID:
+            agent_id = str(uuid.UUID(bytes=bytes(view[offset:offset + 16])))
+            offset += 16
+        else:
+            agent_id = bytes(view[offset:offset + id_length]).decode()
+            offset += id_length
+        (timestamp,) = _TIMESTAMP.unpack_from(view, offset)
+        offset += _TIMESTAMP.size
+        values: List[Any] = [None] * len(FIELDS)
+        for bit, fmt in enumerate(_FORMATS):
+            if mask & (1 << bit):
+                (values[bit],) = fmt.unpack_from(view, offset)
+                offset += fmt.size
+        state, queue_depth, hitl_depth, wallet, spend = values
+        yield Heartbeat(
+            agent_id,
+            timestamp,
+            None if state is None else STATES[state],
+            queue_depth,
+            hitl_depth,
+            None if wallet is None else to_usdc(wallet),
+            None if spend is None else to_usdc(spend),
+        )
+
+
+class HeartbeatEncoder:
+    """
+    Worker side: encodes heartbeats as deltas against the last frame sent
+    per agent, with a full frame at least every `keyframe_interval` seconds
+    so an aggregator that restarted catches up.
+    """
+
+    def __init__(self, keyframe_interval: float = 60.0, clock: Callable[[], float] = time.time):
+        self.keyframe_interval = keyframe_interval
+        self.clock = clock
+        self._sent: Dict[str, Tuple[Tuple[Any, ...], float]] = {}
+
+    def encode(self, agent_id: str, timestamp: Optional[float] = None, **fields: Any) -> bytes:
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise TypeError(f"unknown heartbeat fields: {sorted(unknown)}")
+        now = self.clock() if timestamp is None else timestamp
+        last, keyframe_at = self._sent.get(agent_id, ((None,) * len(FIELDS), float("-inf")))
+        current = tuple(fields.get(name, previous) for name, previous in zip(FIELDS, last))
+        if now - keyframe_at >= self.keyframe_interval:
+            keyframe_at = now
+            changed = current
+        else:
+            changed = tuple(None if value == previous else value for value, previous in zip(current, last))
+        self._sent[agent_id] = (current, keyframe_at)
+        return encode_heartbeat(Heartbeat(agent_id, now, *changed))
+
+    def forget(self, agent_id: str) -> None:
+        self._sent.pop(agent_id, None)
+
+
+# --- Aggregation ---
+
+class _Agent:
+    __slots__ = ("state", "queue_depth", "hitl_depth", "wallet", "spend", "last_seen", "stale")
+
+    def __init__(self):
+        self.state: Optional[str] = None
+        self.queue_depth = 0
+        self.hitl_depth = 0
+        self.wallet = 0  # micro-USDC
+        self.spend = 0
+        self.last_seen = 0.0
+        self.stale = False
+
+    def row(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "queue_depth": self.queue_depth,
+            "hitl_depth": self.hitl_depth,
+            "wallet_balance_usdc": to_usdc(self.wallet),
+            "daily_spend_usdc": to_usdc(self.spend),
+            "last_heartbeat": _iso(self.last_seen),
+            "stale": self.stale,
+        }
+
+
+class _TopK:
+    """
+    The k agents with the highest `score`, kept incrementally. A member whose
+    score falls below the k-th best might be overtaken by any agent, so that
+    (and removing a member) marks the set dirty; it is rebuilt on read.
+    """
+
+    __slots__ = ("k", "score", "members", "floor", "dirty")
+
+    def __init__(self, k: int, score: Callable[[_Agent], int]):
+        self.k = k
+        self.score = score
+        self.members: Dict[str, Tuple[int, str]] = {}
+        self.floor: Optional[Tuple[int, str]] = None
+        self.dirty = False
+
+    def update(self, agent_id: str, agent: _Agent) -> None:
+        if self.dirty:
+            return
+        key = (self.score(agent), agent_id)
+        members = self.members
+        if agent_id in members:
+            members[agent_id] = key
+            if key < self.floor and len(members) == self.k:
+                self.dirty = True
+                return
+        elif len(members) < self.k:
+            members[agent_id] = key
+        elif key > self.floor:
+            del members[self.floor[1]]
+            members[agent_id] = key
+        else:
+            return
+        self.floor = min(members.values())
+
+    def discard(self, agent_id: str) -> None:
+        if agent_id in self.members:
+            self.dirty = True
+
+    def top(self, agents: Dict[str, _Agent]) -> List[Tuple[int, str]]:
+        if self.dirty:
+            best = heapq.nlargest(self.k, ((self.score(agent), agent_id) for agent_id, agent in agents.items()))
+            self.members = {agent_id: (score, agent_id) for score, agent_id in best}
+            self.floor = min(self.members.values()) if self.members else None
+            self.dirty = False
+        return sorted(self.members.values(), reverse=True)
+
+
+_OUTLIERS: Dict[str, Tuple[Callable[[_Agent], int], str, Callable[[int], Any]]] = {
+    # name: (score, reported field, score -> reported value)
+    "lowest_wallet": (lambda a: -a.wallet, "wallet_balance_usdc", lambda s: to_usdc(-s)),
+    "hitl_depth": (lambda a: a.hitl_depth, "hitl_depth", int),
+    "queue_depth": (lambda a: a.queue_depth, "queue_depth", int),
+    "daily_spend": (lambda a: a.spend, "daily_spend_usdc", to_usdc),
+}
+
+
+class FleetAggregator:
+    """
+    Incrementally maintained fleet snapshot.
+
+    `subscribe(callback)` registers `callback(diff)`, called by `publish()`;
+    a diff carries `version` / `base_version`, the changed agent rows in
+    `agents` (None for a removed agent) and only the summary sections
+    (`summary`, `by_state`, `totals`, `outliers`) that changed.
+    """
+
+    def __init__(self, top_k: int = 10, stale_after: float = 90.0, clock: Callable[[], float] = time.time):
+        self.top_k = top_k
+        self.stale_after = stale_after
+        self.clock = clock
+        self._agents: Dict[str, _Agent] = {}
+        self._by_seen: "OrderedDict[str, None]" = OrderedDict()  # heartbeat arrival order
+        self._by_state: Dict[str, int] = {state: 0 for state in STATES}
+        self._totals = {"queue_depth": 0, "hitl_depth": 0, "wallet": 0, "spend": 0}
+        self._stale = 0
+        self._outliers = {name: _TopK(top_k, score) for name, (score, _, _) in _OUTLIERS.items()}
+        self._changed: Dict[str, None] = {}
+        self._removed: Dict[str, None] = {}
+        self._subscribers: List[Callable[[Dict[str, Any]], Any]] = []
+        self._lock = threading.Lock()
+        self._version = 0
+        self._snapshot: Dict[str, Any] = {}
+        self._snapshot_json = b""
+        self.stats = {"frames": 0, "publishes": 0, "diffs": 0, "callback_errors": 0}
+        self.publish()
+
+    def __len__(self) -> int:
+        return len(self._agents)
+
+    # --- Ingest ---
+
+    def apply(self, data: bytes) -> int:
+        """Applies a buffer of heartbeat frames; returns the number applied."""
+        return self.apply_heartbeats(decode_heartbeats(data))
+
+    def apply_heartbeats(self, heartbeats: Iterable[Heartbeat]) -> int:
+        count = 0
+        with self._lock:
+            for heartbeat in heartbeats:
+                self._apply(heartbeat)
+                count += 1
+            self.stats["frames"] += count
+        return count
+
+    def _apply(self, hb: Heartbeat) -> None:
+        agent_id = hb.agent_id
+        agent = self._agents.get(agent_id)
+        if agent is None:
+            agent = self._agents[agent_id] = _Agent()
+            self._removed.pop(agent_id, None)
+        elif hb.timestamp < agent.last_seen:
+            return  # delayed frame, superseded
+        totals = self._totals
+        state = None if hb.state is None else normalize_state(hb.state)
+        if state is not None and state != agent.state:
+            if agent.state is not None:
+                self._by_state[agent.state] -= 1
+            self._by_state[state] += 1
+            agent.state = state
+        if hb.queue_depth is not None:
+            totals["queue_depth"] += hb.queue_depth - agent.queue_depth
+            agent.queue_depth = hb.queue_depth
+        if hb.hitl_depth is not None:
+            totals["hitl_depth"] += hb.hitl_depth - agent.hitl_depth
+            agent.hitl_depth = hb.hitl_depth
+        if hb.wallet_balance is not None:
+            wallet = to_micro(hb.wallet_balance)
+            totals["wallet"] += wallet - agent.wallet
+            agent.wallet = wallet
+        if hb.daily_spend is not None:
+            spend = to_micro(hb.daily_spend)
+            totals["spend"] += spend - agent.spend
+            agent.spend = spend
+        agent.last_seen = hb.timestamp
+        if agent.stale:
+            agent.stale = False
+            self._stale -= 1
+        self._by_seen[agent_id] = None
+        self._by_seen.move_to_end(agent_id)
+        for tracker in self._outliers.values():
+            tracker.update(agent_id, agent)
+        self._changed[agent_id] = None
+
+    def remove(self, agent_id: str) -> bool:
+        """Drops a decommissioned agent."""
+        with self._lock:
+            agent = self._agents.pop(agent_id, None)
+            if agent is None:
+                return False
+            if agent.state is not None:
+                self._by_state[agent.state] -= 1
+            self._totals["queue_depth"] -= agent.queue_depth
+            self._totals["hitl_depth"] -= agent.hitl_depth
+            self._totals["wallet"] -= agent.wallet
+            self._totals["spend"] -= agent.spend
+            self._stale -= agent.stale
+            del self._by_seen[agent_id]
+            for tracker in self._outliers.values():
+                tracker.discard(agent_id)
+            self._changed.pop(agent_id, None)
+            self._removed[agent_id] = None
+            return True
+
+    def load(self, client: Any, agent_ids: Iterable[str]) -> int:
+        """
+        Seeds the snapshot from the `agent_status` hashes in one pipelined
+        round trip. Hash fields: state, last_heartbeat, queue_depth and
+        optionally hitl_depth, wallet_balance, daily_spend. Raises
+        ValueError for a state normalize_state() does not know.
+        """
+        agent_ids = list(agent_ids)
+        pipe = client.pipeline(transaction=False)
+        for agent_id in agent_ids:
+            pipe.hgetall(redis_key("agent_status", agent_id=agent_id))
+        heartbeats = []
+        for agent_id, fields in zip(agent_ids, pipe.execute()):
+            if not fields:
+                continue
+            heartbeats.append(Heartbeat(
+                agent_id,
+                float(fields.get("last_heartbeat", 0.0)),
+                normalize_state(fields["state"]) if fields.get("state") else None,
+                int(fields.get("queue_depth", 0)),
+                int(fields.get("hitl_depth", 0)),
+                float(fields.get("wallet_balance", 0.0)),
+                float(fields.get("daily_spend", 0.0)),
+            ))
+        heartbeats.sort(key=lambda hb: hb.timestamp)  # keeps the stale sweep order
+        return self.apply_heartbeats(heartbeats)
+
+    # --- Snapshot ---
+
+    def _sweep_stale(self, now: float) -> None:
+        cutoff = now - self.stale_after
+        for agent_id in self._by_seen:
+            agent = self._agents[agent_id]
+            if agent.last_seen >= cutoff:
+                break
+            if not agent.stale:
+                agent.stale = True
+                self._stale += 1
+                self._changed[agent_id] = None
+        # Agents are swept oldest-first; stale ones stay at the front until they report again.
+
+    def _build(self, now: float) -> Dict[str, Any]:
+        totals = self._totals
+        outliers = {}
+        for name, (_, field, value) in _OUTLIERS.items():
+            outliers[name] = [{"agent_id": agent_id, field: value(score)}
+                              for score, agent_id in self._outliers[name].top(self._agents)]
+        stale = []
+        for agent_id in self._by_seen:
+            agent = self._agents[agent_id]
+            if not agent.stale or len(stale) == self.top_k:
+                break
+            stale.append({"agent_id": agent_id, "last_heartbeat": _iso(agent.last_seen)})
+        outliers["stale"] = stale
+        return {
+            "summary": {"agents": len(self._agents), "stale": self._stale},
+            "by_state": dict(self._by_state),
+            "totals": {
+                "queue_depth": totals["queue_depth"],
+                "hitl_depth": totals["hitl_depth"],
+                "wallet_balance_usdc": to_usdc(totals["wallet"]),
+                "daily_spend_usdc": to_usdc(totals["spend"]),
+            },
+            "outliers": outliers,
+        }
+
+    def publish(self) -> Optional[Dict[str, Any]]:
+        """
+        Freezes a new snapshot and pushes the diff to subscribers; returns the
+        diff, or None when nothing changed.
+        """
+        with self._lock:
+            now = self.clock()
+            self._sweep_stale(now)
+            previous = self._snapshot
+            body = self._build(now)
+            if self._version and not self._changed and not self._removed and all(
+                    body[section] == previous[section] for section in body):
+                return None
+            diff: Dict[str, Any] = {"version": self._version + 1, "base_version": self._version}
+            diff.update({section: value for section, value in body.items() if previous.get(section) != value})
+            agents: Dict[str, Optional[Dict[str, Any]]] = {agent_id: None for agent_id in self._removed}
+            agents.update((agent_id, self._agents[agent_id].row()) for agent_id in self._changed)
+            diff["agents"] = agents
+            self._changed.clear()
+            self._removed.clear()
+            self._version += 1
+            body["version"] = self._version
+            body["generated_at"] = _iso(now)
+            self._snapshot = body
+            self._snapshot_json = json.dumps(body, separators=(",", ":")).encode()
+            subscribers = list(self._subscribers)
+            self.stats["publishes"] += 1
+        for callback in subscribers:
+            try:
+                callback(diff)
+                self.stats["diffs"] += 1
+            except Exception:  # noqa: BLE001 - one dashboard's failure must not starve the rest
+                self.stats["callback_errors"] += 1
+        return diff
+
+    def snapshot(self) -> Dict[str, Any]:
+        """The last published snapshot (do not mutate)."""
+        return self._snapshot
+
+    def snapshot_json(self) -> bytes:
+        """The last published snapshot, pre-serialized."""
+        return self._snapshot_json
+
+    def agent(self, agent_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            agent = self._agents.get(agent_id)
+            return None if agent is None else agent.row()
+
+    def agents(self) -> Dict[str, Dict[str, Any]]:
+        """Every agent's row, for a dashboard's initial load before it applies diffs."""
+        with self._lock:
+            return {agent_id: agent.row() for agent_id, agent in self._agents.items()}
+
+    # --- Subscribers ---
+
+    def subscribe(self, callback: Callable[[Dict[str, Any]], Any]) -> None:
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict[str, Any]], Any]) -> None:
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+    async def run(self, stop: Optional[asyncio.Event] = None, interval: float = 0.5) -> None:
+        """Publishes every `interval` seconds until `stop` is set."""
+        while stop is None or not stop.is_set():
+            self.publish()
+            if stop is None:
+                await asyncio.sleep(interval)
+            else:
+                try:
+                    await asyncio.wait_for(stop.wait(), timeout=interval)
+                except asyncio.TimeoutError:
+                    pass
@@ -0,0 +1,349 @@
+"""
+HITL routing for Judge results.
+
+The Judge routes every TaskResult by `confidence_score` (NFR 1.1) and sends
+sensitive topics to a human regardless of confidence (NFR 1.2):
+
+- Green (> 0.9): auto-approve
+- Yellow (0.7 - 0.9): async approval, queued for the Orchestrator Dashboard
+- Red (< 0.7): reject and retry
+- any of politics, health_advice, financial_advice, legal_claims: queued
+  for mandatory review, badged by its confidence band
+
+Running the semantic topic classifier on every result is the expensive part.
+A compiled keyword automaton (Aho-Corasick over tokens, one pass per text
+whatever the number of keywords) finds candidates first, and the classifier
+only sees results with a keyword hit, batched. Keyword lists should favour
+recall: a result with no hit is never classified.
+
+Queued results go into one heap per band ordered by urgency (sensitive
+first, then lowest confidence, then oldest), so the next most urgent review
+is O(log n), and depth counters per band and topic are kept live for the
+US-1.2 dashboard.
+
+Reference: specs/functional.md US-1.2, US-2.1, US-2.2, specs/technical.md Section 1.2 (sensitive_topics_detected)
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from chimera.models import SENSITIVE_TOPICS
+from chimera.semantic_filter import tokenize
+
+BANDS = ("red", "yellow", "green")  # most urgent first
+GREEN_THRESHOLD = 0.9
+YELLOW_THRESHOLD = 0.7
+
+AUTO_APPROVE, REVIEW, REJECT_RETRY = "auto_approve", "review", "reject_retry"
+
+DEFAULT_SENSITIVE_KEYWORDS: Dict[str, Tuple[str, ...]] = {
+    "politics": (
+        "election", "elections", "vote", "votes", "voting", "ballot", "campaign rally", "candidate",
+        "parliament", "senate", "congress", "government", "minister", "president", "prime minister",
+        "political", "politics", "party leader", "opposition", "protest", "protests", "referendum",
+        "policy", "legislation", "democrat", "republican", "left wing", "right wing",
+    ),
+    "health_advice": (
+        "cure", "cures", "treatment", "treat", "diagnosis", "diagnose", "symptom", "symptoms",
+        "medication", "medicine", "dose", "dosage", "prescription", "vaccine", "vaccines", "supplement",
+        "supplements", "detox", "weight loss", "diet pill", "cancer", "diabetes", "covid", "doctor",
+        "therapy", "mental health", "anxiety", "depression", "lose weight",
+    ),
+    "financial_advice": (
+        "invest", "investing", "investment", "stock", "stocks", "shares", "crypto", "bitcoin", "token",
+        "tokens", "nft", "buy now", "price target", "returns", "guaranteed return", "passive income",
+        "trading", "forex", "portfolio", "retirement", "401 k", "loan", "mortgage", "to the moon",
+        "financial advice", "get rich",
+    ),
+    "legal_claims": (
+        "lawsuit", "sue", "suing", "court", "illegal", "legal", "lawyer", "attorney", "liable",
+        "liability", "guarantee", "guaranteed", "fda approved", "clinically proven", "certified",
+        "copyright", "trademark", "defamation", "contract", "warranty", "regulation", "compliance",
+    ),
+}
+
+Classifier = Callable[[Sequence[str]], Sequence[Mapping[str, float]]]
+
+
+def band_for(confidence: float) -> str:
+    """Badge colour for a confidence score (Green > 0.9, Yellow > 0.7, Red otherwise)."""
+    if confidence > GREEN_THRESHOLD:
+        return "green"
+    if confidence > YELLOW_THRESHOLD:
+        return "yellow"
+    return "red"
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over tokens.
+
+    Keywords are tokenized like the text (lowercase alphanumerics), so
+    matches always fall on word boundaries and multi-word phrases match
+    across any punctuation or spacing.
+    """
+
+    def __init__(self, keywords: Mapping[str, Iterable[str]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[FrozenSet[str]] = [frozenset()]
+        outputs: List[Set[str]] = [set()]
+        for label, phrases in keywords.items():
+            for phrase in phrases:
+                tokens = tokenize(phrase)
+                if not tokens:
+                    continue
+                state = 0
+                for token in tokens:
+                    nxt = self._goto[state].get(token)
+                    if nxt is None:
+                        nxt = len(self._goto)
+                        self._goto[state][token] = nxt
+                        self._goto.append({})
+                        self._fail.append(0)
+                        outputs.append(set())
+                    state = nxt
+                outputs[state].add(label)
+        # Breadth-first failure links; outputs inherit along them.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and token not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(token, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                outputs[nxt] |= outputs[self._fail[nxt]]
+        self._out = [frozenset(labels) for labels in outputs]
+
+    def __len__(self) -> int:
+        return len(self._goto)
+
+    def labels(self, text: str) -> Set[str]:
+        """Labels of every keyword occurring in `text`."""
+        goto, fail, out = self._goto, self._fail, self._out
+        root = goto[0]
+        found: Set[str] = set()
+        state = 0
+        for token in tokenize(text):
+            if state == 0:
+                state = root.get(token, 0)
+            else:
+                while state and token not in goto[state]:
+                    state = fail[state]
+                state = goto[state].get(token, 0)
+            if out[state]:
+                found |= out[state]
+        return found
+
+
+@dataclass(frozen=True)
+class RoutingDecision:
+    task_id: str
+    action: str  # auto_approve | review | reject_retry
+    band: str  # green | yellow | red
+    confidence_score: float
+    sensitive_topics: Tuple[str, ...]
+    keyword_topics: Tuple[str, ...]  # candidates found by the automaton
+
+
+class _Entry:
+    __slots__ = ("key", "task_id", "band", "result", "decision", "queued_at", "removed")
+
+    def __init__(self, key: tuple, task_id: str, band: str, result: Dict[str, Any], decision: RoutingDecision,
+                 queued_at: float):
+        self.key = key
+        self.task_id = task_id
+        self.band = band
+        self.result = result
+        self.decision = decision
+        self.queued_at = queued_at
+        self.removed = False
+
+    def __lt__(self, other: "_Entry") -> bool:
+        return self.key < other.key
+
+
+class ReviewIndex:
+    """Per-band urgency heaps with lazy deletion and live depth counters."""
+
+    def __init__(self, clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self._heaps: Dict[str, List[_Entry]] = {band: [] for band in BANDS}
+        self._entries: Dict[str, _Entry] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+        self._depth = {band: 0 for band in BANDS}
+        self._topic_depth = {topic: 0 for topic in SENSITIVE_TOPICS}
+        self._sensitive = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def push(self, result: Dict[str, Any], decision: RoutingDecision) -> None:
+        task_id = decision.task_id
+        key = (0 if decision.sensitive_topics else 1, decision.confidence_score, next(self._seq))
+        with self._lock:
+            if task_id in self._entries:
+                self._discard(self._entries[task_id])
+            entry = _Entry(key, task_id, decision.band, result, decision, self.clock())
+            self._entries[task_id] = entry
+            heapq.heappush(self._heaps[decision.band], entry)
+            self._count(entry, 1)
+
+    def pop(self, band: Optional[str] = None) -> Optional[Tuple[Dict[str, Any], RoutingDecision]]:
+        """Removes and returns the most urgent review (in `band`, or red before yellow before green)."""
+        with self._lock:
+            for name in ([band] if band else BANDS):
+                heap = self._heaps[name]
+                while heap:
+                    entry = heapq.heappop(heap)
+                    if not entry.removed:
+                        del self._entries[entry.task_id]
+                        self._count(entry, -1)
+                        return entry.result, entry.decision
+        return None
+
+    def peek(self, band: Optional[str] = None) -> Optional[Tuple[Dict[str, Any], RoutingDecision]]:
+        with self._lock:
+            for name in ([band] if band else BANDS):
+                heap = self._heaps[name]
+                while heap and heap[0].removed:
+                    heapq.heappop(heap)
+                if heap:
+                    return heap[0].result, heap[0].decision
+        return None
+
+    def remove(self, task_id: str) -> bool:
+        """Drops a queued review (resolved elsewhere, task cancelled)."""
+        with self._lock:
+            entry = self._entries.get(task_id)
+            if entry is None:
+                return False
+            self._discard(entry)
+            return True
+
+    def _discard(self, entry: _Entry) -> None:
+        entry.removed = True
+        del self._entries[entry.task_id]
+        self._count(entry, -1)
+        heap = self._heaps[entry.band]
+        if len(heap) > 64 and len(heap) > 2 * self._depth[entry.band]:
+            # Mostly tombstones: rebuild so the heap stays O(live entries).
+            heap[:] = [e for e in heap if not e.removed]
+            heapq.heapify(heap)
+
+    def _count(self, entry: _Entry, delta: int) -> None:
+        self._depth[entry.band] += delta
+        topics = entry.decision.sensitive_topics
+        if topics:
+            self._sensitive += delta
+            for topic in topics:
+                self._topic_depth[topic] = self._topic_depth.get(topic, 0) + delta
+
+    def depths(self) -> Dict[str, Any]:
+        """Live queue depths for the dashboard (O(1))."""
+        with self._lock:
+            return {
+                "total": len(self._entries),
+                "bands": dict(self._depth),
+                "sensitive": self._sensitive,
+                "topics": dict(self._topic_depth),
+            }
+
+
+class HITLRouter:
+    """
+    Routes TaskResults: keyword prefilter, batched classifier on candidates,
+    confidence band, then auto-approve / review queue / reject-retry.
+
+    `classifier(texts)` returns, per text, a mapping of topic -> probability;
+    a topic counts when its probability reaches `classifier_threshold`.
+    Without a classifier, keyword hits are taken as detections.
+    """
+
+    def __init__(
+        self,
+        keywords: Optional[Mapping[str, Iterable[str]]] = None,
+        classifier: Optional[Classifier] = None,
+        classifier_threshold: float = 0.5,
+        index: Optional[ReviewIndex] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.automaton = KeywordAutomaton(DEFAULT_SENSITIVE_KEYWORDS if keywords is None else keywords)
+        self.classifier = classifier
+        self.classifier_threshold = classifier_threshold
+        self.index = index if index is not None else ReviewIndex(clock)
+        self.stats = {"routed": 0, "keyword_candidates": 0, "classified": 0, "sensitive": 0,
+                      AUTO_APPROVE: 0, REVIEW: 0, REJECT_RETRY: 0}
+
+    def route(self, result: Dict[str, Any]) -> RoutingDecision:
+        return self.route_batch([result])[0]
+
+    def route_batch(self, results: Sequence[Dict[str, Any]]) -> List[RoutingDecision]:
+        texts = [_text_of(result) for result in results]
+        candidates = [self.automaton.labels(text) for text in texts]
+        confirmed: List[Set[str]] = [set() for _ in results]
+        pending = [i for i, labels in enumerate(candidates) if labels]
+        if pending and self.classifier is not None:
+            scores = self.classifier([texts[i] for i in pending])
+            for i, topic_scores in zip(pending, scores):
+                confirmed[i] = {t for t, p in topic_scores.items() if t in SENSITIVE_TOPICS and p >= self.classifier_threshold}
+            self.stats["classified"] += len(pending)
+        elif pending:
+            for i in pending:
+                confirmed[i] = set(candidates[i])
+        self.stats["keyword_candidates"] += len(pending)
+
+        decisions = []
+        for result, keyword_topics, topics in zip(results, candidates, confirmed):
+            topics |= set(result.get("sensitive_topics_detected") or ())  # flagged upstream by the Worker
+            confidence = float(result.get("confidence_score", 0.0))
+            band = band_for(confidence)
+            if topics:
+                action = REVIEW
+            elif band == "green":
+                action = AUTO_APPROVE
+            elif band == "yellow":
+                action = REVIEW
+            else:
+                action = REJECT_RETRY
+            decision = RoutingDecision(
+                task_id=str(result["task_id"]),
+                action=action,
+                band=band,
+                confidence_score=confidence,
+                sensitive_topics=tuple(sorted(topics)),
+                keyword_topics=tuple(sorted(keyword_topics)),
+            )
+            if action == REVIEW:
+                self.index.push(result, decision)
+            self.stats["routed"] += 1
+            self.stats[action] += 1
+            self.stats["sensitive"] += bool(topics)
+            decisions.append(decision)
+        return decisions
+
+    def next_review(self, band: Optional[str] = None) -> Optional[Tuple[Dict[str, Any], RoutingDecision]]:
+        """The most urgent queued review, removed from the queue."""
+        return self.index.pop(band)
+
+    def depths(self) -> Dict[str, Any]:
+        return self.index.depths()
+
+
+def _text_of(result: Mapping[str, Any]) -> str:
+    content = result.get("content") or {}
+    if isinstance(content, Mapping):
+        return content.get("text") or ""
+    return str(content)
@@ -0,0 +1,57 @@
+"""
+Redis key patterns.
+
+The first block mirrors specs/technical.md Section 2.3 verbatim; the rest are
+bookkeeping keys used by the queue, memory and OCC implementations. Task
+ids are UUIDs, so they never collide with the fixed suffixes (`pending`,
+`inflight`).
+
+Reference: specs/technical.md Section 2.3 (Redis Schema)
+"""
+
+from typing import Dict
+
+REDIS_KEYS: Dict[str, str] = {
+    # Task Queuing (Planner → Worker)
+    "task_queue": "chimera:tasks:{agent_id}:pending",
+    "task_in_progress": "chimera:tasks:{agent_id}:{task_id}",
+    # Review Queuing (Worker → Judge)
+    "review_queue": "chimera:reviews:{agent_id}:pending",
+    # Episodic Memory (Short-term, last 1 hour)
+    "episodic_memory": "chimera:memory:{agent_id}:episodic",
+    # Budget Tracking (CFO Judge)
+    "daily_spend": "chimera:budget:{agent_id}:{date}",
+    # State Versioning (OCC)
+    "global_state_version": "chimera:state:{agent_id}:version",
+    "state_lock": "chimera:state:{agent_id}:lock",
+    # Agent Status
+    "agent_status": "chimera:agents:{agent_id}:status",
+
+    # --- Queue bookkeeping ---
+    "task_inflight": "chimera:tasks:{agent_id}:inflight",  # Sorted set: task_id -> visibility deadline
+    "task_attempts": "chimera:tasks:{agent_id}:attempts",  # Hash: task_id -> delivery count
+    "task_dead": "chimera:tasks:{agent_id}:dead",  # List of dead-letter JSON strings
+    "review_in_progress": "chimera:reviews:{agent_id}:{task_id}",
+    "review_inflight": "chimera:reviews:{agent_id}:inflight",
+    "review_attempts": "chimera:reviews:{agent_id}:attempts",
+    "review_dead": "chimera:reviews:{agent_id}:dead",
+
+    # --- Memory cache ---
+    "episodic_version": "chimera:memory:{agent_id}:episodic:version",  # Counter: entries ever written
+
+    # --- OCC state ---
+    "global_state": "chimera:state:{agent_id}:data",  # Hash: field -> JSON value
+    "global_state_fields": "chimera:state:{agent_id}:fields",  # Hash: field -> version that last wrote it
+
+    # --- Budget leases ---
+    "budget_leases": "chimera:budget:{agent_id}:{date}:leases",  # Hash: worker_id -> leased micro-USDC
+    "budget_lease_expiry": "chimera:budget:{agent_id}:{date}:lease_expiry",  # Sorted set: worker_id -> deadline
+
+    # --- Rate limits ---
+    "rate_limit": "chimera:ratelimit:{bucket}:{account}",  # Float: GCRA theoretical arrival time; no TTL
+}
+
+
+def redis_key(name: str, **fields: str) -> str:
+    """Formats the key pattern `name`, e.g. redis_key("task_queue", agent_id="a1")."""
+    return REDIS_KEYS[name].format(**fields)
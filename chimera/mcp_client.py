@@ -0,0 +1,467 @@
+"""
+Pooled asyncio MCP client.
+
+Skills reach every external system through MCP servers (news resources for
+trend_fetcher, ideogram/runway for content_generator, twitter/instagram for
+engagement_manager). Opening a session per call pays the connect +
+`initialize` handshake every time; `MCPClientPool` instead keeps long-lived
+sessions per server:
+
+- JSON-RPC 2.0 messages, one per line (the MCP stdio framing), over any
+  asyncio stream pair: TCP (`tcp_connector`) or a server subprocess's stdio
+  (`stdio_connector`)
+- requests are multiplexed: each session carries many calls at once,
+  matched to responses by id; a new session is opened only when every open
+  session has `streams_per_session` calls assigned (up to `max_sessions`)
+- backpressure per server: at most `max_concurrency` calls in flight; up to
+  `max_pending` more wait for a slot, beyond that `ServerBusy` is raised at
+  once instead of queueing without bound
+- a per-(server, method) `LatencyHistogram` records every call; see
+  `metrics()`
+- server notifications (e.g. `notifications/resources/updated` after
+  `subscribe_resource()`) are passed to `on_notification` listeners; a
+  listener that raises is logged and does not affect the session;
+  `on_disconnect` listeners hear when a session ends, since its
+  resource subscriptions end with it (but not when the pool is closed)
+- server→client requests are answered: `ping` with `{}`, anything else
+  with JSON-RPC error -32601, so servers that ping do not drop the session
+- a `stdio_connector` server process is reaped when its session ends:
+  stdin is closed, then the process is terminated (and killed) if it has
+  not exited within `exit_timeout`
+
+Resource reads are retried once on a broken session; tool calls are not
+(they may have side effects such as posting).
+
+Reference: specs/_meta.md Section 2.3 (MCP Abstraction), specs/technical.md Section 3 (MCP Resource URI Patterns)
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import time
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from chimera.metrics import LatencyHistogram
+
+PROTOCOL_VERSION = "2025-06-18"
+CLIENT_INFO = {"name": "chimera", "version": "1.0.0"}
+DEFAULT_TIMEOUT = 30.0
+DEFAULT_EXIT_TIMEOUT = 2.0
+
+logger = logging.getLogger(__name__)
+
+Connector = Callable[[], Awaitable[Tuple[asyncio.StreamReader, asyncio.StreamWriter]]]
+NotificationListener = Callable[[str, str, Dict[str, Any]], Any]
+DisconnectListener = Callable[[str], Any]
+
+
+class MCPError(Exception):
+    """Error response from an MCP server."""
+
+    def __init__(self, message: str, code: int = -32603, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class ServerBusy(MCPError):
+    """The server's concurrency limit and wait queue are both full."""
+
+
+def tcp_connector(host: str, port: int, limit: int = 2 ** 22) -> Connector:
+    async def connect() -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(host, port, limit=limit)
+    return connect
+
+
+# Session writer -> (server process, exit timeout), for stdio_connector sessions.
+_PROCESSES: "weakref.WeakKeyDictionary[asyncio.StreamWriter, Tuple[asyncio.subprocess.Process, float]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def stdio_connector(*command: str, limit: int = 2 ** 22, exit_timeout: float = DEFAULT_EXIT_TIMEOUT) -> Connector:
+    """Spawns an MCP server process per session and talks over its stdin/stdout."""
+
+    async def connect() -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        process = await asyncio.create_subprocess_exec(
+            *command, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, limit=limit
+        )
+        _PROCESSES[process.stdin] = (process, exit_timeout)
+        return process.stdout, process.stdin
+    return connect
+
+
+async def _reap(process: asyncio.subprocess.Process, timeout: float) -> None:
+    """Waits for a server process whose stdin is closed; terminates, then kills, one that lingers."""
+    for stop in (process.terminate, process.kill):
+        try:
+            await asyncio.wait_for(process.wait(), timeout)
+            return
+        except asyncio.TimeoutError:
+            try:
+                stop()
+            except ProcessLookupError:
+                pass
+    await process.wait()
+
+
+class _Session:
+    """One initialized connection with any number of requests in flight."""
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        on_notification: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        on_close: Optional[Callable[[], None]] = None,
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.pending: Dict[int, "asyncio.Future[Any]"] = {}
+        self.ids = itertools.count(1)
+        self.closed = False
+        self.load = 0  # calls assigned by the pool, including ones not yet sent
+        self.server_info: Dict[str, Any] = {}
+        self.on_notification = on_notification
+        self.on_close = on_close
+        # (server process, exit timeout) when the session runs over a stdio_connector process.
+        self._process: Optional[Tuple[asyncio.subprocess.Process, float]] = _PROCESSES.pop(writer, None)
+        self._reaper: "Optional[asyncio.Future[None]]" = None
+        self._task = asyncio.ensure_future(self._read_loop())
+
+    @classmethod
+    async def open(
+        cls,
+        connector: Connector,
+        timeout: float,
+        on_notification: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+        on_close: Optional[Callable[[], None]] = None,
+    ) -> "_Session":
+        reader, writer = await asyncio.wait_for(connector(), timeout)
+        session = cls(reader, writer, on_notification, on_close)
+        try:
+            result = await session.request("initialize", {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {},
+                "clientInfo": CLIENT_INFO,
+            }, timeout)
+            session.server_info = result.get("serverInfo", {})
+            await session.notify("notifications/initialized")
+        except BaseException:
+            await session.close()
+            raise
+        return session
+
+    async def request(self, method: str, params: Dict[str, Any], timeout: float) -> Any:
+        if self.closed:
+            raise ConnectionError("MCP session is closed")
+        request_id = next(self.ids)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[request_id] = future
+        try:
+            await self._send({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+            return await asyncio.wait_for(future, timeout)
+        finally:
+            self.pending.pop(request_id, None)
+
+    async def notify(self, method: str, params: Optional[Dict[str, Any]] = None) -> None:
+        message: Dict[str, Any] = {"jsonrpc": "2.0", "method": method}
+        if params is not None:
+            message["params"] = params
+        await self._send(message)
+
+    async def _send(self, message: Dict[str, Any]) -> None:
+        self.writer.write(json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+    async def _read_loop(self) -> None:
+        error: BaseException = ConnectionError("MCP server closed the session")
+        try:
+            while True:
+                line = await self.reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if "method" in message:
+                    if "id" in message:
+                        await self._answer(message)
+                    elif self.on_notification is not None:
+                        self.on_notification(message["method"], message.get("params") or {})
+                    continue
+                future = self.pending.get(message.get("id"))
+                if future is None or future.done():
+                    continue  # a response to a timed-out call
+                if "error" in message:
+                    err = message["error"]
+                    future.set_exception(MCPError(err.get("message", "MCP error"), err.get("code", -32603), err.get("data")))
+                else:
+                    future.set_result(message.get("result"))
+        except (ConnectionError, ValueError) as exc:
+            error = ConnectionError(f"MCP session failed: {exc}")
+        finally:
+            self.closed = True
+            for future in self.pending.values():
+                if not future.done():
+                    future.set_exception(error)
+            if self.on_close is not None:
+                self.on_close()
+            if self._process is not None:
+                # The pool drops broken sessions without closing them; reap the server here.
+                self._reaper = asyncio.ensure_future(self._stop_process())
+
+    async def _answer(self, message: Dict[str, Any]) -> None:
+        """Replies to a server→client request; only `ping` is supported."""
+        reply: Dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"]}
+        if message["method"] == "ping":
+            reply["result"] = {}
+        else:
+            reply["error"] = {"code": -32601, "message": f"Method not found: {message['method']}"}
+        await self._send(reply)
+
+    async def close(self) -> None:
+        self.closed = True
+        self._task.cancel()
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+        if self._reaper is None and self._process is not None:
+            self._reaper = asyncio.ensure_future(self._stop_process())
+        if self._reaper is not None:
+            await asyncio.shield(self._reaper)
+
+    async def _stop_process(self) -> None:
+        process, timeout = self._process
+        if not self.writer.is_closing():
+            self.writer.close()  # EOF on stdin asks the server to exit
+        await _reap(process, timeout)
+
+
+class _Server:
+    def __init__(self, name: str, connector: Connector, max_concurrency: int):
+        self.name = name
+        self.connector = connector
+        self.sessions: List[_Session] = []
+        self.slots = asyncio.Semaphore(max_concurrency)
+        self.waiting = 0
+        self.in_flight = 0
+        self.opening: Optional["asyncio.Future[None]"] = None
+        self.stats = {"calls": 0, "errors": 0, "rejected": 0, "handshakes": 0, "reconnects": 0}
+
+
+class MCPClientPool:
+    """
+    Long-lived, multiplexed MCP sessions per server name.
+
+    `servers` maps a server name (the `{server}` of `mcp://{server}/...`) to
+    a `Connector`. Use one pool per event loop.
+    """
+
+    def __init__(
+        self,
+        servers: Dict[str, Connector],
+        max_sessions: int = 2,
+        streams_per_session: int = 32,
+        max_concurrency: int = 64,
+        max_pending: int = 256,
+        timeout: float = DEFAULT_TIMEOUT,
+        clock: Callable[[], float] = time.perf_counter,
+    ):
+        if max_sessions < 1 or max_concurrency < 1:
+            raise ValueError("max_sessions and max_concurrency must be >= 1")
+        self.max_sessions = max_sessions
+        self.streams_per_session = streams_per_session
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self.clock = clock
+        self._connectors = dict(servers)
+        self._servers: Dict[str, _Server] = {}
+        self._latency: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._listeners: List[NotificationListener] = []
+        self._disconnect_listeners: List[DisconnectListener] = []
+        self._closed = False
+
+    async def __aenter__(self) -> "MCPClientPool":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    def add_server(self, name: str, connector: Connector) -> None:
+        self._connectors[name] = connector
+
+    def on_notification(self, listener: NotificationListener) -> None:
+        """`listener(server, method, params)` receives server notifications from every session."""
+        self._listeners.append(listener)
+
+    def on_disconnect(self, listener: DisconnectListener) -> None:
+        """`listener(server)` runs when a session to `server` ends; its resource subscriptions are gone."""
+        self._disconnect_listeners.append(listener)
+
+    def _dispatch_disconnect(self, server: str) -> None:
+        if self._closed:
+            return  # sessions ended by close(); nobody should reconnect
+        for listener in self._disconnect_listeners:
+            try:
+                listener(server)
+            except Exception:
+                logger.exception("MCP disconnect listener failed for %s", server)
+
+    def _dispatch_notification(self, server: str, method: str, params: Dict[str, Any]) -> None:
+        for listener in self._listeners:
+            try:
+                listener(server, method, params)
+            except Exception:
+                logger.exception("MCP notification listener failed for %s %s", server, method)
+
+    # --- Calls ---
+
+    async def call_tool(self, server: str, name: str, arguments: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """`tools/call` result (`content`, `isError`, ...). Raises MCPError if the tool reports an error."""
+        result = await self._call(server, "tools/call", {"name": name, "arguments": arguments or {}}, name, retry=False)
+        if result.get("isError"):
+            text = " ".join(c.get("text", "") for c in result.get("content", []) if c.get("type") == "text")
+            raise MCPError(text or f"Tool {name} failed", data=result)
+        return result
+
+    async def read_resource(self, uri: str) -> Any:
+        """
+        Reads `mcp://{server}/...`; JSON text contents are decoded, so this
+        works as a trend_fetcher / TieredMemory resource reader.
+        """
+        server = urlparse(uri).netloc
+        result = await self._call(server, "resources/read", {"uri": uri}, "resources/read", retry=True)
+        contents = result.get("contents", [])
+        if len(contents) == 1 and "text" in contents[0]:
+            text = contents[0]["text"]
+            if contents[0].get("mimeType", "application/json") == "application/json":
+                return json.loads(text)
+            return text
+        return result
+
+    async def subscribe_resource(self, uri: str) -> bool:
+        """
+        Sends `resources/subscribe`; False if the server does not support it.
+        Updates arrive as `notifications/resources/updated` via `on_notification`.
+        """
+        try:
+            await self._call(urlparse(uri).netloc, "resources/subscribe", {"uri": uri}, "resources/subscribe", retry=True)
+        except MCPError as exc:
+            if exc.code == -32601:
+                return False
+            raise
+        return True
+
+    async def request(self, server: str, method: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """Any other JSON-RPC method (e.g. `tools/list`, `ping`)."""
+        return await self._call(server, method, params or {}, method, retry=method != "tools/call")
+
+    async def _call(self, server_name: str, method: str, params: Dict[str, Any], label: str, retry: bool) -> Any:
+        server = self._server(server_name)
+        if server.in_flight >= self.max_concurrency and server.waiting >= self.max_pending:
+            server.stats["rejected"] += 1
+            raise ServerBusy(f"MCP server {server_name!r} is saturated", code=-32000)
+        start = self.clock()
+        server.waiting += 1
+        try:
+            await server.slots.acquire()
+        finally:
+            server.waiting -= 1
+        server.in_flight += 1
+        try:
+            for attempt in (0, 1):
+                session = await self._session(server)
+                try:
+                    result = await session.request(method, params, self.timeout)
+                    break
+                except ConnectionError:
+                    if not retry or attempt:
+                        raise
+                    server.stats["reconnects"] += 1
+                finally:
+                    session.load -= 1
+            server.stats["calls"] += 1
+            return result
+        except BaseException:
+            server.stats["errors"] += 1
+            raise
+        finally:
+            server.in_flight -= 1
+            server.slots.release()
+            key = (server_name, label)
+            histogram = self._latency.get(key)
+            if histogram is None:
+                histogram = self._latency[key] = LatencyHistogram()
+            histogram.observe(self.clock() - start)
+
+    def _server(self, name: str) -> _Server:
+        server = self._servers.get(name)
+        if server is None:
+            connector = self._connectors.get(name)
+            if connector is None:
+                raise MCPError(f"Unknown MCP server {name!r}", code=-32601)
+            server = self._servers[name] = _Server(name, connector, self.max_concurrency)
+        return server
+
+    async def _session(self, server: _Server) -> _Session:
+        """Picks the least-loaded session and reserves a stream on it; the caller releases it."""
+        while True:
+            if self._closed:
+                raise ConnectionError("MCP client pool is closed")
+            server.sessions = [s for s in server.sessions if not s.closed]
+            best = min(server.sessions, key=lambda s: s.load, default=None)
+            if best is not None and (best.load < self.streams_per_session or len(server.sessions) >= self.max_sessions):
+                best.load += 1
+                return best
+            if server.opening is None:
+                # Single-flight: concurrent callers share one handshake, then pick again.
+                server.opening = asyncio.ensure_future(self._open(server))
+            await asyncio.shield(server.opening)
+
+    async def _open(self, server: _Server) -> None:
+        if self._closed:
+            raise ConnectionError("MCP client pool is closed")
+        try:
+            session = await _Session.open(
+                server.connector,
+                self.timeout,
+                lambda method, params: self._dispatch_notification(server.name, method, params),
+                lambda: self._dispatch_disconnect(server.name),
+            )
+            if self._closed:
+                # close() ran during the handshake.
+                await session.close()
+                raise ConnectionError("MCP client pool is closed")
+            server.sessions.append(session)
+            server.stats["handshakes"] += 1
+        finally:
+            server.opening = None
+
+    # --- Lifecycle and metrics ---
+
+    async def close(self) -> None:
+        """Closes every session; later calls raise ConnectionError."""
+        self._closed = True
+        for server in self._servers.values():
+            for session in server.sessions:
+                await session.close()
+            server.sessions = []
+
+    def metrics(self) -> Dict[str, Any]:
+        """Per server: sessions, in-flight/queued calls, counters and latency percentiles per method/tool."""
+        out: Dict[str, Any] = {}
+        for name, server in self._servers.items():
+            out[name] = {
+                **server.stats,
+                "sessions": len([s for s in server.sessions if not s.closed]),
+                "in_flight": server.in_flight,
+                "queued": server.waiting,
+                "latency": {label: h.snapshot() for (srv, label), h in self._latency.items() if srv == name},
+            }
+        return out
@@ -0,0 +1,183 @@
+"""
+Local stub MCP server for tests and benchmarks.
+
+Speaks the same line-delimited JSON-RPC as `chimera.mcp_client` over TCP and
+serves:
+
+- `initialize` (after an optional `handshake_latency`, standing in for TLS
+  and auth on a real server) and `ping`
+- `tools/list` / `tools/call` from a dict of tool handlers
+- `resources/read` from a resource handler returning a JSON-able payload
+- `resources/subscribe` (unless `subscriptions=False`); `notify_updated(uri)`
+  sends `notifications/resources/updated` to subscribed connections
+
+Every request is handled in its own task, so responses on one connection
+come back out of order, as with a real multiplexing server. Handlers may be
+plain or coroutine functions; an exception becomes an `isError` tool result
+(tools) or a JSON-RPC error (resources).
+
+Reference: specs/technical.md Section 1.3 (MCP Tool Definition Schema), Section 3 (MCP Resource URI Patterns)
+"""
+
+import asyncio
+import inspect
+import json
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from chimera.mcp_client import Connector, tcp_connector
+
+Handler = Callable[..., Any]
+
+
+class StubMCPServer:
+    def __init__(
+        self,
+        tools: Optional[Dict[str, Handler]] = None,
+        resources: Optional[Callable[[str], Any]] = None,
+        latency: float = 0.0,
+        handshake_latency: float = 0.0,
+        name: str = "stub",
+        subscriptions: bool = True,
+    ):
+        self.tools = dict(tools or {})
+        self.resources = resources
+        self.latency = latency
+        self.handshake_latency = handshake_latency
+        self.name = name
+        self.subscriptions = subscriptions
+        self._subscribers: Dict[str, Set[asyncio.StreamWriter]] = {}
+        self.address: Optional[Tuple[str, int]] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Set[asyncio.StreamWriter] = set()
+        self._handlers: Set["asyncio.Task[Any]"] = set()
+        self.stats = {"connections": 0, "handshakes": 0, "requests": 0, "max_concurrent": 0}
+        self._active = 0
+
+    async def __aenter__(self) -> "StubMCPServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.stop()
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        self._server = await asyncio.start_server(self._serve, host, port, limit=2 ** 22)
+        self.address = self._server.sockets[0].getsockname()[:2]
+        return self.address
+
+    def connector(self) -> Connector:
+        if self.address is None:
+            raise RuntimeError("StubMCPServer is not started")
+        return tcp_connector(*self.address)
+
+    def drop_connections(self) -> None:
+        """Closes every open connection (simulates a server restart)."""
+        for writer in list(self._connections):
+            writer.close()
+
+    async def stop(self) -> None:
+        self.drop_connections()
+        if self._handlers:
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def notify_updated(self, uri: str) -> int:
+        """Notifies connections subscribed to `uri`; returns how many were notified."""
+        message = {"jsonrpc": "2.0", "method": "notifications/resources/updated", "params": {"uri": uri}}
+        line = json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+        writers = [w for w in self._subscribers.get(uri, ()) if w in self._connections]
+        for writer in writers:
+            writer.write(line)
+            await writer.drain()
+        return len(writers)
+
+    # --- Protocol ---
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.stats["connections"] += 1
+        self._connections.add(writer)
+        current = asyncio.current_task()
+        self._handlers.add(current)
+        tasks: Set["asyncio.Task[None]"] = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                message = json.loads(line)
+                if "id" not in message:
+                    continue  # notifications
+                if message.get("method") == "resources/subscribe" and self.subscriptions:
+                    self._subscribers.setdefault(message["params"]["uri"], set()).add(writer)
+                task = asyncio.ensure_future(self._respond(message, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+        except ConnectionError:
+            pass
+        finally:
+            self._connections.discard(writer)
+            self._handlers.discard(current)
+            for writers in self._subscribers.values():
+                writers.discard(writer)
+            for task in tasks:
+                task.cancel()
+            writer.close()
+
+    async def _respond(self, message: Dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        self.stats["requests"] += 1
+        self._active += 1
+        self.stats["max_concurrent"] = max(self.stats["max_concurrent"], self._active)
+        try:
+            response: Dict[str, Any] = {"jsonrpc": "2.0", "id": message["id"]}
+            try:
+                response["result"] = await self._dispatch(message["method"], message.get("params") or {})
+            except LookupError as exc:
+                response["error"] = {"code": -32601, "message": str(exc)}
+            except Exception as exc:  # noqa: BLE001 - reported to the client
+                response["error"] = {"code": -32603, "message": str(exc)}
+            writer.write(json.dumps(response, separators=(",", ":")).encode("utf-8") + b"\n")
+            await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self._active -= 1
+
+    async def _dispatch(self, method: str, params: Dict[str, Any]) -> Any:
+        if method == "initialize":
+            self.stats["handshakes"] += 1
+            await asyncio.sleep(self.handshake_latency)
+            return {
+                "protocolVersion": params.get("protocolVersion"),
+                "capabilities": {"tools": {}, "resources": {}},
+                "serverInfo": {"name": self.name, "version": "0.0.0"},
+            }
+        if method == "ping":
+            return {}
+        if method == "resources/subscribe" and self.subscriptions:
+            return {}
+        if method == "tools/list":
+            return {"tools": [{"name": name, "description": "", "inputSchema": {"type": "object", "properties": {}}}
+                              for name in self.tools]}
+        await asyncio.sleep(self.latency)
+        if method == "tools/call":
+            handler = self.tools.get(params.get("name"))
+            if handler is None:
+                raise LookupError(f"Unknown tool {params.get('name')!r}")
+            try:
+                value = await _maybe_await(handler(**params.get("arguments", {})))
+            except Exception as exc:  # noqa: BLE001 - tool errors are results in MCP
+                return {"content": [{"type": "text", "text": str(exc)}], "isError": True}
+            return {"content": [{"type": "text", "text": json.dumps(value)}], "structuredContent": value, "isError": False}
+        if method == "resources/read":
+            if self.resources is None:
+                raise LookupError("No resources")
+            value = await _maybe_await(self.resources(params["uri"]))
+            return {"contents": [{"uri": params["uri"], "mimeType": "application/json", "text": json.dumps(value)}]}
+        raise LookupError(f"Method not found: {method}")
+
+
+async def _maybe_await(value: Any) -> Any:
+    return await value if inspect.isawaitable(value) else value
@@ -0,0 +1,235 @@
+"""
+Tiered memory retrieval with an in-process L1 cache per worker.
+
+FR 1.1 reads two remote tiers before every reasoning step: the last hour of
+episodic memory (Redis list `chimera:memory:{agent_id}:episodic`) and
+semantically relevant long-term memories (`mcp://memory/{agent_id}/semantic`,
+backed by Weaviate `AgentMemory`). `TieredMemory` keeps an L1 copy of both:
+
+- episodic: writes go through this object (LPUSH + INCR of
+  `chimera:memory:{agent_id}:episodic:version`) and update L1 in place.
+  Reads within `max_staleness` seconds are served from L1 with no hop;
+  older entries are revalidated in one round trip that reads the version
+  counter and the first `prefetch` list items atomically, so a few writes
+  by other workers are merged without refetching the list
+- semantic: query results are cached per (agent_id, query, limit) for
+  `semantic_ttl` seconds and dropped by `invalidate(agent_id)` when the
+  long-term store is updated (FR 1.2 background learning)
+- both tiers are LRU-bounded; `metrics()` reports hits/misses per tier
+
+Reference: specs/functional.md FR 1.1 (Hierarchical Memory Retrieval), specs/technical.md Sections 2.2, 2.3
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from chimera.keys import redis_key
+
+EPISODIC_TTL = 3600
+MEMORY_SEMANTIC_URI = "mcp://memory/{agent_id}/semantic?query={query}&limit={limit}"
+
+SemanticReader = Callable[[str], Dict[str, Any]]
+
+
+def _clone(value: Any) -> Any:
+    """Copies a decoded JSON value, so callers never share dicts or lists with L1."""
+    if isinstance(value, dict):
+        return {k: _clone(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_clone(v) for v in value]
+    return value
+
+
+class _Episodic:
+    __slots__ = ("entries", "version", "checked_at")
+
+    def __init__(self, entries: List[Dict[str, Any]], version: int, checked_at: float):
+        self.entries = entries  # newest first, like the Redis list
+        self.version = version
+        self.checked_at = checked_at
+
+
+class TieredMemory:
+    """
+    L1 cache in front of Redis episodic memory and the semantic memory resource.
+
+    `client` is any redis-py compatible client created with
+    `decode_responses=True`; `semantic_reader` reads an
+    `mcp://memory/{agent_id}/semantic` URI and returns `{"memories": [...]}`.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        semantic_reader: Optional[SemanticReader] = None,
+        max_staleness: float = 1.0,
+        semantic_ttl: float = 60.0,
+        max_entries_per_agent: int = 500,
+        prefetch: int = 8,
+        max_agents: int = 256,
+        max_queries: int = 2048,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.client = client
+        self.semantic_reader = semantic_reader
+        self.max_staleness = max_staleness
+        self.semantic_ttl = semantic_ttl
+        self.max_entries_per_agent = max_entries_per_agent
+        self.prefetch = prefetch
+        self.max_agents = max_agents
+        self.max_queries = max_queries
+        self.clock = clock
+        self._episodic: "OrderedDict[str, _Episodic]" = OrderedDict()
+        self._semantic: "OrderedDict[Tuple[str, str, int], Tuple[float, Tuple[Dict[str, Any], ...]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {
+            "episodic_hits": 0, "episodic_revalidated": 0, "episodic_deltas": 0, "episodic_misses": 0,
+            "semantic_hits": 0, "semantic_misses": 0, "evictions": 0,
+        }
+
+    # --- Episodic ---
+
+    def write_episodic(self, agent_id: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Appends an interaction to Redis and to L1; adds `timestamp` (epoch seconds) if absent."""
+        now = self.clock()
+        entry = dict(entry)
+        entry.setdefault("timestamp", now)
+        key = redis_key("episodic_memory", agent_id=agent_id)
+        version_key = redis_key("episodic_version", agent_id=agent_id)
+        with self.client.pipeline() as pipe:
+            pipe.lpush(key, json.dumps(entry, separators=(",", ":")))
+            pipe.ltrim(key, 0, self.max_entries_per_agent - 1)
+            pipe.expire(key, EPISODIC_TTL)
+            pipe.incr(version_key)
+            version = pipe.execute()[3]
+        with self._lock:
+            cached = self._episodic.get(agent_id)
+            if cached is not None and cached.version == version - 1:
+                cached.entries.insert(0, _clone(entry))
+                del cached.entries[self.max_entries_per_agent:]
+                cached.version = version
+                cached.checked_at = now
+            elif cached is not None:
+                # Someone else wrote in between; the next read fetches the gap.
+                cached.checked_at = float("-inf")
+        return entry
+
+    def recent(self, agent_id: str, hours: float = 1.0) -> List[Dict[str, Any]]:
+        """Episodic entries from the last `hours`, newest first."""
+        now = self.clock()
+        with self._lock:
+            cached = self._episodic.get(agent_id)
+            if cached is not None and now - cached.checked_at < self.max_staleness:
+                self._episodic.move_to_end(agent_id)
+                self.stats["episodic_hits"] += 1
+                return self._window(cached.entries, now, hours)
+            known_version = cached.version if cached is not None else None
+
+        # One atomic snapshot: the version plus the head of the list, which
+        # covers the common case of a few writes by other workers.
+        version, head = self._snapshot(agent_id, self.prefetch)
+        gap = None if known_version is None else version - known_version
+        if gap == 0:
+            fetched: List[Dict[str, Any]] = []
+            stat = "episodic_revalidated"
+        elif gap is not None and 0 < gap <= len(head):
+            fetched = head[:gap]
+            stat = "episodic_deltas"
+        else:
+            if len(head) < self.prefetch:
+                fetched = head  # the prefetch already holds the whole list
+            else:
+                version, fetched = self._snapshot(agent_id, self.max_entries_per_agent)
+            stat = "episodic_misses"
+
+        with self._lock:
+            cached = self._episodic.get(agent_id)
+            if cached is None or (stat == "episodic_misses" and version >= cached.version):
+                cached = _Episodic(fetched, version, now)
+                self._episodic[agent_id] = cached
+            elif cached.version == known_version:
+                if stat == "episodic_deltas":
+                    cached.entries[:0] = fetched
+                    del cached.entries[self.max_entries_per_agent:]
+                cached.version = version
+                cached.checked_at = now
+            # Otherwise a local write moved L1 on meanwhile; keep it, the next read revalidates.
+            self._episodic.move_to_end(agent_id)
+            while len(self._episodic) > self.max_agents:
+                self._episodic.popitem(last=False)
+                self.stats["evictions"] += 1
+            self.stats[stat] += 1
+            return self._window(cached.entries, now, hours)
+
+    def _snapshot(self, agent_id: str, count: int) -> Tuple[int, List[Dict[str, Any]]]:
+        with self.client.pipeline() as pipe:
+            pipe.get(redis_key("episodic_version", agent_id=agent_id))
+            pipe.lrange(redis_key("episodic_memory", agent_id=agent_id), 0, count - 1)
+            version, raw = pipe.execute()
+        return int(version or 0), [json.loads(item) for item in raw]
+
+    @staticmethod
+    def _window(entries: List[Dict[str, Any]], now: float, hours: float) -> List[Dict[str, Any]]:
+        cutoff = now - hours * 3600
+        out = []
+        for entry in entries:
+            if entry.get("timestamp", now) < cutoff:
+                break  # newest first: everything after is older
+            out.append(_clone(entry))
+        return out
+
+    # --- Semantic ---
+
+    def semantic(self, agent_id: str, query: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Long-term memories relevant to `query`, via L1 or the semantic memory resource."""
+        key = (agent_id, " ".join(query.lower().split()), limit)
+        now = self.clock()
+        with self._lock:
+            hit = self._semantic.get(key)
+            if hit is not None and now - hit[0] < self.semantic_ttl:
+                self._semantic.move_to_end(key)
+                self.stats["semantic_hits"] += 1
+                return _clone(list(hit[1]))
+        if self.semantic_reader is None:
+            raise RuntimeError("No semantic memory reader configured")
+        uri = MEMORY_SEMANTIC_URI.format(agent_id=agent_id, query=quote(query), limit=limit)
+        memories = list(self.semantic_reader(uri).get("memories", []))
+        with self._lock:
+            self._semantic[key] = (now, tuple(_clone(memories)))  # callers get copies
+            self._semantic.move_to_end(key)
+            while len(self._semantic) > self.max_queries:
+                self._semantic.popitem(last=False)
+                self.stats["evictions"] += 1
+            self.stats["semantic_misses"] += 1
+        return memories
+
+    # --- Invalidation and metrics ---
+
+    def invalidate(self, agent_id: Optional[str] = None) -> None:
+        """Drops L1 state for one agent (or all), e.g. after a Weaviate update."""
+        with self._lock:
+            if agent_id is None:
+                self._episodic.clear()
+                self._semantic.clear()
+                return
+            self._episodic.pop(agent_id, None)
+            for key in [k for k in self._semantic if k[0] == agent_id]:
+                del self._semantic[key]
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters plus per-tier hit rates (a revalidation counts as a hit: no payload fetched)."""
+        s = self.stats
+        episodic_hits = s["episodic_hits"] + s["episodic_revalidated"]
+        episodic_total = episodic_hits + s["episodic_deltas"] + s["episodic_misses"]
+        semantic_total = s["semantic_hits"] + s["semantic_misses"]
+        return {
+            **s,
+            "episodic_hit_rate": episodic_hits / episodic_total if episodic_total else 0.0,
+            "semantic_hit_rate": s["semantic_hits"] / semantic_total if semantic_total else 0.0,
+            "episodic_agents": len(self._episodic),
+            "semantic_queries": len(self._semantic),
+        }
@@ -0,0 +1,68 @@
+"""
+Constant-memory latency histograms.
+
+Latencies are counted in fixed log-spaced buckets (each bound 25% above the
+previous, from 50 microseconds to ~2 minutes), so recording is O(log
+buckets), memory is constant, and percentiles are accurate to one bucket
+(within 25%).
+
+Reference: specs/_meta.md Section 3.1 (Scalability)
+"""
+
+import bisect
+import math
+from typing import Dict, List
+
+MIN_BOUND = 50e-6
+GROWTH = 1.25
+BUCKETS = 68
+
+BOUNDS: List[float] = [MIN_BOUND * GROWTH ** i for i in range(BUCKETS)]
+
+
+class LatencyHistogram:
+    """Counts of observed durations (seconds) per log-spaced bucket."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self):
+        self.counts = [0] * (BUCKETS + 1)  # the last bucket is overflow
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(BOUNDS, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, p: float) -> float:
+        """Upper bound of the bucket holding the p-th percentile (p in [0, 100])."""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p / 100.0 * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(BOUNDS[i], self.max) if i < BUCKETS else self.max
+        return self.max
+
+    def snapshot(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.percentile(50),
+            "p90": self.percentile(90),
+            "p99": self.percentile(99),
+            "max": self.max,
+        }
@@ -0,0 +1,568 @@
+"""
+Typed AgentTask / TaskResult models and their wire formats.
+
+Tasks and results travel Planner -> Worker -> Judge as JSON strings, and
+every hop parses them into dicts that repeat every key and carry UUIDs as
+36-character strings. The models here keep the schema fields in `__slots__`
+(task ids as 16 raw bytes, enums as their values) and have two codecs:
+
+- binary (`encode()` / `decode()`): a versioned envelope (magic, format
+  version, kind, presence flags) followed by fixed-width fields packed with
+  `struct`: UUIDs as 16 bytes, enums as one-byte codes (255 + string for a
+  value outside the schema enum), sensitive topics as a bitmask,
+  length-prefixed strings. Free-form objects (`content`, extra context and
+  result keys) are length-prefixed compact JSON blobs; `content` is decoded
+  on first access (below), the usually small extra blobs during `decode()`.
+- JSON (`to_json()` / `from_json()`), the spec representation, for debugging
+  and for queues whose clients use `decode_responses=True`.
+
+`decode()` is zero-copy for `content` and `reasoning_trace`: the model keeps
+memoryview slices of the frame and only decodes them on attribute access, so
+a Judge routing on `confidence_score` never materializes them, and
+re-encoding an untouched result copies the raw slices through.
+
+Reference: specs/technical.md Section 1.1 (AgentTask), Section 1.2 (TaskResult), Section 2.3 (Redis Schema)
+"""
+
+import json
+import struct
+import uuid
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+TASK_TYPES = ("generate_content", "reply_comment", "execute_transaction", "fetch_trends", "analyze_sentiment")
+PRIORITIES = ("high", "medium", "low")
+TASK_STATUSES = ("pending", "in_progress", "review", "complete", "rejected", "escalated")
+RESULT_TYPES = ("content", "transaction", "analysis", "error")
+SENSITIVE_TOPICS = ("politics", "health_advice", "financial_advice", "legal_claims")  # sensitive_topics_detected
+
+MAGIC = b"\xc3\x8e"
+WIRE_VERSION = 1
+KIND_TASK, KIND_RESULT = 1, 2
+
+_ENVELOPE = struct.Struct("<2sBBB")  # magic, version, kind, flags
+_TASK_FIXED = struct.Struct("<BBB")  # task_type, priority, status
+_RESULT_FIXED = struct.Struct("<BdB")  # result_type, confidence_score, sensitive topic mask
+_U16 = struct.Struct("<H")
+_U32 = struct.Struct("<I")
+_F64 = struct.Struct("<d")
+_OTHER = 255  # enum code: the value follows as a string
+
+# AgentTask presence flags
+_T_UUID, _T_WORKER, _T_STATE_VERSION, _T_BUDGET = 0x01, 0x02, 0x04, 0x08
+_T_PERSONA, _T_RESOURCES, _T_CONTEXT_EXTRA, _T_EXTRA = 0x10, 0x20, 0x40, 0x80
+# TaskResult presence flags
+_R_UUID, _R_CONTENT, _R_TRACE, _R_EXTRA, _R_TOPICS = 0x01, 0x02, 0x04, 0x08, 0x10
+
+_TASK_KEYS = frozenset(("task_id", "task_type", "priority", "context", "assigned_worker_id", "created_at", "status",
+                        "state_version"))
+_CONTEXT_KEYS = frozenset(("goal_description", "persona_constraints", "required_resources", "budget_limit"))
+_RESULT_KEYS = frozenset(("task_id", "worker_id", "result_type", "content", "confidence_score", "reasoning_trace",
+                          "created_at", "sensitive_topics_detected"))
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+class CodecError(ValueError):
+    """A frame is truncated, from an unknown format version, or not a Chimera frame."""
+
+
+def _pack_id(value: str) -> Union[bytes, str]:
+    """16 raw bytes for a canonical UUID string, else the string itself."""
+    try:
+        packed = uuid.UUID(value).bytes
+    except (ValueError, AttributeError, TypeError):
+        return value
+    return packed if str(uuid.UUID(bytes=packed)) == value else value
+
+
+def _unpack_id(value: Union[bytes, str]) -> str:
+    return str(uuid.UUID(bytes=value)) if isinstance(value, bytes) else value
+
+
+def _dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+# --- Models ---
+
+class AgentTask:
+    """AgentTask (specs/technical.md Section 1.1) with the context flattened into slots."""
+
+    __slots__ = ("_id", "task_type", "priority", "status", "created_at", "goal_description", "persona_constraints",
+                 "required_resources", "budget_limit", "assigned_worker_id", "state_version", "context_extra",
+                 "extra")
+
+    def __init__(
+        self,
+        task_id: str,
+        task_type: str,
+        priority: str,
+        goal_description: str,
+        created_at: str,
+        status: str = "pending",
+        persona_constraints: Optional[List[str]] = None,
+        required_resources: Optional[List[str]] = None,
+        budget_limit: Optional[float] = None,
+        assigned_worker_id: Optional[str] = None,
+        state_version: Optional[str] = None,
+        context_extra: Optional[Dict[str, Any]] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        self._id = _pack_id(task_id)
+        self.task_type = task_type
+        self.priority = priority
+        self.status = status
+        self.created_at = created_at
+        self.goal_description = goal_description
+        self.persona_constraints = persona_constraints
+        self.required_resources = required_resources
+        self.budget_limit = budget_limit
+        self.assigned_worker_id = assigned_worker_id
+        self.state_version = state_version
+        self.context_extra = context_extra or None  # context keys outside the schema
+        self.extra = extra or None  # top-level keys outside the schema
+
+    @property
+    def task_id(self) -> str:
+        return _unpack_id(self._id)
+
+    @task_id.setter
+    def task_id(self, value: str) -> None:
+        self._id = _pack_id(value)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AgentTask":
+        context = data.get("context") or {}
+        return cls(
+            task_id=data["task_id"],
+            task_type=data["task_type"],
+            priority=data["priority"],
+            goal_description=context.get("goal_description", ""),
+            created_at=data["created_at"],
+            status=data["status"],
+            persona_constraints=context.get("persona_constraints"),
+            required_resources=context.get("required_resources"),
+            budget_limit=context.get("budget_limit"),
+            assigned_worker_id=data.get("assigned_worker_id"),
+            state_version=data.get("state_version"),
+            context_extra={k: v for k, v in context.items() if k not in _CONTEXT_KEYS},
+            extra={k: v for k, v in data.items() if k not in _TASK_KEYS},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The spec dict; `assigned_worker_id` is always present (null while unassigned)."""
+        context: Dict[str, Any] = {"goal_description": self.goal_description}
+        if self.persona_constraints is not None:
+            context["persona_constraints"] = list(self.persona_constraints)
+        if self.required_resources is not None:
+            context["required_resources"] = list(self.required_resources)
+        if self.budget_limit is not None:
+            context["budget_limit"] = self.budget_limit
+        if self.context_extra:
+            context.update(self.context_extra)
+        data: Dict[str, Any] = {
+            "task_id": self.task_id,
+            "task_type": self.task_type,
+            "priority": self.priority,
+            "context": context,
+            "assigned_worker_id": self.assigned_worker_id,
+            "created_at": self.created_at,
+            "status": self.status,
+        }
+        if self.state_version is not None:
+            data["state_version"] = self.state_version
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, AgentTask) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"AgentTask(task_id={self.task_id!r}, task_type={self.task_type!r}, status={self.status!r})"
+
+
+class TaskResult:
+    """
+    TaskResult (specs/technical.md Section 1.2).
+
+    `content` and `reasoning_trace` of a decoded result stay raw slices of
+    the frame until first accessed.
+    """
+
+    __slots__ = ("_id", "worker_id", "result_type", "confidence_score", "created_at", "sensitive_topics_detected",
+                 "extra", "_content", "_content_raw", "_trace", "_trace_raw")
+
+    def __init__(
+        self,
+        task_id: str,
+        worker_id: str,
+        result_type: str,
+        confidence_score: float,
+        created_at: str,
+        content: Optional[Dict[str, Any]] = None,
+        reasoning_trace: Optional[str] = None,
+        sensitive_topics_detected: Optional[List[str]] = None,
+        extra: Optional[Dict[str, Any]] = None,
+    ):
+        self._id = _pack_id(task_id)
+        self.worker_id = worker_id
+        self.result_type = result_type
+        self.confidence_score = float(confidence_score)
+        self.created_at = created_at
+        self.sensitive_topics_detected = sensitive_topics_detected
+        self.extra = extra or None
+        self._content = content
+        self._content_raw: Optional[Buffer] = None
+        self._trace = reasoning_trace
+        self._trace_raw: Optional[Buffer] = None
+
+    @property
+    def task_id(self) -> str:
+        return _unpack_id(self._id)
+
+    @task_id.setter
+    def task_id(self, value: str) -> None:
+        self._id = _pack_id(value)
+
+    @property
+    def content(self) -> Optional[Dict[str, Any]]:
+        if self._content_raw is not None:
+            self._content = json.loads(bytes(self._content_raw))
+            self._content_raw = None
+        return self._content
+
+    @content.setter
+    def content(self, value: Optional[Dict[str, Any]]) -> None:
+        self._content, self._content_raw = value, None
+
+    @property
+    def reasoning_trace(self) -> Optional[str]:
+        if self._trace_raw is not None:
+            self._trace = str(self._trace_raw, "utf-8")
+            self._trace_raw = None
+        return self._trace
+
+    @reasoning_trace.setter
+    def reasoning_trace(self, value: Optional[str]) -> None:
+        self._trace, self._trace_raw = value, None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskResult":
+        return cls(
+            task_id=data["task_id"],
+            worker_id=data["worker_id"],
+            result_type=data["result_type"],
+            confidence_score=data["confidence_score"],
+            created_at=data["created_at"],
+            content=data.get("content"),
+            reasoning_trace=data.get("reasoning_trace"),
+            sensitive_topics_detected=data.get("sensitive_topics_detected"),
+            extra={k: v for k, v in data.items() if k not in _RESULT_KEYS},
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        data: Dict[str, Any] = {
+            "task_id": self.task_id,
+            "worker_id": self.worker_id,
+            "result_type": self.result_type,
+            "confidence_score": self.confidence_score,
+            "created_at": self.created_at,
+        }
+        content = self.content
+        if content is not None:
+            data["content"] = content
+        trace = self.reasoning_trace
+        if trace is not None:
+            data["reasoning_trace"] = trace
+        if self.sensitive_topics_detected is not None:
+            data["sensitive_topics_detected"] = list(self.sensitive_topics_detected)
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, TaskResult) and self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return (f"TaskResult(task_id={self.task_id!r}, result_type={self.result_type!r}, "
+                f"confidence_score={self.confidence_score!r})")
+
+
+Model = Union[AgentTask, TaskResult]
+
+_TASK_TYPE_CODES = {v: i for i, v in enumerate(TASK_TYPES)}
+_PRIORITY_CODES = {v: i for i, v in enumerate(PRIORITIES)}
+_STATUS_CODES = {v: i for i, v in enumerate(TASK_STATUSES)}
+_RESULT_TYPE_CODES = {v: i for i, v in enumerate(RESULT_TYPES)}
+_TOPIC_BITS = {v: 1 << i for i, v in enumerate(SENSITIVE_TOPICS)}
+_TOPIC_LISTS = [tuple(t for t, bit in _TOPIC_BITS.items() if mask & bit) for mask in range(256)]
+
+
+# --- Binary codec ---
+
+class _Writer:
+    __slots__ = ("parts",)
+
+    def __init__(self):
+        self.parts: List[Buffer] = []
+
+    def short(self, text: str) -> None:
+        raw = text.encode("utf-8")
+        if len(raw) > 0xFFFF:
+            raise CodecError("string field longer than 65535 bytes")
+        self.parts += (_U16.pack(len(raw)), raw)
+
+    def long(self, raw: Buffer) -> None:
+        self.parts += (_U32.pack(len(raw)), raw)
+
+    def id(self, value: Union[bytes, str]) -> None:
+        if isinstance(value, bytes):
+            self.parts.append(value)
+        else:
+            self.short(value)
+
+    def other(self, value: str, code: int) -> None:
+        """An enum value outside the schema follows its _OTHER code as a string."""
+        if code == _OTHER:
+            self.short(value)
+
+    def strings(self, values: Sequence[str]) -> None:
+        self.parts.append(_U16.pack(len(values)))
+        for value in values:
+            self.short(value)
+
+
+class _Reader:
+    """Sequential reads over a frame; small fields are sliced from `data`, payloads from `view`."""
+
+    __slots__ = ("data", "view", "offset")
+
+    def __init__(self, data: bytes, offset: int):
+        self.data = data
+        self.view = memoryview(data)
+        self.offset = offset
+
+    def _end(self, size: int) -> int:
+        end = self.offset + size
+        if end > len(self.data):
+            raise CodecError("truncated frame")
+        return end
+
+    def unpack(self, fmt: struct.Struct) -> Tuple[Any, ...]:
+        values = fmt.unpack_from(self.data, self.offset)  # struct.error when truncated
+        self.offset += fmt.size
+        return values
+
+    def short(self) -> str:
+        (size,) = _U16.unpack_from(self.data, self.offset)
+        start = self.offset + 2
+        self.offset = end = start + size
+        if end > len(self.data):
+            raise CodecError("truncated frame")
+        return self.data[start:end].decode("utf-8")
+
+    def long(self) -> bytes:
+        (size,) = _U32.unpack_from(self.data, self.offset)
+        start = self.offset + 4
+        self.offset = end = start + size
+        if end > len(self.data):
+            raise CodecError("truncated frame")
+        return self.data[start:end]
+
+    def payload(self) -> memoryview:
+        """Like long(), but a zero-copy slice."""
+        (size,) = _U32.unpack_from(self.data, self.offset)
+        start = self.offset + 4
+        self.offset = end = start + size
+        if end > len(self.data):
+            raise CodecError("truncated frame")
+        return self.view[start:end]
+
+    def id(self, packed: bool) -> Union[bytes, str]:
+        if not packed:
+            return self.short()
+        start = self.offset
+        self.offset = end = self._end(16)
+        return self.data[start:end]
+
+    def enum(self, code: int, values: Tuple[str, ...]) -> str:
+        return self.short() if code == _OTHER else values[code]
+
+    def strings(self) -> List[str]:
+        (count,) = self.unpack(_U16)
+        return [self.short() for _ in range(count)]
+
+
+def _code(value: str, codes: Dict[str, int]) -> int:
+    return codes.get(value, _OTHER)
+
+
+def _encode_task(task: AgentTask) -> bytes:
+    w = _Writer()
+    flags = 0
+    if isinstance(task._id, bytes):
+        flags |= _T_UUID
+    codes = (_code(task.task_type, _TASK_TYPE_CODES), _code(task.priority, _PRIORITY_CODES),
+             _code(task.status, _STATUS_CODES))
+    w.id(task._id)
+    w.parts.append(_TASK_FIXED.pack(*codes))
+    for value, code in zip((task.task_type, task.priority, task.status), codes):
+        w.other(value, code)
+    w.short(task.created_at)
+    w.long(task.goal_description.encode("utf-8"))
+    if task.assigned_worker_id is not None:
+        flags |= _T_WORKER
+        w.short(task.assigned_worker_id)
+    if task.state_version is not None:
+        flags |= _T_STATE_VERSION
+        w.short(task.state_version)
+    if task.budget_limit is not None:
+        flags |= _T_BUDGET
+        w.parts.append(_F64.pack(task.budget_limit))
+    if task.persona_constraints is not None:
+        flags |= _T_PERSONA
+        w.strings(task.persona_constraints)
+    if task.required_resources is not None:
+        flags |= _T_RESOURCES
+        w.strings(task.required_resources)
+    if task.context_extra:
+        flags |= _T_CONTEXT_EXTRA
+        w.long(_dumps(task.context_extra))
+    if task.extra:
+        flags |= _T_EXTRA
+        w.long(_dumps(task.extra))
+    return _ENVELOPE.pack(MAGIC, WIRE_VERSION, KIND_TASK, flags) + b"".join(w.parts)
+
+
+def _decode_task(r: _Reader, flags: int) -> AgentTask:
+    task = AgentTask.__new__(AgentTask)
+    task._id = r.id(bool(flags & _T_UUID))
+    type_code, priority_code, status_code = r.unpack(_TASK_FIXED)
+    task.task_type = r.enum(type_code, TASK_TYPES)
+    task.priority = r.enum(priority_code, PRIORITIES)
+    task.status = r.enum(status_code, TASK_STATUSES)
+    task.created_at = r.short()
+    task.goal_description = r.long().decode("utf-8")
+    task.assigned_worker_id = r.short() if flags & _T_WORKER else None
+    task.state_version = r.short() if flags & _T_STATE_VERSION else None
+    task.budget_limit = r.unpack(_F64)[0] if flags & _T_BUDGET else None
+    task.persona_constraints = r.strings() if flags & _T_PERSONA else None
+    task.required_resources = r.strings() if flags & _T_RESOURCES else None
+    task.context_extra = json.loads(r.long()) if flags & _T_CONTEXT_EXTRA else None
+    task.extra = json.loads(r.long()) if flags & _T_EXTRA else None
+    return task
+
+
+def _encode_result(result: TaskResult) -> bytes:
+    w = _Writer()
+    flags = 0
+    if isinstance(result._id, bytes):
+        flags |= _R_UUID
+    topics = 0
+    if result.sensitive_topics_detected is not None:
+        flags |= _R_TOPICS
+        for topic in result.sensitive_topics_detected:
+            bit = _TOPIC_BITS.get(topic)
+            if bit is None:
+                raise CodecError(f"sensitive topic {topic!r} is not in the TaskResult schema enum")
+            topics |= bit
+    code = _code(result.result_type, _RESULT_TYPE_CODES)
+    w.id(result._id)
+    w.parts.append(_RESULT_FIXED.pack(code, result.confidence_score, topics))
+    w.other(result.result_type, code)
+    w.short(result.worker_id)
+    w.short(result.created_at)
+    if result._content_raw is not None:
+        flags |= _R_CONTENT
+        w.long(result._content_raw)  # untouched since decode: pass the slice through
+    elif result._content is not None:
+        flags |= _R_CONTENT
+        w.long(_dumps(result._content))
+    if result._trace_raw is not None:
+        flags |= _R_TRACE
+        w.long(result._trace_raw)
+    elif result._trace is not None:
+        flags |= _R_TRACE
+        w.long(result._trace.encode("utf-8"))
+    if result.extra:
+        flags |= _R_EXTRA
+        w.long(_dumps(result.extra))
+    return _ENVELOPE.pack(MAGIC, WIRE_VERSION, KIND_RESULT, flags) + b"".join(w.parts)
+
+
+def _decode_result(r: _Reader, flags: int) -> TaskResult:
+    result = TaskResult.__new__(TaskResult)
+    result._id = r.id(bool(flags & _R_UUID))
+    code, result.confidence_score, topics = r.unpack(_RESULT_FIXED)
+    result.result_type = r.enum(code, RESULT_TYPES)
+    result.worker_id = r.short()
+    result.created_at = r.short()
+    result.sensitive_topics_detected = list(_TOPIC_LISTS[topics]) if flags & _R_TOPICS else None
+    result._content = result._trace = None
+    result._content_raw = r.payload() if flags & _R_CONTENT else None
+    result._trace_raw = r.payload() if flags & _R_TRACE else None
+    result.extra = json.loads(r.long()) if flags & _R_EXTRA else None
+    return result
+
+
+def encode(model: Model) -> bytes:
+    """Binary frame for an AgentTask or TaskResult."""
+    if isinstance(model, TaskResult):
+        return _encode_result(model)
+    if isinstance(model, AgentTask):
+        return _encode_task(model)
+    raise TypeError(f"cannot encode {type(model).__name__}")
+
+
+def decode(data: Buffer) -> Model:
+    """
+    Model from a binary frame. A decoded result's `content` and
+    `reasoning_trace` are slices of `data` (copied once first if `data` is
+    not `bytes`).
+    """
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    if len(data) < _ENVELOPE.size:
+        raise CodecError("truncated frame")
+    magic, version, kind, flags = _ENVELOPE.unpack_from(data)
+    if magic != MAGIC:
+        raise CodecError("not a Chimera frame")
+    if version != WIRE_VERSION:
+        raise CodecError(f"unsupported wire version {version}")
+    reader = _Reader(data, _ENVELOPE.size)
+    try:
+        if kind == KIND_RESULT:
+            model: Model = _decode_result(reader, flags)
+        elif kind == KIND_TASK:
+            model = _decode_task(reader, flags)
+        else:
+            raise CodecError(f"unknown frame kind {kind}")
+    except struct.error:
+        raise CodecError("truncated frame") from None
+    if reader.offset != len(data):
+        raise CodecError("trailing bytes after frame")
+    return model
+
+
+# --- JSON fallback ---
+
+def to_json(model: Model, indent: Optional[int] = None) -> str:
+    """The spec JSON for `model` (compact unless `indent` is given)."""
+    if indent is not None:
+        return json.dumps(model.to_dict(), indent=indent)
+    return json.dumps(model.to_dict(), separators=(",", ":"))
+
+
+def from_json(text: Union[str, bytes]) -> Model:
+    data = json.loads(text)
+    return TaskResult.from_dict(data) if "worker_id" in data and "result_type" in data else AgentTask.from_dict(data)
+
+
+def loads(payload: Union[str, Buffer]) -> Model:
+    """Model from either wire format (binary frames start with MAGIC, JSON with '{')."""
+    if isinstance(payload, str):
+        return from_json(payload)
+    if bytes(payload[:2]) == MAGIC:
+        return decode(payload)
+    return from_json(bytes(payload))
@@ -0,0 +1,224 @@
+"""
+Optimistic commit engine for the Judge.
+
+GlobalState for an agent is a hash of JSON fields
+(`chimera:state:{agent_id}:data`) versioned by the integer in
+`chimera:state:{agent_id}:version`. Instead of taking
+`chimera:state:{agent_id}:lock` around every commit, a batch of approved
+results is committed with one compare-and-set: WATCH the version key, check,
+then MULTI/EXEC the writes plus the version bump. A concurrent Judge makes
+EXEC fail and the batch is re-checked against the new version.
+
+Conflicts are detected per field, not per version: every field also records
+the version that last wrote it (`chimera:state:{agent_id}:fields`). A
+proposal built on `base_version` conflicts only if a field it read or writes
+changed after that version, or was written earlier in the same batch. So a
+stale `state_version` alone does not invalidate a result.
+
+Conflicting proposals are handed to `revalidate(proposal, fresh_values)`,
+which may return replacement writes to retry on the next round; only
+proposals it declines (or that keep conflicting, or lose `max_cas_retries`
+compare-and-set races in one commit) are rejected back to the Planner.
+
+Reference: specs/functional.md FR 6.1 (Optimistic Concurrency Control), specs/technical.md Section 2.3
+"""
+
+import json
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from chimera.keys import redis_key
+from chimera.redis_store import WatchError
+
+DEFAULT_MAX_ROUNDS = 3
+DEFAULT_MAX_CAS_RETRIES = 32
+
+
+@dataclass(frozen=True)
+class Proposal:
+    """
+    State change a Worker's result wants to commit.
+
+    `base_version` is the `state_version` the Worker read; `reads` are the
+    state fields its output depends on; `writes` the fields it sets.
+    """
+
+    task_id: str
+    base_version: int
+    writes: Dict[str, Any]
+    reads: Tuple[str, ...] = ()
+    result: Optional[Dict[str, Any]] = None
+
+    @property
+    def touched(self) -> Set[str]:
+        return set(self.reads) | set(self.writes)
+
+
+@dataclass
+class CommitOutcome:
+    committed: List[str] = field(default_factory=list)
+    rejected: List[str] = field(default_factory=list)
+    version: int = 0
+    rounds: int = 0
+
+
+Revalidator = Callable[[Proposal, Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+def parse_version(state_version: Any) -> int:
+    """AgentTask.state_version as stored by this engine ("" / None -> 0)."""
+    return int(state_version or 0)
+
+
+class CommitEngine:
+    """
+    Batched OCC commits against one Redis-compatible client.
+
+    `client` is any redis-py compatible client created with
+    `decode_responses=True` (see chimera.redis_store.InMemoryRedis).
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        revalidate: Optional[Revalidator] = None,
+        max_rounds: int = DEFAULT_MAX_ROUNDS,
+        max_cas_retries: int = DEFAULT_MAX_CAS_RETRIES,
+    ):
+        if max_rounds < 1:
+            raise ValueError("max_rounds must be >= 1")
+        if max_cas_retries < 0:
+            raise ValueError("max_cas_retries must be >= 0")
+        self.client = client
+        self.revalidate = revalidate
+        self.max_rounds = max_rounds
+        self.max_cas_retries = max_cas_retries
+        self.stats = {
+            "batches": 0, "proposals": 0, "committed": 0, "conflicts": 0,
+            "revalidated": 0, "rejected": 0, "cas_retries": 0,
+        }
+
+    @property
+    def conflict_rate(self) -> float:
+        """Field conflicts per submitted proposal."""
+        return self.stats["conflicts"] / self.stats["proposals"] if self.stats["proposals"] else 0.0
+
+    # --- Reads ---
+
+    def read_state(self, agent_id: str, fields: Optional[Iterable[str]] = None) -> Tuple[int, Dict[str, Any]]:
+        """Consistent `(version, values)` snapshot for Planner/Worker reads."""
+        with self.client.pipeline() as pipe:
+            pipe.get(redis_key("global_state_version", agent_id=agent_id))
+            data_key = redis_key("global_state", agent_id=agent_id)
+            names = list(fields) if fields is not None else None
+            if names is None:
+                pipe.hgetall(data_key)
+            else:
+                pipe.hmget(data_key, names)
+            version, raw = pipe.execute()
+        if names is not None:
+            raw = {name: value for name, value in zip(names, raw) if value is not None}
+        return parse_version(version), {name: json.loads(value) for name, value in raw.items()}
+
+    # --- Commits ---
+
+    def commit(self, agent_id: str, proposals: List[Proposal]) -> CommitOutcome:
+        """
+        Commits as many proposals as possible in order; returns what landed.
+
+        Each round commits every non-conflicting proposal with one CAS on the
+        version key, so the version advances by one per round, not per result.
+        """
+        outcome = CommitOutcome()
+        self.stats["batches"] += 1
+        self.stats["proposals"] += len(proposals)
+        pending = list(proposals)
+        version_key = redis_key("global_state_version", agent_id=agent_id)
+        data_key = redis_key("global_state", agent_id=agent_id)
+        fields_key = redis_key("global_state_fields", agent_id=agent_id)
+
+        cas_retries = 0
+        with self.client.pipeline() as pipe:
+            while pending and outcome.rounds < self.max_rounds:
+                outcome.rounds += 1
+                try:
+                    pipe.watch(version_key)
+                    current = parse_version(pipe.get(version_key))
+                    accepted, conflicting = self._partition(pipe, fields_key, current, pending)
+                    if accepted:
+                        new_version = current + 1
+                        writes: Dict[str, str] = {}
+                        for proposal in accepted:
+                            writes.update((name, json.dumps(value)) for name, value in proposal.writes.items())
+                        pipe.multi()
+                        if writes:
+                            pipe.hset(data_key, mapping=writes)
+                            pipe.hset(fields_key, mapping={name: new_version for name in writes})
+                        pipe.set(version_key, new_version)
+                        pipe.execute()
+                        outcome.version = new_version
+                        outcome.committed.extend(p.task_id for p in accepted)
+                        self.stats["committed"] += len(accepted)
+                    else:
+                        pipe.unwatch()
+                        outcome.version = current
+                except WatchError:
+                    # Another Judge committed first; re-check everything against its version.
+                    # Lost races are not conflict rounds, but are capped so sustained contention can't spin forever.
+                    self.stats["cas_retries"] += 1
+                    outcome.rounds -= 1
+                    cas_retries += 1
+                    if cas_retries > self.max_cas_retries:
+                        break
+                    continue
+                self.stats["conflicts"] += len(conflicting)
+                pending = self._retry(agent_id, conflicting, outcome)
+
+        for proposal in pending:
+            outcome.rejected.append(proposal.task_id)
+        self.stats["rejected"] += len(outcome.rejected)
+        return outcome
+
+    def _partition(
+        self,
+        pipe: Any,
+        fields_key: str,
+        current: int,
+        proposals: List[Proposal],
+    ) -> Tuple[List[Proposal], List[Proposal]]:
+        stale = sorted({name for p in proposals if p.base_version < current for name in p.touched})
+        written_at = dict(zip(stale, pipe.hmget(fields_key, stale))) if stale else {}
+        accepted: List[Proposal] = []
+        conflicting: List[Proposal] = []
+        claimed: Set[str] = set()
+        for proposal in proposals:
+            touched = proposal.touched
+            if proposal.base_version > current:
+                conflicting.append(proposal)  # built on a version that was never committed
+            elif touched & claimed or any(
+                int(written_at.get(name) or 0) > proposal.base_version
+                for name in touched
+            ):
+                conflicting.append(proposal)
+            else:
+                accepted.append(proposal)
+                claimed.update(proposal.writes)
+        return accepted, conflicting
+
+    def _retry(self, agent_id: str, conflicting: List[Proposal], outcome: CommitOutcome) -> List[Proposal]:
+        if not conflicting:
+            return []
+        if self.revalidate is None:
+            outcome.rejected.extend(p.task_id for p in conflicting)
+            return []
+        names = sorted({name for p in conflicting for name in p.touched})
+        version, fresh = self.read_state(agent_id, names)
+        retry: List[Proposal] = []
+        for proposal in conflicting:
+            writes = self.revalidate(proposal, {name: fresh.get(name) for name in proposal.touched})
+            if writes is None:
+                outcome.rejected.append(proposal.task_id)
+                continue
+            self.stats["revalidated"] += 1
+            retry.append(replace(proposal, base_version=version, writes=writes))
+        return retry
@@ -0,0 +1,517 @@
+"""
+Write-behind persistence for the high-volume PostgreSQL tables.
+
+Judge decisions, HITL reviews and wallet transactions are written one row at
+a time but read rarely and in bulk, so `WriteBehindStore` takes them off the
+request path:
+
+- `write()` appends the rows to a local journal and returns once they are
+  durable there (fsync, group-committed across concurrent writers); the
+  rows then sit in memory until a flush
+- a background flusher writes every buffered row in one transaction, with
+  multi-row inserts, when `max_batch` rows are waiting or `flush_interval`
+  seconds have passed
+- the journal is rotated into a new segment at each flush and old segments
+  are deleted only after the database commits, so a crash at any point
+  loses nothing: on restart the remaining segments are replayed
+- inserts are idempotent (`ON CONFLICT (id)`), so replaying rows that did
+  reach the database is harmless; `agent_tasks` and `transactions` rows
+  carry status changes and are upserted, last write wins, after being
+  coalesced by id within a batch
+- backpressure: once `max_buffered` rows are waiting (the database fell
+  behind), `write()` blocks until a flush makes room, or raises
+  BacklogFull after `timeout`
+- a failed flush keeps its rows and retries with exponential backoff;
+  when the database rejects the data itself (a DB-API IntegrityError or
+  DataError, e.g. a constraint violation) the batch is split in halves
+  until the offending rows are isolated, the rest commit, and the rejected
+  rows move to the journal's dead-letter file (`dead_letters()`) instead
+  of blocking every later row
+- every batch is written in `TABLES` order, parents before children, so
+  foreign keys hold whatever order the rows were buffered or retried in
+
+`SQLiteBackend` runs the same path without a live Postgres; `PostgresBackend`
+takes any DB-API connection (psycopg is optional).
+
+Reference: specs/technical.md Section 2.1 (PostgreSQL Schema), specs/_meta.md Section 3.1 (Scalability)
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# In foreign-key order: a table only references tables listed before it.
+TABLES: Dict[str, Tuple[str, ...]] = {
+    "agent_tasks": ("id", "agent_id", "campaign_id", "task_type", "priority", "context", "status",
+                    "state_version", "created_at", "updated_at"),
+    "task_results": ("id", "task_id", "worker_id", "result_type", "content", "confidence_score",
+                     "reasoning_trace", "sensitive_topics_detected", "created_at"),
+    "hitl_reviews": ("id", "task_result_id", "reviewer_id", "decision", "reviewer_notes", "reviewed_at"),
+    "transactions": ("id", "wallet_id", "task_id", "transaction_type", "tx_hash", "amount_usdc", "status",
+                     "created_at"),
+}
+UPSERT_TABLES = frozenset({"agent_tasks", "transactions"})  # rows carry status changes
+JSON_COLUMNS = frozenset({"context", "content"})
+ARRAY_COLUMNS = frozenset({"sensitive_topics_detected"})
+
+DEFAULT_MAX_BATCH = 1000
+DEFAULT_FLUSH_INTERVAL = 0.5
+DEFAULT_MAX_BUFFERED = 50_000
+MAX_RETRY_DELAY = 30.0
+
+Batches = Dict[str, List[Tuple[Any, ...]]]
+
+
+class BacklogFull(RuntimeError):
+    """The database is too far behind: `max_buffered` rows are still waiting."""
+
+
+_COLUMN_SETS = {table: frozenset(columns) for table, columns in TABLES.items()}
+
+
+def _row(table: str, row: Dict[str, Any]) -> Tuple[Any, ...]:
+    columns = TABLES.get(table)
+    if columns is None:
+        raise ValueError(f"Unknown table {table!r}")
+    if not row.get("id"):
+        raise ValueError(f"{table} rows need an id")
+    unknown = row.keys() - _COLUMN_SETS[table]
+    if unknown:
+        raise ValueError(f"Unknown {table} columns: {sorted(unknown)}")
+    return tuple(row.get(column) for column in columns)
+
+
+def _rejects_data(exc: BaseException) -> bool:
+    """True for DB-API errors about the rows themselves (sqlite3, psycopg 2/3), not the connection."""
+    return any(cls.__name__ in ("IntegrityError", "DataError") for cls in type(exc).__mro__)
+
+
+def _coalesce(table: str, rows: List[Tuple[Any, ...]]) -> List[Tuple[Any, ...]]:
+    """Keeps the last row per id for upsert tables (one status change wins)."""
+    if table not in UPSERT_TABLES:
+        return rows
+    return list({row[0]: row for row in rows}.values())
+
+
+# --- Journal ---
+
+class Journal:
+    """
+    Append-only segment files of `crc32 json` lines under `directory`.
+    Concurrent `sync()` calls share one fsync (group commit). The directory
+    is fsynced whenever a segment is created or deleted, so an acknowledged
+    segment keeps its directory entry through a power loss. Rows the
+    database keeps rejecting go to `dead-letter.log`, which is never replayed.
+    """
+
+    def __init__(self, directory: str, fsync: bool = True):
+        self.directory = directory
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._sync_lock = threading.Lock()
+        self._written = 0
+        self._synced = 0
+        self.syncs = 0
+        existing = self.segments()
+        self._segment = (int(os.path.basename(existing[-1])[8:-4]) if existing else 0) + 1
+        self._file = open(self._path(self._segment), "a", encoding="utf-8")
+        self.sync_directory()
+
+    def _path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"journal-{segment:08d}.log")
+
+    @staticmethod
+    def _line(entry: Any) -> str:
+        body = json.dumps(entry, separators=(",", ":"), default=str)
+        return f"{zlib.crc32(body.encode()):08x} {body}\n"
+
+    @staticmethod
+    def _read(path: str) -> Iterable[Any]:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                crc, _, body = line.rstrip("\n").partition(" ")
+                if not line.endswith("\n") or crc != f"{zlib.crc32(body.encode()):08x}":
+                    break  # a write cut short by the crash; nothing after it was acknowledged
+                yield json.loads(body)
+
+    def segments(self) -> List[str]:
+        """Segment paths, oldest first (including the open one)."""
+        names = sorted(n for n in os.listdir(self.directory) if n.startswith("journal-") and n.endswith(".log"))
+        return [os.path.join(self.directory, n) for n in names]
+
+    def append(self, table: str, rows: Sequence[Tuple[Any, ...]]) -> int:
+        """Writes rows to the OS (safe from a process crash); returns a position for `sync()`."""
+        lines = [self._line([table, row]) for row in rows]
+        with self._lock:
+            self._file.write("".join(lines))
+            self._file.flush()
+            self._written += 1
+            return self._written
+
+    def sync(self, position: int) -> None:
+        """Returns once everything up to `position` is on disk."""
+        if not self.fsync or self._synced >= position:
+            return
+        with self._sync_lock:
+            if self._synced >= position:
+                return  # another writer's fsync covered us
+            with self._lock:
+                target = self._written
+                fd = self._file.fileno()
+            os.fsync(fd)
+            self.syncs += 1
+            self._synced = target
+
+    def rotate(self) -> List[str]:
+        """Starts a new segment; returns the closed ones (safe to delete once flushed)."""
+        with self._sync_lock, self._lock:
+            if self.fsync:
+                os.fsync(self._file.fileno())
+                self._synced = self._written
+            self._file.close()
+            self._segment += 1
+            self._file = open(self._path(self._segment), "a", encoding="utf-8")
+            self.sync_directory()
+            return self.segments()[:-1]
+
+    def sync_directory(self) -> None:
+        """Makes segment creations and deletions durable (no-op without fsync, or on Windows)."""
+        if not self.fsync or os.name == "nt":
+            return
+        fd = os.open(self.directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    def replay(self) -> Iterable[Tuple[str, Tuple[Any, ...]]]:
+        """(table, row) from every segment, stopping at a torn or corrupt tail."""
+        for path in self.segments():
+            for table, row in self._read(path):
+                yield table, tuple(row)
+
+    def dead_letter(self, entries: Sequence[Tuple[str, Tuple[Any, ...], str]]) -> None:
+        """Durably appends (table, row, error) entries to the dead-letter file."""
+        path = os.path.join(self.directory, "dead-letter.log")
+        created = not os.path.exists(path)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(self._line(list(entry)) for entry in entries))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        if created:
+            self.sync_directory()
+
+    def dead_letters(self) -> List[Tuple[str, Tuple[Any, ...], str]]:
+        path = os.path.join(self.directory, "dead-letter.log")
+        if not os.path.exists(path):
+            return []
+        return [(table, tuple(row), error) for table, row, error in self._read(path)]
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+# --- Store ---
+
+class WriteBehindStore:
+    """
+    Buffered, journaled writer in front of a backend; thread-safe.
+
+        store = WriteBehindStore(SQLiteBackend("chimera.db"), "var/journal").start()
+        store.write("task_results", [result_row])
+        ...
+        store.close()  # final flush
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        journal_dir: str,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        max_buffered: int = DEFAULT_MAX_BUFFERED,
+        fsync: bool = True,
+    ):
+        if not 1 <= max_batch <= max_buffered:
+            raise ValueError("need 1 <= max_batch <= max_buffered")
+        self.backend = backend
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.journal = Journal(journal_dir, fsync=fsync)
+        self._buffer: Batches = {}
+        self._buffered = 0
+        self._retry: Batches = {}  # rows of a failed flush, still journaled
+        self._retry_delay = 0.0
+        self._lock = threading.Lock()
+        self._room = threading.Condition(self._lock)
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.stats = {"written": 0, "flushed": 0, "flushes": 0, "flush_errors": 0, "recovered": 0,
+                      "backpressure_waits": 0, "isolations": 0, "dead_lettered": 0}
+        self._recover()
+
+    def _recover(self) -> None:
+        """Buffers rows from a previous run's journal; `flush()` writes them again."""
+        for table, row in self.journal.replay():
+            self._buffer.setdefault(table, []).append(row)
+            self._buffered += 1
+        self.stats["recovered"] = self._buffered
+
+    @property
+    def buffered(self) -> int:
+        """Rows acknowledged but not yet in the database."""
+        return self._buffered
+
+    # --- Writing ---
+
+    def write(self, table: str, rows: Sequence[Dict[str, Any]], timeout: Optional[float] = None) -> None:
+        """
+        Durably accepts rows for `table`. Blocks while the backlog is full
+        (BacklogFull after `timeout` seconds).
+        """
+        tuples = [_row(table, row) for row in rows]
+        if not tuples:
+            return
+        with self._lock:
+            if self._buffered + len(tuples) > self.max_buffered:
+                self.stats["backpressure_waits"] += 1
+                self._wake.set()
+                if not self._room.wait_for(lambda: self._buffered + len(tuples) <= self.max_buffered
+                                           or self._buffered == 0, timeout):
+                    raise BacklogFull(f"{self._buffered} rows waiting for the database")
+            position = self.journal.append(table, tuples)
+            self._buffer.setdefault(table, []).extend(tuples)
+            self._buffered += len(tuples)
+            self.stats["written"] += len(tuples)
+            if self._buffered >= self.max_batch:
+                self._wake.set()
+        self.journal.sync(position)
+
+    # --- Flushing ---
+
+    def flush(self) -> int:
+        """
+        Writes everything buffered in one transaction; returns rows flushed.
+        If the database rejects the data, the batch is bisected (`_isolate`)
+        and the rows it rejects on their own are dead-lettered.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if not self._buffered:
+                    return 0
+                batches, self._buffer = self._buffer, {}
+                for table, rows in self._retry.items():
+                    batches[table] = rows + batches.get(table, [])
+                closed = self.journal.rotate()  # segments holding exactly these rows
+                count = self._buffered
+            batch = {table: _coalesce(table, batches[table]) for table in TABLES if batches.get(table)}
+            rejected: List[Tuple[str, Tuple[Any, ...], str]] = []
+            try:
+                try:
+                    self.backend.write(batch)
+                except Exception as exc:
+                    if not _rejects_data(exc):
+                        raise
+                    self.stats["isolations"] += 1
+                    rejected = self._isolate(batch, exc)
+                    if rejected:
+                        self.journal.dead_letter(rejected)  # before the segments holding them go
+            except Exception:
+                self._retry = batches
+                self.stats["flush_errors"] += 1
+                self._retry_delay = min(max(self._retry_delay * 2, self.flush_interval), MAX_RETRY_DELAY)
+                raise
+            self._retry = {}
+            self._retry_delay = 0.0
+            self._remove(closed)
+            with self._lock:
+                self._buffered -= count
+                self.stats["flushed"] += count - len(rejected)
+                self.stats["dead_lettered"] += len(rejected)
+                self.stats["flushes"] += 1
+                self._room.notify_all()
+            return count - len(rejected)
+
+    def _isolate(self, batch: Batches, error: Exception) -> List[Tuple[str, Tuple[Any, ...], str]]:
+        """
+        Writes a batch the database rejected with `error` in halves,
+        recursively and parents first; returns the rows rejected on their own as
+        (table, row, error). Any other error (the database went away
+        meanwhile) is raised and the whole batch is retried; the slices that
+        did commit are replayed harmlessly.
+        """
+        rows = [(table, row) for table, table_rows in batch.items() for row in table_rows]
+        rejected: List[Tuple[str, Tuple[Any, ...], str]] = []
+
+        def split(part: List[Tuple[str, Tuple[Any, ...]]], exc: Exception) -> None:
+            if len(part) == 1:
+                rejected.append((part[0][0], part[0][1], f"{type(exc).__name__}: {exc}"))
+                return
+            middle = len(part) // 2
+            attempt(part[:middle])
+            attempt(part[middle:])
+
+        def attempt(part: List[Tuple[str, Tuple[Any, ...]]]) -> None:
+            grouped: Batches = {}
+            for table, row in part:
+                grouped.setdefault(table, []).append(row)
+            try:
+                self.backend.write(grouped)
+            except Exception as exc:
+                if not _rejects_data(exc):
+                    raise
+                split(part, exc)
+
+        split(rows, error)  # the whole batch already failed
+        return rejected
+
+    def dead_letters(self) -> List[Tuple[str, Dict[str, Any], str]]:
+        """Rows the database rejected, as (table, row, error); they are not retried."""
+        return [(table, dict(zip(TABLES[table], row)), error) for table, row, error in self.journal.dead_letters()]
+
+    def _remove(self, paths: List[str]) -> None:
+        for path in paths:
+            os.remove(path)
+        if paths:
+            self.journal.sync_directory()
+
+    def start(self) -> "WriteBehindStore":
+        self._thread = threading.Thread(target=self._run, name="chimera-write-behind", daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval + self._retry_delay)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception:
+                pass  # counted in stats; rows stay journaled and are retried
+
+    def close(self) -> None:
+        """Stops the flusher and flushes what is left (raises if the database is down)."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        try:
+            self.flush()
+        finally:
+            self.journal.close()
+
+
+# --- Backends ---
+
+def _upsert_clause(table: str) -> str:
+    if table not in UPSERT_TABLES:
+        return "ON CONFLICT (id) DO NOTHING"
+    updates = ", ".join(f"{column} = excluded.{column}" for column in TABLES[table][1:])
+    return f"ON CONFLICT (id) DO UPDATE SET {updates}"
+
+
+class SQLiteBackend:
+    """Stand-in for Postgres in tests and benchmarks; JSON and array columns are stored as JSON text."""
+
+    def __init__(self, path: str = ":memory:", synchronous: str = "NORMAL"):
+        self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(f"PRAGMA synchronous={synchronous}")
+        self._lock = threading.Lock()
+        self.transactions = 0
+        self.create_schema()
+
+    def create_schema(self) -> None:
+        with self._lock:
+            for table, columns in TABLES.items():
+                body = ", ".join(f"{c} TEXT PRIMARY KEY" if c == "id" else c for c in columns)
+                self.conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({body})")
+
+    @staticmethod
+    def _adapt(table: str, row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        return tuple(json.dumps(value) if value is not None and (column in JSON_COLUMNS or column in ARRAY_COLUMNS)
+                     else value for column, value in zip(TABLES[table], row))
+
+    def write(self, batches: Batches) -> None:
+        with self._lock:
+            self.conn.execute("BEGIN")
+            try:
+                for table in TABLES:
+                    rows = batches.get(table)
+                    if not rows:
+                        continue
+                    columns = TABLES[table]
+                    sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+                           f"{_upsert_clause(table)}")
+                    self.conn.executemany(sql, [self._adapt(table, row) for row in rows])
+                self.conn.execute("COMMIT")
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.transactions += 1
+
+    def fetch(self, table: str, row_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self.conn.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone()
+        if row is None:
+            return None
+        return {c: json.loads(v) if (c in JSON_COLUMNS or c in ARRAY_COLUMNS) and v is not None else v
+                for c, v in zip(TABLES[table], row)}
+
+    def count(self, table: str) -> int:
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+
+
+class PostgresBackend:
+    """
+    Multi-row `INSERT ... VALUES (...), (...)` over any DB-API connection
+    with `format` paramstyle (psycopg 2/3), `page_size` rows per statement.
+    """
+
+    def __init__(self, connection: Any, page_size: int = 1000):
+        self.conn = connection
+        self.page_size = page_size
+        self.transactions = 0
+
+    @staticmethod
+    def _adapt(table: str, row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+        # jsonb takes JSON text; text[] columns take Python lists as-is.
+        return tuple(json.dumps(value) if column in JSON_COLUMNS and value is not None else value
+                     for column, value in zip(TABLES[table], row))
+
+    def statements(self, batches: Batches) -> Iterable[Tuple[str, List[Any]]]:
+        """Statements for `batches`, parent tables first (`TABLES` order)."""
+        for table in TABLES:
+            rows = batches.get(table)
+            if not rows:
+                continue
+            columns = TABLES[table]
+            one = "(" + ", ".join("%s::jsonb" if c in JSON_COLUMNS else "%s" for c in columns) + ")"
+            for start in range(0, len(rows), self.page_size):
+                page = rows[start:start + self.page_size]
+                sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES {', '.join([one] * len(page))} "
+                       f"{_upsert_clause(table)}")
+                yield sql, [value for row in page for value in self._adapt(table, row)]
+
+    def write(self, batches: Batches) -> None:
+        cursor = self.conn.cursor()
+        try:
+            for sql, params in self.statements(batches):
+                cursor.execute(sql, params)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            cursor.close()
+        self.transactions += 1
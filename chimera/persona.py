@@ -0,0 +1,314 @@
+"""
+SOUL.md persona store: parse once, share by hash, reload on change.
+
+FR 1.0 loads each agent's persona from its SOUL.md at startup. With hundreds
+of agents per host that parse dominates startup, and GitOps updates would
+otherwise need a restart. `PersonaStore`:
+
+- hashes each file's bytes (SHA-256, the AgentPersona `soul_md_hash`) and
+  parses a given hash only once; agents whose files are identical share one
+  immutable `Persona`
+- remembers (mtime, size) per file, so `refresh()` only re-reads files that
+  were touched and only re-parses those whose hash actually changed
+- `watch()` polls in a daemon thread and notifies subscribers with
+  `(path, old, new)` when a persona changes, so agents pick up the new
+  version without restarting
+
+Frontmatter is parsed with PyYAML when it is installed; otherwise a small
+parser handles the SOUL.md schema (scalars and lists of strings).
+
+Reference: specs/functional.md FR 1.0 (Persona Instantiation via SOUL.md), specs/technical.md Section 4.1, Section 2.2 (AgentPersona)
+"""
+
+import hashlib
+import logging
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import yaml
+except ImportError:  # PyYAML is optional
+    yaml = None
+
+FRONTMATTER_DELIMITER = "---"
+LIST_FIELDS = ("voice_traits", "directives", "core_beliefs")
+REQUIRED_FIELDS = ("name", "version")
+
+logger = logging.getLogger(__name__)
+
+PersonaListener = Callable[[Path, Optional["Persona"], Optional["Persona"]], None]
+
+
+class PersonaError(ValueError):
+    """A SOUL.md file is malformed or misses required fields."""
+
+
+@dataclass(frozen=True)
+class Persona:
+    """Parsed SOUL.md; field names follow the AgentPersona class."""
+
+    soul_md_hash: str
+    name: str
+    version: str
+    id: str = ""
+    backstory: str = ""
+    voice_traits: Tuple[str, ...] = ()
+    directives: Tuple[str, ...] = ()
+    core_beliefs: Tuple[str, ...] = ()
+    governance_model: str = "Human-Reviewed"
+    wallet_address: str = ""
+    extra: Tuple[Tuple[str, Any], ...] = field(default=(), compare=False)
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Mapping-style access, so a Persona can be passed where an AgentPersona dict is read."""
+        return getattr(self, name, default)
+
+
+# --- Parsing ---
+
+
+def _split(text: str) -> Tuple[str, str]:
+    lines = text.lstrip("\ufeff").splitlines()
+    if not lines or lines[0].strip() != FRONTMATTER_DELIMITER:
+        raise PersonaError("SOUL.md must start with a '---' frontmatter block")
+    for end in range(1, len(lines)):
+        if lines[end].strip() == FRONTMATTER_DELIMITER:
+            return "\n".join(lines[1:end]), "\n".join(lines[end + 1:])
+    raise PersonaError("Unterminated SOUL.md frontmatter")
+
+
+def _scalar(raw: str) -> str:
+    raw = raw.strip()
+    if raw[:1] in ("'", '"'):
+        quote = raw[0]
+        end = raw.find(quote, 1)
+        if end == -1:
+            raise PersonaError(f"Unterminated string: {raw}")
+        return raw[1:end]
+    comment = raw.find(" #")
+    return (raw[:comment] if comment != -1 else raw).strip()
+
+
+def _parse_frontmatter(text: str) -> Dict[str, Any]:
+    """The SOUL.md subset of YAML: `key: scalar` and `key:` followed by `- item` lines."""
+    data: Dict[str, Any] = {}
+    current: Optional[str] = None
+    for number, line in enumerate(text.splitlines(), 2):
+        stripped = line.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if stripped.startswith("- "):
+            if current is None or not isinstance(data.get(current), list):
+                raise PersonaError(f"Line {number}: list item outside a list")
+            data[current].append(_scalar(stripped[2:]))
+            continue
+        key, sep, rest = stripped.partition(":")
+        if not sep or line[:1].isspace():
+            raise PersonaError(f"Line {number}: expected 'key: value'")
+        current = key.strip()
+        value = _scalar(rest)
+        data[current] = value if value else []
+    return data
+
+
+def parse_soul_md(data: bytes) -> Persona:
+    """Parses SOUL.md bytes; the hash is over the exact bytes."""
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        text = data.decode("utf-8")
+    except UnicodeDecodeError as exc:
+        raise PersonaError(f"SOUL.md is not UTF-8: {exc}") from None
+    head, body = _split(text)
+    if yaml is not None:
+        try:
+            meta = yaml.load(head, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)) or {}
+        except yaml.YAMLError as exc:
+            raise PersonaError(f"Invalid frontmatter: {exc}") from None
+    else:
+        meta = _parse_frontmatter(head)
+    if not isinstance(meta, dict):
+        raise PersonaError("Frontmatter must be a mapping")
+
+    missing = [name for name in REQUIRED_FIELDS if not meta.get(name)]
+    if missing:
+        raise PersonaError(f"Missing required fields: {', '.join(missing)}")
+    values: Dict[str, Any] = {}
+    for name in LIST_FIELDS:
+        items = meta.get(name) or []
+        if not isinstance(items, list) or not all(isinstance(i, str) for i in items):
+            raise PersonaError(f"{name} must be a list of strings")
+        values[name] = tuple(items)
+    known = set(REQUIRED_FIELDS) | set(LIST_FIELDS) | {"id", "governance_model", "wallet_address"}
+    return Persona(
+        soul_md_hash=digest,
+        name=str(meta["name"]),
+        version=str(meta["version"]),
+        id=str(meta.get("id") or ""),
+        backstory=body.strip(),
+        governance_model=str(meta.get("governance_model") or "Human-Reviewed"),
+        wallet_address=str(meta.get("wallet_address") or ""),
+        extra=tuple(sorted((k, v) for k, v in meta.items() if k not in known)),
+        **values,
+    )
+
+
+# --- Store ---
+
+
+class _File:
+    __slots__ = ("stamp", "soul_md_hash")
+
+    def __init__(self, stamp: Tuple[int, int], soul_md_hash: str):
+        self.stamp = stamp
+        self.soul_md_hash = soul_md_hash
+
+
+class PersonaStore:
+    """
+    Loaded personas by file path, deduplicated by `soul_md_hash`. Thread-safe.
+    """
+
+    def __init__(self):
+        self._files: Dict[Path, _File] = {}
+        self._personas: Dict[str, Persona] = {}
+        self._refs: Dict[str, int] = {}
+        self._listeners: List[PersonaListener] = []
+        self._lock = threading.RLock()
+        self._watcher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats = {"reads": 0, "parses": 0, "shared": 0, "reloads": 0, "errors": 0, "listener_errors": 0}
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    @property
+    def unique(self) -> int:
+        """Distinct personas held (files with identical bytes share one)."""
+        return len(self._personas)
+
+    def subscribe(self, listener: PersonaListener) -> None:
+        """`listener(path, old, new)` is called after a file's persona changes or disappears."""
+        self._listeners.append(listener)
+
+    # --- Loading ---
+
+    def load(self, path: os.PathLike) -> Persona:
+        """The persona in `path`, parsed only if its bytes were never seen."""
+        path = Path(path).resolve()
+        with self._lock:
+            return self._load(path)
+
+    def load_many(self, paths: Iterable[os.PathLike]) -> Dict[Path, Persona]:
+        return {Path(p).resolve(): self.load(p) for p in paths}
+
+    def get(self, path: os.PathLike) -> Optional[Persona]:
+        """The already-loaded persona for `path` (no I/O)."""
+        entry = self._files.get(Path(path).resolve())
+        return self._personas.get(entry.soul_md_hash) if entry is not None else None
+
+    def by_hash(self, soul_md_hash: str) -> Optional[Persona]:
+        return self._personas.get(soul_md_hash)
+
+    def _load(self, path: Path) -> Persona:
+        stat = path.stat()
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        entry = self._files.get(path)
+        if entry is not None and entry.stamp == stamp:
+            return self._personas[entry.soul_md_hash]
+        data = path.read_bytes()
+        self.stats["reads"] += 1
+        digest = hashlib.sha256(data).hexdigest()
+        previous = entry.soul_md_hash if entry is not None else None
+        if digest != previous:
+            persona = self._personas.get(digest)
+            if persona is None:
+                try:
+                    persona = parse_soul_md(data)
+                except PersonaError as exc:
+                    self.stats["errors"] += 1
+                    raise PersonaError(f"{path}: {exc}") from None
+                self._personas[digest] = persona
+                self.stats["parses"] += 1
+            else:
+                self.stats["shared"] += 1
+            self._refs[digest] = self._refs.get(digest, 0) + 1
+            if previous is not None:
+                self._release(previous)
+        self._files[path] = _File(stamp, digest)
+        return self._personas[digest]
+
+    def _release(self, soul_md_hash: str) -> None:
+        self._refs[soul_md_hash] -= 1
+        if not self._refs[soul_md_hash]:
+            del self._refs[soul_md_hash]
+            del self._personas[soul_md_hash]
+
+    def forget(self, path: os.PathLike) -> None:
+        with self._lock:
+            entry = self._files.pop(Path(path).resolve(), None)
+            if entry is not None:
+                self._release(entry.soul_md_hash)
+
+    # --- Reloading ---
+
+    def refresh(self) -> List[Path]:
+        """
+        Re-stats every loaded file; returns paths whose persona changed.
+
+        A file that fails to parse or cannot be read keeps its last good
+        persona; a deleted file is forgotten and reported with `new=None`.
+        A listener that raises is logged and does not stop the others.
+        """
+        changes: List[Tuple[Path, Optional[Persona], Optional[Persona]]] = []
+        with self._lock:
+            for path in list(self._files):
+                old = self._personas[self._files[path].soul_md_hash]
+                try:
+                    new = self._load(path)
+                except FileNotFoundError:
+                    self.forget(path)
+                    changes.append((path, old, None))
+                    continue
+                except PersonaError:
+                    continue
+                except OSError as exc:
+                    self.stats["errors"] += 1
+                    logger.warning("Cannot re-read persona %s: %s", path, exc)
+                    continue
+                if new is not old:
+                    self.stats["reloads"] += 1
+                    changes.append((path, old, new))
+        for path, old, new in changes:
+            for listener in self._listeners:
+                try:
+                    listener(path, old, new)
+                except Exception:
+                    self.stats["listener_errors"] += 1
+                    logger.exception("Persona listener failed for %s", path)
+        return [path for path, _, _ in changes]
+
+    def watch(self, interval: float = 2.0) -> None:
+        """Starts a daemon thread calling `refresh()` every `interval` seconds."""
+        if self._watcher is not None:
+            return
+        self._stop.clear()
+
+        def run() -> None:
+            while not self._stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception:
+                    # A dead watcher would silently end hot reload for good.
+                    logger.exception("Persona refresh failed")
+
+        self._watcher = threading.Thread(target=run, name="persona-watch", daemon=True)
+        self._watcher.start()
+
+    def stop(self) -> None:
+        if self._watcher is not None:
+            self._stop.set()
+            self._watcher.join()
+            self._watcher = None
@@ -0,0 +1,344 @@
+"""
+TaskQueue and ReviewQueue over Redis lists.
+
+Producers LPUSH JSON strings onto `chimera:{tasks|reviews}:{agent_id}:pending`
+and consumers take from the right end, so each list is FIFO. On top of the
+spec layout this module adds:
+
+- batched enqueue: one LPUSH per agent, one pipeline round trip per call
+- batched claim: WATCH the pending list, read up to `count` items from its
+  tail, then MULTI/EXEC the trim plus the visibility bookkeeping, so items
+  are never held only in a consumer's memory
+- blocking claims: BLMOVE of the tail onto itself waits server-side for the
+  list to become non-empty without removing anything
+- visibility timeouts: each claimed item gets the spec hash
+  `chimera:tasks:{agent_id}:{task_id}` (worker_id, started_at, payload)
+  and an entry in the `:inflight` sorted set scored by deadline;
+  `requeue_expired()` returns items whose consumer went silent
+- dead-lettering: items delivered `max_deliveries` times, or nacked without
+  requeue, move to the `:dead` list with the reason; so do payloads that are
+  not a JSON object with a `task_id`, as soon as a claim reaches them
+
+Delivery is at-least-once: an item whose visibility expires is redelivered
+even if the first consumer later finishes it.
+
+Reference: specs/technical.md Section 2.3 (Redis Schema), specs/functional.md FR 6.0
+"""
+
+import json
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from chimera.keys import redis_key
+from chimera.redis_store import WatchError
+
+DEFAULT_VISIBILITY_TIMEOUT = 300.0
+DEFAULT_MAX_DELIVERIES = 5
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _dumps(item: Dict[str, Any]) -> str:
+    return json.dumps(item, separators=(",", ":"))
+
+
+def _loads_item(payload: str) -> Optional[Dict[str, Any]]:
+    """Decodes a queued payload; None when it is not an object carrying a task_id."""
+    try:
+        item = json.loads(payload)
+    except ValueError:
+        return None
+    if not isinstance(item, dict) or not isinstance(item.get("task_id"), str) or not item["task_id"]:
+        return None
+    return item
+
+
+class RedisQueue:
+    """
+    Per-agent reliable queue. Items are dicts carrying a `task_id`.
+
+    `client` is any redis-py compatible client created with
+    `decode_responses=True` (see chimera.redis_store.InMemoryRedis).
+    """
+
+    namespace = ""
+
+    def __init__(
+        self,
+        client: Any,
+        visibility_timeout: float = DEFAULT_VISIBILITY_TIMEOUT,
+        max_deliveries: int = DEFAULT_MAX_DELIVERIES,
+        clock: Callable[[], float] = time.time,
+    ):
+        if max_deliveries < 1:
+            raise ValueError("max_deliveries must be >= 1")
+        self.client = client
+        self.visibility_timeout = visibility_timeout
+        self.max_deliveries = max_deliveries
+        self.clock = clock
+
+    # --- Keys ---
+
+    def pending_key(self, agent_id: str) -> str:
+        return redis_key(f"{self.namespace}_queue", agent_id=agent_id)
+
+    def item_key(self, agent_id: str, task_id: str) -> str:
+        return redis_key(f"{self.namespace}_in_progress", agent_id=agent_id, task_id=task_id)
+
+    def inflight_key(self, agent_id: str) -> str:
+        return redis_key(f"{self.namespace}_inflight", agent_id=agent_id)
+
+    def attempts_key(self, agent_id: str) -> str:
+        return redis_key(f"{self.namespace}_attempts", agent_id=agent_id)
+
+    def dead_key(self, agent_id: str) -> str:
+        return redis_key(f"{self.namespace}_dead", agent_id=agent_id)
+
+    # --- Producing ---
+
+    def enqueue(self, agent_id: str, items: Sequence[Dict[str, Any]], pipe: Any = None) -> int:
+        """
+        Pushes `items` in order with a single LPUSH.
+
+        Returns the new queue length, or 0 when queued onto the caller's
+        `pipe` (the caller executes it, e.g. together with an `ack`).
+        """
+        if not items:
+            return 0
+        for item in items:
+            if not item.get("task_id"):
+                raise ValueError("Queue items must carry a task_id")
+        payloads = [_dumps(item) for item in items]
+        if pipe is not None:
+            pipe.lpush(self.pending_key(agent_id), *payloads)
+            return 0
+        return self.client.lpush(self.pending_key(agent_id), *payloads)
+
+    def enqueue_many(self, batches: Dict[str, Sequence[Dict[str, Any]]]) -> Dict[str, int]:
+        """Enqueues per-agent batches in one pipelined round trip; returns queue lengths."""
+        agents = [agent_id for agent_id, items in batches.items() if items]
+        if not agents:
+            return {}
+        with self.client.pipeline(transaction=False) as pipe:
+            for agent_id in agents:
+                self.enqueue(agent_id, batches[agent_id], pipe=pipe)
+            lengths = pipe.execute()
+        return dict(zip(agents, lengths))
+
+    # --- Consuming ---
+
+    def claim(
+        self,
+        agent_id: str,
+        worker_id: str,
+        count: int = 1,
+        block: Optional[float] = None,
+        visibility_timeout: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Claims up to `count` items, oldest first.
+
+        With `block` (seconds, 0 = forever) waits for work when the queue is
+        empty; otherwise returns [] at once. Claimed items stay invisible to
+        other consumers until acked, nacked or their visibility expires.
+        """
+        if count < 1:
+            raise ValueError("count must be >= 1")
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        pending = self.pending_key(agent_id)
+        deadline = None if not block else time.monotonic() + block
+        while True:
+            claimed = self._claim_now(agent_id, worker_id, count, timeout)
+            if claimed or block is None:
+                return claimed
+            wait = 0 if deadline is None else deadline - time.monotonic()
+            if deadline is not None and wait <= 0:
+                return []
+            # Rotating the tail onto itself only waits for the list to fill.
+            self.client.blmove(pending, pending, wait, "RIGHT", "RIGHT")
+
+    def _claim_now(self, agent_id: str, worker_id: str, count: int, timeout: float) -> List[Dict[str, Any]]:
+        pending = self.pending_key(agent_id)
+        inflight = self.inflight_key(agent_id)
+        attempts = self.attempts_key(agent_id)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(pending)
+                    payloads = pipe.lrange(pending, -count, -1)
+                    if not payloads:
+                        return []
+                    payloads.reverse()  # the right end is the oldest
+                    items, claimed, malformed = [], [], []
+                    for payload in payloads:
+                        item = _loads_item(payload)
+                        if item is None:
+                            malformed.append(payload)
+                        else:
+                            items.append(item)
+                            claimed.append(payload)
+                    now = self.clock()
+                    started_at = _iso(now)
+                    expires = now + timeout
+                    pipe.multi()
+                    pipe.ltrim(pending, 0, -len(payloads) - 1)
+                    for item, payload in zip(items, claimed):
+                        task_id = item["task_id"]
+                        pipe.hset(self.item_key(agent_id, task_id), mapping={
+                            "worker_id": worker_id,
+                            "started_at": started_at,
+                            "payload": payload,
+                        })
+                        pipe.hincrby(attempts, task_id, 1)
+                    if items:
+                        pipe.zadd(inflight, {item["task_id"]: expires for item in items})
+                    if malformed:
+                        # Parked rather than raised, or they would block the queue for good.
+                        pipe.lpush(self.dead_key(agent_id), *(_dumps({
+                            "payload": payload,
+                            "reason": "malformed_payload",
+                            "deliveries": 0,
+                            "dead_at": started_at,
+                        }) for payload in malformed))
+                    pipe.execute()
+                    if items:
+                        return items
+                    # Only malformed payloads were taken; look at what is behind them.
+                except WatchError:
+                    continue
+
+    def ack(self, agent_id: str, task_ids: Iterable[str], pipe: Any = None) -> int:
+        """
+        Marks claimed items done. Returns how many were still in flight
+        (0 when queued onto the caller's `pipe`).
+        """
+        task_ids = list(task_ids)
+        if not task_ids:
+            return 0
+        own = pipe is None
+        if own:
+            pipe = self.client.pipeline()
+        pipe.zrem(self.inflight_key(agent_id), *task_ids)
+        pipe.delete(*(self.item_key(agent_id, task_id) for task_id in task_ids))
+        pipe.hdel(self.attempts_key(agent_id), *task_ids)
+        if not own:
+            return 0
+        return pipe.execute()[0]
+
+    def touch(self, agent_id: str, task_ids: Iterable[str], visibility_timeout: Optional[float] = None) -> int:
+        """Extends the visibility deadline of in-flight items (worker heartbeat)."""
+        task_ids = list(task_ids)
+        if not task_ids:
+            return 0
+        timeout = self.visibility_timeout if visibility_timeout is None else visibility_timeout
+        expires = self.clock() + timeout
+        # XX: never resurrect an item that was already acked or requeued.
+        return self.client.zadd(self.inflight_key(agent_id), {task_id: expires for task_id in task_ids}, xx=True, ch=True)
+
+    def nack(self, agent_id: str, task_ids: Iterable[str], requeue: bool = True, reason: str = "nack") -> Dict[str, int]:
+        """
+        Releases claimed items: back to the front of the queue, or to the
+        dead-letter list when `requeue` is False or deliveries are exhausted.
+        """
+        return self._release(agent_id, list(task_ids), requeue, reason)
+
+    def requeue_expired(self, agent_id: str, limit: int = 100) -> Dict[str, int]:
+        """Releases up to `limit` items whose visibility deadline has passed."""
+        expired = self.client.zrangebyscore(self.inflight_key(agent_id), "-inf", self.clock(), start=0, num=limit)
+        return self._release(agent_id, expired, True, "visibility_timeout")
+
+    def _release(self, agent_id: str, task_ids: List[str], requeue: bool, reason: str) -> Dict[str, int]:
+        counts = {"requeued": 0, "dead_lettered": 0}
+        if not task_ids:
+            return counts
+        inflight = self.inflight_key(agent_id)
+        attempts_key = self.attempts_key(agent_id)
+        item_keys = [self.item_key(agent_id, task_id) for task_id in task_ids]
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(inflight, *item_keys)
+                    # Reads share one round trip; the WATCH still guards them.
+                    with self.client.pipeline(transaction=False) as reads:
+                        for key in item_keys:
+                            reads.hget(key, "payload")
+                        reads.hmget(attempts_key, task_ids)
+                        *payloads, attempts = reads.execute()
+                    counts = {"requeued": 0, "dead_lettered": 0}
+                    pipe.multi()
+                    requeue_payloads = []
+                    for task_id, key, payload, delivered in zip(task_ids, item_keys, payloads, attempts):
+                        if payload is None:
+                            continue  # acked or released by someone else meanwhile
+                        pipe.zrem(inflight, task_id)
+                        pipe.delete(key)
+                        delivered = int(delivered or 0)
+                        if requeue and delivered < self.max_deliveries:
+                            requeue_payloads.append(payload)
+                            counts["requeued"] += 1
+                        else:
+                            pipe.lpush(self.dead_key(agent_id), _dumps({
+                                "item": json.loads(payload),
+                                "reason": reason if not requeue else "max_deliveries_exceeded",
+                                "deliveries": delivered,
+                                "dead_at": _iso(self.clock()),
+                            }))
+                            pipe.hdel(attempts_key, task_id)
+                            counts["dead_lettered"] += 1
+                    if requeue_payloads:
+                        # RPUSH puts redeliveries at the consume end, ahead of newer work.
+                        pipe.rpush(self.pending_key(agent_id), *reversed(requeue_payloads))
+                    pipe.execute()
+                    return counts
+                except WatchError:
+                    continue
+
+    # --- Inspection ---
+
+    def depth(self, agent_id: str) -> int:
+        return self.client.llen(self.pending_key(agent_id))
+
+    def in_flight(self, agent_id: str) -> int:
+        return self.client.zcard(self.inflight_key(agent_id))
+
+    def dead_letters(self, agent_id: str, count: int = 100) -> List[Dict[str, Any]]:
+        """
+        Most recent dead letters first: {"item", "reason", "deliveries", "dead_at"}
+        (malformed payloads carry the raw string as "payload" instead of "item").
+        """
+        return [json.loads(entry) for entry in self.client.lrange(self.dead_key(agent_id), 0, count - 1)]
+
+    def replay_dead(self, agent_id: str, count: int = 100) -> int:
+        """Moves up to `count` dead letters back onto the queue with fresh delivery counts."""
+        dead = self.dead_key(agent_id)
+        with self.client.pipeline() as pipe:
+            while True:
+                try:
+                    pipe.watch(dead)
+                    entries = pipe.lrange(dead, -count, -1)
+                    if not entries:
+                        return 0
+                    letters = [json.loads(entry) for entry in reversed(entries)]
+                    payloads = [letter["payload"] if "payload" in letter else _dumps(letter["item"]) for letter in letters]
+                    pipe.multi()
+                    pipe.ltrim(dead, 0, -len(entries) - 1)
+                    pipe.lpush(self.pending_key(agent_id), *payloads)
+                    pipe.execute()
+                    return len(payloads)
+                except WatchError:
+                    continue
+
+
+class TaskQueue(RedisQueue):
+    """Planner → Worker queue of AgentTask JSON (`chimera:tasks:{agent_id}:pending`)."""
+
+    namespace = "task"
+
+
+class ReviewQueue(RedisQueue):
+    """Worker → Judge queue of TaskResult JSON (`chimera:reviews:{agent_id}:pending`)."""
+
+    namespace = "review"
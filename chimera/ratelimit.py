@@ -0,0 +1,253 @@
+"""
+Distributed rate limiter for MCP publish/reply tools.
+
+Every social action goes through an MCP tool (`twitter.post_tweet`,
+`twitter.reply_tweet`, `instagram.publish_media`, ...) and hundreds of
+agents share each platform account's quota. `RateLimiter` schedules those
+calls instead of rejecting them:
+
+- quotas are per tool and account; tools that draw on one platform quota
+  (posting and replying on X) name the same `bucket`
+- GCRA: the only shared state is the bucket's theoretical arrival time
+  (TAT) in `chimera:ratelimit:{bucket}:{account}`; reserving n slots
+  advances it by n emission intervals (`period / limit`) with one atomic
+  INCRBYFLOAT while the bucket is busy, and with a WATCH/MULTI/EXEC reset
+  when it was idle, so slots are never handed out twice however many
+  processes reserve
+- `reserve()` returns the time at which the action may run (never fails);
+  `acquire()` / `call_tool()` sleep until then, so queued actions go out
+  at the next free slot rather than into a 429
+- each process caches a block of future slots per bucket and serves calls
+  from it without a round trip; the block is sized by the calls seen in
+  the last `prefetch_window` seconds (capped at `max_block`), so it doubles
+  during a burst and shrinks back to one slot when traffic is sparse
+- a cached slot whose time has passed is dropped, never used late;
+  `close()` gives unused slots back when no other process reserved after
+  them
+
+With `burst=1` no window of `period` seconds sees more than `limit` calls.
+`margin` pads the emission interval to absorb clock skew between processes
+and dispatch delay.
+
+Reference: specs/functional.md FR 4.0 (MCP tools, rate limiting), specs/technical.md Section 2.3 (Redis Schema)
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from chimera.keys import redis_key
+from chimera.redis_store import WatchError
+
+DEFAULT_PREFETCH_WINDOW = 1.0
+DEFAULT_MAX_BLOCK = 64
+DEFAULT_MARGIN = 0.01
+
+
+class Quota(NamedTuple):
+    limit: int  # calls per period
+    period: float  # seconds
+    burst: int = 1  # calls allowed back to back
+    bucket: str = ""  # shared quota name; defaults to the tool name
+
+
+# Conservative defaults; set from the account's API tier.
+DEFAULT_QUOTAS: Dict[str, Quota] = {
+    "twitter.post_tweet": Quota(100, 900, bucket="twitter.tweets"),
+    "twitter.reply_tweet": Quota(100, 900, bucket="twitter.tweets"),
+    "instagram.publish_media": Quota(25, 86400),
+}
+
+
+def gcra_slots(tat: float, now: float, count: int, interval: float, tolerance: float) -> Tuple[List[float], float]:
+    """Start times for `count` actions from `now`, and the TAT after them."""
+    tat = max(tat, now)
+    slots = []
+    for _ in range(count):
+        slots.append(max(now, tat - tolerance))
+        tat += interval
+    return slots, tat
+
+
+class _Bucket:
+    """This process's cache of reserved slots for one bucket and account."""
+
+    __slots__ = ("key", "interval", "tolerance", "lock", "slots", "recent", "tail")
+
+    def __init__(self, key: str, interval: float, tolerance: float):
+        self.key = key
+        self.interval = interval
+        self.tolerance = tolerance
+        self.lock = threading.Lock()
+        self.slots: Deque[float] = deque()
+        self.recent: Deque[float] = deque()  # reservation times in the prefetch window
+        self.tail = 0.0  # TAT we stored with our last block
+
+
+class RateLimiter:
+    """
+    Per-process limiter over a redis-py compatible client
+    (`decode_responses=True`, see chimera.redis_store.InMemoryRedis);
+    thread-safe. Tools without a quota are not limited.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        quotas: Optional[Dict[str, Quota]] = None,
+        prefetch_window: float = DEFAULT_PREFETCH_WINDOW,
+        max_block: int = DEFAULT_MAX_BLOCK,
+        margin: float = DEFAULT_MARGIN,
+        clock: Callable[[], float] = time.time,
+    ):
+        if max_block < 1:
+            raise ValueError("max_block must be >= 1")
+        self.client = client
+        self.quotas = dict(DEFAULT_QUOTAS if quotas is None else quotas)
+        for tool, quota in self.quotas.items():
+            if quota.limit < 1 or quota.period <= 0 or quota.burst < 1:
+                raise ValueError(f"invalid quota for {tool}: {quota}")
+        self.prefetch_window = prefetch_window
+        self.max_block = max_block
+        self.margin = margin
+        self.clock = clock
+        self._buckets: Dict[Tuple[str, str], _Bucket] = {}
+        self._lock = threading.Lock()
+        self.stats = {"reserved": 0, "local": 0, "fetches": 0, "resets": 0, "wasted": 0, "returned": 0,
+                      "unlimited": 0}
+
+    def _bucket(self, tool: str, account: str) -> Optional[_Bucket]:
+        quota = self.quotas.get(tool)
+        if quota is None:
+            return None
+        name = quota.bucket or tool
+        bucket = self._buckets.get((name, account))
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get((name, account))
+                if bucket is None:
+                    interval = quota.period / quota.limit * (1 + self.margin)
+                    bucket = self._buckets[(name, account)] = _Bucket(
+                        redis_key("rate_limit", bucket=name, account=account), interval, (quota.burst - 1) * interval)
+        return bucket
+
+    # --- Reservations ---
+
+    def reserve(self, tool: str, account: str = "default") -> float:
+        """Reserves the next slot for one `tool` call on `account`; returns when it may run (clock time)."""
+        now = self.clock()
+        bucket = self._bucket(tool, account)
+        if bucket is None:
+            self.stats["unlimited"] += 1
+            return now
+        with bucket.lock:
+            recent = bucket.recent
+            recent.append(now)
+            while recent[0] <= now - self.prefetch_window:
+                recent.popleft()
+            slots = bucket.slots
+            while slots and slots[0] < now:
+                slots.popleft()  # using it late could crowd the next holder's slot
+                self.stats["wasted"] += 1
+            if slots:
+                self.stats["local"] += 1
+            else:
+                self._fetch(bucket, now, min(self.max_block, len(recent)))
+            self.stats["reserved"] += 1
+            return slots.popleft()
+
+    def _fetch(self, bucket: _Bucket, now: float, count: int) -> None:
+        """
+        Reserves `count` slots. While the bucket is busy (TAT ahead of now)
+        one INCRBYFLOAT does it; an idle bucket's stale TAT is reset with a
+        compare-and-set round. Caller holds `bucket.lock`.
+        """
+        span = count * bucket.interval
+        tat = float(self.client.incrbyfloat(bucket.key, span))
+        start = tat - span
+        if start < now:
+            with self.client.pipeline() as pipe:
+                while True:
+                    try:
+                        pipe.watch(bucket.key)
+                        current = float(pipe.get(bucket.key) or 0)
+                        # Nobody reserved since our increment: restart from our own base.
+                        base = start if current == tat else current
+                        slots, tat = gcra_slots(base, now, count, bucket.interval, bucket.tolerance)
+                        pipe.multi()
+                        pipe.set(bucket.key, repr(tat))
+                        pipe.execute()
+                        break
+                    except WatchError:
+                        continue
+            self.stats["resets"] += 1
+        else:
+            slots, _ = gcra_slots(start, now, count, bucket.interval, bucket.tolerance)
+        self.stats["fetches"] += 1
+        bucket.slots.extend(slots)
+        bucket.tail = tat
+
+    async def acquire(self, tool: str, account: str = "default") -> float:
+        """Waits for a slot; returns the seconds waited."""
+        delay = self.reserve(tool, account) - self.clock()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return max(delay, 0.0)
+
+    async def call_tool(
+        self,
+        mcp: Any,
+        server: str,
+        name: str,
+        arguments: Optional[Dict[str, Any]] = None,
+        account: str = "default",
+    ) -> Dict[str, Any]:
+        """`mcp.call_tool(server, name, arguments)` (an MCPClientPool) at the next free `server.name` slot."""
+        await self.acquire(f"{server}.{name}", account)
+        return await mcp.call_tool(server, name, arguments)
+
+    # --- Shutdown ---
+
+    def close(self) -> None:
+        """Gives back cached slots that are still the newest reservations of their bucket."""
+        now = self.clock()
+        for bucket in list(self._buckets.values()):
+            with bucket.lock:
+                while bucket.slots and bucket.slots[0] < now:
+                    bucket.slots.popleft()
+                    self.stats["wasted"] += 1
+                if bucket.slots:
+                    self._give_back(bucket, now)
+
+    def _give_back(self, bucket: _Bucket, now: float) -> None:
+        unused = len(bucket.slots)
+        with self.client.pipeline() as pipe:
+            try:
+                pipe.watch(bucket.key)
+                stored = pipe.get(bucket.key)
+                if stored is None or float(stored) != bucket.tail:
+                    return  # someone reserved after us; those slots stay spent
+                pipe.multi()
+                pipe.set(bucket.key, repr(max(now, bucket.tail - unused * bucket.interval)))
+                pipe.execute()
+            except WatchError:
+                return
+        self.stats["returned"] += unused
+        bucket.slots.clear()
+
+    # --- Inspection ---
+
+    def next_slot(self, tool: str, account: str = "default") -> float:
+        """When the next call would run, without reserving it."""
+        now = self.clock()
+        bucket = self._bucket(tool, account)
+        if bucket is None:
+            return now
+        with bucket.lock:
+            cached = [slot for slot in bucket.slots if slot >= now]
+            if cached:
+                return cached[0]
+        stored = self.client.get(bucket.key)
+        return gcra_slots(float(stored or 0), now, 1, bucket.interval, bucket.tolerance)[0][0]
@@ -0,0 +1,612 @@
+"""
+In-memory Redis stand-in for offline tests and benchmarks.
+
+`InMemoryRedis` implements the subset of the redis-py client API used by
+Chimera services (strings, lists, hashes, sorted sets, key expiry, blocking
+list moves and WATCH/MULTI/EXEC pipelines) with the semantics of a client
+created with `decode_responses=True`. Production code takes any client with
+that API, so a real `redis.Redis(..., decode_responses=True)` is a drop-in
+replacement; redis-py itself is optional.
+
+Every public command and every pipeline `execute()` counts as one round
+trip; `round_trip_latency` sleeps that long per round trip so benchmarks can
+model network cost.
+
+Reference: specs/technical.md Section 2.3 (Redis Schema), specs/_meta.md Section 2.3 (Redis for queuing)
+"""
+
+import fnmatch
+import functools
+import threading
+import time
+from collections import deque
+from itertools import islice
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+try:
+    from redis.exceptions import ResponseError, WatchError
+except ImportError:  # redis-py is optional
+    class ResponseError(Exception):
+        """Command error reported by the server (e.g. WRONGTYPE)."""
+
+    class WatchError(Exception):
+        """A WATCHed key changed before EXEC; the transaction was discarded."""
+
+
+def _command(fn: Callable) -> Callable:
+    """Marks a method as a Redis command: one round trip, run under the store lock."""
+
+    @functools.wraps(fn)
+    def wrapper(self: "InMemoryRedis", *args: Any, **kwargs: Any) -> Any:
+        self._round_trip()
+        with self._lock:
+            return fn(self, *args, **kwargs)
+
+    wrapper.raw = fn
+    return wrapper
+
+
+def _encode(value: Any) -> str:
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool) or value is None:
+        raise ResponseError(f"Invalid input of type {type(value).__name__}; convert to str, int or float first")
+    if isinstance(value, float):
+        return repr(value)
+    if isinstance(value, int):
+        return str(value)
+    if isinstance(value, bytes):
+        return value.decode()
+    raise ResponseError(f"Invalid input of type {type(value).__name__}")
+
+
+def _score(bound: Any) -> Tuple[float, bool]:
+    """Parses a sorted-set bound ("-inf", "(1.5", 3) into (value, exclusive)."""
+    if isinstance(bound, str):
+        if bound.startswith("("):
+            return float(bound[1:]), True
+        return float(bound), False
+    return float(bound), False
+
+
+def _fmt_float(value: float) -> str:
+    return repr(int(value)) if value == int(value) and abs(value) < 1e17 else repr(value)
+
+
+class InMemoryRedis:
+    """
+    Thread-safe, single-process Redis substitute.
+
+    Commands are serialized by one lock, matching Redis' single-threaded
+    execution; a pipeline's queued commands run atomically under it.
+    """
+
+    def __init__(self, round_trip_latency: float = 0.0, clock: Callable[[], float] = time.time):
+        self.round_trip_latency = round_trip_latency
+        self.clock = clock
+        self._data: Dict[str, Any] = {}
+        self._expires: Dict[str, float] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._blocked = 0
+        self.round_trips = 0
+
+    def _round_trip(self) -> None:
+        self.round_trips += 1
+        if self.round_trip_latency:
+            time.sleep(self.round_trip_latency)
+
+    def pipeline(self, transaction: bool = True) -> "Pipeline":
+        return Pipeline(self, transaction)
+
+    # --- Keyspace internals ---
+
+    def _alive(self, key: str) -> bool:
+        deadline = self._expires.get(key)
+        if deadline is not None and self.clock() >= deadline:
+            del self._expires[key]
+            del self._data[key]
+            self._touch(key)
+            return False
+        return key in self._data
+
+    def _get(self, key: str, kind: type) -> Any:
+        if not self._alive(key):
+            return None
+        value = self._data[key]
+        if not isinstance(value, kind):
+            raise ResponseError("WRONGTYPE Operation against a key holding the wrong kind of value")
+        return value
+
+    def _get_or_create(self, key: str, kind: type) -> Any:
+        value = self._get(key, kind)
+        if value is None:
+            value = self._data[key] = kind()
+        return value
+
+    def _touch(self, key: str) -> None:
+        self._versions[key] = self._versions.get(key, 0) + 1
+        if self._blocked:
+            self._changed.notify_all()
+
+    def _drop_if_empty(self, key: str) -> None:
+        if not self._data.get(key) and key in self._data:
+            del self._data[key]
+            self._expires.pop(key, None)
+
+    def _version(self, key: str) -> int:
+        self._alive(key)
+        return self._versions.get(key, 0)
+
+    # --- Keys ---
+
+    @_command
+    def delete(self, *names: str) -> int:
+        removed = 0
+        for name in names:
+            if self._alive(name):
+                del self._data[name]
+                self._expires.pop(name, None)
+                self._touch(name)
+                removed += 1
+        return removed
+
+    @_command
+    def exists(self, *names: str) -> int:
+        return sum(1 for name in names if self._alive(name))
+
+    @_command
+    def expire(self, name: str, time: float) -> bool:
+        if not self._alive(name):
+            return False
+        self._expires[name] = self.clock() + float(time)
+        self._touch(name)
+        return True
+
+    @_command
+    def ttl(self, name: str) -> int:
+        if not self._alive(name):
+            return -2
+        deadline = self._expires.get(name)
+        if deadline is None:
+            return -1
+        return max(0, round(deadline - self.clock()))
+
+    @_command
+    def keys(self, pattern: str = "*") -> List[str]:
+        return [key for key in list(self._data) if self._alive(key) and fnmatch.fnmatchcase(key, pattern)]
+
+    @_command
+    def flushall(self) -> bool:
+        for key in list(self._data):
+            self._touch(key)
+        self._data.clear()
+        self._expires.clear()
+        return True
+
+    # --- Strings ---
+
+    @_command
+    def get(self, name: str) -> Optional[str]:
+        return self._get(name, str)
+
+    @_command
+    def mget(self, keys: List[str], *args: str) -> List[Optional[str]]:
+        names = list(keys) + list(args) if isinstance(keys, (list, tuple)) else [keys, *args]
+        return [self._get(name, str) for name in names]
+
+    @_command
+    def set(
+        self,
+        name: str,
+        value: Any,
+        ex: Optional[float] = None,
+        px: Optional[float] = None,
+        nx: bool = False,
+        xx: bool = False,
+    ) -> Optional[bool]:
+        present = self._alive(name)
+        if (nx and present) or (xx and not present):
+            return None
+        self._data[name] = _encode(value)
+        self._expires.pop(name, None)
+        if ex is not None:
+            self._expires[name] = self.clock() + float(ex)
+        elif px is not None:
+            self._expires[name] = self.clock() + float(px) / 1000.0
+        self._touch(name)
+        return True
+
+    @_command
+    def incrby(self, name: str, amount: int = 1) -> int:
+        current = self._get(name, str)
+        try:
+            value = int(current or 0) + int(amount)
+        except ValueError:
+            raise ResponseError("value is not an integer or out of range") from None
+        self._data[name] = str(value)
+        self._touch(name)
+        return value
+
+    incr = incrby
+
+    @_command
+    def incrbyfloat(self, name: str, amount: float = 1.0) -> float:
+        current = self._get(name, str)
+        try:
+            value = float(current or 0) + float(amount)
+        except ValueError:
+            raise ResponseError("value is not a valid float") from None
+        self._data[name] = _fmt_float(value)
+        self._touch(name)
+        return value
+
+    # --- Lists ---
+
+    @_command
+    def lpush(self, name: str, *values: Any) -> int:
+        items: Deque[str] = self._get_or_create(name, deque)
+        items.extendleft(_encode(v) for v in values)
+        self._touch(name)
+        return len(items)
+
+    @_command
+    def rpush(self, name: str, *values: Any) -> int:
+        items: Deque[str] = self._get_or_create(name, deque)
+        items.extend(_encode(v) for v in values)
+        self._touch(name)
+        return len(items)
+
+    def _pop(self, name: str, count: Optional[int], left: bool) -> Any:
+        items: Optional[Deque[str]] = self._get(name, deque)
+        if not items:
+            return None
+        pop = items.popleft if left else items.pop
+        if count is None:
+            result: Any = pop()
+        else:
+            result = [pop() for _ in range(min(count, len(items)))]
+        self._drop_if_empty(name)
+        self._touch(name)
+        return result
+
+    @_command
+    def lpop(self, name: str, count: Optional[int] = None) -> Any:
+        return self._pop(name, count, left=True)
+
+    @_command
+    def rpop(self, name: str, count: Optional[int] = None) -> Any:
+        return self._pop(name, count, left=False)
+
+    @_command
+    def llen(self, name: str) -> int:
+        items = self._get(name, deque)
+        return len(items) if items else 0
+
+    @staticmethod
+    def _bounds(length: int, start: int, end: int) -> Tuple[int, int]:
+        if start < 0:
+            start = max(0, length + start)
+        if end < 0:
+            end = length + end
+        return start, min(end, length - 1)
+
+    @_command
+    def lrange(self, name: str, start: int, end: int) -> List[str]:
+        items = self._get(name, deque)
+        if not items:
+            return []
+        start, end = self._bounds(len(items), start, end)
+        if start > end:
+            return []
+        length = len(items)
+        if start > length // 2:
+            # Tail ranges (the consume side of a queue) are read from the right.
+            tail = list(islice(reversed(items), length - 1 - end, length - start))
+            tail.reverse()
+            return tail
+        return list(islice(items, start, end + 1))
+
+    @_command
+    def ltrim(self, name: str, start: int, end: int) -> bool:
+        items = self._get(name, deque)
+        if not items:
+            return True
+        start, end = self._bounds(len(items), start, end)
+        if start > end:
+            items.clear()
+        else:
+            for _ in range(len(items) - 1 - end):
+                items.pop()
+            for _ in range(start):
+                items.popleft()
+        self._drop_if_empty(name)
+        self._touch(name)
+        return True
+
+    @_command
+    def lrem(self, name: str, count: int, value: Any) -> int:
+        items = self._get(name, deque)
+        if not items:
+            return 0
+        value = _encode(value)
+        limit = abs(count) or len(items)
+        ordered = list(items) if count >= 0 else list(reversed(items))
+        kept, removed = [], 0
+        for item in ordered:
+            if item == value and removed < limit:
+                removed += 1
+            else:
+                kept.append(item)
+        if removed:
+            items.clear()
+            items.extend(kept if count >= 0 else reversed(kept))
+            self._drop_if_empty(name)
+            self._touch(name)
+        return removed
+
+    def _move(self, first_list: str, second_list: str, src: str, dest: str) -> Optional[str]:
+        items = self._get(first_list, deque)
+        if not items:
+            return None
+        self._get(second_list, deque)  # WRONGTYPE check before mutating the source
+        value = items.popleft() if src.upper() == "LEFT" else items.pop()
+        target: Deque[str] = self._get_or_create(second_list, deque)
+        if dest.upper() == "LEFT":
+            target.appendleft(value)
+        else:
+            target.append(value)
+        self._drop_if_empty(first_list)
+        self._touch(first_list)
+        self._touch(second_list)
+        return value
+
+    @_command
+    def lmove(self, first_list: str, second_list: str, src: str = "LEFT", dest: str = "RIGHT") -> Optional[str]:
+        return self._move(first_list, second_list, src, dest)
+
+    @_command
+    def blmove(
+        self,
+        first_list: str,
+        second_list: str,
+        timeout: float,
+        src: str = "LEFT",
+        dest: str = "RIGHT",
+    ) -> Optional[str]:
+        """Like LMOVE, but waits up to `timeout` seconds (0 = forever) for `first_list`."""
+        deadline = None if not timeout else time.monotonic() + float(timeout)
+        while not self._get(first_list, deque):
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return None
+            self._blocked += 1
+            try:
+                self._changed.wait(remaining)
+            finally:
+                self._blocked -= 1
+        return self._move(first_list, second_list, src, dest)
+
+    # --- Hashes ---
+
+    @_command
+    def hset(
+        self,
+        name: str,
+        key: Optional[str] = None,
+        value: Any = None,
+        mapping: Optional[Dict[str, Any]] = None,
+    ) -> int:
+        fields: Dict[str, str] = self._get_or_create(name, dict)
+        pairs = dict(mapping or {})
+        if key is not None:
+            pairs[key] = value
+        added = 0
+        for field, field_value in pairs.items():
+            added += field not in fields
+            fields[field] = _encode(field_value)
+        self._touch(name)
+        return added
+
+    @_command
+    def hget(self, name: str, key: str) -> Optional[str]:
+        fields = self._get(name, dict)
+        return fields.get(key) if fields else None
+
+    @_command
+    def hmget(self, name: str, keys: List[str], *args: str) -> List[Optional[str]]:
+        fields = self._get(name, dict) or {}
+        names = list(keys) + list(args) if isinstance(keys, (list, tuple)) else [keys, *args]
+        return [fields.get(field) for field in names]
+
+    @_command
+    def hgetall(self, name: str) -> Dict[str, str]:
+        return dict(self._get(name, dict) or {})
+
+    @_command
+    def hdel(self, name: str, *keys: str) -> int:
+        fields = self._get(name, dict)
+        if not fields:
+            return 0
+        removed = sum(1 for field in keys if fields.pop(field, None) is not None)
+        if removed:
+            self._drop_if_empty(name)
+            self._touch(name)
+        return removed
+
+    @_command
+    def hlen(self, name: str) -> int:
+        return len(self._get(name, dict) or {})
+
+    @_command
+    def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        fields: Dict[str, str] = self._get_or_create(name, dict)
+        value = int(fields.get(key, 0)) + int(amount)
+        fields[key] = str(value)
+        self._touch(name)
+        return value
+
+    @_command
+    def hincrbyfloat(self, name: str, key: str, amount: float = 1.0) -> float:
+        fields: Dict[str, str] = self._get_or_create(name, dict)
+        value = float(fields.get(key, 0)) + float(amount)
+        fields[key] = _fmt_float(value)
+        self._touch(name)
+        return value
+
+    # --- Sorted sets ---
+
+    @_command
+    def zadd(
+        self,
+        name: str,
+        mapping: Dict[str, float],
+        nx: bool = False,
+        xx: bool = False,
+        ch: bool = False,
+    ) -> int:
+        scores: Dict[str, float] = self._get_or_create(name, _SortedSet)
+        added = changed = 0
+        for member, score in mapping.items():
+            member = _encode(member)
+            previous = scores.get(member)
+            if (nx and previous is not None) or (xx and previous is None):
+                continue
+            added += previous is None
+            changed += previous != float(score)
+            scores[member] = float(score)
+        self._drop_if_empty(name)
+        self._touch(name)
+        return changed if ch else added
+
+    @_command
+    def zrem(self, name: str, *values: str) -> int:
+        scores = self._get(name, _SortedSet)
+        if not scores:
+            return 0
+        removed = sum(1 for member in values if scores.pop(member, None) is not None)
+        if removed:
+            self._drop_if_empty(name)
+            self._touch(name)
+        return removed
+
+    @_command
+    def zscore(self, name: str, value: str) -> Optional[float]:
+        scores = self._get(name, _SortedSet)
+        return scores.get(value) if scores else None
+
+    @_command
+    def zcard(self, name: str) -> int:
+        return len(self._get(name, _SortedSet) or {})
+
+    @_command
+    def zrangebyscore(
+        self,
+        name: str,
+        min: Any,
+        max: Any,
+        start: Optional[int] = None,
+        num: Optional[int] = None,
+        withscores: bool = False,
+    ) -> List[Any]:
+        scores = self._get(name, _SortedSet)
+        if not scores:
+            return []
+        low, low_open = _score(min)
+        high, high_open = _score(max)
+        matched = sorted(
+            (score, member) for member, score in scores.items()
+            if (score > low if low_open else score >= low) and (score < high if high_open else score <= high)
+        )
+        if start is not None:
+            matched = matched[start:] if num is None or num < 0 else matched[start:start + num]
+        if withscores:
+            return [(member, score) for score, member in matched]
+        return [member for _, member in matched]
+
+
+class _SortedSet(dict):
+    """member -> score; ordering is computed on read (sets here stay small)."""
+
+
+class Pipeline:
+    """
+    redis-py style pipeline.
+
+    After `watch()` commands run immediately (one round trip each) until
+    `multi()`; afterwards they are queued and `execute()` runs them in one
+    round trip, atomically, raising `WatchError` if a watched key changed.
+    Without `transaction` queued commands still share one round trip.
+    """
+
+    def __init__(self, client: InMemoryRedis, transaction: bool = True):
+        self.client = client
+        self.transaction = transaction
+        self._queue: List[Tuple[Callable, tuple, dict]] = []
+        self._watched: Dict[str, int] = {}
+        self._immediate = False
+
+    def __enter__(self) -> "Pipeline":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.reset()
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+    def watch(self, *names: str) -> None:
+        client = self.client
+        client._round_trip()
+        with client._lock:
+            for name in names:
+                self._watched[name] = client._version(name)
+        self._immediate = True
+
+    def unwatch(self) -> None:
+        self._watched.clear()
+        self._immediate = False
+
+    def multi(self) -> None:
+        self._immediate = False
+
+    def reset(self) -> None:
+        self._queue.clear()
+        self.unwatch()
+
+    def __getattr__(self, name: str) -> Any:
+        method = getattr(InMemoryRedis, name, None)
+        raw = getattr(method, "raw", None)
+        if raw is None or name == "blmove":
+            raise AttributeError(f"Pipeline has no command {name!r}")
+        if self._immediate:
+            return getattr(self.client, name)
+
+        def queue(*args: Any, **kwargs: Any) -> "Pipeline":
+            self._queue.append((raw, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self, raise_on_error: bool = True) -> List[Any]:
+        client = self.client
+        client._round_trip()
+        try:
+            with client._lock:
+                for name, version in self._watched.items():
+                    if client._version(name) != version:
+                        raise WatchError("Watched variable changed.")
+                results: List[Any] = []
+                for raw, args, kwargs in self._queue:
+                    try:
+                        results.append(raw(client, *args, **kwargs))
+                    except ResponseError as exc:
+                        results.append(exc)
+        finally:
+            self.reset()
+        if raise_on_error:
+            for result in results:
+                if isinstance(result, ResponseError):
+                    raise result
+        return results
@@ -0,0 +1,236 @@
+"""
+Priority-aware, fair-share task scheduler between the Planner and Worker Pool.
+
+- one lane per AgentTask `priority` (high > medium > low), served strictly
+  in that order
+- inside a lane, start-time fair queuing across `agent_id`s: each agent's
+  head task gets a virtual finish tag `max(V, last_tag) + cost / weight` and
+  the smallest tag is dispatched, so a noisy agent only gets its weighted
+  share of the lane however many tasks it submits
+- aging: a task that waited `aging_seconds` in its lane is promoted to the
+  next lane up, so low-priority work still drains under sustained load
+- queue wait (submit -> dispatch) is recorded per original priority; see
+  `wait_stats()` for p50/p99
+
+Tasks removed by promotion are left in their old per-agent deque as
+tombstones and skipped on dispatch, keeping every operation O(log agents).
+
+Reference: specs/technical.md Section 1.1 (AgentTask priority, task_type), specs/functional.md FR 6.0
+"""
+
+import heapq
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+PRIORITIES = ("high", "medium", "low")
+DEFAULT_AGING_SECONDS = 30.0
+DEFAULT_WAIT_WINDOW = 4096
+
+
+class _Entry:
+    __slots__ = ("seq", "agent_id", "task", "priority", "lane", "cost", "submitted_at", "lane_since", "done")
+
+    def __init__(self, seq: int, agent_id: str, task: Dict[str, Any], lane: int, cost: float, now: float):
+        self.seq = seq
+        self.agent_id = agent_id
+        self.task = task
+        self.priority = lane
+        self.lane = lane
+        self.cost = cost
+        self.submitted_at = now
+        self.lane_since = now
+        self.done = False
+
+
+class _Lane:
+    """Fair queue across agents for one priority level."""
+
+    __slots__ = ("index", "queues", "ready", "tokens", "finish", "vtime", "by_age", "size")
+
+    def __init__(self, index: int):
+        self.index = index
+        self.queues: Dict[str, Deque[_Entry]] = {}
+        self.ready: List[Tuple[float, int, str]] = []
+        # agent_id -> token of its one valid `ready` entry; others are stale.
+        self.tokens: Dict[str, int] = {}
+        self.finish: Dict[str, float] = {}
+        self.vtime = 0.0
+        self.by_age: List[Tuple[float, int, _Entry]] = []
+        self.size = 0
+
+    def head(self, agent_id: str) -> Optional[_Entry]:
+        queue = self.queues.get(agent_id)
+        while queue and (queue[0].done or queue[0].lane != self.index):
+            queue.popleft()
+        if queue:
+            return queue[0]
+        self.queues.pop(agent_id, None)
+        return None
+
+
+class FairScheduler:
+    """
+    In-process scheduler; thread-safe. The Planner `submit()`s AgentTasks
+    per agent and Worker Pool dispatchers take them with `next_batch()`.
+    """
+
+    def __init__(
+        self,
+        agent_weights: Optional[Dict[str, float]] = None,
+        task_costs: Optional[Dict[str, float]] = None,
+        aging_seconds: float = DEFAULT_AGING_SECONDS,
+        wait_window: int = DEFAULT_WAIT_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if aging_seconds <= 0:
+            raise ValueError("aging_seconds must be > 0")
+        self.agent_weights = dict(agent_weights or {})
+        self.task_costs = dict(task_costs or {})
+        self.aging_seconds = aging_seconds
+        self.clock = clock
+        self._lanes = [_Lane(i) for i in range(len(PRIORITIES))]
+        self._waits: List[Deque[float]] = [deque(maxlen=wait_window) for _ in PRIORITIES]
+        self._seq = 0
+        self._lock = threading.Lock()
+        self.stats = {"submitted": 0, "dispatched": 0, "promoted": 0}
+
+    def __len__(self) -> int:
+        return sum(lane.size for lane in self._lanes)
+
+    def depth(self) -> Dict[str, int]:
+        """Queued tasks per lane (promoted tasks count in their current lane)."""
+        return {name: lane.size for name, lane in zip(PRIORITIES, self._lanes)}
+
+    def set_weight(self, agent_id: str, weight: float) -> None:
+        if weight <= 0:
+            raise ValueError("weight must be > 0")
+        with self._lock:
+            self.agent_weights[agent_id] = weight
+
+    # --- Submission ---
+
+    def submit(self, agent_id: str, task: Dict[str, Any], cost: Optional[float] = None) -> None:
+        self.submit_many(agent_id, [task], cost)
+
+    def submit_many(self, agent_id: str, tasks: List[Dict[str, Any]], cost: Optional[float] = None) -> None:
+        """Queues AgentTasks for `agent_id`; lane comes from each task's `priority`."""
+        with self._lock:
+            now = self.clock()
+            for task in tasks:
+                priority = task.get("priority", "medium")
+                if priority not in PRIORITIES:
+                    raise ValueError(f"Unknown priority {priority!r}; expected one of {PRIORITIES}")
+                task_cost = cost if cost is not None else self.task_costs.get(task.get("task_type"), 1.0)
+                self._seq += 1
+                entry = _Entry(self._seq, agent_id, task, PRIORITIES.index(priority), task_cost, now)
+                self._enqueue(self._lanes[entry.lane], entry)
+            self.stats["submitted"] += len(tasks)
+
+    def _enqueue(self, lane: _Lane, entry: _Entry) -> None:
+        queue = lane.queues.get(entry.agent_id)
+        if queue is None:
+            queue = lane.queues[entry.agent_id] = deque()
+        queue.append(entry)
+        lane.size += 1
+        if lane.index:  # the top lane has nowhere to promote to
+            heapq.heappush(lane.by_age, (entry.lane_since, entry.seq, entry))
+        if entry.agent_id not in lane.tokens:
+            start = max(lane.vtime, lane.finish.get(entry.agent_id, 0.0))
+            self._schedule(lane, entry.agent_id, entry, start)
+
+    def _schedule(self, lane: _Lane, agent_id: str, head: _Entry, start: float) -> None:
+        lane.tokens[agent_id] = head.seq
+        tag = start + head.cost / self.agent_weights.get(agent_id, 1.0)
+        heapq.heappush(lane.ready, (tag, head.seq, agent_id))
+
+    # --- Dispatch ---
+
+    def next(self) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Returns `(agent_id, task)` for the next task to run, or None when idle."""
+        batch = self.next_batch(1)
+        return batch[0] if batch else None
+
+    def next_batch(self, n: int) -> List[Tuple[str, Dict[str, Any]]]:
+        """Dispatches up to `n` tasks in scheduling order."""
+        out: List[Tuple[str, Dict[str, Any]]] = []
+        with self._lock:
+            now = self.clock()
+            self._age(now)
+            for lane in self._lanes:
+                while lane.size and len(out) < n:
+                    entry = self._pop(lane)
+                    if entry is None:
+                        break
+                    entry.done = True
+                    self._waits[entry.priority].append(now - entry.submitted_at)
+                    out.append((entry.agent_id, entry.task))
+                if len(out) >= n:
+                    break
+            self.stats["dispatched"] += len(out)
+        return out
+
+    def _pop(self, lane: _Lane) -> Optional[_Entry]:
+        while lane.ready:
+            tag, token, agent_id = heapq.heappop(lane.ready)
+            if lane.tokens.get(agent_id) != token:
+                continue
+            entry = lane.head(agent_id)
+            if entry is None:
+                # Everything this agent had here was promoted away.
+                del lane.tokens[agent_id]
+                continue
+            lane.queues[agent_id].popleft()
+            lane.size -= 1
+            lane.vtime = tag
+            lane.finish[agent_id] = tag
+            following = lane.head(agent_id)
+            if following is not None:
+                self._schedule(lane, agent_id, following, tag)
+            else:
+                del lane.tokens[agent_id]
+            if len(lane.finish) > 2 * len(lane.tokens) + 1024:
+                # Idle agents whose tag is behind virtual time would restart at V anyway.
+                lane.finish = {a: f for a, f in lane.finish.items() if f > lane.vtime}
+            return entry
+        return None
+
+    def _age(self, now: float) -> None:
+        for lane in self._lanes[1:]:
+            upper = self._lanes[lane.index - 1]
+            heap = lane.by_age
+            while heap:
+                since, _, entry = heap[0]
+                if entry.done or entry.lane != lane.index:
+                    heapq.heappop(heap)
+                    continue
+                if now - since < self.aging_seconds:
+                    break
+                heapq.heappop(heap)
+                # The entry stays in this lane's deque as a tombstone.
+                lane.size -= 1
+                entry.lane = upper.index
+                entry.lane_since = now
+                self._enqueue(upper, entry)
+                self.stats["promoted"] += 1
+
+    # --- Metrics ---
+
+    def wait_stats(self) -> Dict[str, Dict[str, float]]:
+        """p50/p99/max queue wait (seconds) over the recent window, per original priority."""
+        with self._lock:
+            snapshot = [list(waits) for waits in self._waits]
+        result = {}
+        for name, waits in zip(PRIORITIES, snapshot):
+            ordered = sorted(waits)
+            if not ordered:
+                result[name] = {"count": 0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+                continue
+            result[name] = {
+                "count": len(ordered),
+                "p50": ordered[(len(ordered) - 1) // 2],
+                "p99": ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))],
+                "max": ordered[-1],
+            }
+        return result
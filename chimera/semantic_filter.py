@@ -0,0 +1,165 @@
+"""
+Vectorized Semantic Filter for ingested content.
+
+Every ingested item is scored against the agent's interest/persona vectors
+before any task is created. Scoring is done per batch:
+
+1. a lexical prefilter drops items sharing no token with the interest
+   vocabulary (they score 0.0 and are never embedded)
+2. surviving items are embedded together into an (n x d) matrix
+3. one matrix multiply against the (m x d) interest matrix yields all cosine
+   similarities; an item's relevance is its best match, clipped to [0, 1]
+4. the relevance threshold is applied as a boolean mask
+
+`HashingEmbedder` is a dependency-free, process-stable embedder for local
+runs and benchmarks; production agents pass the same embedding model that
+backs Weaviate semantic memory (any callable mapping texts to an array).
+
+Reference: specs/functional.md FR 2.0, FR 2.1 (Semantic Filtering & Relevance Scoring)
+"""
+
+import re
+import zlib
+from functools import lru_cache
+from typing import Any, Callable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+DEFAULT_RELEVANCE_THRESHOLD = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Tokens too common to count as a lexical match on their own.
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+Embedder = Callable[[Sequence[str]], np.ndarray]
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+@lru_cache(maxsize=1 << 16)
+def _hash_token(token: str, dim: int) -> Tuple[int, float]:
+    # crc32 rather than hash(): columns must agree across worker processes.
+    h = zlib.crc32(token.encode("utf-8"))
+    return h % dim, (1.0 if (h >> 31) & 1 else -1.0)
+
+
+class HashingEmbedder:
+    """
+    Signed feature-hashing bag-of-words embedder producing L2-normalized rows.
+    """
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def __call__(self, texts: Sequence[str]) -> np.ndarray:
+        return self.embed_tokens([tokenize(t) for t in texts])
+
+    def embed_tokens(self, token_lists: Sequence[Sequence[str]]) -> np.ndarray:
+        rows: List[int] = []
+        cols: List[int] = []
+        signs: List[float] = []
+        dim = self.dim
+        for row, tokens in enumerate(token_lists):
+            for token in tokens:
+                col, sign = _hash_token(token, dim)
+                rows.append(row)
+                cols.append(col)
+                signs.append(sign)
+        n = len(token_lists)
+        flat = np.asarray(rows, dtype=np.int64) * dim + np.asarray(cols, dtype=np.int64)
+        matrix = np.bincount(flat, weights=np.asarray(signs), minlength=n * dim)
+        return _normalize_rows(matrix.reshape(n, dim))
+
+
+def _normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    return matrix / norms
+
+
+class SemanticFilter:
+    """
+    Batch relevance scorer for one agent's interests.
+
+    `interests` are short texts describing the agent's niche and persona
+    (e.g. SOUL.md voice traits and core beliefs, campaign goals).
+    """
+
+    def __init__(
+        self,
+        interests: Sequence[str],
+        embedder: Optional[Embedder] = None,
+        threshold: float = DEFAULT_RELEVANCE_THRESHOLD,
+        prefilter: bool = True,
+        vocabulary: Optional[Set[str]] = None,
+    ):
+        if not interests:
+            raise ValueError("SemanticFilter needs at least one interest text")
+        if not 0.0 <= threshold <= 1.0:
+            raise ValueError("threshold must be within 0.0-1.0")
+        self.embedder = embedder or HashingEmbedder()
+        self.threshold = threshold
+        self.prefilter = prefilter
+        interest_tokens = [tokenize(text) for text in interests]
+        if vocabulary is None:
+            vocabulary = {tok for tokens in interest_tokens for tok in tokens} - STOPWORDS
+        self.vocabulary = frozenset(vocabulary)
+        self.interest_matrix = self._embed(list(interests), interest_tokens)
+        self.stats = {"scored": 0, "prefiltered": 0, "passed": 0}
+
+    def _embed(self, texts: List[str], token_lists: List[List[str]]) -> np.ndarray:
+        embed_tokens = getattr(self.embedder, "embed_tokens", None)
+        if embed_tokens is not None:
+            return embed_tokens(token_lists)
+        return _normalize_rows(self.embedder(texts))
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Relevance in [0, 1] for every text, as a float32 array.
+
+        Items rejected by the lexical prefilter score exactly 0.0.
+        """
+        n = len(texts)
+        scores = np.zeros(n, dtype=np.float32)
+        if n == 0:
+            return scores
+        token_lists = [tokenize(t) for t in texts]
+        if self.prefilter:
+            vocabulary = self.vocabulary
+            keep = [i for i, tokens in enumerate(token_lists) if not vocabulary.isdisjoint(tokens)]
+        else:
+            keep = list(range(n))
+        self.stats["scored"] += n
+        self.stats["prefiltered"] += n - len(keep)
+        if keep:
+            embeddings = self._embed([texts[i] for i in keep], [token_lists[i] for i in keep])
+            similarity = embeddings @ self.interest_matrix.T
+            scores[keep] = np.clip(similarity.max(axis=1), 0.0, 1.0)
+        return scores
+
+    def mask(self, texts: Sequence[str], threshold: Optional[float] = None) -> np.ndarray:
+        """Boolean array: True where relevance >= threshold."""
+        limit = self.threshold if threshold is None else threshold
+        return self.score(texts) >= limit
+
+    def select(
+        self,
+        items: Sequence[Any],
+        text_of: Callable[[Any], str] = lambda item: item,
+        threshold: Optional[float] = None,
+    ) -> List[Tuple[Any, float]]:
+        """
+        Returns `(item, relevance_score)` for items at or above the threshold,
+        in input order. Only these should reach Planner task creation.
+        """
+        limit = self.threshold if threshold is None else threshold
+        scores = self.score([text_of(item) for item in items])
+        passed = np.flatnonzero(scores >= limit)
+        self.stats["passed"] += len(passed)
+        return [(items[i], float(scores[i])) for i in passed]
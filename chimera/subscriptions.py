@@ -0,0 +1,407 @@
+"""
+Resource subscription engine for FR 2.0 Active Resource Monitoring.
+
+Instead of every agent polling its configured MCP Resources, planners
+`subscribe()` to a URI and the `ResourceMonitor` polls each distinct URI
+once, whatever the number of subscribers, then fans new items out to all of
+them:
+
+- URIs are grouped by a canonical form (scheme/host lowercased, query
+  parameters sorted), so upstream reads scale with distinct resources, not
+  agents
+- intervals adapt per resource: a read that brings new items shortens the
+  interval (`speedup`, down to `min_interval`), an idle read lengthens it
+  (`backoff`, up to the smallest `max_interval` any subscriber asked for);
+  due times are jittered so resources do not synchronize
+- only new items are delivered: items are identified by `id` (or their
+  content) and remembered per resource; a payload identical to the last
+  one short-circuits the diff
+- conditional reads: with `conditional=True` the reader is called as
+  `reader(uri, etag)` and may return `NOT_MODIFIED`; the payload's `etag`
+  is sent back on the next read
+- push: `for_pool()` wires MCP `resources/subscribe`; a resource the server
+  accepts is read when `notifications/resources/updated` arrives and polled
+  only at `max_interval` as a safety net; when the session carrying the
+  subscription drops, the resource is read at once, polled normally and
+  re-subscribed on the next pass (which reconnects); a subscribe that
+  fails is retried on later passes, backing off from `min_interval` up to
+  `max_interval`
+
+Reference: specs/functional.md FR 2.0 (Active Resource Monitoring), specs/technical.md Section 3 (MCP Resource URI Patterns)
+"""
+
+import asyncio
+import hashlib
+import heapq
+import inspect
+import itertools
+import json
+import random
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+DEFAULT_MIN_INTERVAL = 5.0
+DEFAULT_BASE_INTERVAL = 30.0
+DEFAULT_MAX_INTERVAL = 300.0
+DEFAULT_SEEN_ITEMS = 2048
+
+NOT_MODIFIED = object()
+
+Reader = Callable[..., Any]
+Callback = Callable[[str, List[Any]], Any]
+ItemsOf = Callable[[Any], List[Any]]
+
+
+def canonical_uri(uri: str) -> str:
+    """Scheme and host lowercased, query parameters sorted; path kept as is."""
+    parts = urlsplit(uri.strip())
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+
+def default_items(payload: Any) -> List[Any]:
+    """The payload itself if it is a list, else every list value in it (e.g. `trends`, `mentions`)."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        return [item for value in payload.values() if isinstance(value, list) for item in value]
+    return []
+
+
+def _item_key(item: Any) -> str:
+    if isinstance(item, dict):
+        for field in ("id", "tweet_id", "mention_id", "memory_id"):
+            if item.get(field) is not None:
+                return f"{field}:{item[field]}"
+    return hashlib.sha1(json.dumps(item, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class Subscription:
+    __slots__ = ("uri", "agent_id", "callback", "max_interval", "active")
+
+    def __init__(self, uri: str, agent_id: str, callback: Callback, max_interval: float):
+        self.uri = uri
+        self.agent_id = agent_id
+        self.callback = callback
+        self.max_interval = max_interval
+        self.active = True
+
+
+class _Resource:
+    __slots__ = ("uri", "subscribers", "interval", "due", "token", "etag", "digest", "seen", "pushed")
+
+    def __init__(self, uri: str, interval: float, due: float):
+        self.uri = uri
+        self.subscribers: List[Subscription] = []
+        self.interval = interval
+        self.due = due
+        self.token = 0  # matches the one live heap entry
+        self.etag: Optional[str] = None
+        self.digest: Optional[str] = None
+        self.seen: "OrderedDict[str, None]" = OrderedDict()
+        self.pushed = False
+
+    @property
+    def max_interval(self) -> float:
+        return min(s.max_interval for s in self.subscribers)
+
+
+class ResourceMonitor:
+    """
+    Polls each distinct subscribed resource once and fans new items out.
+
+    `reader(uri)` (or `reader(uri, etag)` when `conditional`) returns the
+    resource payload, plain or awaitable. Drive it with `await run()`, or
+    step it with `poll_due()` / `next_due()`.
+    """
+
+    def __init__(
+        self,
+        reader: Reader,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        base_interval: float = DEFAULT_BASE_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        backoff: float = 2.0,
+        speedup: float = 0.5,
+        jitter: float = 0.1,
+        conditional: bool = False,
+        items_of: ItemsOf = default_items,
+        max_concurrency: int = 32,
+        subscribe_upstream: Optional[Callable[[str], Awaitable[bool]]] = None,
+        seen_items: int = DEFAULT_SEEN_ITEMS,
+        clock: Callable[[], float] = time.monotonic,
+        seed: Optional[int] = None,
+    ):
+        if not 0 < min_interval <= base_interval <= max_interval:
+            raise ValueError("expected 0 < min_interval <= base_interval <= max_interval")
+        self.reader = reader
+        self.min_interval = min_interval
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.speedup = speedup
+        self.jitter = jitter
+        self.conditional = conditional
+        self.items_of = items_of
+        self.max_concurrency = max_concurrency
+        self.subscribe_upstream = subscribe_upstream
+        self.seen_items = seen_items
+        self.clock = clock
+        self._rng = random.Random(seed)
+        self._resources: Dict[str, _Resource] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._tokens = itertools.count(1)
+        self._wake: Optional[asyncio.Event] = None
+        self._pending_upstream: Set[str] = set()
+        self._upstream_retry: Dict[str, Tuple[float, float]] = {}  # uri -> (next attempt, delay)
+        self.stats = {
+            "reads": 0, "not_modified": 0, "unchanged": 0, "errors": 0, "new_items": 0,
+            "deliveries": 0, "callback_errors": 0, "push_updates": 0, "subscribe_errors": 0,
+        }
+
+    @classmethod
+    def for_pool(cls, pool: Any, **kwargs: Any) -> "ResourceMonitor":
+        """Reads through an MCPClientPool and uses `resources/subscribe` where servers support it."""
+        monitor = cls(pool.read_resource, subscribe_upstream=pool.subscribe_resource, **kwargs)
+
+        def on_notification(server: str, method: str, params: Dict[str, Any]) -> None:
+            if method == "notifications/resources/updated" and "uri" in params:
+                monitor.notify_updated(params["uri"])
+
+        pool.on_notification(on_notification)
+        pool.on_disconnect(monitor.connection_lost)
+        return monitor
+
+    def __len__(self) -> int:
+        """Distinct resources being monitored."""
+        return len(self._resources)
+
+    @property
+    def subscriber_count(self) -> int:
+        return sum(len(r.subscribers) for r in self._resources.values())
+
+    # --- Subscriptions ---
+
+    def subscribe(
+        self,
+        agent_id: str,
+        uri: str,
+        callback: Callback,
+        max_interval: Optional[float] = None,
+    ) -> Subscription:
+        """
+        `callback(uri, new_items)` (plain or async) runs for every read that
+        brings new items; a subscriber joining an already-monitored resource
+        gets items that arrive from then on. `max_interval` caps how stale
+        this subscriber accepts.
+        """
+        key = canonical_uri(uri)
+        subscription = Subscription(key, agent_id, callback, max_interval or self.max_interval)
+        resource = self._resources.get(key)
+        if resource is None:
+            resource = self._resources[key] = _Resource(key, self.base_interval, self.clock())
+            self._push(resource)
+            if self.subscribe_upstream is not None:
+                self._pending_upstream.add(key)
+        resource.subscribers.append(subscription)
+        if resource.interval > resource.max_interval:
+            resource.interval = resource.max_interval
+            self._reschedule(resource, min(resource.due, self.clock() + resource.interval))
+        self._kick()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.active = False
+        resource = self._resources.get(subscription.uri)
+        if resource is None:
+            return
+        resource.subscribers = [s for s in resource.subscribers if s is not subscription]
+        if not resource.subscribers:
+            del self._resources[subscription.uri]  # its heap entry is skipped from now on
+            self._pending_upstream.discard(subscription.uri)
+            self._upstream_retry.pop(subscription.uri, None)
+
+    def notify_updated(self, uri: str) -> None:
+        """Push path: the server says `uri` changed; read it on the next pass."""
+        resource = self._resources.get(canonical_uri(uri))
+        if resource is not None:
+            self.stats["push_updates"] += 1
+            self._reschedule(resource, self.clock())
+            self._kick()
+
+    def connection_lost(self, server: str) -> None:
+        """The MCP session to `server` ended, and with it the push subscriptions it carried."""
+        server = server.lower()
+        for resource in self._resources.values():
+            if resource.pushed and urlsplit(resource.uri).netloc == server:
+                resource.pushed = False
+                self._pending_upstream.add(resource.uri)
+                self._reschedule(resource, self.clock())  # updates may have been missed meanwhile
+        self._kick()
+
+    # --- Scheduling ---
+
+    def _push(self, resource: _Resource) -> None:
+        resource.token = next(self._tokens)
+        heapq.heappush(self._heap, (resource.due, resource.token, resource.uri))
+
+    def _reschedule(self, resource: _Resource, due: float) -> None:
+        resource.due = due
+        self._push(resource)
+
+    def _kick(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def next_due(self) -> Optional[float]:
+        """Clock time of the earliest scheduled read, or None when idle."""
+        while self._heap:
+            due, token, uri = self._heap[0]
+            resource = self._resources.get(uri)
+            if resource is not None and resource.token == token:
+                return due
+            heapq.heappop(self._heap)
+        return None
+
+    def _pop_due(self, now: float) -> List[_Resource]:
+        due: List[_Resource] = []
+        while self.next_due() is not None and self._heap[0][0] <= now:
+            _, _, uri = heapq.heappop(self._heap)
+            resource = self._resources[uri]
+            resource.token = 0
+            due.append(resource)
+        return due
+
+    # --- Polling ---
+
+    async def poll_due(self) -> int:
+        """Reads every resource that is due (at most `max_concurrency` at once); returns reads made."""
+        await self._subscribe_upstream()
+        due = self._pop_due(self.clock())
+        if not due:
+            return 0
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def poll(resource: _Resource) -> None:
+            async with semaphore:
+                await self._poll(resource)
+
+        await asyncio.gather(*(poll(r) for r in due))
+        return len(due)
+
+    async def _subscribe_upstream(self) -> None:
+        if not self._pending_upstream:
+            return
+        now = self.clock()
+        uris = [uri for uri in self._pending_upstream if self._upstream_retry.get(uri, (now, 0.0))[0] <= now]
+        if not uris:
+            return
+        self._pending_upstream.difference_update(uris)
+        accepted = await asyncio.gather(*(self.subscribe_upstream(uri) for uri in uris), return_exceptions=True)
+        for uri, ok in zip(uris, accepted):
+            resource = self._resources.get(uri)
+            if resource is None:
+                continue
+            if isinstance(ok, BaseException):
+                # Transient failures must not leave the resource polled for good.
+                self.stats["subscribe_errors"] += 1
+                _, delay = self._upstream_retry.get(uri, (now, 0.0))
+                delay = self.min_interval if not delay else min(self.max_interval, delay * self.backoff)
+                self._upstream_retry[uri] = (self.clock() + delay, delay)
+                self._pending_upstream.add(uri)
+                continue
+            self._upstream_retry.pop(uri, None)
+            if ok is True:
+                resource.pushed = True
+
+    async def _poll(self, resource: _Resource) -> None:
+        self.stats["reads"] += 1
+        try:
+            result = self.reader(resource.uri, resource.etag) if self.conditional else self.reader(resource.uri)
+            if inspect.isawaitable(result):
+                result = await result
+        except Exception:  # noqa: BLE001 - a failing resource must not stop the others
+            self.stats["errors"] += 1
+            self._schedule_next(resource, active=False)
+            return
+        if resource.uri not in self._resources:
+            return  # everyone unsubscribed while the read was in flight
+        new_items = self._diff(resource, result)
+        self._schedule_next(resource, active=bool(new_items))
+        if new_items:
+            await self._deliver(resource, new_items)
+
+    def _diff(self, resource: _Resource, payload: Any) -> List[Any]:
+        if payload is NOT_MODIFIED or payload is None:
+            self.stats["not_modified"] += 1
+            return []
+        if isinstance(payload, dict) and payload.get("etag"):
+            resource.etag = str(payload["etag"])
+        digest = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        if digest == resource.digest:
+            self.stats["unchanged"] += 1
+            return []
+        resource.digest = digest
+        new_items = []
+        for item in self.items_of(payload):
+            key = _item_key(item)
+            if key in resource.seen:
+                continue
+            resource.seen[key] = None
+            new_items.append(item)
+        while len(resource.seen) > self.seen_items:
+            resource.seen.popitem(last=False)
+        self.stats["new_items"] += len(new_items)
+        return new_items
+
+    def _schedule_next(self, resource: _Resource, active: bool) -> None:
+        if resource.uri not in self._resources or resource.token:
+            return  # gone, or a push already rescheduled it
+        ceiling = resource.max_interval
+        if resource.pushed:
+            resource.interval = ceiling
+        elif active:
+            resource.interval = max(self.min_interval, resource.interval * self.speedup)
+        else:
+            resource.interval = min(ceiling, resource.interval * self.backoff)
+        spread = resource.interval * self.jitter
+        self._reschedule(resource, self.clock() + resource.interval + self._rng.uniform(-spread, spread))
+
+    async def _deliver(self, resource: _Resource, items: List[Any]) -> None:
+        for subscription in list(resource.subscribers):
+            if not subscription.active:
+                continue
+            try:
+                result = subscription.callback(resource.uri, items)
+                if inspect.isawaitable(result):
+                    await result
+                self.stats["deliveries"] += 1
+            except Exception:  # noqa: BLE001 - one planner's failure must not starve the rest
+                self.stats["callback_errors"] += 1
+
+    async def run(self, stop: Optional[asyncio.Event] = None, idle_wait: float = 1.0) -> None:
+        """Polls until `stop` is set, sleeping until the next read is due or a push/subscribe arrives."""
+        self._wake = asyncio.Event()
+        try:
+            while stop is None or not stop.is_set():
+                await self.poll_due()
+                due = self.next_due()
+                delay = idle_wait if due is None else max(0.0, due - self.clock())
+                self._wake.clear()
+                waits = [asyncio.ensure_future(self._wake.wait())]
+                if stop is not None:
+                    waits.append(asyncio.ensure_future(stop.wait()))
+                await asyncio.wait(waits, timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                for task in waits:
+                    task.cancel()
+        finally:
+            self._wake = None
+
+    def resources(self) -> Dict[str, Dict[str, Any]]:
+        """Per-resource subscriber count, current interval and push status."""
+        return {
+            uri: {"subscribers": len(r.subscribers), "interval": r.interval, "pushed": r.pushed, "due": r.due}
+            for uri, r in self._resources.items()
+        }
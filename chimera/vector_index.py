@@ -0,0 +1,413 @@
+"""
+Local approximate-nearest-neighbour index for semantic memory.
+
+An IVF-Flat index (inverted file over spherical k-means cells) in plain NumPy
+that answers the same contract as the Weaviate-backed resource
+`mcp://memory/{agent_id}/semantic?query={text}&limit={n}`, so it can replace
+the semantic tier in development, tests and latency-sensitive agents (e.g.
+`TieredMemory(semantic_reader=index.read_resource)`).
+
+- vectors, agent codes, cell assignments and payload offsets live in
+  memory-mapped files under `path` and grow by doubling; memories are
+  appended to `payloads.jsonl`, so inserts are incremental and the index
+  reopens without rebuilding. The metadata file (count, agent list) is
+  rewritten every `flush_every` inserted rows, on training and on
+  `flush()`/`close()`; rows added since are dropped on reopen after a crash
+- until `train_threshold` vectors exist, search is exact; then centroids
+  are trained on a sample and every vector is assigned to a cell. The
+  cells are retrained whenever the index grows `retrain_factor`-fold since
+  the last training, so cell sizes stay around sqrt(N)
+- queries probe the `nprobe` closest cells. With an `agent_id` filter,
+  the probe count is widened by the agent's share of the index, and agents
+  small enough that scanning their own vectors is cheaper than that are
+  answered exactly
+- similarity is cosine (vectors are L2-normalized on insert), reported as
+  `score` on each returned memory
+
+Reference: specs/technical.md Section 2.2 (AgentMemory), Section 3 (memory_semantic), specs/functional.md FR 1.1
+"""
+
+import json
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+import numpy as np
+
+from chimera.semantic_filter import HashingEmbedder
+
+DEFAULT_NPROBE = 16
+DEFAULT_TRAIN_THRESHOLD = 10_000
+DEFAULT_FLUSH_EVERY = 1024
+META_FILE = "index.json"
+
+Embedder = Callable[[Sequence[str]], np.ndarray]
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    np.maximum(norms, 1e-12, out=norms)
+    return matrix / norms
+
+
+class _Column:
+    """Growable array, memory-mapped when `path` is set."""
+
+    def __init__(self, path: Optional[Path], dtype: Any, width: int = 0, capacity: int = 1024):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.width = width
+        self.data = self._allocate(capacity, existing=path is not None and path.exists())
+
+    def _shape(self, rows: int) -> Tuple[int, ...]:
+        return (rows, self.width) if self.width else (rows,)
+
+    def _allocate(self, rows: int, existing: bool = False) -> np.ndarray:
+        if self.path is None:
+            return np.zeros(self._shape(rows), dtype=self.dtype)
+        row_bytes = self.dtype.itemsize * max(self.width, 1)
+        if existing:
+            rows = max(rows, os.path.getsize(self.path) // row_bytes)
+        with open(self.path, "ab") as handle:
+            handle.truncate(rows * row_bytes)
+        return np.memmap(self.path, dtype=self.dtype, mode="r+", shape=self._shape(rows))
+
+    def reserve(self, rows: int) -> None:
+        capacity = len(self.data)
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        if self.path is None:
+            grown = np.zeros(self._shape(capacity), dtype=self.dtype)
+            grown[: len(self.data)] = self.data
+            self.data = grown
+        else:
+            self.data.flush()
+            del self.data
+            self.data = self._allocate(capacity)
+
+    def flush(self) -> None:
+        if isinstance(self.data, np.memmap):
+            self.data.flush()
+
+
+class _Postings:
+    """id lists per key (cell or agent): CSR arrays plus per-key tails of later inserts."""
+
+    def __init__(self):
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.ids = np.zeros(0, dtype=np.int64)
+        self.tail: Dict[int, List[int]] = {}
+        self.tail_size = 0
+
+    def rebuild(self, keys: np.ndarray, size: int) -> None:
+        order = np.argsort(keys, kind="stable")
+        counts = np.bincount(keys, minlength=size)
+        self.offsets = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+        self.ids = order.astype(np.int64)
+        self.tail, self.tail_size = {}, 0
+
+    def append(self, ids: Sequence[int], keys: Sequence[int]) -> None:
+        for row, key in zip(ids, keys):
+            self.tail.setdefault(key, []).append(row)
+        self.tail_size += len(ids)
+
+    def get(self, keys: Sequence[int]) -> np.ndarray:
+        parts = [self.ids[self.offsets[k]:self.offsets[k + 1]] for k in keys if k + 1 < len(self.offsets)]
+        parts.extend(np.asarray(self.tail[k], dtype=np.int64) for k in keys if k in self.tail)
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+
+class IVFIndex:
+    """
+    IVF-Flat cosine index with per-agent filtering.
+
+    `path` is a directory for the memory-mapped files (None keeps everything
+    in RAM). An existing index in `path` is reopened; `dim` must match.
+    """
+
+    def __init__(
+        self,
+        path: Optional[os.PathLike] = None,
+        dim: int = 512,
+        nprobe: int = DEFAULT_NPROBE,
+        nlist: Optional[int] = None,
+        train_threshold: int = DEFAULT_TRAIN_THRESHOLD,
+        retrain_factor: float = 4.0,
+        embedder: Optional[Embedder] = None,
+        flush_every: int = DEFAULT_FLUSH_EVERY,
+    ):
+        self.path = Path(path) if path is not None else None
+        self.nprobe = nprobe
+        self.nlist = nlist
+        self._requested_nlist = nlist
+        self.train_threshold = train_threshold
+        self.retrain_factor = retrain_factor
+        self.flush_every = flush_every
+        self.trained_at = 0
+        self.count = 0
+        self._flushed_count = 0
+        self.agents: List[str] = []
+        self.centroids: Optional[np.ndarray] = None
+        meta: Dict[str, Any] = {}
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            if (self.path / META_FILE).exists():
+                meta = json.loads((self.path / META_FILE).read_text())
+                if meta["dim"] != dim:
+                    raise ValueError(f"Index at {self.path} has dim {meta['dim']}, not {dim}")
+        self.dim = dim
+        self.embedder = embedder or HashingEmbedder(dim)
+        self._vectors = _Column(self._file("vectors.f32"), np.float32, dim)
+        self._agent_codes = _Column(self._file("agents.i32"), np.int32)
+        self._cells = _Column(self._file("cells.i32"), np.int32)
+        self._offsets = _Column(self._file("offsets.i64"), np.int64)
+        self._by_cell = _Postings()
+        self._by_agent = _Postings()
+        self._agent_index: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._payloads: Dict[int, bytes] = {}  # offset -> line, when not on disk
+        self._payload_end = 0
+        if meta:
+            self._load(meta)
+
+    def _file(self, name: str) -> Optional[Path]:
+        return self.path / name if self.path is not None else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def trained(self) -> bool:
+        return self.centroids is not None
+
+    # --- Persistence ---
+
+    def _load(self, meta: Dict[str, Any]) -> None:
+        self.count = meta["count"]
+        self.agents = meta["agents"]
+        self._agent_index = {name: code for code, name in enumerate(self.agents)}
+        self._payload_end = meta["payload_end"]
+        self._flushed_count = self.count
+        self.trained_at = meta.get("trained_at", 0)
+        centroids = self.path / "centroids.npy"
+        if centroids.exists():
+            self.centroids = np.load(centroids)
+            self.nlist = len(self.centroids)
+        self._rebuild_postings()
+
+    def flush(self) -> None:
+        """Persists metadata; the count is written last so a torn insert is ignored on reopen."""
+        if self.path is None:
+            return
+        for column in (self._vectors, self._agent_codes, self._cells, self._offsets):
+            column.flush()
+        meta = {"dim": self.dim, "count": self.count, "agents": self.agents, "payload_end": self._payload_end,
+                "trained_at": self.trained_at}
+        tmp = self.path / (META_FILE + ".tmp")
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.path / META_FILE)
+        self._flushed_count = self.count
+
+    def close(self) -> None:
+        self.flush()
+
+    def _rebuild_postings(self) -> None:
+        n = self.count
+        self._by_agent.rebuild(self._agent_codes.data[:n], len(self.agents))
+        if self.trained:
+            self._by_cell.rebuild(self._cells.data[:n], len(self.centroids))
+
+    # --- Inserts ---
+
+    def add(self, agent_id: str, memory: Dict[str, Any], vector: Optional[np.ndarray] = None) -> int:
+        vectors = None if vector is None else np.asarray(vector, dtype=np.float32)[None, :]
+        return self.add_many([agent_id], [memory], vectors)[0]
+
+    def add_many(
+        self,
+        agent_ids: Sequence[str],
+        memories: Sequence[Dict[str, Any]],
+        vectors: Optional[np.ndarray] = None,
+    ) -> List[int]:
+        """
+        Appends AgentMemory records; embeds `content` when `vectors` is None.
+        Returns the new row ids.
+        """
+        if len(agent_ids) != len(memories):
+            raise ValueError("agent_ids and memories must have the same length")
+        if not memories:
+            return []
+        if vectors is None:
+            vectors = self.embedder([m.get("content", "") for m in memories])
+        vectors = _normalize(vectors)
+        if vectors.shape != (len(memories), self.dim):
+            raise ValueError(f"vectors must have shape ({len(memories)}, {self.dim})")
+
+        with self._lock:
+            start, end = self.count, self.count + len(memories)
+            codes = np.empty(len(memories), dtype=np.int32)
+            for i, agent_id in enumerate(agent_ids):
+                code = self._agent_index.get(agent_id)
+                if code is None:
+                    code = self._agent_index[agent_id] = len(self.agents)
+                    self.agents.append(agent_id)
+                codes[i] = code
+            for column in (self._vectors, self._agent_codes, self._cells, self._offsets):
+                column.reserve(end)
+            self._vectors.data[start:end] = vectors
+            self._agent_codes.data[start:end] = codes
+            self._offsets.data[start:end] = self._append_payloads(agent_ids, memories)
+            cells = self._assign(vectors) if self.trained else np.full(len(memories), -1, dtype=np.int32)
+            self._cells.data[start:end] = cells
+            self.count = end
+
+            ids = list(range(start, end))
+            self._by_agent.append(ids, codes.tolist())
+            if self.trained:
+                self._by_cell.append(ids, cells.tolist())
+            if self.trained_at == 0 and self.count >= self.train_threshold:
+                self.train()
+            elif self.trained_at and self.count >= self.trained_at * self.retrain_factor:
+                self.train(nlist=self._requested_nlist or max(1, int(math.sqrt(self.count))))
+            elif self._by_agent.tail_size > max(4096, self.count // 8):
+                self._rebuild_postings()
+            if self.count - self._flushed_count >= self.flush_every:
+                self.flush()
+        return ids
+
+    def _append_payloads(self, agent_ids: Sequence[str], memories: Sequence[Dict[str, Any]]) -> np.ndarray:
+        lines = [
+            (json.dumps({**memory, "agent_id": agent_id}, separators=(",", ":")) + "\n").encode("utf-8")
+            for agent_id, memory in zip(agent_ids, memories)
+        ]
+        offsets = np.empty(len(lines), dtype=np.int64)
+        position = self._payload_end
+        for i, line in enumerate(lines):
+            offsets[i] = position
+            position += len(line)
+        if self.path is None:
+            self._payloads.update(zip(offsets.tolist(), lines))
+        else:
+            with open(self.path / "payloads.jsonl", "ab") as handle:
+                handle.seek(self._payload_end)
+                handle.truncate()
+                handle.write(b"".join(lines))
+        self._payload_end = position
+        return offsets
+
+    def _payload(self, row: int) -> Dict[str, Any]:
+        offset = int(self._offsets.data[row])
+        if self.path is None:
+            return json.loads(self._payloads[offset])
+        with open(self.path / "payloads.jsonl", "rb") as handle:
+            handle.seek(offset)
+            return json.loads(handle.readline())
+
+    # --- Training ---
+
+    def train(self, nlist: Optional[int] = None, sample_size: int = 65_536, iterations: int = 10, seed: int = 0) -> None:
+        """(Re)trains the cell centroids with spherical k-means and reassigns every vector."""
+        with self._lock:
+            n = self.count
+            if n == 0:
+                return
+            nlist = nlist or self.nlist or max(1, int(math.sqrt(n)))
+            nlist = min(nlist, n)
+            rng = np.random.default_rng(seed)
+            sample = self._vectors.data[np.sort(rng.choice(n, size=min(n, max(sample_size, 32 * nlist)), replace=False))]
+            centroids = sample[rng.choice(len(sample), size=nlist, replace=False)].copy()
+            for _ in range(iterations):
+                labels = np.argmax(sample @ centroids.T, axis=1)
+                order = np.argsort(labels, kind="stable")
+                present, starts = np.unique(labels[order], return_index=True)
+                sums = np.zeros_like(centroids)
+                sums[present] = np.add.reduceat(sample[order], starts, axis=0)
+                empty = np.ones(nlist, dtype=bool)
+                empty[present] = False
+                if empty.any():
+                    sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()), replace=False)]
+                centroids = _normalize(sums)
+            self.centroids = centroids.astype(np.float32)
+            self.nlist = nlist
+            self.trained_at = n
+            for begin in range(0, n, 65_536):
+                stop = min(n, begin + 65_536)
+                self._cells.data[begin:stop] = self._assign(self._vectors.data[begin:stop])
+            if self.path is not None:
+                np.save(self.path / "centroids.npy", self.centroids)
+            self._rebuild_postings()
+            self.flush()
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    # --- Queries ---
+
+    def search(
+        self,
+        vector: np.ndarray,
+        limit: int = 10,
+        agent_id: Optional[str] = None,
+        nprobe: Optional[int] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns `(row_ids, scores)` of the `limit` most similar vectors, best first."""
+        query = _normalize(vector).reshape(-1)
+        with self._lock:
+            n = self.count
+            candidates: Optional[np.ndarray] = None
+            code = None
+            if agent_id is not None:
+                code = self._agent_index.get(agent_id)
+                if code is None:
+                    return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+            probes = min(nprobe or self.nprobe, self.nlist or 1)
+            if code is not None:
+                own = self._by_agent.get([code])
+                share = len(own) / n
+                # An agent's k-th neighbour sits around global rank k / share, so keeping
+                # recall needs ~probes / share cells; scanning its own rows is cheaper
+                # unless share ** 2 > probes / nlist.
+                if not self.trained or share * share <= probes / self.nlist:
+                    candidates = own
+                else:
+                    probes = min(self.nlist, math.ceil(probes / share))
+            if candidates is None and self.trained:
+                cells = np.argpartition(-(self.centroids @ query), probes - 1)[:probes]
+                candidates = self._by_cell.get(cells.tolist())
+                if code is not None:
+                    candidates = candidates[self._agent_codes.data[candidates] == code]
+            if candidates is None:
+                scores = self._vectors.data[:n] @ query
+                candidates = np.arange(n)
+            else:
+                candidates = np.sort(candidates)  # sequential reads from the memory map
+                scores = self._vectors.data[candidates] @ query
+        if len(scores) > limit:
+            top = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return candidates[top], scores[top]
+
+    def query(self, agent_id: str, text: str, limit: int = 5) -> List[Dict[str, Any]]:
+        """Memories for `agent_id` most similar to `text`, each with a `score`."""
+        ids, scores = self.search(self.embedder([text])[0], limit, agent_id=agent_id)
+        with self._lock:
+            return [{**self._payload(int(row)), "score": round(float(score), 4)} for row, score in zip(ids, scores)]
+
+    def read_resource(self, uri: str) -> Dict[str, Any]:
+        """Serves `mcp://memory/{agent_id}/semantic?query={text}&limit={n}`."""
+        parsed = urlparse(uri)
+        parts = [unquote(p) for p in parsed.path.strip("/").split("/")]
+        if parsed.scheme != "mcp" or parsed.netloc != "memory" or len(parts) != 2 or parts[1] != "semantic":
+            raise ValueError(f"Not a semantic memory resource: {uri}")
+        params = parse_qs(parsed.query)
+        text = params.get("query", [""])[0]
+        limit = int(params.get("limit", ["5"])[0])
+        return {"memories": self.query(parts[0], text, limit)}
@@ -0,0 +1,426 @@
+"""
+Elastic local Worker Pool: worker processes, each running an asyncio loop.
+
+FR 6.0's Worker Pool pops tasks, executes them and pushes results.
+`WorkerPool` is the local runtime for it:
+
+- each worker process runs its own event loop with up to `slots_per_worker`
+  tasks at once, so I/O-bound MCP calls overlap inside a process while
+  CPU-bound steps (scoring, validation, media post-processing) run in
+  parallel across processes
+- the parent keeps the queue and hands each task to the least-loaded worker
+  with a free slot, never more than a worker can start; the backlog stays
+  in one place (`queue_depth`) and no task waits behind a busy process
+- `ScalingPolicy` sizes the pool from queue depth and observed end-to-end
+  latency: it grows at once when demand outgrows the open slots or p90
+  latency misses the target, and shrinks one worker at a time after demand
+  stayed low for `scale_down_after` seconds
+- a retiring worker finishes its in-flight tasks before it exits, and
+  `close()` drains everything already submitted before stopping the pool
+- tasks held by a worker that dies are redelivered, up to `max_deliveries`
+  times
+
+`handler(task)` runs in the workers, so it must be picklable (a module-level
+function); it may be a coroutine function. Results travel back pickled.
+
+Reference: specs/functional.md FR 6.0 (Worker Pool), specs/technical.md Section 2.3 (agent_status queue_depth)
+"""
+
+import asyncio
+import inspect
+import itertools
+import multiprocessing
+import os
+import pickle
+import signal
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, Optional, Set
+
+from chimera.metrics import LatencyHistogram
+
+DEFAULT_SLOTS_PER_WORKER = 8
+DEFAULT_TARGET_LATENCY = 2.0
+DEFAULT_SCALE_DOWN_AFTER = 30.0
+DEFAULT_CONTROL_INTERVAL = 1.0
+DEFAULT_MAX_DELIVERIES = 3
+
+
+class TaskFailed(RuntimeError):
+    """The handler raised, or the task outlived `max_deliveries` worker crashes."""
+
+
+class ScalingPolicy:
+    """
+    Target worker count for the current load. Scale-up is immediate;
+    scale-down waits `scale_down_after` seconds of low demand per step.
+    """
+
+    def __init__(
+        self,
+        min_workers: int = 1,
+        max_workers: Optional[int] = None,
+        slots_per_worker: int = DEFAULT_SLOTS_PER_WORKER,
+        target_latency: float = DEFAULT_TARGET_LATENCY,
+        scale_down_after: float = DEFAULT_SCALE_DOWN_AFTER,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_workers is None:
+            max_workers = max(os.cpu_count() or 1, min_workers, 1)
+        if not 0 <= min_workers <= max_workers or max_workers < 1:
+            raise ValueError("need 0 <= min_workers <= max_workers and max_workers >= 1")
+        if slots_per_worker < 1:
+            raise ValueError("slots_per_worker must be >= 1")
+        self.min_workers = min_workers
+        self.max_workers = max_workers
+        self.slots_per_worker = slots_per_worker
+        self.target_latency = target_latency
+        self.scale_down_after = scale_down_after
+        self.clock = clock
+        self._low_since: Optional[float] = None
+
+    def decide(self, workers: int, queue_depth: int, in_flight: int, latency_p90: float) -> int:
+        """
+        Workers wanted now. Enough slots for everything queued or running;
+        one more when latency misses the target while workers share load.
+        """
+        demand = queue_depth + in_flight
+        target = -(-demand // self.slots_per_worker)
+        slow = latency_p90 > self.target_latency
+        if slow and demand > workers:
+            target = max(target, workers + 1)
+        target = min(max(target, self.min_workers), self.max_workers)
+        if target >= workers or slow:  # never shrink while latency misses the target
+            self._low_since = None
+            return max(target, workers)
+        now = self.clock()
+        if self._low_since is None:
+            self._low_since = now
+        if now - self._low_since < self.scale_down_after:
+            return workers
+        self._low_since = now  # one step per period
+        return workers - 1
+
+
+# --- Worker process ---
+
+def _worker_main(handler: Callable, initializer: Optional[Callable], inbox: Any, outbox: Any, worker_id: int) -> None:
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # the parent decides when to stop
+    asyncio.run(_worker_loop(handler, initializer, inbox, outbox, worker_id))
+
+
+async def _worker_loop(handler: Callable, initializer: Optional[Callable], inbox: Any, outbox: Any,
+                       worker_id: int) -> None:
+    if initializer is not None:
+        ready = initializer()
+        if inspect.isawaitable(ready):
+            await ready
+    loop = asyncio.get_running_loop()
+    running: Set[asyncio.Future] = set()
+    while True:
+        message = await loop.run_in_executor(None, inbox.get)
+        if message is None:  # retire: finish what we hold, then exit
+            break
+        job = asyncio.ensure_future(_execute(handler, message, outbox, worker_id))
+        running.add(job)
+        job.add_done_callback(running.discard)
+    if running:
+        await asyncio.wait(running)
+    outbox.put(("exit", worker_id, None, None))
+
+
+async def _execute(handler: Callable, message: Any, outbox: Any, worker_id: int) -> None:
+    seq, task = message
+    try:
+        result = handler(task)
+        if inspect.isawaitable(result):
+            result = await result
+        reply = ("done", worker_id, seq, pickle.dumps(result))
+    except Exception as exc:
+        reply = ("error", worker_id, seq, f"{type(exc).__name__}: {exc}")
+    outbox.put(reply)
+
+
+# --- Parent ---
+
+class _Job:
+    __slots__ = ("seq", "task", "future", "submitted_at", "deliveries")
+
+    def __init__(self, seq: int, task: Any, future: asyncio.Future, now: float):
+        self.seq = seq
+        self.task = task
+        self.future = future
+        self.submitted_at = now
+        self.deliveries = 0
+
+
+class _Worker:
+    __slots__ = ("worker_id", "process", "inbox", "jobs", "retiring", "exited", "started_at")
+
+    def __init__(self, worker_id: int, process: Any, inbox: Any, now: float):
+        self.worker_id = worker_id
+        self.process = process
+        self.inbox = inbox
+        self.jobs: Set[int] = set()
+        self.retiring = False
+        self.exited = False
+        self.started_at = now
+
+
+class WorkerPool:
+    """
+    Elastic pool of worker processes. Use from one event loop:
+
+        async with WorkerPool(handler, ScalingPolicy(max_workers=8)) as pool:
+            result = await pool.submit(task)
+
+    `external_depth` adds work still waiting outside the pool (e.g.
+    `lambda: task_queue.depth(agent_id)`) to the depth the policy sees.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Any],
+        policy: Optional[ScalingPolicy] = None,
+        initializer: Optional[Callable[[], Any]] = None,
+        max_deliveries: int = DEFAULT_MAX_DELIVERIES,
+        control_interval: float = DEFAULT_CONTROL_INTERVAL,
+        external_depth: Optional[Callable[[], int]] = None,
+        mp_context: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_deliveries < 1:
+            raise ValueError("max_deliveries must be >= 1")
+        self.handler = handler
+        self.policy = policy or ScalingPolicy(clock=clock)
+        self.initializer = initializer
+        self.max_deliveries = max_deliveries
+        self.control_interval = control_interval
+        self.external_depth = external_depth
+        self.clock = clock
+        self.latency = LatencyHistogram()  # submit -> result, all time
+        self._window = LatencyHistogram()  # since the last control tick
+        self._window_start = clock()
+        self._ctx = mp_context or multiprocessing.get_context()
+        self._outbox: Any = None
+        self._reader: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._control_task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._idle: Optional[asyncio.Event] = None
+        self._pending: Deque[_Job] = deque()
+        self._jobs: Dict[int, _Job] = {}
+        self._workers: Dict[int, _Worker] = {}
+        self._seq = itertools.count()
+        self._worker_ids = itertools.count()
+        self._closing = False
+        self._stopping = False
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "redelivered": 0, "crashed": 0,
+                      "scaled_up": 0, "scaled_down": 0, "peak_workers": 0, "worker_seconds": 0.0}
+
+    async def __aenter__(self) -> "WorkerPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+    @property
+    def workers(self) -> int:
+        """Workers taking new tasks (retiring ones excluded)."""
+        return sum(1 for worker in self._workers.values() if not worker.retiring)
+
+    def status(self) -> Dict[str, Any]:
+        """Fields for the agent's status hash / heartbeat."""
+        return {
+            "state": "working" if self._pending or self._jobs else "sleeping",
+            "queue_depth": len(self._pending),
+            "in_flight": len(self._jobs),
+            "workers": self.workers,
+            "latency_p90": self.latency.percentile(90),
+        }
+
+    # --- Lifecycle ---
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._wake = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._outbox = self._ctx.Queue()
+        self._reader = threading.Thread(target=self._read, name="chimera-worker-results", daemon=True)
+        self._reader.start()
+        for _ in range(self.policy.min_workers):
+            self._spawn()
+        self._control_task = asyncio.ensure_future(self._control())
+
+    async def close(self, timeout: Optional[float] = None) -> None:
+        """
+        Stops intake and waits for every submitted task to finish, then
+        retires the workers. After `timeout` seconds, unfinished tasks fail
+        and the workers are terminated.
+        """
+        self._closing = True
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            for job in itertools.chain(self._pending, self._jobs.values()):
+                if not job.future.done():
+                    job.future.set_exception(TaskFailed("pool closed before the task finished"))
+            self._pending.clear()
+            self._jobs.clear()
+            for worker in self._workers.values():
+                worker.jobs.clear()
+                worker.process.terminate()
+        self._stopping = True
+        for worker in list(self._workers.values()):
+            if not worker.retiring:
+                self._retire(worker)
+        while self._workers:
+            await asyncio.sleep(0.01)
+            self._reap()
+        self._control_task.cancel()
+        self._outbox.put(None)
+        await self._loop.run_in_executor(None, self._reader.join)
+        self._outbox.close()
+
+    # --- Submission ---
+
+    def submit(self, task: Any) -> "asyncio.Future[Any]":
+        """Queues a task; the future resolves to the handler's result or raises TaskFailed."""
+        if self._closing or self._loop is None:
+            raise RuntimeError("pool is not running")
+        job = _Job(next(self._seq), task, self._loop.create_future(), self.clock())
+        self._pending.append(job)
+        self._idle.clear()
+        self.stats["submitted"] += 1
+        self._dispatch()
+        if self._pending:
+            self._wake.set()  # out of slots: let the controller look now
+        return job.future
+
+    def _dispatch(self) -> None:
+        slots = self.policy.slots_per_worker
+        while self._pending:
+            worker = min((w for w in self._workers.values() if not w.retiring and len(w.jobs) < slots),
+                         key=lambda w: len(w.jobs), default=None)
+            if worker is None:
+                return
+            job = self._pending.popleft()
+            job.deliveries += 1
+            self._jobs[job.seq] = job
+            worker.jobs.add(job.seq)
+            worker.inbox.put((job.seq, job.task))
+
+    # --- Results ---
+
+    def _read(self) -> None:
+        while True:
+            message = self._outbox.get()
+            if message is None:
+                return
+            self._loop.call_soon_threadsafe(self._on_message, message)
+
+    def _on_message(self, message: Any) -> None:
+        kind, worker_id, seq, payload = message
+        worker = self._workers.get(worker_id)
+        if kind == "exit":
+            if worker is not None:
+                worker.exited = True
+            return
+        if worker is not None:
+            worker.jobs.discard(seq)
+        job = self._jobs.pop(seq, None)
+        if job is None:
+            return  # a redelivered task that already finished elsewhere
+        elapsed = self.clock() - job.submitted_at
+        self.latency.observe(elapsed)
+        self._window.observe(elapsed)
+        if not job.future.done():
+            if kind == "done":
+                job.future.set_result(pickle.loads(payload))
+            else:
+                job.future.set_exception(TaskFailed(payload))
+        self.stats["completed" if kind == "done" else "failed"] += 1
+        self._dispatch()
+        self._check_idle()
+
+    def _check_idle(self) -> None:
+        if not self._pending and not self._jobs:
+            self._idle.set()
+
+    # --- Scaling ---
+
+    async def _control(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.control_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            self._reap()
+            if not self._stopping:
+                self._scale()
+                self._dispatch()
+
+    def _scale(self) -> None:
+        now = self.clock()
+        depth = len(self._pending) + (self.external_depth() if self.external_depth is not None else 0)
+        target = self.policy.decide(self.workers, depth, len(self._jobs), self._window.percentile(90))
+        if now - self._window_start >= self.control_interval:
+            self._window = LatencyHistogram()
+            self._window_start = now
+        while self.workers < target:
+            self._spawn()
+            self.stats["scaled_up"] += 1
+        surplus = self.workers - target
+        if surplus > 0:
+            idlest = sorted((w for w in self._workers.values() if not w.retiring), key=lambda w: len(w.jobs))
+            for worker in idlest[:surplus]:
+                self._retire(worker)
+                self.stats["scaled_down"] += 1
+
+    def _spawn(self) -> None:
+        worker_id = next(self._worker_ids)
+        inbox = self._ctx.Queue()
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(self.handler, self.initializer, inbox, self._outbox, worker_id),
+            name=f"chimera-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._workers[worker_id] = _Worker(worker_id, process, inbox, self.clock())
+        self.stats["peak_workers"] = max(self.stats["peak_workers"], len(self._workers))
+
+    def _retire(self, worker: _Worker) -> None:
+        worker.retiring = True
+        worker.inbox.put(None)  # after everything already assigned to it
+
+    def _reap(self) -> None:
+        """Collects exited workers; redelivers tasks held by crashed ones."""
+        for worker in list(self._workers.values()):
+            if worker.process.is_alive():
+                continue
+            if worker.retiring and not worker.exited and worker.process.exitcode == 0:
+                continue  # clean exit; its last results are still in the pipe
+            worker.process.join()
+            worker.inbox.close()
+            del self._workers[worker.worker_id]
+            self.stats["worker_seconds"] += self.clock() - worker.started_at
+            if worker.exited:
+                continue
+            self.stats["crashed"] += 1
+            for seq in sorted(worker.jobs, reverse=True):
+                job = self._jobs.pop(seq, None)
+                if job is None:
+                    continue
+                if job.deliveries >= self.max_deliveries:
+                    job.future.set_exception(TaskFailed(f"worker died {job.deliveries} times running this task"))
+                    self.stats["failed"] += 1
+                else:
+                    self._pending.appendleft(job)
+                    self.stats["redelivered"] += 1
+        self._check_idle()
+
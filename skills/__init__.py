@@ -0,0 +1,23 @@
+"""
+Chimera runtime skills.
+
+Reference: skills/README.md
+"""
+
+from skills.schema_registry import (
+    CompiledValidator,
+    SchemaRegistry,
+    SchemaValidationError,
+    registry,
+    validate_input,
+    validate_output,
+)
+
+__all__ = [
+    "CompiledValidator",
+    "SchemaRegistry",
+    "SchemaValidationError",
+    "registry",
+    "validate_input",
+    "validate_output",
+]
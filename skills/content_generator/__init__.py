@@ -0,0 +1,27 @@
+"""
+content_generator skill.
+
+Reference: skills/content_generator/README.md
+"""
+
+from skills.content_generator.cache import GenerationCache, canonical_parameters, generation_key
+from skills.content_generator.render import (
+    RenderJob,
+    RenderPipeline,
+    RenderQueueFull,
+    TierConfig,
+    review_queue_callback,
+    review_result,
+)
+
+__all__ = [
+    "GenerationCache",
+    "RenderJob",
+    "RenderPipeline",
+    "RenderQueueFull",
+    "TierConfig",
+    "canonical_parameters",
+    "generation_key",
+    "review_queue_callback",
+    "review_result",
+]
@@ -0,0 +1,330 @@
+"""
+Content-addressed cache of content_generator results.
+
+Campaigns regenerate near-identical assets: the same topic, platform,
+character LoRA and content type across agents and retries. Each of those
+is a paid image or video tool call. Results are stored under a SHA-256 of the
+canonical generation parameters:
+
+- canonical parameters: whitespace-collapsed, case-folded `topic`, sorted
+  de-duplicated `persona_constraints`, `tier` defaulted to "daily";
+  `budget_limit_usdc` is excluded (it caps spend, it does not change output)
+- single-flight: concurrent identical requests share one paid generation;
+  only the caller that triggered it reports its cost
+- disk-backed: one JSON file per key under `directory`, written atomically,
+  so hits survive restarts and are shared by workers on the same volume
+  (an index miss checks the disk for entries other workers wrote)
+- eviction by age (`max_age` since generation) and by size (`max_bytes`,
+  least recently used first)
+- a result that cannot be stored (disk full, permissions) is still
+  returned; the failure is logged and counted in `stats["store_errors"]`
+- hits and coalesced waiters report `generation_cost_usdc: 0.0`, with
+  `cache_hit: true` and the original `cached_cost_usdc`, so CFO Judge budget
+  tracking only counts money actually spent
+
+Reference: skills/content_generator/README.md, skills/content_generator/output_schema.json (metadata.generation_cost_usdc)
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple, Union
+
+KEY_FIELDS = ("content_type", "platform", "topic", "character_reference_id", "tier", "persona_constraints")
+DEFAULT_TIER = "daily"
+
+logger = logging.getLogger(__name__)
+
+Generator = Callable[[Mapping[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+def _normalize_text(value: str) -> str:
+    return " ".join(str(value).split()).casefold()
+
+
+def canonical_parameters(parameters: Mapping[str, Any]) -> Dict[str, Any]:
+    """The subset of content_generator `parameters` that determines the output, normalized."""
+    canonical: Dict[str, Any] = {
+        "content_type": parameters.get("content_type"),
+        "platform": parameters.get("platform"),
+        "topic": _normalize_text(parameters.get("topic") or ""),
+        "tier": parameters.get("tier") or DEFAULT_TIER,
+    }
+    if parameters.get("character_reference_id"):
+        canonical["character_reference_id"] = parameters["character_reference_id"]
+    constraints = {_normalize_text(c) for c in parameters.get("persona_constraints") or ()}
+    if constraints:
+        canonical["persona_constraints"] = sorted(constraints)
+    return canonical
+
+
+def generation_key(parameters: Mapping[str, Any], namespace: str = "") -> str:
+    """SHA-256 of the canonical parameters; `namespace` separates model/tool versions."""
+    canonical = json.dumps(canonical_parameters(parameters), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256((namespace + "\n" + canonical).encode("utf-8")).hexdigest()
+
+
+class GenerationCache:
+    """
+    Disk-backed, content-addressed result cache with single-flight generation.
+
+    `clock` is wall-clock time (entries outlive the process); file mtimes
+    record when each result was generated.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_age: float = 7 * 86400.0,
+        max_bytes: int = 256 * 2 ** 20,
+        namespace: str = "",
+        clock: Callable[[], float] = time.time,
+    ):
+        if max_bytes < 1:
+            raise ValueError("max_bytes must be >= 1")
+        self.directory = Path(directory)
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.namespace = namespace
+        self.clock = clock
+        # key -> (stored_at, size), least recently used first
+        self._index: "OrderedDict[str, Tuple[float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._inflight: Dict[str, "asyncio.Future[Dict[str, Any]]"] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "hits": 0, "misses": 0, "coalesced": 0, "generations": 0,
+            "expired": 0, "evictions": 0, "store_errors": 0, "spent_usdc": 0.0, "saved_usdc": 0.0,
+        }
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def key(self, parameters: Mapping[str, Any]) -> str:
+        return generation_key(parameters, self.namespace)
+
+    # --- Lookup ---
+
+    def get(self, parameters: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+        """A cached result shaped as a hit (zero cost), or None."""
+        key = self.key(parameters)
+        stored = self._read(key)
+        if stored is None:
+            return None
+        with self._lock:
+            self.stats["hits"] += 1
+        return self._as_hit(stored, key)
+
+    async def generate(self, parameters: Mapping[str, Any], generator: Generator) -> Dict[str, Any]:
+        """
+        Returns the cached result for `parameters`, or calls `generator(parameters)` once.
+
+        Identical requests arriving while a generation is in flight wait on it
+        and receive it as a zero-cost hit. Failed generations are not cached.
+        """
+        key = self.key(parameters)
+        stored = self._read(key)
+        if stored is not None:
+            with self._lock:
+                self.stats["hits"] += 1
+            return self._as_hit(stored, key)
+
+        pending = self._pending(key)
+        if pending is not None:
+            with self._lock:
+                self.stats["coalesced"] += 1
+            return self._as_hit(await asyncio.shield(pending), key)
+
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        with self._lock:
+            self.stats["misses"] += 1
+        try:
+            result = await generator(parameters)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a generation nobody else awaited doesn't log a warning.
+            future.exception()
+            raise
+        else:
+            # The generation is paid for: a storage failure must not fail it or make a retry pay again.
+            try:
+                self.put(parameters, result)
+            except (OSError, TypeError, ValueError):
+                logger.exception("could not cache generation %s", key)
+                with self._lock:
+                    self.stats["store_errors"] += 1
+            future.set_result(result)
+            with self._lock:
+                self.stats["generations"] += 1
+                self.stats["spent_usdc"] += _cost(result)
+            return result
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _pending(self, key: str) -> "Optional[asyncio.Future[Dict[str, Any]]]":
+        future = self._inflight.get(key)
+        # Futures from a loop that has since been closed (asyncio.run per call) are unusable.
+        if future is None or future.done() or future.get_loop() is not asyncio.get_running_loop():
+            return None
+        return future
+
+    def _as_hit(self, result: Dict[str, Any], key: str) -> Dict[str, Any]:
+        hit = copy.deepcopy(result)
+        metadata = hit.setdefault("metadata", {})
+        cost = _cost(result)
+        metadata["cached_cost_usdc"] = cost
+        metadata["generation_cost_usdc"] = 0.0
+        metadata["cache_hit"] = True
+        metadata["cache_key"] = key
+        with self._lock:
+            self.stats["saved_usdc"] += cost
+        return hit
+
+    # --- Store ---
+
+    def put(self, parameters: Mapping[str, Any], result: Mapping[str, Any]) -> str:
+        """Stores `result` under the key of `parameters`; returns the key."""
+        key = self.key(parameters)
+        now = self.clock()
+        record = {"key": key, "parameters": canonical_parameters(parameters), "result": result}
+        data = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.utime(tmp, (now, now))
+        os.replace(tmp, path)
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+            self._index[key] = (now, len(data))
+            self._bytes += len(data)
+            victims = self._over_budget()
+        self._unlink(victims)
+        return key
+
+    def invalidate(self, parameters: Optional[Mapping[str, Any]] = None) -> None:
+        """Drops the entry for `parameters`, or everything when None."""
+        with self._lock:
+            keys = list(self._index) if parameters is None else [self.key(parameters)]
+            for key in keys:
+                entry = self._index.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry[1]
+        self._unlink(keys)
+
+    def prune(self) -> int:
+        """Removes every entry older than `max_age`; returns how many."""
+        cutoff = self.clock() - self.max_age
+        with self._lock:
+            expired = [key for key, (stored_at, _) in self._index.items() if stored_at < cutoff]
+            for key in expired:
+                self._bytes -= self._index.pop(key)[1]
+            self.stats["expired"] += len(expired)
+        self._unlink(expired)
+        return len(expired)
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            known = key in self._index
+        if not known and not self._adopt(key):
+            return None
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            if self.clock() - entry[0] > self.max_age:
+                del self._index[key]
+                self._bytes -= entry[1]
+                self.stats["expired"] += 1
+                expired = True
+            else:
+                self._index.move_to_end(key)
+                expired = False
+        if expired:
+            self._unlink([key])
+            return None
+        try:
+            return json.loads(self._path(key).read_bytes())["result"]
+        except (OSError, ValueError, KeyError):
+            # Removed by another worker's eviction, or a torn/corrupt file: treat as a miss.
+            with self._lock:
+                entry = self._index.pop(key, None)
+                if entry is not None:
+                    self._bytes -= entry[1]
+            self._unlink([key])
+            return None
+
+    def _adopt(self, key: str) -> bool:
+        """Indexes an entry another worker wrote after our scan; False if there is none."""
+        try:
+            st = self._path(key).stat()
+        except OSError:
+            return False
+        with self._lock:
+            if key not in self._index:
+                self._index[key] = (st.st_mtime, st.st_size)
+                self._bytes += st.st_size
+            victims = self._over_budget()
+        self._unlink(victims)
+        return True
+
+    def _over_budget(self) -> list:
+        victims = []
+        while self._bytes > self.max_bytes and len(self._index) > 1:
+            key, (_, size) = self._index.popitem(last=False)
+            self._bytes -= size
+            self.stats["evictions"] += 1
+            victims.append(key)
+        return victims
+
+    def _unlink(self, keys) -> None:
+        for key in keys:
+            try:
+                self._path(key).unlink()
+            except FileNotFoundError:
+                pass
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _scan(self) -> None:
+        """Rebuilds the index from disk, oldest first, then applies the size budget."""
+        found = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir() or len(shard.name) != 2:
+                continue
+            for item in os.scandir(shard.path):
+                if item.name.endswith(".json") and not item.name.startswith("."):
+                    st = item.stat()
+                    found.append((st.st_mtime, item.name[:-5], st.st_size))
+        found.sort()
+        with self._lock:
+            for stored_at, key, size in found:
+                self._index[key] = (stored_at, size)
+                self._bytes += size
+            victims = self._over_budget()
+        self._unlink(victims)
+
+
+def _cost(result: Mapping[str, Any]) -> float:
+    return float((result.get("metadata") or {}).get("generation_cost_usdc") or 0.0)
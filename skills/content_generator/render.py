@@ -0,0 +1,380 @@
+"""
+Asynchronous tiered video rendering for content_generator (FR 3.2).
+
+A video render takes minutes; awaiting it inside the skill call holds a
+Worker for the whole render. `RenderPipeline.submit()` instead returns a
+`RenderJob` handle at once and renders in the background:
+
+- one queue per tier: Tier 1 "daily" (image-to-video) and Tier 2 "hero"
+  (text-to-video), so a backlog of hero renders never delays daily ones
+- each tier has a fixed number of render slots; Tier 1 runs many renders in
+  parallel, Tier 2 is additionally rate-limited (token bucket: `rate` starts
+  per second with `burst`), matching the paid text-to-video tool's quota
+- bounded queues: `submit()` raises RenderQueueFull instead of buffering
+  without limit
+- completion callbacks (`on_complete`) run for every finished job;
+  `review_queue_callback()` turns finished jobs into TaskResults on the
+  ReviewQueue for the Judge
+- an optional GenerationCache de-duplicates identical renders
+
+Reference: specs/functional.md FR 3.2 (Hybrid Video Rendering Strategy), FR 6.0, skills/content_generator/README.md
+"""
+
+import asyncio
+import time
+import uuid
+from collections import OrderedDict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Mapping, Optional
+
+from chimera.metrics import LatencyHistogram
+
+TIERS = ("daily", "hero")
+TIER_NUMBER = {"daily": 1, "hero": 2}
+TIER_MODE = {"daily": "image-to-video", "hero": "text-to-video"}
+
+QUEUED, RENDERING, COMPLETE, FAILED, CANCELLED = "queued", "rendering", "complete", "failed", "cancelled"
+
+Renderer = Callable[[Mapping[str, Any]], Awaitable[Dict[str, Any]]]
+
+
+class RenderQueueFull(RuntimeError):
+    """A tier's queue is at `max_queued`; the caller should retry later or downgrade the tier."""
+
+
+@dataclass(frozen=True)
+class TierConfig:
+    concurrency: int
+    rate: Optional[float] = None  # renders started per second; None = unlimited
+    burst: int = 1
+    max_queued: int = 1000
+
+
+DEFAULT_TIERS = {
+    "daily": TierConfig(concurrency=16),
+    "hero": TierConfig(concurrency=2, rate=1 / 60.0, burst=2, max_queued=200),
+}
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class RenderJob:
+    """Handle for one render; `await job.wait()` returns the content_generator result."""
+
+    __slots__ = ("job_id", "task_id", "agent_id", "tier", "parameters", "status", "submitted_at",
+                 "started_at", "finished_at", "result", "error", "_future")
+
+    def __init__(self, tier: str, parameters: Mapping[str, Any], task_id: Optional[str], agent_id: Optional[str],
+                 submitted_at: float, future: "asyncio.Future[Dict[str, Any]]"):
+        self.job_id = str(uuid.uuid4())
+        self.task_id = task_id or self.job_id
+        self.agent_id = agent_id
+        self.tier = tier
+        self.parameters = dict(parameters)
+        self.status = QUEUED
+        self.submitted_at = submitted_at
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[BaseException] = None
+        self._future = future
+
+    def done(self) -> bool:
+        return self.status in (COMPLETE, FAILED, CANCELLED)
+
+    async def wait(self) -> Dict[str, Any]:
+        """The render result; raises the render error, or CancelledError if cancelled."""
+        return await asyncio.shield(self._future)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The handle returned to the skill caller in place of the finished content."""
+        return {
+            "job_id": self.job_id,
+            "task_id": self.task_id,
+            "tier": self.tier,
+            "status": self.status,
+            "error": None if self.error is None else str(self.error),
+        }
+
+    def _finish(self, status: str, now: float, result: Optional[Dict[str, Any]] = None,
+                error: Optional[BaseException] = None) -> None:
+        self.status = status
+        self.finished_at = now
+        self.result = result
+        self.error = error
+        if self._future.done():
+            return
+        if status == COMPLETE:
+            self._future.set_result(result)
+        elif status == CANCELLED:
+            self._future.cancel()
+        else:
+            self._future.set_exception(error)
+            # Mark retrieved so a job nobody awaits doesn't log a warning.
+            self._future.exception()
+
+
+class _TokenBucket:
+    __slots__ = ("rate", "burst", "tokens", "updated")
+
+    def __init__(self, rate: float, burst: int, now: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = now
+
+    def reserve(self, now: float) -> float:
+        """Takes one token; returns how long to wait before using it."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class RenderPipeline:
+    """
+    Per-tier bounded render queues drained by a fixed number of slots each.
+
+    `renderers` maps tier ("daily", "hero") to an async function taking the
+    content_generator `parameters` and returning its output document.
+    `submit()` must be called from the event loop that runs the renders.
+    Handles of the last `max_jobs` jobs stay available through `get()`.
+    """
+
+    def __init__(
+        self,
+        renderers: Mapping[str, Renderer],
+        tiers: Optional[Mapping[str, TierConfig]] = None,
+        cache: Any = None,
+        timeout: Optional[float] = None,
+        max_jobs: int = 10_000,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.tiers = dict(DEFAULT_TIERS)
+        self.tiers.update(tiers or {})
+        unknown = set(renderers) - set(TIERS)
+        if unknown:
+            raise ValueError(f"Unknown tiers: {sorted(unknown)}")
+        for tier in renderers:
+            if self.tiers[tier].concurrency < 1:
+                raise ValueError(f"{tier} concurrency must be >= 1")
+        self.renderers = dict(renderers)
+        self.cache = cache
+        self.timeout = timeout
+        self.max_jobs = max_jobs
+        self.clock = clock
+        self._queues: Dict[str, Deque[RenderJob]] = {tier: deque() for tier in TIERS}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._workers: List["asyncio.Task[None]"] = []
+        self._buckets: Dict[str, _TokenBucket] = {}
+        self._jobs: "OrderedDict[str, RenderJob]" = OrderedDict()
+        self._active = {tier: 0 for tier in TIERS}
+        self._callbacks: List[Callable[[RenderJob], Any]] = []
+        self._closing = False
+        self.queue_wait = {tier: LatencyHistogram() for tier in TIERS}
+        self.render_time = {tier: LatencyHistogram() for tier in TIERS}
+        self.stats = {"submitted": 0, "completed": 0, "failed": 0, "cancelled": 0, "rejected": 0,
+                      "callback_errors": 0, "max_active": {tier: 0 for tier in TIERS}}
+
+    def on_complete(self, callback: Callable[[RenderJob], Any]) -> None:
+        """Registers `callback(job)`, called once per job when it completes, fails or is cancelled."""
+        self._callbacks.append(callback)
+
+    # --- Jobs ---
+
+    def submit(
+        self,
+        parameters: Mapping[str, Any],
+        task_id: Optional[str] = None,
+        agent_id: Optional[str] = None,
+    ) -> RenderJob:
+        """Queues a render of `parameters` on its tier (default "daily") and returns its handle."""
+        if self._closing:
+            raise RuntimeError("RenderPipeline is closed")
+        tier = parameters.get("tier") or "daily"
+        if tier not in self.renderers:
+            raise ValueError(f"No renderer for tier {tier!r}")
+        queue = self._queues[tier]
+        if len(queue) >= self.tiers[tier].max_queued:
+            self.stats["rejected"] += 1
+            raise RenderQueueFull(f"{tier} render queue is full ({len(queue)} jobs)")
+        self._start()
+        job = RenderJob(tier, parameters, task_id, agent_id, self.clock(), asyncio.get_running_loop().create_future())
+        self._jobs[job.job_id] = job
+        queue.append(job)
+        self._wakeups[tier].set()
+        self.stats["submitted"] += 1
+        return job
+
+    def get(self, job_id: str) -> Optional[RenderJob]:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancels a job that has not started rendering."""
+        job = self._jobs.get(job_id)
+        if job is None or job.status != QUEUED:
+            return False
+        self._queues[job.tier].remove(job)
+        self._finish(job, CANCELLED)
+        return True
+
+    def depth(self, tier: Optional[str] = None) -> int:
+        """Jobs waiting for a render slot (one tier, or all)."""
+        return sum(len(self._queues[t]) for t in ([tier] if tier else TIERS))
+
+    def active(self, tier: Optional[str] = None) -> int:
+        return sum(self._active[t] for t in ([tier] if tier else TIERS))
+
+    # --- Execution ---
+
+    def _start(self) -> None:
+        if self._workers:
+            return
+        now = self.clock()
+        for tier in self.renderers:
+            config = self.tiers[tier]
+            if config.rate:
+                self._buckets[tier] = _TokenBucket(config.rate, config.burst, now)
+            self._wakeups[tier] = asyncio.Event()
+            self._workers.extend(asyncio.ensure_future(self._slot(tier)) for _ in range(config.concurrency))
+
+    async def _slot(self, tier: str) -> None:
+        queue, wakeup = self._queues[tier], self._wakeups[tier]
+        bucket = self._buckets.get(tier)
+        while True:
+            if not queue:
+                if self._closing:
+                    return
+                wakeup.clear()
+                await wakeup.wait()
+                continue
+            if bucket is not None:
+                delay = bucket.reserve(self.clock())
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                if not queue:
+                    bucket.tokens += 1  # the job was cancelled while we waited
+                    continue
+            await self._render(queue.popleft())
+
+    async def _render(self, job: RenderJob) -> None:
+        tier = job.tier
+        job.status = RENDERING
+        job.started_at = self.clock()
+        self.queue_wait[tier].observe(max(0.0, job.started_at - job.submitted_at))
+        self._active[tier] += 1
+        self.stats["max_active"][tier] = max(self.stats["max_active"][tier], self._active[tier])
+        renderer = self.renderers[tier]
+        try:
+            work = renderer(job.parameters) if self.cache is None else self.cache.generate(job.parameters, renderer)
+            result = await (work if self.timeout is None else asyncio.wait_for(work, self.timeout))
+        except asyncio.CancelledError:
+            self._finish(job, CANCELLED)
+            raise
+        except Exception as exc:  # noqa: BLE001 - recorded on the job and reported to the Judge
+            self._finish(job, FAILED, error=exc)
+        else:
+            self._finish(job, COMPLETE, result=result)
+        finally:
+            self._active[tier] -= 1
+            self.render_time[tier].observe(max(0.0, self.clock() - job.started_at))
+
+    def _finish(self, job: RenderJob, status: str, result: Optional[Dict[str, Any]] = None,
+                error: Optional[BaseException] = None) -> None:
+        job._finish(status, self.clock(), result, error)
+        self.stats[{COMPLETE: "completed", FAILED: "failed", CANCELLED: "cancelled"}[status]] += 1
+        for callback in self._callbacks:
+            try:
+                callback(job)
+            except Exception:  # noqa: BLE001 - one bad callback must not lose the job
+                self.stats["callback_errors"] += 1
+        excess = len(self._jobs) - self.max_jobs
+        if excess > 0:
+            # Oldest finished handles go first; unfinished ones are always kept.
+            stale = []
+            for job_id, old in self._jobs.items():
+                if len(stale) == excess:
+                    break
+                if old.done():
+                    stale.append(job_id)
+            for job_id in stale:
+                del self._jobs[job_id]
+
+    async def join(self) -> None:
+        """Waits until every submitted job has finished."""
+        while self.depth() or self.active():
+            pending = [job._future for job in self._jobs.values() if not job.done()]
+            if pending:
+                await asyncio.wait(pending)
+            else:
+                await asyncio.sleep(0)
+
+    async def close(self, drain: bool = True) -> None:
+        """Stops the slots; with `drain`, finishes queued jobs first, otherwise cancels them."""
+        self._closing = True
+        if not drain:
+            for tier in TIERS:
+                while self._queues[tier]:
+                    self._finish(self._queues[tier].popleft(), CANCELLED)
+        for wakeup in self._wakeups.values():
+            wakeup.set()
+        if drain:
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        else:
+            for worker in self._workers:
+                worker.cancel()
+            await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            tier: {
+                "queued": len(self._queues[tier]),
+                "active": self._active[tier],
+                "queue_wait": self.queue_wait[tier].snapshot(),
+                "render_time": self.render_time[tier].snapshot(),
+            }
+            for tier in TIERS
+        }
+
+
+# --- Review handoff ---
+
+def review_result(job: RenderJob, worker_id: str) -> Dict[str, Any]:
+    """TaskResult for a finished job (specs/technical.md Section 1.2)."""
+    elapsed = (job.finished_at or 0.0) - (job.started_at or job.submitted_at)
+    trace = f"Tier {TIER_NUMBER[job.tier]} ({job.tier}) {TIER_MODE[job.tier]} render {job.job_id}"
+    result: Dict[str, Any] = {
+        "task_id": job.task_id,
+        "worker_id": worker_id,
+        "created_at": _iso(job.finished_at or time.time()),
+    }
+    if job.status == COMPLETE:
+        output = job.result or {}
+        metadata = output.get("metadata") or {}
+        result.update({
+            "result_type": "content",
+            "content": {k: v for k, v in (output.get("content") or {}).items() if v is not None},
+            "confidence_score": float(metadata.get("character_consistency_score", 0.0)),
+            "reasoning_trace": f"{trace} completed in {elapsed:.1f}s",
+            "metadata": metadata,
+        })
+    else:
+        result.update({
+            "result_type": "error",
+            "confidence_score": 0.0,
+            "reasoning_trace": f"{trace} {job.status}" + (f": {job.error}" if job.error else ""),
+        })
+    return result
+
+
+def review_queue_callback(review_queue: Any, worker_id: str, default_agent_id: str = "unassigned") -> Callable[[RenderJob], None]:
+    """An `on_complete` callback that pushes each finished job's TaskResult onto `review_queue`."""
+
+    def push(job: RenderJob) -> None:
+        review_queue.enqueue(job.agent_id or default_agent_id, [review_result(job, worker_id)])
+
+    return push
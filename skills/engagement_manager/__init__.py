@@ -0,0 +1,23 @@
+"""
+engagement_manager skill.
+
+Reference: skills/engagement_manager/README.md
+"""
+
+from skills.engagement_manager.context import (
+    ContextBuilder,
+    PackedContext,
+    PersonaPrefix,
+    Segment,
+    TokenCounter,
+    persona_hash,
+)
+
+__all__ = [
+    "ContextBuilder",
+    "PackedContext",
+    "PersonaPrefix",
+    "Segment",
+    "TokenCounter",
+    "persona_hash",
+]
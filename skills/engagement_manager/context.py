@@ -0,0 +1,277 @@
+"""
+Token-budgeted context builder for engagement_manager.
+
+FR 1.1 assembles the reply prompt from SOUL.md plus memories under a context
+window limit. Rebuilding and re-tokenizing that whole prompt for every reply
+is wasted work: the persona block only changes with the persona version and
+the conversation only grows by a message or two per turn.
+
+- the SOUL.md block (backstory, voice traits, core beliefs, directives) is
+  rendered and counted once per `soul_md_hash` and reused as a fixed prefix
+- every other piece (conversation message, episodic or semantic memory,
+  user profile, trending topics) is a segment whose token count is cached
+  by its text, so a new turn only tokenizes what is new
+- segments are ranked by relevance to the message being answered and packed
+  greedily into the remaining budget; the prompt total is the sum of the
+  parts, never a re-count of the joined string
+- `context_used` reports exactly what was packed, in the shape of
+  engagement_manager's `metadata.context_used`
+
+Token counts are exact for the tokenizer passed as `encode`, assuming it
+does not merge tokens across the blank line separating segments (true for
+the default and for BPE tokenizers that split on whitespace).
+
+Reference: specs/functional.md FR 1.1 (Hierarchical Memory Retrieval), skills/engagement_manager/README.md
+"""
+
+import hashlib
+import json
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from chimera.semantic_filter import STOPWORDS, tokenize
+
+SOUL_MD_SECTIONS = ("backstory", "voice_traits", "core_beliefs", "directives")
+SEPARATOR = "\n\n"
+DEFAULT_TOKEN_BUDGET = 3072
+
+# Relevance of segments that are not scored against the query.
+LATEST_MESSAGE_RELEVANCE = 2.0
+PROFILE_RELEVANCE = 0.6
+TRENDS_RELEVANCE = 0.4
+
+# Prompt order of packed segments (packing order is by relevance).
+SEGMENT_ORDER = ("constraints", "profile", "trends", "semantic", "episodic", "history")
+
+_PIECE_RE = re.compile(r"\w{1,4}|[^\w\s]")
+
+Encoder = Callable[[str], Sequence[Any]]
+
+
+def approximate_encode(text: str) -> List[str]:
+    """Dependency-free stand-in for a BPE tokenizer (~1.3 tokens per English word)."""
+    return _PIECE_RE.findall(text)
+
+
+class TokenCounter:
+    """Token counts per text, cached so repeated segments are tokenized once."""
+
+    def __init__(self, encode: Optional[Encoder] = None, max_entries: int = 65_536):
+        self.encode = encode or approximate_encode
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "tokenized": 0}
+
+    def count(self, text: str) -> int:
+        with self._lock:
+            cached = self._counts.get(text)
+            if cached is not None:
+                self._counts.move_to_end(text)
+                self.stats["hits"] += 1
+                return cached
+        tokens = len(self.encode(text))
+        with self._lock:
+            self._counts[text] = tokens
+            while len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+            self.stats["tokenized"] += 1
+        return tokens
+
+
+@dataclass(frozen=True)
+class Segment:
+    kind: str
+    text: str
+    relevance: float
+    tokens: int
+    position: int = 0  # chronological index within its kind
+
+
+@dataclass(frozen=True)
+class PersonaPrefix:
+    soul_md_hash: str
+    text: str
+    tokens: int
+    sections: Tuple[str, ...]
+    lines: frozenset  # rendered constraint lines already covered by the persona
+
+
+@dataclass(frozen=True)
+class PackedContext:
+    prefix: PersonaPrefix
+    segments: Tuple[Segment, ...]  # in prompt order
+    tokens: int
+    token_budget: int
+    dropped: int
+    context_used: Dict[str, Any]
+
+    @property
+    def prompt(self) -> str:
+        return SEPARATOR.join([self.prefix.text] + [s.text for s in self.segments])
+
+
+def persona_hash(persona: Mapping[str, Any]) -> str:
+    """`soul_md_hash` of an AgentPersona, or a SHA-256 of its SOUL.md sections when absent."""
+    if persona.get("soul_md_hash"):
+        return persona.get("soul_md_hash")
+    canonical = json.dumps({s: persona.get(s) for s in SOUL_MD_SECTIONS}, sort_keys=True)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ContextBuilder:
+    """
+    Packs persona, memories and conversation into `token_budget` tokens.
+
+    `persona` is an AgentPersona-shaped mapping (`soul_md_hash`, `backstory`,
+    `voice_traits`, `core_beliefs`, `directives`) or a chimera.persona.Persona;
+    `encode` is the model's tokenizer (e.g. tiktoken's `Encoding.encode`).
+    """
+
+    def __init__(
+        self,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        encode: Optional[Encoder] = None,
+        max_personas: int = 64,
+        counter: Optional[TokenCounter] = None,
+    ):
+        self.token_budget = token_budget
+        self.counter = counter or TokenCounter(encode)
+        self.max_personas = max_personas
+        self.separator_tokens = self.counter.count(SEPARATOR)
+        self._prefixes: "OrderedDict[str, PersonaPrefix]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"builds": 0, "prefix_hits": 0, "prefix_misses": 0, "packed": 0, "dropped": 0}
+
+    # --- Persona prefix ---
+
+    def prefix(self, persona: Mapping[str, Any]) -> PersonaPrefix:
+        """The rendered SOUL.md block for this persona version, tokenized once."""
+        key = persona_hash(persona)
+        with self._lock:
+            cached = self._prefixes.get(key)
+            if cached is not None:
+                self._prefixes.move_to_end(key)
+                self.stats["prefix_hits"] += 1
+                return cached
+        blocks: List[str] = []
+        sections: List[str] = []
+        lines = set()
+        if persona.get("backstory"):
+            blocks.append("# Persona\n" + persona.get("backstory").strip())
+            sections.append("backstory")
+        for section in SOUL_MD_SECTIONS[1:]:
+            values = [str(v) for v in persona.get(section) or ()]
+            if values:
+                blocks.append("## " + section.replace("_", " ").capitalize() + "\n" + "\n".join(f"- {v}" for v in values))
+                sections.append(section)
+                lines.update(v.strip().lower() for v in values)
+        text = SEPARATOR.join(blocks)
+        built = PersonaPrefix(key, text, len(self.counter.encode(text)), tuple(sections), frozenset(lines))
+        with self._lock:
+            self._prefixes[key] = built
+            while len(self._prefixes) > self.max_personas:
+                self._prefixes.popitem(last=False)
+            self.stats["prefix_misses"] += 1
+        return built
+
+    # --- Packing ---
+
+    def build(
+        self,
+        persona: Mapping[str, Any],
+        parameters: Mapping[str, Any],
+        episodic: Sequence[Mapping[str, Any]] = (),
+        semantic: Sequence[Mapping[str, Any]] = (),
+        query: Optional[str] = None,
+    ) -> PackedContext:
+        """
+        Packs an engagement_manager call's `parameters` plus retrieved memories.
+
+        `episodic` is newest first (as returned by TieredMemory.recent);
+        `semantic` memories may carry a `score`. `query` defaults to the
+        latest conversation message.
+        """
+        prefix = self.prefix(persona)
+        context = parameters.get("context") or {}
+        history = list(context.get("conversation_history") or ())
+        if query is None:
+            query = history[-1] if history else ""
+        terms = set(tokenize(query)) - STOPWORDS
+
+        def overlap(text: str) -> float:
+            return len(terms.intersection(tokenize(text))) / len(terms) if terms else 0.0
+
+        used = prefix.tokens
+        required: List[Segment] = []
+        constraints = [c for c in parameters.get("persona_constraints") or () if c.strip().lower() not in prefix.lines]
+        if constraints:
+            required.append(self._segment("constraints", "## Constraints\n" + "\n".join(f"- {c}" for c in constraints), 0.0))
+        for segment in required:
+            used += self.separator_tokens + segment.tokens
+        if used > self.token_budget:
+            raise ValueError(f"Persona block needs {used} tokens; token_budget is {self.token_budget}")
+
+        candidates: List[Segment] = []
+        for i, message in enumerate(history):
+            if i == len(history) - 1:
+                relevance = LATEST_MESSAGE_RELEVANCE
+            else:
+                relevance = 0.5 * (i + 1) / len(history) + 0.5 * overlap(message)
+            candidates.append(self._segment("history", message, relevance, i))
+        for rank, memory in enumerate(episodic):
+            text = str(memory.get("text") or memory.get("content") or "")
+            relevance = 0.5 * (1.0 - rank / len(episodic)) + 0.5 * overlap(text)
+            candidates.append(self._segment("episodic", "[recent] " + text, relevance, -rank))
+        for i, memory in enumerate(semantic):
+            text = str(memory.get("content") or memory.get("text") or "")
+            relevance = float(memory["score"]) if memory.get("score") is not None else overlap(text)
+            candidates.append(self._segment("semantic", "[memory] " + text, relevance, -i))
+        profile = context.get("user_profile")
+        if profile:
+            rendered = ", ".join(
+                f"{k}: {', '.join(map(str, v)) if isinstance(v, list) else json.dumps(v)}" for k, v in sorted(profile.items())
+            )
+            candidates.append(self._segment("profile", "## User profile\n" + rendered, PROFILE_RELEVANCE))
+        trends = context.get("trending_topics")
+        if trends:
+            text = "## Trending\n" + ", ".join(trends)
+            candidates.append(self._segment("trends", text, max(TRENDS_RELEVANCE, overlap(text))))
+
+        packed = list(required)
+        for segment in sorted(candidates, key=lambda s: -s.relevance):
+            cost = self.separator_tokens + segment.tokens
+            if used + cost <= self.token_budget:
+                packed.append(segment)
+                used += cost
+        packed.sort(key=lambda s: (SEGMENT_ORDER.index(s.kind), -s.relevance if s.kind == "semantic" else s.position))
+
+        counts = {kind: 0 for kind in SEGMENT_ORDER}
+        for segment in packed:
+            counts[segment.kind] += 1
+        dropped = len(candidates) + len(required) - len(packed)
+        with self._lock:
+            self.stats["builds"] += 1
+            self.stats["packed"] += len(packed)
+            self.stats["dropped"] += dropped
+        return PackedContext(
+            prefix=prefix,
+            segments=tuple(packed),
+            tokens=used,
+            token_budget=self.token_budget,
+            dropped=dropped,
+            context_used={
+                "episodic_memory_count": counts["episodic"],
+                "semantic_memory_count": counts["semantic"],
+                "soul_md_sections": list(prefix.sections),
+                "conversation_turns": counts["history"],
+                "token_count": used,
+                "token_budget": self.token_budget,
+            },
+        )
+
+    def _segment(self, kind: str, text: str, relevance: float, position: int = 0) -> Segment:
+        return Segment(kind, text, relevance, self.counter.count(text), position)
@@ -0,0 +1,290 @@
+"""
+Compiled validators for the skill input/output contracts.
+
+Each `skills/{skill}/input_schema.json` and `output_schema.json` is read once,
+compiled into a tree of checker closures (required-key sets, enum sets, numeric
+bounds) and cached in a `SchemaRegistry`. Validation then never touches the
+filesystem or re-interprets the JSON schema.
+
+Reference: skills/README.md (Skill Development Guidelines - Input/Output Contracts)
+Reference: specs/technical.md Section 1 (API Contracts)
+"""
+
+import json
+import re
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+SKILLS_DIR = Path(__file__).parent
+
+SCHEMA_FILES = {
+    "input": "input_schema.json",
+    "output": "output_schema.json",
+}
+
+# A checker appends human-readable messages to `errors`; the middle argument is
+# the runtime path prefix contributed by enclosing array items.
+Checker = Callable[[Any, str, List[str]], None]
+
+
+class SchemaValidationError(ValueError):
+    """
+    Raised when a payload does not satisfy a skill contract.
+
+    Mirrors the structured error response from skills/README.md
+    (Error Handling) via `to_error_response()`.
+    """
+
+    code = "SCHEMA_VALIDATION_ERROR"
+
+    def __init__(self, schema_title: str, errors: List[str]):
+        self.schema_title = schema_title
+        self.errors = errors
+        super().__init__(f"{schema_title}: " + "; ".join(errors))
+
+    def to_error_response(self) -> Dict[str, Any]:
+        return {
+            "error": {
+                "code": self.code,
+                "message": f"Payload does not match {self.schema_title}",
+                "details": {"errors": list(self.errors)},
+            }
+        }
+
+
+# --- Type and format checks ---
+
+_MISSING = object()
+
+# JSON Schema type name -> Python classes accepted for it.
+PYTHON_TYPES: Dict[str, Tuple[type, ...]] = {
+    "object": (dict,),
+    "array": (list,),
+    "string": (str,),
+    "integer": (int,),
+    "number": (int, float),
+    "boolean": (bool,),
+    "null": (type(None),),
+}
+
+
+def _is_date_time(value: str) -> bool:
+    try:
+        datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return False
+    return True
+
+
+_URI_RE = re.compile(r"^[A-Za-z][A-Za-z0-9+.-]*:")
+
+FORMAT_CHECKS: Dict[str, Callable[[str], bool]] = {
+    "date-time": _is_date_time,
+    "uri": lambda v: _URI_RE.match(v) is not None,
+}
+
+
+def _where(prefix: str, rel: str) -> str:
+    return (prefix + rel).lstrip(".") or "<root>"
+
+
+# --- Compilation ---
+
+def compile_schema(schema: Dict[str, Any], rel: str = "") -> Checker:
+    """
+    Compiles a (draft-07 subset) JSON schema node into a single checker.
+
+    Supported keywords are the ones used by the skill contracts: type, const,
+    enum, required, properties, items, minimum, maximum, maxLength, pattern
+    and format (date-time, uri). Unknown keywords are ignored, as in JSON Schema.
+
+    Every constraint of a node is folded into one closure, and property paths
+    are resolved at compile time, so a valid payload costs one call per node
+    and no string formatting. `rel` is the node's path below the nearest array
+    item; checkers receive the runtime prefix for array indices only.
+    """
+    types = schema.get("type")
+    names = () if types is None else ((types,) if isinstance(types, str) else tuple(types))
+    accept = tuple(cls for name in names for cls in PYTHON_TYPES[name]) or None
+    # bool subclasses int, so integer/number must reject it explicitly.
+    reject_bool = accept is not None and "boolean" not in names and bool not in accept and int in accept
+    expected = " or ".join(names)
+
+    const = schema.get("const", _MISSING)
+    enum_values = schema.get("enum")
+    allowed = frozenset(v for v in enum_values if v is not None) if enum_values is not None else None
+    allow_null = enum_values is not None and None in enum_values
+    listing = sorted(map(str, allowed)) if allowed is not None else None
+
+    minimum = schema.get("minimum")
+    maximum = schema.get("maximum")
+    has_range = minimum is not None or maximum is not None
+    lo = float("-inf") if minimum is None else minimum
+    hi = float("inf") if maximum is None else maximum
+
+    max_length = schema.get("maxLength")
+    pattern = schema.get("pattern")
+    search = re.compile(pattern).search if pattern is not None else None
+    fmt_name = schema.get("format")
+    fmt = FORMAT_CHECKS.get(fmt_name or "")
+    has_string_checks = max_length is not None or search is not None or fmt is not None
+
+    required_order = tuple(schema.get("required", ()))
+    required = frozenset(required_order)
+    properties = tuple(
+        (key, compile_schema(sub, f"{rel}.{key}")) for key, sub in schema.get("properties", {}).items()
+    )
+    has_object_checks = bool(required or properties)
+    item_check = compile_schema(schema["items"]) if "items" in schema else None
+
+    def check(value, prefix, errors):
+        if accept is not None and (not isinstance(value, accept) or (reject_bool and value.__class__ is bool)):
+            errors.append(f"{_where(prefix, rel)}: {value!r} is not of type {expected}")
+            return
+        if const is not _MISSING and value != const:
+            errors.append(f"{_where(prefix, rel)}: expected {const!r}, got {value!r}")
+        if allowed is not None:
+            if value is None:
+                if not allow_null:
+                    errors.append(f"{_where(prefix, rel)}: None is not one of {listing}")
+            elif not isinstance(value, (str, int, float)) or value not in allowed:
+                errors.append(f"{_where(prefix, rel)}: {value!r} is not one of {listing}")
+        if has_range and isinstance(value, (int, float)) and value.__class__ is not bool and not lo <= value <= hi:
+            bound = f"minimum of {lo}" if value < lo else f"maximum of {hi}"
+            errors.append(f"{_where(prefix, rel)}: {value!r} violates the {bound}")
+        if has_string_checks and isinstance(value, str):
+            if max_length is not None and len(value) > max_length:
+                errors.append(f"{_where(prefix, rel)}: length {len(value)} exceeds maxLength {max_length}")
+            if search is not None and search(value) is None:
+                errors.append(f"{_where(prefix, rel)}: {value!r} does not match {pattern!r}")
+            if fmt is not None and not fmt(value):
+                errors.append(f"{_where(prefix, rel)}: {value!r} is not a valid {fmt_name}")
+        if has_object_checks and isinstance(value, dict):
+            if not required <= value.keys():
+                for key in required_order:
+                    if key not in value:
+                        errors.append(f"{_where(prefix, rel + '.' + key)}: required property is missing")
+            get = value.get
+            for key, checker in properties:
+                child = get(key, _MISSING)
+                if child is not _MISSING:
+                    checker(child, prefix, errors)
+        if item_check is not None and isinstance(value, list):
+            base = prefix + rel
+            for i, item in enumerate(value):
+                item_check(item, f"{base}[{i}]", errors)
+    return check
+
+
+class CompiledValidator:
+    """A reusable validator for one JSON schema."""
+
+    __slots__ = ("title", "schema", "_check")
+
+    def __init__(self, schema: Dict[str, Any]):
+        self.title = schema.get("title", "schema")
+        self.schema = schema
+        self._check = compile_schema(schema)
+
+    def iter_errors(self, payload: Any) -> List[str]:
+        """Returns every violation found in `payload` (empty when valid)."""
+        errors: List[str] = []
+        self._check(payload, "", errors)
+        return errors
+
+    def is_valid(self, payload: Any) -> bool:
+        return not self.iter_errors(payload)
+
+    def validate(self, payload: Any) -> Any:
+        """Returns `payload` unchanged, or raises SchemaValidationError."""
+        errors: List[str] = []
+        self._check(payload, "", errors)
+        if errors:
+            raise SchemaValidationError(self.title, errors)
+        return payload
+
+    def validate_many(self, payloads: Iterable[Any]) -> List[List[str]]:
+        """
+        Validates a batch in one call.
+
+        Returns one error list per payload, in input order; valid payloads map
+        to an empty list so callers can zip results back onto their inputs.
+        """
+        check = self._check
+        results: List[List[str]] = []
+        append = results.append
+        for payload in payloads:
+            errors: List[str] = []
+            check(payload, "", errors)
+            append(errors)
+        return results
+
+
+class SchemaRegistry:
+    """
+    Loads and compiles skill schemas on first use, then serves them from memory.
+
+    Reference: skills/*/input_schema.json, skills/*/output_schema.json
+    """
+
+    def __init__(self, skills_dir: Path = SKILLS_DIR):
+        self.skills_dir = Path(skills_dir)
+        self._validators: Dict[Tuple[str, str], CompiledValidator] = {}
+        self._lock = threading.Lock()
+
+    def load_schema(self, skill_name: str, kind: str) -> Dict[str, Any]:
+        """Reads the raw JSON schema for `skill_name` ("input" or "output")."""
+        if kind not in SCHEMA_FILES:
+            raise ValueError(f"Unknown schema kind {kind!r}; expected one of {sorted(SCHEMA_FILES)}")
+        schema_path = self.skills_dir / skill_name / SCHEMA_FILES[kind]
+        with open(schema_path, "r") as f:
+            return json.load(f)
+
+    def get(self, skill_name: str, kind: str = "input") -> CompiledValidator:
+        key = (skill_name, kind)
+        validator = self._validators.get(key)
+        if validator is None:
+            with self._lock:
+                validator = self._validators.get(key)
+                if validator is None:
+                    validator = CompiledValidator(self.load_schema(skill_name, kind))
+                    self._validators[key] = validator
+        return validator
+
+    def skills(self) -> List[str]:
+        """Skill directories that ship an input schema."""
+        return sorted(
+            p.name for p in self.skills_dir.iterdir()
+            if (p / SCHEMA_FILES["input"]).exists()
+        )
+
+    def preload(self) -> None:
+        """Compiles every known skill schema up front (e.g. at worker start)."""
+        for skill_name in self.skills():
+            for kind in SCHEMA_FILES:
+                if (self.skills_dir / skill_name / SCHEMA_FILES[kind]).exists():
+                    self.get(skill_name, kind)
+
+    def validate_input(self, skill_name: str, payload: Any) -> Any:
+        return self.get(skill_name, "input").validate(payload)
+
+    def validate_output(self, skill_name: str, payload: Any) -> Any:
+        return self.get(skill_name, "output").validate(payload)
+
+    def validate_many(self, skill_name: str, payloads: Iterable[Any], kind: str = "input") -> List[List[str]]:
+        return self.get(skill_name, kind).validate_many(payloads)
+
+
+registry = SchemaRegistry()
+
+
+def validate_input(skill_name: str, payload: Any) -> Any:
+    """Validates `payload` against `skills/{skill_name}/input_schema.json`."""
+    return registry.validate_input(skill_name, payload)
+
+
+def validate_output(skill_name: str, payload: Any) -> Any:
+    """Validates `payload` against `skills/{skill_name}/output_schema.json`."""
+    return registry.validate_output(skill_name, payload)
@@ -0,0 +1,31 @@
+"""
+trend_fetcher skill.
+
+Reference: skills/trend_fetcher/README.md
+"""
+
+from skills.trend_fetcher.cache import TrendCache
+from skills.trend_fetcher.implementation import (
+    TrendQuery,
+    fetch_trends,
+    fetch_trends_async,
+    fetch_trends_batch,
+    fetch_trends_batch_async,
+    normalize_parameters,
+    set_resource_reader,
+    set_trend_cache,
+)
+from skills.trend_fetcher.spotter import TrendSpotter
+
+__all__ = [
+    "TrendCache",
+    "TrendQuery",
+    "TrendSpotter",
+    "fetch_trends",
+    "fetch_trends_async",
+    "fetch_trends_batch",
+    "fetch_trends_batch_async",
+    "normalize_parameters",
+    "set_resource_reader",
+    "set_trend_cache",
+]
@@ -0,0 +1,195 @@
+"""
+In-process cache for trend_fetcher resource reads.
+
+Entries are keyed by the normalized (region, category, timeframe_hours) and
+hold the unfiltered resource payload, so any `relevance_threshold` is answered
+by filtering the cached trends rather than re-reading the resource.
+
+- LRU eviction bounded by `max_entries`
+- TTL proportional to `timeframe_hours` (a 168h window changes slower than 1h)
+- stale-while-revalidate: past TTL but inside the stale window, the cached
+  payload is returned at once and a background refresh is scheduled
+- single-flight: concurrent misses for one key share a single upstream read;
+  if the caller running it is cancelled, a waiting caller takes it over
+
+The cache is asyncio-based and stale refreshes run as tasks on the caller's
+loop, so stale entries are only served to long-lived loops (Planner/Worker
+services). Callers whose loop ends with the call (`asyncio.run` per call, as
+the synchronous `fetch_trends` does) pass `revalidate=False`: a stale entry
+is then reloaded in the foreground, since its refresh would be cancelled.
+
+Reference: skills/trend_fetcher/README.md, skills/trend_fetcher/output_schema.json (metadata.fetched_at)
+"""
+
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+CacheKey = Tuple[str, str, int]
+
+
+class _LoadAbandoned(Exception):
+    """Set on a shared load whose leader was cancelled; waiters retry the load themselves."""
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    payload: Dict[str, Any]
+    fetched_at: str
+    stored_at: float
+    ttl: float
+    stale_until: float
+
+
+class TrendCache:
+    """
+    LRU + TTL + stale-while-revalidate cache with single-flight loading.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds_per_hour: float = 12.5,
+        min_ttl: float = 30.0,
+        max_ttl: float = 3600.0,
+        stale_factor: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be >= 1")
+        self.max_entries = max_entries
+        self.ttl_seconds_per_hour = ttl_seconds_per_hour
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.stale_factor = stale_factor
+        self.clock = clock
+        self._entries: "OrderedDict[CacheKey, CacheEntry]" = OrderedDict()
+        self._inflight: Dict[CacheKey, "asyncio.Future[CacheEntry]"] = {}
+        self._refresh_tasks: Set["asyncio.Task[Any]"] = set()
+        self.stats = {"hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0, "evictions": 0}
+
+    def ttl_for(self, timeframe_hours: int) -> float:
+        """TTL for a window of `timeframe_hours` (24h -> 5 min with defaults)."""
+        return max(self.min_ttl, min(self.max_ttl, self.ttl_seconds_per_hour * timeframe_hours))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, key: CacheKey) -> Optional[CacheEntry]:
+        """Returns the entry for `key` without touching LRU order or stats."""
+        return self._entries.get(key)
+
+    def invalidate(self, key: Optional[CacheKey] = None) -> None:
+        """Drops one key, or everything when `key` is None."""
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+    def put(self, key: CacheKey, payload: Dict[str, Any], fetched_at: str) -> CacheEntry:
+        now = self.clock()
+        ttl = self.ttl_for(key[2])
+        entry = CacheEntry(payload, fetched_at, now, ttl, now + ttl * (1 + self.stale_factor))
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats["evictions"] += 1
+        return entry
+
+    async def get(
+        self,
+        key: CacheKey,
+        loader: Callable[[], Awaitable[Tuple[Dict[str, Any], str]]],
+        revalidate: bool = True,
+    ) -> CacheEntry:
+        """
+        Returns the entry for `key`, loading it through `loader` on a miss.
+
+        `loader` returns `(payload, fetched_at)`. Fresh entries are returned
+        directly; stale ones are returned while a refresh runs in the
+        background (with `revalidate=False` they count as expired); expired or
+        missing ones wait on a single shared load.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = self.clock()
+            age = now - entry.stored_at
+            if age < entry.ttl:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry
+            if revalidate and now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self.stats["stale_hits"] += 1
+                if self._pending(key) is None:
+                    self.stats["refreshes"] += 1
+                    task = asyncio.ensure_future(self._load(key, loader, self._begin(key)))
+                    self._refresh_tasks.add(task)
+                    task.add_done_callback(self._refresh_done)
+                return entry
+            self._entries.pop(key, None)
+
+        pending = self._pending(key)
+        if pending is not None:
+            self.stats["coalesced"] += 1
+        while pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except _LoadAbandoned:
+                # The first waiter to get here starts a new load; the rest join it.
+                pending = self._pending(key)
+        self.stats["misses"] += 1
+        return await self._load(key, loader, self._begin(key))
+
+    def _pending(self, key: CacheKey) -> "Optional[asyncio.Future[CacheEntry]]":
+        future = self._inflight.get(key)
+        # Futures from a loop that has since been closed (asyncio.run per call) are unusable.
+        if future is None or future.done() or future.get_loop() is not asyncio.get_running_loop():
+            return None
+        return future
+
+    def _begin(self, key: CacheKey) -> "asyncio.Future[CacheEntry]":
+        # Registered synchronously so callers arriving before the load starts coalesce onto it.
+        future: "asyncio.Future[CacheEntry]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        return future
+
+    async def _load(
+        self,
+        key: CacheKey,
+        loader: Callable[[], Awaitable[Tuple[Dict[str, Any], str]]],
+        future: "asyncio.Future[CacheEntry]",
+    ) -> CacheEntry:
+        try:
+            payload, fetched_at = await loader()
+            entry = self.put(key, payload, fetched_at)
+        except asyncio.CancelledError:
+            # Cancellation stays with the leader; waiters are not cancelled with it.
+            future.set_exception(_LoadAbandoned())
+            future.exception()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark retrieved so a load nobody else awaited doesn't log a warning.
+            future.exception()
+            raise
+        else:
+            future.set_result(entry)
+            return entry
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _refresh_done(self, task: "asyncio.Task[Any]") -> None:
+        self._refresh_tasks.discard(task)
+        if not task.cancelled():
+            # A failed background refresh keeps serving the stale entry.
+            task.exception()
+
+    async def drain(self) -> None:
+        """Waits for outstanding background refreshes (tests and shutdown)."""
+        while self._refresh_tasks:
+            await asyncio.gather(*list(self._refresh_tasks), return_exceptions=True)
@@ -0,0 +1,287 @@
+"""
+trend_fetcher skill implementation.
+
+Reads `mcp://news/{region}/{category}/trends?hours={n}` through an MCP resource
+reader and shapes the payload into the skill's output contract: trends filtered
+by `relevance_threshold` and sorted by `relevance_score` (descending).
+
+Reference: skills/trend_fetcher/README.md, specs/technical.md Section 3
+Reference: SRS Section 4.2 (FR 2.0-2.2)
+"""
+
+import asyncio
+import inspect
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from skills.schema_registry import SchemaValidationError, registry
+from skills.trend_fetcher.cache import CacheKey, TrendCache
+
+SKILL_NAME = "trend_fetcher"
+
+NEWS_TRENDS_URI = "mcp://news/{region}/{category}/trends?hours={hours}"
+
+DEFAULT_TIMEFRAME_HOURS = 24
+DEFAULT_RELEVANCE_THRESHOLD = 0.75
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Takes a resource URI, returns the resource payload: {"trends": [...], "confidence"?: float}.
+# May be a plain function or a coroutine function.
+ResourceReader = Callable[[str], Union[Dict[str, Any], Awaitable[Dict[str, Any]]]]
+
+_resource_reader: Optional[ResourceReader] = None
+_trend_cache: Optional[TrendCache] = None
+
+
+class TrendQuery(NamedTuple):
+    """Normalized trend_fetcher parameters."""
+
+    region: str
+    category: str
+    timeframe_hours: int
+    relevance_threshold: float
+
+    @property
+    def resource_uri(self) -> str:
+        return NEWS_TRENDS_URI.format(region=self.region, category=self.category, hours=self.timeframe_hours)
+
+    @property
+    def cache_key(self) -> CacheKey:
+        return (self.region, self.category, self.timeframe_hours)
+
+
+def set_resource_reader(reader: Optional[ResourceReader]) -> None:
+    """Installs the MCP resource reader used when callers don't pass one."""
+    global _resource_reader
+    _resource_reader = reader
+
+
+def set_trend_cache(cache: Optional[TrendCache]) -> None:
+    """Installs the TrendCache used when callers don't pass one (None disables caching)."""
+    global _trend_cache
+    _trend_cache = cache
+
+
+def normalize_parameters(parameters: Dict[str, Any]) -> TrendQuery:
+    """Applies schema defaults and canonicalizes region/category casing."""
+    return TrendQuery(
+        region=parameters["region"].strip().lower(),
+        category=parameters["category"].strip().lower(),
+        timeframe_hours=parameters.get("timeframe_hours", DEFAULT_TIMEFRAME_HOURS),
+        relevance_threshold=float(parameters.get("relevance_threshold", DEFAULT_RELEVANCE_THRESHOLD)),
+    )
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def _resolve_reader(reader: Optional[ResourceReader]) -> ResourceReader:
+    reader = reader or _resource_reader
+    if reader is None:
+        raise RuntimeError(
+            "No MCP resource reader configured for trend_fetcher; "
+            "pass reader= or call set_resource_reader()"
+        )
+    return reader
+
+
+async def _read_resource(reader: ResourceReader, uri: str) -> Dict[str, Any]:
+    payload = reader(uri)
+    if inspect.isawaitable(payload):
+        payload = await payload
+    return payload
+
+
+async def _load_trends(
+    reader: ResourceReader,
+    query: TrendQuery,
+    cache: Optional[TrendCache],
+    semaphore: Optional[asyncio.Semaphore] = None,
+    revalidate: bool = True,
+) -> Tuple[Dict[str, Any], str]:
+    """Returns `(payload, fetched_at)` for `query`, going through `cache` when set."""
+
+    async def load() -> Tuple[Dict[str, Any], str]:
+        if semaphore is None:
+            payload = await _read_resource(reader, query.resource_uri)
+        else:
+            async with semaphore:
+                payload = await _read_resource(reader, query.resource_uri)
+        return payload, _utc_now()
+
+    if cache is None:
+        return await load()
+    entry = await cache.get(query.cache_key, load, revalidate)
+    return entry.payload, entry.fetched_at
+
+
+def build_output(
+    query: TrendQuery,
+    payload: Dict[str, Any],
+    fetched_at: Optional[str] = None,
+    source_count: int = 1,
+) -> Dict[str, Any]:
+    """
+    Shapes a raw resource payload into the output contract for `query`.
+
+    Reference: skills/trend_fetcher/output_schema.json
+    """
+    threshold = query.relevance_threshold
+    default_sources = [query.resource_uri]
+    trends = []
+    for raw in payload.get("trends", ()):
+        relevance = float(raw["relevance_score"])
+        if relevance < threshold:
+            continue
+        trend = {
+            "topic": raw["topic"],
+            "engagement_score": float(raw["engagement_score"]),
+            "relevance_score": relevance,
+            "sources": list(raw.get("sources") or default_sources),
+        }
+        if "growth_rate" in raw:
+            trend["growth_rate"] = raw["growth_rate"]
+        trends.append(trend)
+    trends.sort(key=lambda t: t["relevance_score"], reverse=True)
+
+    if "confidence" in payload:
+        confidence = float(payload["confidence"])
+    elif trends:
+        confidence = sum(t["relevance_score"] for t in trends) / len(trends)
+    else:
+        confidence = 0.0
+
+    return {
+        "trends": trends,
+        "metadata": {
+            "fetched_at": fetched_at or _utc_now(),
+            "source_count": source_count,
+            "confidence": round(confidence, 4),
+        },
+    }
+
+
+async def fetch_trends_async(
+    input_data: Dict[str, Any],
+    reader: Optional[ResourceReader] = None,
+    cache: Optional[TrendCache] = None,
+    revalidate: bool = True,
+) -> Dict[str, Any]:
+    """
+    Fetches trends for a single trend_fetcher request.
+
+    With a cache, `metadata.fetched_at` is the time of the upstream read that
+    produced the cached payload; `revalidate=False` reloads stale entries
+    instead of serving them (for loops that end with the call). Raises
+    SchemaValidationError when `input_data` violates input_schema.json.
+    """
+    registry.validate_input(SKILL_NAME, input_data)
+    query = normalize_parameters(input_data["parameters"])
+    if cache is None:
+        cache = _trend_cache
+    payload, fetched_at = await _load_trends(_resolve_reader(reader), query, cache, revalidate=revalidate)
+    return build_output(query, payload, fetched_at)
+
+
+def fetch_trends(
+    input_data: Dict[str, Any],
+    reader: Optional[ResourceReader] = None,
+    cache: Optional[TrendCache] = None,
+) -> Dict[str, Any]:
+    """
+    Synchronous entry point for the trend_fetcher skill. Each call runs its
+    own event loop, so stale cache entries are reloaded rather than served
+    (a background refresh would not outlive the call).
+
+    Reference: skills/trend_fetcher/input_schema.json, output_schema.json
+    """
+    return asyncio.run(fetch_trends_async(input_data, reader, cache, revalidate=False))
+
+
+def _error_response(code: str, message: str, details: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    return {"error": {"code": code, "message": message, "details": details or {}}}
+
+
+async def fetch_trends_batch_async(
+    requests: Sequence[Dict[str, Any]],
+    reader: Optional[ResourceReader] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    cache: Optional[TrendCache] = None,
+    revalidate: bool = True,
+) -> List[Dict[str, Any]]:
+    """
+    Fetches trends for many requests at once.
+
+    Requests with identical normalized (region, category, timeframe_hours) share
+    one read of the underlying resource; each still gets its own output filtered
+    by its own `relevance_threshold`. Reads run concurrently, at most
+    `max_concurrency` in flight. Results are returned in request order; an
+    invalid request, a failed read or a malformed payload yields a structured
+    error response in its slot instead of failing the whole batch. `revalidate` is as for
+    `fetch_trends_async`.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be >= 1")
+    reader = _resolve_reader(reader)
+    if cache is None:
+        cache = _trend_cache
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(requests)
+    queries: Dict[int, TrendQuery] = {}
+    validator = registry.get(SKILL_NAME, "input")
+    for i, errors in enumerate(validator.validate_many(requests)):
+        if errors:
+            results[i] = SchemaValidationError(validator.title, errors).to_error_response()
+        else:
+            queries[i] = normalize_parameters(requests[i]["parameters"])
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    # One representative query per distinct resource; cache hits skip the semaphore.
+    by_uri = {q.resource_uri: q for q in queries.values()}
+    loaded = await asyncio.gather(
+        *(_load_trends(reader, q, cache, semaphore, revalidate) for q in by_uri.values()),
+        return_exceptions=True,
+    )
+    loaded_by_uri = dict(zip(by_uri, loaded))
+
+    outputs: Dict[TrendQuery, Dict[str, Any]] = {}
+    for i, query in queries.items():
+        loaded_result = loaded_by_uri[query.resource_uri]
+        if isinstance(loaded_result, BaseException):
+            results[i] = _error_response(
+                "RESOURCE_FETCH_ERROR",
+                str(loaded_result) or type(loaded_result).__name__,
+                {"resource": query.resource_uri},
+            )
+            continue
+        # Identical parameter sets are shaped once, then copied per slot.
+        if query not in outputs:
+            payload, fetched_at = loaded_result
+            try:
+                outputs[query] = build_output(query, payload, fetched_at)
+            except (KeyError, TypeError, ValueError, AttributeError) as exc:
+                outputs[query] = _error_response(
+                    "RESOURCE_FORMAT_ERROR",
+                    f"malformed trends payload: {type(exc).__name__}: {exc}",
+                    {"resource": query.resource_uri},
+                )
+        shaped = outputs[query]
+        if "error" in shaped:
+            results[i] = {"error": dict(shaped["error"], details=dict(shaped["error"]["details"]))}
+            continue
+        results[i] = {
+            "trends": [dict(t, sources=list(t["sources"])) for t in shaped["trends"]],
+            "metadata": dict(shaped["metadata"]),
+        }
+    return results
+
+
+def fetch_trends_batch(
+    requests: Sequence[Dict[str, Any]],
+    reader: Optional[ResourceReader] = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    cache: Optional[TrendCache] = None,
+) -> List[Dict[str, Any]]:
+    """Synchronous wrapper around `fetch_trends_batch_async`; stale entries are reloaded, as in `fetch_trends`."""
+    return asyncio.run(fetch_trends_batch_async(requests, reader, max_concurrency, cache, revalidate=False))
@@ -0,0 +1,312 @@
+"""
+Streaming Trend Spotter.
+
+Maintains per-topic sliding-window statistics as news items arrive instead of
+re-clustering the whole window on every pass:
+
+- a fixed ring of time buckets per topic (constant memory per topic) holding
+  item counts and engagement/relevance sums for the window (default 4 hours)
+- an expiry wheel so each (topic, bucket) pair is expired exactly once
+- fast/slow exponentially decayed arrival rates whose ratio is `growth_rate`
+- lazily-invalidated max-heaps for top-k by `relevance_score` or
+  `engagement_score`
+- "Trend Alert" events emitted once when a topic crosses the alert
+  thresholds, re-armed only after it falls back below them
+
+`resource_payload()` returns the shape trend_fetcher expects from
+`mcp://news/{region}/{category}/trends`, so a spotter can sit behind
+`set_resource_reader()`.
+
+Reference: specs/functional.md FR 2.2 (Trend Detection), skills/trend_fetcher/output_schema.json
+"""
+
+import heapq
+import itertools
+import math
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_WINDOW_HOURS = 4
+DEFAULT_BUCKET_SECONDS = 300
+MAX_SOURCES_PER_TOPIC = 5
+
+SCORE_FIELDS = ("relevance_score", "engagement_score")
+
+
+def _iso(ts: float) -> str:
+    return datetime.fromtimestamp(ts, timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _TopicState:
+    """Per-topic window state; memory is fixed by the bucket count."""
+
+    __slots__ = (
+        "topic", "bucket_ids", "counts", "engagement", "relevance",
+        "count", "engagement_sum", "relevance_sum",
+        "fast_rate", "slow_rate", "rate_ts", "sources",
+        "version", "alerted",
+    )
+
+    def __init__(self, topic: str, buckets: int):
+        self.topic = topic
+        self.bucket_ids = [-1] * buckets
+        self.counts = [0] * buckets
+        self.engagement = [0.0] * buckets
+        self.relevance = [0.0] * buckets
+        self.count = 0
+        self.engagement_sum = 0.0
+        self.relevance_sum = 0.0
+        self.fast_rate = 0.0
+        self.slow_rate = 0.0
+        self.rate_ts = 0.0
+        self.sources: List[str] = []
+        self.version = -1  # stamp of this state's newest heap entries
+        self.alerted = False
+
+    def score(self, field: str) -> float:
+        if not self.count:
+            return 0.0
+        total = self.relevance_sum if field == "relevance_score" else self.engagement_sum
+        return total / self.count
+
+
+class TrendSpotter:
+    """
+    Incremental topic-cluster tracker over a sliding time window.
+
+    Items are dicts with `topic`, `timestamp` (epoch seconds), and optional
+    `engagement_score`, `relevance_score` (0.0-1.0) and `source` (MCP URI).
+    Time is event time: the window ends at the newest timestamp seen.
+    """
+
+    def __init__(
+        self,
+        window_hours: float = DEFAULT_WINDOW_HOURS,
+        bucket_seconds: int = DEFAULT_BUCKET_SECONDS,
+        alert_min_items: int = 20,
+        alert_relevance: float = 0.75,
+        alert_growth: float = 0.5,
+        rearm_ratio: float = 0.5,
+        on_alert: Optional[Callable[[Dict[str, Any]], None]] = None,
+    ):
+        self.window_seconds = window_hours * 3600
+        self.bucket_seconds = bucket_seconds
+        self.buckets = max(1, int(math.ceil(self.window_seconds / bucket_seconds)))
+        # Fast rate tracks the last quarter window, slow rate the whole window.
+        self.fast_tau = self.window_seconds / 4
+        self.slow_tau = self.window_seconds
+        self.alert_min_items = alert_min_items
+        self.alert_relevance = alert_relevance
+        self.alert_growth = alert_growth
+        self.rearm_ratio = rearm_ratio
+        self.on_alert = on_alert
+
+        self.now = 0.0
+        self._topics: Dict[str, _TopicState] = {}
+        self._wheel: Dict[int, List[str]] = {}
+        self._expired_through = -1
+        self._heaps: Dict[str, List[Tuple[float, int, str]]] = {field: [] for field in SCORE_FIELDS}
+        # Spotter-wide so a re-created topic never matches its predecessor's entries.
+        self._stamps = itertools.count()
+        self.items_ingested = 0
+        self.items_dropped = 0
+
+    def __len__(self) -> int:
+        return len(self._topics)
+
+    # --- Ingestion ---
+
+    def ingest(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Adds one item; returns the Trend Alert it triggered, if any."""
+        ts = float(item["timestamp"])
+        if ts > self.now:
+            self.advance(ts)
+        bucket = int(ts // self.bucket_seconds)
+        if bucket <= self._expired_through or ts <= self.now - self.window_seconds:
+            self.items_dropped += 1
+            return None
+
+        key = item["topic"].strip().lower()
+        state = self._topics.get(key)
+        if state is None:
+            state = self._topics[key] = _TopicState(item["topic"].strip(), self.buckets)
+
+        slot = bucket % self.buckets
+        if state.bucket_ids[slot] > bucket:
+            # The slot already holds a newer bucket: the item is older than the window.
+            self.items_dropped += 1
+            return None
+        if state.bucket_ids[slot] != bucket:
+            self._clear_slot(state, slot)
+            state.bucket_ids[slot] = bucket
+            self._wheel.setdefault(bucket, []).append(key)
+
+        engagement = float(item.get("engagement_score", 0.0))
+        relevance = float(item.get("relevance_score", 0.0))
+        state.counts[slot] += 1
+        state.engagement[slot] += engagement
+        state.relevance[slot] += relevance
+        state.count += 1
+        state.engagement_sum += engagement
+        state.relevance_sum += relevance
+        self._bump_rates(state, ts)
+
+        source = item.get("source")
+        if source and source not in state.sources:
+            state.sources.append(source)
+            if len(state.sources) > MAX_SOURCES_PER_TOPIC:
+                del state.sources[0]
+
+        self.items_ingested += 1
+        self._reindex(key, state)
+        return self._check_alert(state)
+
+    def ingest_many(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ingests a batch; returns the alerts it triggered, in order."""
+        alerts = []
+        for item in items:
+            alert = self.ingest(item)
+            if alert is not None:
+                alerts.append(alert)
+        return alerts
+
+    def advance(self, now: float) -> None:
+        """Moves the window end to `now`, expiring buckets that fell out of it."""
+        if now <= self.now:
+            return
+        self.now = now
+        limit = int((now - self.window_seconds) // self.bucket_seconds)
+        if limit <= self._expired_through:
+            return
+        if limit - self._expired_through <= len(self._wheel):
+            expiring = [b for b in range(self._expired_through + 1, limit + 1) if b in self._wheel]
+        else:
+            expiring = sorted(b for b in self._wheel if b <= limit)
+        for bucket in expiring:
+            for key in self._wheel.pop(bucket):
+                state = self._topics.get(key)
+                if state is None:
+                    continue
+                slot = bucket % self.buckets
+                if state.bucket_ids[slot] == bucket:
+                    self._clear_slot(state, slot)
+                    if state.count == 0:
+                        del self._topics[key]
+                    else:
+                        self._reindex(key, state)
+                        self._check_alert(state)
+        self._expired_through = limit
+
+    def _clear_slot(self, state: _TopicState, slot: int) -> None:
+        state.count -= state.counts[slot]
+        state.engagement_sum -= state.engagement[slot]
+        state.relevance_sum -= state.relevance[slot]
+        state.counts[slot] = 0
+        state.engagement[slot] = 0.0
+        state.relevance[slot] = 0.0
+        state.bucket_ids[slot] = -1
+        if state.count == 0:
+            # Avoid float residue from repeated add/subtract.
+            state.engagement_sum = state.relevance_sum = 0.0
+
+    # --- Growth rate ---
+
+    def _decay(self, state: _TopicState, ts: float) -> Tuple[float, float]:
+        dt = max(0.0, ts - state.rate_ts)
+        return state.fast_rate * math.exp(-dt / self.fast_tau), state.slow_rate * math.exp(-dt / self.slow_tau)
+
+    def _bump_rates(self, state: _TopicState, ts: float) -> None:
+        fast, slow = self._decay(state, max(ts, state.rate_ts))
+        state.fast_rate = fast + 1.0 / self.fast_tau
+        state.slow_rate = slow + 1.0 / self.slow_tau
+        state.rate_ts = max(ts, state.rate_ts)
+
+    def growth(self, state: _TopicState) -> float:
+        """Relative change of the recent arrival rate vs the window rate (0.5 == +50%)."""
+        fast, slow = self._decay(state, self.now)
+        if slow <= 0.0:
+            return 0.0
+        return fast / slow - 1.0
+
+    # --- Indexing and queries ---
+
+    def _reindex(self, key: str, state: _TopicState) -> None:
+        state.version = next(self._stamps)
+        for field, heap in self._heaps.items():
+            heapq.heappush(heap, (-state.score(field), state.version, key))
+            if len(heap) > 4 * len(self._topics) + 64:
+                self._rebuild(field)
+
+    def _rebuild(self, field: str) -> None:
+        heap = [(-s.score(field), s.version, k) for k, s in self._topics.items()]
+        heapq.heapify(heap)
+        self._heaps[field] = heap
+
+    def _trend(self, state: _TopicState) -> Dict[str, Any]:
+        growth = self.growth(state)
+        trend = {
+            "topic": state.topic,
+            "engagement_score": round(state.score("engagement_score"), 4),
+            "relevance_score": round(state.score("relevance_score"), 4),
+            "growth_rate": f"{growth * 100:+.0f}%",
+            "item_count": state.count,
+        }
+        if state.sources:
+            trend["sources"] = list(state.sources)
+        return trend
+
+    def top_k(self, k: int, by: str = "relevance_score") -> List[Dict[str, Any]]:
+        """
+        Returns the `k` best topics by `by` in O(k log n) amortized.
+
+        Stale heap entries (older versions, expired topics) are discarded as
+        they surface; valid ones are pushed back after the read.
+        """
+        if by not in self._heaps:
+            raise ValueError(f"Unknown score field {by!r}; expected one of {SCORE_FIELDS}")
+        heap = self._heaps[by]
+        found: List[Tuple[float, int, str]] = []
+        seen = set()
+        while heap and len(found) < k:
+            entry = heapq.heappop(heap)
+            _, version, key = entry
+            state = self._topics.get(key)
+            if state is None or state.version != version or key in seen:
+                continue
+            seen.add(key)
+            found.append(entry)
+        for entry in found:
+            heapq.heappush(heap, entry)
+        return [self._trend(self._topics[key]) for _, _, key in found]
+
+    def resource_payload(self, k: int = 20) -> Dict[str, Any]:
+        """Top-k trends in the news-resource shape consumed by trend_fetcher."""
+        return {"trends": self.top_k(k)}
+
+    # --- Alerts ---
+
+    def _check_alert(self, state: _TopicState) -> Optional[Dict[str, Any]]:
+        relevance = state.score("relevance_score")
+        growth = self.growth(state)
+        if not state.alerted:
+            if (
+                state.count >= self.alert_min_items
+                and relevance >= self.alert_relevance
+                and growth >= self.alert_growth
+            ):
+                state.alerted = True
+                alert = {
+                    "type": "trend_alert",
+                    "detected_at": _iso(self.now),
+                    "window_hours": self.window_seconds / 3600,
+                    "trend": self._trend(state),
+                }
+                if self.on_alert is not None:
+                    self.on_alert(alert)
+                return alert
+        elif (
+            state.count < self.alert_min_items * self.rearm_ratio
+            or relevance < self.alert_relevance * self.rearm_ratio
+        ):
+            state.alerted = False
+        return None
@@ -0,0 +1,13 @@
+"""Helpers shared by the test modules."""
+
+T0 = 1_770_000_000.0  # 2026-02-02T02:40:00Z
+
+
+class FakeClock:
+    """Stands in for the `clock` callables (time.time / time.monotonic); tests move `now` by hand."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
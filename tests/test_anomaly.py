@@ -0,0 +1,127 @@
+import unittest
+
+import numpy as np
+
+from chimera.anomaly import AnomalyDetector
+from helpers import T0
+
+# Reference: specs/openclaw_integration.md Section 3.4 (Protocol 4: Safety & Quarantine)
+
+
+class TestAnomalyDetector(unittest.TestCase):
+    """
+    Test running statistics and the Protocol 4 quarantine rules.
+
+    Reference: specs/openclaw_integration.md Section 3.4.1 (Quarantine Trigger Schema)
+    """
+
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+        self.emitted = []
+        self.detector = AnomalyDetector(on_trigger=self.emitted.append)
+
+    def feed(self, agent_id, sentiments, consistency=0.95, start=0):
+        triggers = []
+        for i, value in enumerate(sentiments):
+            trigger = self.detector.observe(agent_id, float(value), consistency, timestamp=T0 + start + i)
+            if trigger:
+                triggers.append((i, trigger))
+        return triggers
+
+    def test_running_statistics_match_full_history(self):
+        values = self.rng.uniform(-1, 1, 500)
+        self.feed("a", values)
+        metrics = self.detector.metrics("a")
+        self.assertEqual(metrics["messages"], 500)
+        self.assertAlmostEqual(metrics["sentiment_mean"], values.mean(), places=10)
+        self.assertAlmostEqual(metrics["lifetime_variance"], values.var(), places=10)
+
+        ew_mean, ew_var = values[0], 0.0
+        for value in values[1:]:
+            diff = value - ew_mean
+            ew_mean += 0.1 * diff
+            ew_var = 0.9 * (ew_var + diff * 0.1 * diff)
+        self.assertAlmostEqual(metrics["recent_mean"], ew_mean, places=10)
+        self.assertAlmostEqual(metrics["sentiment_variance"], ew_var, places=10)
+        expected = np.quantile(values[-32:], [0.1, 0.5, 0.9])
+        np.testing.assert_allclose(list(metrics["window_quantiles"].values()), expected)
+
+    def test_batch_matches_sequential(self):
+        agents = [f"agent-{i}" for i in self.rng.integers(0, 5, 400)]
+        sentiment = self.rng.uniform(-1, 1, 400)
+        consistency = self.rng.uniform(0.5, 1, 400)
+        timestamps = T0 + np.arange(400)
+        batched = AnomalyDetector(quarantine_duration=50)
+        triggers = batched.observe_batch(agents, sentiment, consistency, timestamps)
+        sequential = AnomalyDetector(quarantine_duration=50)
+        expected = [t for t in (sequential.observe(a, s, c, ts)
+                                for a, s, c, ts in zip(agents, sentiment, consistency, timestamps)) if t]
+
+        key = lambda t: (t["triggering_agent_id"], t["detected_at"], t["quarantine_reason"], t["metrics"])
+        self.assertEqual([key(t) for t in triggers], [key(t) for t in expected])
+        self.assertGreater(len(triggers), 0)
+        for agent_id in set(agents):
+            self.assertEqual(batched.metrics(agent_id), sequential.metrics(agent_id))
+
+    def test_stable_agent_is_never_quarantined(self):
+        self.assertEqual(self.feed("calm", 0.4 + self.rng.normal(0, 0.15, 5000)), [])
+        self.assertLess(self.detector.metrics("calm")["anomaly_score"], 0.9)
+
+    def test_sentiment_variance_trigger_payload(self):
+        triggers = self.feed("volatile", self.rng.choice([-0.95, 0.95], 100))
+        index, trigger = triggers[0]
+        self.assertGreaterEqual(index, self.detector.min_messages - 1)  # no trigger during warm-up
+        self.assertEqual(trigger["protocol"], "safety_quarantine")
+        self.assertEqual(trigger["version"], "1.0")
+        self.assertEqual(trigger["triggering_agent_id"], "volatile")
+        self.assertEqual(trigger["quarantine_reason"], "sentiment_variance")
+        self.assertGreater(trigger["metrics"]["sentiment_variance"], 0.8)
+        self.assertEqual(set(trigger["metrics"]), {"sentiment_variance", "persona_consistency_score", "anomaly_score"})
+        self.assertEqual(trigger["quarantine_duration"], 3600)
+        self.assertEqual(trigger["escalation_level"], "automatic")
+        self.assertRegex(trigger["detected_at"], r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+        self.assertEqual(self.emitted, [trigger])
+
+    def test_persona_drift(self):
+        self.assertEqual(self.feed("drifter", np.full(50, 0.3), consistency=0.9), [])
+        triggers = self.feed("drifter", np.full(50, 0.3), consistency=0.4, start=50)
+        self.assertEqual(triggers[0][1]["quarantine_reason"], "persona_drift")
+        self.assertLess(triggers[0][1]["metrics"]["persona_consistency_score"], 0.7)
+
+    def test_sentiment_shift_is_suspicious(self):
+        self.feed("shifty", 0.5 + self.rng.normal(0, 0.1, 300))
+        triggers = self.feed("shifty", -0.4 + self.rng.normal(0, 0.1, 32), start=300)
+        self.assertEqual(len(triggers), 1)
+        self.assertEqual(triggers[0][1]["quarantine_reason"], "suspicious_behavior")
+        self.assertGreater(triggers[0][1]["metrics"]["anomaly_score"], 0.9)
+
+    def test_quarantine_suppresses_repeats_until_expiry_or_release(self):
+        self.feed("volatile", self.rng.choice([-0.95, 0.95], 100))
+        self.assertEqual(self.detector.stats["triggers"], 1)
+        self.assertGreater(self.detector.stats["suppressed"], 0)
+        self.assertTrue(self.detector.is_quarantined("volatile", now=T0 + 100))
+
+        self.detector.release("volatile")
+        self.assertFalse(self.detector.is_quarantined("volatile", now=T0 + 100))
+        self.feed("volatile", self.rng.choice([-0.95, 0.95], 10), start=100)
+        self.assertEqual(self.detector.stats["triggers"], 2)
+
+        self.feed("volatile", self.rng.choice([-0.95, 0.95], 10), start=3690)  # still quarantined
+        self.assertEqual(self.detector.stats["triggers"], 2)
+        self.feed("volatile", self.rng.choice([-0.95, 0.95], 10), start=100 + 3600 + 10)
+        self.assertEqual(self.detector.stats["triggers"], 3)
+
+    def test_multiple_rules_need_human_review(self):
+        triggers = self.feed("bad", self.rng.choice([-0.95, 0.95], 100), consistency=0.2)
+        self.assertEqual(triggers[0][1]["escalation_level"], "human_review_required")
+
+    def test_many_agents_grow_state(self):
+        detector = AnomalyDetector(capacity=4)
+        detector.observe_batch([f"a{i}" for i in range(100)], np.zeros(100), np.ones(100))
+        self.assertEqual(len(detector), 100)
+        self.assertEqual(detector.metrics("a99")["messages"], 1)
+        self.assertIsNone(detector.metrics("unknown"))
+
+
+if __name__ == '__main__':
+    unittest.main()
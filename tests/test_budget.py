@@ -0,0 +1,168 @@
+import random
+import threading
+import unittest
+
+from chimera.budget import BudgetExceeded, BudgetLedger, budget_date, to_micro
+from chimera.redis_store import InMemoryRedis
+from helpers import FakeClock, T0
+
+# Reference: specs/functional.md FR 5.2 (Budget Governance), specs/technical.md Section 2.3 (Redis Schema)
+
+
+class TestBudgetLedger(unittest.TestCase):
+    """
+    Test reserve/commit/release against the daily limit and spend leases.
+
+    Reference: specs/functional.md FR 5.2 ("Max daily spend: $50 USDC")
+    """
+
+    def setUp(self):
+        self.redis = InMemoryRedis()
+        self.clock = FakeClock(T0)
+
+    def ledger(self, **kwargs):
+        kwargs.setdefault("clock", self.clock)
+        return BudgetLedger(self.redis, **kwargs)
+
+    def test_reserve_commit_release(self):
+        ledger = self.ledger()
+        image = ledger.reserve("agent-1", 2.5, task_id="t1")
+        boost = ledger.reserve("agent-1", 1.0, task_id="t2")
+        ledger.commit(image, actual_usdc=2.25)
+        ledger.release(boost)
+        self.assertEqual((image.state, boost.state), ("committed", "released"))
+        with self.assertRaises(ValueError):
+            ledger.commit(boost)
+
+        ledger.flush()
+        key = f"chimera:budget:agent-1:{budget_date(T0)}"
+        self.assertEqual(float(self.redis.get(key)), 2.25)
+        self.assertEqual(ledger.spent("agent-1"), 2.25)
+        ledger.close()
+        self.assertEqual(self.redis.hgetall(key + ":leases"), {})
+
+    def test_most_checks_stay_local(self):
+        ledger = self.ledger(lease_usdc=5.0)
+        for _ in range(100):
+            ledger.commit(ledger.reserve("agent-1", 0.1))
+        self.assertLessEqual(ledger.stats["syncs"], 3)
+        self.assertGreaterEqual(ledger.stats["local"], 97)
+        ledger.close()
+        self.assertAlmostEqual(ledger.spent("agent-1"), 10.0, places=6)
+
+    def test_daily_limit_rejects(self):
+        ledger = self.ledger(daily_limit_usdc=50.0, limits={"vip": 500.0})
+        spent = 0.0
+        with self.assertRaises(BudgetExceeded) as caught:
+            while True:
+                ledger.commit(ledger.reserve("agent-1", 3.0))
+                spent += 3.0
+        self.assertEqual(spent, 48.0)
+        self.assertEqual(caught.exception.reason, "daily_limit")
+        self.assertAlmostEqual(caught.exception.available, 2.0)
+        ledger.commit(ledger.reserve("agent-1", 2.0))  # the last $2 are still reachable
+        ledger.reserve("vip", 100.0)
+        ledger.close()
+        self.assertEqual(ledger.spent("agent-1"), 50.0)
+
+    def test_task_budget_limit(self):
+        ledger = self.ledger()
+        first = ledger.reserve("agent-1", 8.0, task_id="t1", budget_limit=10.0)
+        with self.assertRaises(BudgetExceeded) as caught:
+            ledger.reserve("agent-1", 3.0, task_id="t1", budget_limit=10.0)
+        self.assertEqual(caught.exception.reason, "task_budget")
+        ledger.commit(first, actual_usdc=6.0)
+        ledger.reserve("agent-1", 4.0, task_id="t1", budget_limit=10.0)
+
+    def test_budget_resets_at_midnight_utc(self):
+        self.clock.now = T0 - T0 % 86400 + 86400 - 1  # 23:59:59 UTC
+        ledger = self.ledger(daily_limit_usdc=10.0)
+        ledger.commit(ledger.reserve("agent-1", 10.0))
+        with self.assertRaises(BudgetExceeded):
+            ledger.reserve("agent-1", 1.0)
+        yesterday = budget_date(self.clock.now)
+
+        self.clock.now += 2
+        ledger.commit(ledger.reserve("agent-1", 4.0))
+        ledger.close()
+        self.assertEqual(ledger.spent("agent-1", yesterday), 10.0)
+        self.assertEqual(ledger.spent("agent-1"), 4.0)
+
+    def test_crashed_worker_lease_is_charged_in_full(self):
+        crashed = self.ledger(worker_id="w-crashed", daily_limit_usdc=20.0, lease_usdc=5.0)
+        held = crashed.reserve("agent-1", 1.0)
+        crashed.commit(crashed.reserve("agent-1", 1.0))  # unflushed when the worker "dies"
+
+        self.clock.now += 301  # past lease_ttl
+        survivor = self.ledger(worker_id="w-alive", daily_limit_usdc=20.0, lease_usdc=5.0)
+        survivor.commit(survivor.reserve("agent-1", 1.0))
+        self.assertEqual(survivor.stats["reclaimed_leases"], 1)
+        self.assertEqual(survivor.spent("agent-1"), 5.0)  # the whole lease, not the $2 actually used
+
+        # The "crashed" worker comes back: its lease is gone and must not be double counted.
+        crashed.commit(held)
+        crashed.flush()
+        self.assertEqual(crashed.stats["lost_leases"], 1)
+        survivor.close()
+        crashed.close()
+        self.assertEqual(survivor.spent("agent-1"), 6.0)
+
+    def test_anomaly_fast_path_flags(self):
+        ledger = self.ledger(daily_limit_usdc=50.0, max_velocity=10)
+        for _ in range(5):
+            self.assertFalse(ledger.reserve("agent-1", 0.5).requires_review)
+        self.assertEqual(ledger.reserve("agent-1", 4.0).flags, ("unusual_amount",))
+        self.assertIn("large_single_spend", ledger.reserve("agent-1", 15.0).flags)
+        flags = [ledger.reserve("agent-2", 0.1).flags for _ in range(12)]
+        self.assertEqual(flags[-1], ("spend_velocity",))
+        self.assertEqual(ledger.stats["flagged"], 4)
+
+
+class TestBudgetLedgerConcurrency(unittest.TestCase):
+    """
+    Stress test: many workers and threads spending for one agent at once.
+
+    Reference: specs/functional.md FR 5.2 (CFO Judge REJECTS exceeding limits)
+    """
+
+    def test_limit_is_never_overshot(self):
+        redis = InMemoryRedis()
+        limit = 50.0
+        ledgers = [BudgetLedger(redis, daily_limit_usdc=limit, lease_usdc=2.0, flush_interval=0.01)
+                   for _ in range(4)]
+        committed = []
+        lock = threading.Lock()
+
+        def worker(ledger, seed):
+            rng = random.Random(seed)
+            for _ in range(200):
+                try:
+                    reservation = ledger.reserve("agent-1", rng.choice([0.01, 0.25, 0.5, 1.0, 2.5]))
+                except BudgetExceeded:
+                    continue
+                if rng.random() < 0.2:
+                    ledger.release(reservation)
+                    continue
+                actual = round(reservation.amount_usdc * rng.uniform(0.5, 1.0), 6)
+                ledger.commit(reservation, actual_usdc=actual)
+                with lock:
+                    committed.append(to_micro(actual))
+
+        threads = [threading.Thread(target=worker, args=(ledger, 4 * n + i))
+                   for n, ledger in enumerate(ledgers) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for ledger in ledgers:
+            ledger.close()
+
+        spent = to_micro(ledgers[0].spent("agent-1"))
+        self.assertEqual(spent, sum(committed))
+        self.assertLessEqual(spent, to_micro(limit))
+        self.assertGreater(spent, to_micro(limit * 0.8))  # the budget was actually used, not stranded in leases
+        self.assertEqual(redis.hgetall(f"chimera:budget:agent-1:{budget_date(ledgers[0].clock())}:leases"), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
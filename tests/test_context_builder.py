@@ -0,0 +1,137 @@
+import unittest
+
+from skills.engagement_manager import ContextBuilder, TokenCounter
+from skills.engagement_manager.context import approximate_encode
+from skills.schema_registry import validate_output
+
+# Reference: specs/functional.md FR 1.1, skills/engagement_manager/README.md
+
+
+PERSONA = {
+    "soul_md_hash": "sha256-persona-v1",
+    "backstory": "Addis-based fashion influencer who loves vintage markets.",
+    "voice_traits": ["Witty", "Empathetic"],
+    "core_beliefs": ["Sustainability-focused"],
+    "directives": ["Never discuss politics"],
+}
+
+
+def parameters(history, trends=("Sustainable Fashion",), constraints=("Witty", "Keep replies short")):
+    return {
+        "interaction_type": "reply",
+        "platform": "twitter",
+        "target_content_id": "tweet-1",
+        "target_user_id": "user-1",
+        "persona_constraints": list(constraints),
+        "context": {
+            "conversation_history": list(history),
+            "user_profile": {"followers": 5000, "verified": False, "interests": ["fashion"]},
+            "trending_topics": list(trends),
+        },
+    }
+
+
+class CountingEncoder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return approximate_encode(text)
+
+
+class TestPersonaPrefix(unittest.TestCase):
+    """
+    Test that the SOUL.md block is a cached prefix keyed by soul_md_hash.
+
+    Reference: specs/technical.md Section 2.2 (AgentPersona.soul_md_hash)
+    """
+
+    def test_prefix_tokenized_once_per_version(self):
+        encoder = CountingEncoder()
+        builder = ContextBuilder(encode=encoder)
+        builder.build(PERSONA, parameters(["User: hi"]))
+        builder.build(PERSONA, parameters(["User: hi", "Agent: hey", "User: thrift tips?"]))
+        prefix_calls = [c for c in encoder.calls if c.startswith("# Persona")]
+        self.assertEqual(len(prefix_calls), 1)
+        self.assertEqual(builder.stats["prefix_hits"], 1)
+
+        builder.build({**PERSONA, "soul_md_hash": "sha256-persona-v2"}, parameters(["User: hi"]))
+        self.assertEqual(builder.stats["prefix_misses"], 2)
+
+    def test_only_new_messages_are_tokenized(self):
+        encoder = CountingEncoder()
+        builder = ContextBuilder(encode=encoder)
+        history = ["User: what do you think of thrift stores?", "Agent: love them!"]
+        builder.build(PERSONA, parameters(history))
+        before = len(encoder.calls)
+        builder.build(PERSONA, parameters(history + ["User: any in Addis?"]))
+        self.assertEqual(encoder.calls[before:], ["User: any in Addis?"])
+
+    def test_constraints_already_in_persona_are_not_repeated(self):
+        packed = ContextBuilder().build(PERSONA, parameters(["User: hi"]))
+        constraints = [s for s in packed.segments if s.kind == "constraints"]
+        self.assertEqual(constraints[0].text, "## Constraints\n- Keep replies short")
+
+
+class TestPacking(unittest.TestCase):
+    """
+    Test budgeted packing and the reported context_used.
+
+    Reference: skills/engagement_manager/output_schema.json (metadata.context_used)
+    """
+
+    def test_token_count_matches_full_prompt(self):
+        builder = ContextBuilder(token_budget=10_000)
+        packed = builder.build(
+            PERSONA,
+            parameters(["User: sustainable fashion?", "Agent: always!", "User: best thrift in Addis?"]),
+            episodic=[{"text": "replied about thrift"}, {"text": "posted a haul"}],
+            semantic=[{"content": "Merkato thrift finds", "score": 0.9}],
+        )
+        self.assertEqual(packed.tokens, len(approximate_encode(packed.prompt)))
+        self.assertEqual(packed.dropped, 0)
+        self.assertEqual(packed.context_used["episodic_memory_count"], 2)
+        self.assertEqual(packed.context_used["semantic_memory_count"], 1)
+        self.assertEqual(packed.context_used["soul_md_sections"], ["backstory", "voice_traits", "core_beliefs", "directives"])
+        self.assertTrue(packed.prompt.endswith("User: best thrift in Addis?"))
+
+    def test_budget_keeps_most_relevant(self):
+        counter = TokenCounter()
+        builder = ContextBuilder(counter=counter)
+        base = builder.build(PERSONA, parameters(["User: thrift shopping in Addis?"]), semantic=[]).tokens
+        semantic = [
+            {"content": "notes on thrift shopping in Addis markets", "score": 0.95},
+            {"content": "unrelated recipe for injera " * 3, "score": 0.2},
+        ]
+        budget = base + builder.separator_tokens + counter.count("[memory] " + semantic[0]["content"]) + 1
+        packed = ContextBuilder(token_budget=budget, counter=counter).build(
+            PERSONA, parameters(["User: thrift shopping in Addis?"]), semantic=semantic
+        )
+        self.assertLessEqual(packed.tokens, budget)
+        self.assertEqual([s.text for s in packed.segments if s.kind == "semantic"], ["[memory] " + semantic[0]["content"]])
+        self.assertEqual(packed.dropped, 1)
+
+    def test_latest_message_is_packed_first_and_history_stays_in_order(self):
+        history = [f"User: message number {i} about fashion" for i in range(40)]
+        packed = ContextBuilder(token_budget=200).build(PERSONA, parameters(history))
+        turns = [s.text for s in packed.segments if s.kind == "history"]
+        self.assertEqual(turns[-1], history[-1])
+        self.assertEqual(turns, sorted(turns, key=history.index))
+        self.assertLess(len(turns), 40)
+        self.assertLessEqual(packed.tokens, 200)
+
+    def test_context_used_fits_output_schema(self):
+        packed = ContextBuilder().build(PERSONA, parameters(["User: hi"]))
+        validate_output("engagement_manager", {
+            "interaction": {"type": "reply", "platform": "twitter", "response_text": "hey!", "sent_at": "2026-02-04T10:10:00Z"},
+            "metadata": {"context_used": packed.context_used, "relevance_score": 0.9, "sentiment_score": 0.5},
+        })
+
+    def test_persona_larger_than_budget_is_an_error(self):
+        with self.assertRaises(ValueError):
+            ContextBuilder(token_budget=5).build(PERSONA, parameters(["User: hi"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
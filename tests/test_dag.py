@@ -0,0 +1,194 @@
+import asyncio
+import unittest
+
+from chimera.dag import DONE, FAILED, PENDING, READY, RUNNING, SKIPPED, DagExecutor, topological_levels
+
+# Reference: specs/functional.md US-4.1 (Goal Decomposition)
+
+
+def node(task_id, deps=(), seconds=1.0, task_type="generate_content", agent_id="agent-1"):
+    return {
+        "task_id": task_id,
+        "task_type": task_type,
+        "priority": "medium",
+        "context": {"goal_description": f"step {task_id}"},
+        "created_at": "2026-02-04T10:00:00Z",
+        "status": "pending",
+        "depends_on": list(deps),
+        "estimated_seconds": seconds,
+        "agent_id": agent_id,
+    }
+
+
+def ids(tasks):
+    return [task["task_id"] for task in tasks]
+
+
+class TestDagExecutor(unittest.TestCase):
+    """
+    Test dependency release, critical-path order, caps and failures.
+
+    Reference: specs/functional.md US-4.1 ("Planner generates DAG of tasks")
+    """
+
+    def test_tasks_release_as_dependencies_finish(self):
+        dag = DagExecutor.from_task_tree({"tasks": [
+            node("research"), node("draft", ["research"]), node("image", ["research"]),
+            node("post", ["draft", "image"]),
+        ]})
+        self.assertEqual(ids(dag.next_ready()), ["research"])
+        self.assertEqual(dag.next_ready(), [])
+        self.assertEqual(sorted(dag.complete("research")), ["draft", "image"])
+        first = dag.next_ready()
+        self.assertEqual(first[0]["agent_id"], "agent-1")
+        self.assertNotIn("depends_on", first[0])
+        dag.complete("draft")
+        self.assertEqual(dag.state("post"), PENDING)
+        dag.complete("image")
+        self.assertEqual(dag.state("post"), READY)
+        dag.next_ready()
+        dag.complete("post")
+        self.assertTrue(dag.finished)
+        self.assertEqual(dag.counts()[DONE], 4)
+
+    def test_critical_path_first(self):
+        dag = DagExecutor.from_task_tree([
+            node("short"),
+            node("long-1", seconds=2), node("long-2", ["long-1"], seconds=5), node("long-3", ["long-2"], seconds=5),
+            node("mid", seconds=4),
+        ])
+        self.assertEqual(dag.rank("long-1"), 12.0)
+        self.assertEqual(dag.critical_path(), ["long-1", "long-2", "long-3"])
+        self.assertEqual(ids(dag.next_ready(max_tasks=2)), ["long-1", "mid"])
+        self.assertEqual(ids(dag.next_ready()), ["short"])
+
+    def test_dropped_edge_reranks_old_dependency(self):
+        dag = DagExecutor.from_task_tree([node("A", seconds=1), node("B", ["A"], seconds=10), node("C", seconds=5)])
+        self.assertEqual(dag.rank("A"), 11)
+        dag.replan(add=[node("B", seconds=10)])
+        self.assertEqual(dag.rank("A"), 1)
+        self.assertEqual(ids(dag.next_ready(max_tasks=2)), ["B", "C"])
+
+    def test_agent_and_type_caps(self):
+        tasks = [node(f"render-{i}", task_type="generate_content", agent_id=f"a{i % 2}") for i in range(4)]
+        tasks += [node(f"reply-{i}", task_type="reply_comment", agent_id="a0", seconds=0.5) for i in range(3)]
+        dag = DagExecutor.from_task_tree(tasks, agent_limit=2, type_limits={"generate_content": 1})
+        self.assertEqual(ids(dag.next_ready()), ["render-0", "reply-0"])  # one render at a time
+        dag.complete("render-0")
+        self.assertEqual(ids(dag.next_ready()), ["render-1", "reply-1"])
+        self.assertEqual(dag.counts()[RUNNING], 3)
+        dag.complete("reply-0")
+        self.assertEqual(ids(dag.next_ready()), ["reply-2"])  # a0 is back at its cap of two
+        dag.complete("render-1")
+        self.assertEqual(ids(dag.next_ready()), ["render-3"])  # render-2 belongs to a0
+        self.assertEqual(dag.state("render-2"), READY)
+        self.assertGreater(dag.stats["parked"], 0)
+
+    def test_failure_retries_then_skips_descendants(self):
+        dag = DagExecutor.from_task_tree([node("a"), node("b", ["a"]), node("c", ["b"]), node("d")], max_attempts=2)
+        dag.next_ready()
+        self.assertTrue(dag.fail("a"))
+        self.assertEqual(ids(dag.next_ready()), ["a"])
+        self.assertFalse(dag.fail("a"))
+        self.assertEqual([dag.state(t) for t in "abcd"], [FAILED, SKIPPED, SKIPPED, RUNNING])
+        with self.assertRaises(ValueError):
+            dag.complete("b")
+
+
+class TestReplanning(unittest.TestCase):
+    """
+    Test incremental re-planning of a running campaign.
+
+    Reference: specs/functional.md US-4.1 ("Dynamic re-planning on state changes")
+    """
+
+    def setUp(self):
+        # Two independent chains of 50 tasks.
+        tasks = []
+        for chain in "xy":
+            tasks += [node(f"{chain}{i}", [f"{chain}{i - 1}"] if i else []) for i in range(50)]
+        self.dag = DagExecutor.from_task_tree(tasks)
+
+    def test_only_ancestors_are_reranked(self):
+        reranked = self.dag.replan(add=[node("x-extra", ["x10"], seconds=100)])
+        self.assertEqual(reranked, 12)  # x-extra and x0..x10, not the y chain
+        self.assertEqual(self.dag.rank("x0"), 11 + 100)
+        self.assertEqual(self.dag.rank("y0"), 50)
+        self.assertEqual(ids(self.dag.next_ready(max_tasks=1)), ["x0"])
+
+    def test_update_and_remove(self):
+        self.dag.next_ready()
+        self.dag.complete("x0")
+        self.dag.replan(add=[node("x1", ["x0", "y5"])])  # x1 now also waits for y5
+        self.assertEqual(self.dag.state("x1"), PENDING)
+        self.dag.replan(remove=["y5"])  # y6 loses its dependency and x1 its extra one
+        self.assertEqual(self.dag.state("x1"), READY)
+        self.assertEqual(self.dag.state("y6"), READY)
+        self.assertEqual(len(self.dag), 99)
+        self.assertEqual(self.dag.rank("y0"), 5)
+
+    def test_rejected_plans_change_nothing(self):
+        with self.assertRaises(ValueError):
+            self.dag.replan(add=[node("x0", ["x49"])])  # cycle
+        with self.assertRaises(ValueError):
+            self.dag.replan(add=[node("z", ["missing"])])
+        self.dag.next_ready()
+        with self.assertRaises(ValueError):
+            self.dag.replan(remove=["x0"])  # already running
+        self.assertEqual(len(self.dag), 100)
+        self.assertEqual(self.dag.rank("x0"), 50)
+        self.assertEqual(self.dag.critical_path()[-1], "x49")
+
+
+class TestDagRun(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the async driver.
+
+    Reference: specs/functional.md US-4.1 ("Worker Agents can execute them in parallel")
+    """
+
+    async def test_run_executes_in_dependency_order(self):
+        levels = [[f"l{depth}-{i}" for i in range(3)] for depth in range(4)]
+        tasks = [node(task_id, levels[depth - 1] if depth else []) for depth, level in enumerate(levels)
+                 for task_id in level]
+        tasks.append(node("broken"))
+        tasks.append(node("after-broken", ["broken"]))
+        dag = DagExecutor.from_task_tree(tasks)
+        order, active, peak = [], [0], [0]
+
+        async def execute(task):
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+            await asyncio.sleep(0)
+            active[0] -= 1
+            if task["task_id"] == "broken":
+                raise RuntimeError("render failed")
+            order.append(task["task_id"])
+
+        counts = await dag.run(execute, max_concurrency=2)
+        self.assertEqual(counts[DONE], 12)
+        self.assertEqual((counts[FAILED], counts[SKIPPED]), (1, 1))
+        self.assertLessEqual(peak[0], 2)
+        position = {task_id: i for i, task_id in enumerate(order)}
+        for depth in range(1, 4):
+            for task_id in levels[depth]:
+                self.assertTrue(all(position[dep] < position[task_id] for dep in levels[depth - 1]))
+        self.assertEqual(topological_levels(tasks)[0][:3], levels[0])
+
+    async def test_stop_settles_running_jobs(self):
+        dag = DagExecutor.from_task_tree([node("fast"), node("slow"), node("later", ["fast", "slow"])])
+        stop = asyncio.Event()
+
+        async def execute(task):
+            if task["task_id"] == "fast":
+                stop.set()
+            else:
+                await asyncio.sleep(0.01)
+
+        counts = await dag.run(execute, stop=stop)
+        self.assertEqual((counts[RUNNING], counts[DONE]), (0, 2))
+        self.assertEqual(dag.state("later"), READY)
+
+
+if __name__ == '__main__':
+    unittest.main()
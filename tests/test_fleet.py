@@ -0,0 +1,187 @@
+import heapq
+import random
+import unittest
+import uuid
+
+from chimera.fleet import (
+    STATES,
+    FleetAggregator,
+    Heartbeat,
+    HeartbeatEncoder,
+    decode_heartbeats,
+    encode_heartbeat,
+    normalize_state,
+)
+from chimera.keys import redis_key
+from chimera.redis_store import InMemoryRedis
+from helpers import FakeClock, T0
+
+# Reference: specs/functional.md US-1.2 (Fleet Monitoring)
+
+
+class TestHeartbeatEncoding(unittest.TestCase):
+    """
+    Test the binary heartbeat frames and delta encoding.
+
+    Reference: specs/technical.md Section 2.3 (agent_status: state, last_heartbeat, queue_depth)
+    """
+
+    def test_round_trip_and_frame_sizes(self):
+        agent_id = str(uuid.uuid4())
+        full = Heartbeat(agent_id, T0 + 0.25, "judging", 12, 3, 41.123456, 8.5)
+        liveness = Heartbeat("agent-named", T0 + 1)
+        self.assertEqual(len(encode_heartbeat(full)), 52)
+        self.assertEqual(len(encode_heartbeat(Heartbeat(agent_id, T0))), 27)
+        buffer = encode_heartbeat(full) + encode_heartbeat(liveness)
+        self.assertEqual(list(decode_heartbeats(buffer)), [full, liveness])
+
+    def test_non_canonical_uuid_keeps_its_spelling(self):
+        agent_id = str(uuid.uuid4()).upper()
+        (decoded,) = decode_heartbeats(encode_heartbeat(Heartbeat(agent_id, T0, "working")))
+        self.assertEqual(decoded.agent_id, agent_id)
+
+    def test_spec_state_spellings(self):
+        self.assertEqual([normalize_state(s) for s in ("Planning", " Judging", "active", "sleeping")],
+                         ["planning", "judging", "working", "sleeping"])
+        (decoded,) = decode_heartbeats(encode_heartbeat(Heartbeat("a1", T0, "Working")))
+        self.assertEqual(decoded.state, "working")
+        with self.assertRaisesRegex(ValueError, "unknown agent state 'busy'"):
+            encode_heartbeat(Heartbeat("a1", T0, "busy"))
+
+    def test_encoder_sends_only_changes_until_keyframe(self):
+        clock = FakeClock(T0)
+        encoder = HeartbeatEncoder(keyframe_interval=60, clock=clock)
+        first = encoder.encode("a1", state="working", queue_depth=4, wallet_balance=10.0)
+        clock.now += 5
+        second = encoder.encode("a1", state="working", queue_depth=5, wallet_balance=10.0)
+        clock.now += 60
+        third = encoder.encode("a1")
+        (first,), (second,), (third,) = (list(decode_heartbeats(f)) for f in (first, second, third))
+        self.assertEqual((first.state, first.queue_depth, first.wallet_balance), ("working", 4, 10.0))
+        self.assertEqual(second, Heartbeat("a1", T0 + 5, queue_depth=5))
+        self.assertEqual((third.state, third.queue_depth), ("working", 5))  # keyframe repeats everything
+        with self.assertRaises(TypeError):
+            encoder.encode("a1", mood="happy")
+
+
+class TestFleetAggregator(unittest.TestCase):
+    """
+    Test incremental counts, totals, outliers, staleness and diffs.
+
+    Reference: specs/functional.md US-1.2 (agent states, wallet balances, HITL queue depth)
+    """
+
+    def setUp(self):
+        self.clock = FakeClock(T0)
+        self.fleet = FleetAggregator(top_k=3, stale_after=90, clock=self.clock)
+
+    def send(self, *heartbeats):
+        self.fleet.apply(b"".join(encode_heartbeat(hb) for hb in heartbeats))
+
+    def test_incremental_state_matches_recomputation(self):
+        rng = random.Random(5)
+        encoder = HeartbeatEncoder(keyframe_interval=30, clock=self.clock)
+        truth = {}
+        for step in range(5000):
+            self.clock.now = T0 + step * 0.01
+            agent_id = f"agent-{rng.randrange(40)}"
+            if rng.random() < 0.01 and agent_id in truth:
+                self.fleet.remove(agent_id)
+                encoder.forget(agent_id)
+                del truth[agent_id]
+                continue
+            status = dict(truth.get(agent_id) or {"state": "sleeping", "queue_depth": 0, "hitl_depth": 0,
+                                                  "wallet_balance": 20.0, "daily_spend": 0.0})
+            field = rng.choice(["state", "queue_depth", "hitl_depth", "wallet_balance", "daily_spend"])
+            status[field] = {"state": rng.choice(STATES[:4]), "queue_depth": rng.randrange(50),
+                             "hitl_depth": rng.randrange(20), "wallet_balance": round(rng.uniform(0, 100), 6),
+                             "daily_spend": round(rng.uniform(0, 50), 6)}[field]
+            truth[agent_id] = status
+            self.fleet.apply(encoder.encode(agent_id, **status))
+            if step % 500 == 0:
+                self.fleet.publish()
+
+        self.fleet.publish()
+        snapshot = self.fleet.snapshot()
+        self.assertEqual(snapshot["summary"]["agents"], len(truth))
+        self.assertEqual(snapshot["by_state"], {state: sum(s["state"] == state for s in truth.values())
+                                                for state in STATES})
+        self.assertEqual(snapshot["totals"]["hitl_depth"], sum(s["hitl_depth"] for s in truth.values()))
+        self.assertAlmostEqual(snapshot["totals"]["wallet_balance_usdc"],
+                               sum(s["wallet_balance"] for s in truth.values()), places=5)
+        lowest = heapq.nsmallest(3, (s["wallet_balance"] for s in truth.values()))
+        self.assertEqual([o["wallet_balance_usdc"] for o in snapshot["outliers"]["lowest_wallet"]], lowest)
+        deepest = heapq.nlargest(3, (s["queue_depth"] for s in truth.values()))
+        self.assertEqual([o["queue_depth"] for o in snapshot["outliers"]["queue_depth"]], deepest)
+
+    def test_silent_agents_turn_stale_and_recover(self):
+        self.send(Heartbeat("a1", T0, "working", 1, 0, 5.0, 0.0), Heartbeat("a2", T0 + 50, "sleeping", 0, 0, 5.0, 0.0))
+        self.clock.now = T0 + 100
+        diff = self.fleet.publish()
+        self.assertEqual(diff["summary"], {"agents": 2, "stale": 1})
+        self.assertTrue(diff["agents"]["a1"]["stale"])
+        self.assertEqual([o["agent_id"] for o in self.fleet.snapshot()["outliers"]["stale"]], ["a1"])
+
+        self.send(Heartbeat("a1", T0 + 101))
+        self.clock.now = T0 + 120
+        self.fleet.publish()
+        self.assertEqual(self.fleet.snapshot()["summary"]["stale"], 0)
+        self.assertFalse(self.fleet.agent("a1")["stale"])
+
+    def test_delayed_frames_are_ignored(self):
+        self.send(Heartbeat("a1", T0 + 10, "judging", 2), Heartbeat("a1", T0 + 5, "working", 9))
+        self.assertEqual(self.fleet.agent("a1")["state"], "judging")
+        self.assertEqual(self.fleet.agent("a1")["queue_depth"], 2)
+
+    def test_diffs_carry_only_changes(self):
+        diffs = []
+        self.fleet.subscribe(diffs.append)
+        self.send(Heartbeat("a1", T0, "working", 1, 2, 5.0, 0.0), Heartbeat("a2", T0, "working", 1, 0, 5.0, 0.0))
+        first = self.fleet.publish()
+        self.assertEqual(set(first["agents"]), {"a1", "a2"})
+        self.assertEqual(first["by_state"]["working"], 2)
+
+        self.assertIsNone(self.fleet.publish())  # nothing changed, nothing pushed
+        self.send(Heartbeat("a2", T0 + 1, queue_depth=7))
+        second = self.fleet.publish()
+        self.assertEqual(second["base_version"], first["version"])
+        self.assertEqual(set(second["agents"]), {"a2"})
+        self.assertNotIn("by_state", second)
+        self.assertEqual(second["totals"]["queue_depth"], 8)
+
+        self.fleet.remove("a1")
+        third = self.fleet.publish()
+        self.assertEqual(third["agents"], {"a1": None})
+        self.assertEqual(third["summary"]["agents"], 1)
+        self.assertEqual(diffs, [first, second, third])
+        self.assertEqual(self.fleet.snapshot()["version"], third["version"])
+
+    def test_failing_subscriber_does_not_block_others(self):
+        received = []
+        self.fleet.subscribe(lambda diff: 1 / 0)
+        self.fleet.subscribe(received.append)
+        self.send(Heartbeat("a1", T0, "working"))
+        self.fleet.publish()
+        self.assertEqual(len(received), 1)
+        self.assertEqual(self.fleet.stats["callback_errors"], 1)
+
+    def test_load_from_status_hashes_in_one_round_trip(self):
+        redis = InMemoryRedis()
+        for i in range(50):
+            redis.hset(redis_key("agent_status", agent_id=f"a{i}"), mapping={
+                "state": "active" if i % 2 else "Sleeping", "last_heartbeat": T0 - i, "queue_depth": i,
+                "wallet_balance": 10.0 + i,
+            })
+        before = redis.round_trips
+        self.assertEqual(self.fleet.load(redis, [f"a{i}" for i in range(52)]), 50)
+        self.assertEqual(redis.round_trips - before, 1)
+        self.fleet.publish()
+        snapshot = self.fleet.snapshot()
+        self.assertEqual((snapshot["by_state"]["working"], snapshot["by_state"]["sleeping"]), (25, 25))
+        self.assertEqual(snapshot["totals"]["queue_depth"], sum(range(50)))
+        self.assertEqual(snapshot["outliers"]["lowest_wallet"][0], {"agent_id": "a0", "wallet_balance_usdc": 10.0})
+        self.assertEqual(self.fleet.snapshot_json()[:1], b"{")
+
+
+if __name__ == '__main__':
+    unittest.main()
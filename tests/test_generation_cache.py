@@ -0,0 +1,209 @@
+import asyncio
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from helpers import FakeClock
+from skills.content_generator import GenerationCache, generation_key
+
+# Reference: skills/content_generator/README.md, skills/content_generator/output_schema.json (metadata.generation_cost_usdc)
+
+
+class PaidGenerator:
+    """Stands in for the paid image/video MCP tools; counts calls."""
+
+    def __init__(self, cost=12.5, delay=0.0, fail=False):
+        self.cost = cost
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def __call__(self, parameters):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("ideogram unavailable")
+        return {
+            "content": {
+                "text": f"Post about {parameters['topic']} #{self.calls}",
+                "image_url": f"https://cdn.chimera.ai/generated/image-{self.calls}.jpg",
+                "video_url": None,
+                "platform": parameters["platform"],
+                "disclosure_level": "automated",
+            },
+            "metadata": {
+                "generated_at": "2026-02-04T10:05:00Z",
+                "generation_cost_usdc": self.cost,
+                "character_consistency_score": 0.95,
+                "brand_alignment_score": 0.91,
+            },
+        }
+
+
+def params(**overrides):
+    parameters = {
+        "content_type": "image",
+        "platform": "instagram",
+        "topic": "Sustainable Fashion Trends",
+        "persona_constraints": ["Witty", "Sustainability-focused"],
+        "character_reference_id": "agent-123-character-lora",
+        "tier": "daily",
+        "budget_limit_usdc": 25.0,
+    }
+    parameters.update(overrides)
+    return parameters
+
+
+class TestGenerationCache(unittest.IsolatedAsyncioTestCase):
+    """
+    Test content addressing, coalescing, persistence, eviction and cost reporting.
+
+    Reference: skills/content_generator/README.md (Implementation Notes)
+    """
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = Path(self._tmp.name)
+        self.clock = FakeClock(1_000_000.0)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def make_cache(self, **kwargs):
+        return GenerationCache(self.directory, clock=self.clock, **kwargs)
+
+    def test_key_ignores_budget_and_cosmetic_differences(self):
+        base = generation_key(params())
+        self.assertEqual(base, generation_key(params(budget_limit_usdc=3.0)))
+        self.assertEqual(base, generation_key(params(topic="  sustainable   fashion TRENDS ")))
+        self.assertEqual(base, generation_key(params(persona_constraints=["sustainability-focused", "Witty", "witty"])))
+        self.assertEqual(base, generation_key({k: v for k, v in params().items() if k != "tier"}))
+        self.assertNotEqual(base, generation_key(params(platform="tiktok")))
+        self.assertNotEqual(base, generation_key(params(character_reference_id="agent-456-character-lora")))
+        self.assertNotEqual(base, generation_key(params(tier="hero")))
+        self.assertNotEqual(base, generation_key(params(), namespace="ideogram-v3"))
+
+    async def test_hit_reports_zero_cost(self):
+        cache = self.make_cache()
+        generator = PaidGenerator(cost=12.5)
+        first = await cache.generate(params(), generator)
+        second = await cache.generate(params(budget_limit_usdc=5.0), generator)
+
+        self.assertEqual(generator.calls, 1)
+        self.assertEqual(first["metadata"]["generation_cost_usdc"], 12.5)
+        self.assertNotIn("cache_hit", first["metadata"])
+        self.assertEqual(second["content"], first["content"])
+        self.assertEqual(second["metadata"]["generation_cost_usdc"], 0.0)
+        self.assertTrue(second["metadata"]["cache_hit"])
+        self.assertEqual(second["metadata"]["cached_cost_usdc"], 12.5)
+        self.assertEqual(cache.stats["spent_usdc"], 12.5)
+        self.assertEqual(cache.stats["saved_usdc"], 12.5)
+
+    async def test_concurrent_identical_requests_pay_once(self):
+        cache = self.make_cache()
+        generator = PaidGenerator(delay=0.05)
+        results = await asyncio.gather(*(cache.generate(params(), generator) for _ in range(10)))
+
+        self.assertEqual(generator.calls, 1)
+        self.assertEqual(cache.stats["coalesced"], 9)
+        costs = sorted(r["metadata"]["generation_cost_usdc"] for r in results)
+        self.assertEqual(costs, [0.0] * 9 + [12.5])
+        self.assertEqual(len({r["content"]["image_url"] for r in results}), 1)
+
+    async def test_failures_are_shared_but_not_cached(self):
+        cache = self.make_cache()
+        generator = PaidGenerator(delay=0.02, fail=True)
+        results = await asyncio.gather(*(cache.generate(params(), generator) for _ in range(3)), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+        self.assertEqual(generator.calls, 1)
+        self.assertEqual(len(cache), 0)
+
+        generator.fail = False
+        await cache.generate(params(), generator)
+        self.assertEqual(generator.calls, 2)
+
+    async def test_entries_survive_restart(self):
+        generator = PaidGenerator()
+        await self.make_cache().generate(params(), generator)
+
+        reopened = self.make_cache()
+        self.assertEqual(len(reopened), 1)
+        result = await reopened.generate(params(), generator)
+        self.assertEqual(generator.calls, 1)
+        self.assertTrue(result["metadata"]["cache_hit"])
+
+    async def test_entries_are_shared_between_workers(self):
+        generator = PaidGenerator()
+        other = self.make_cache()
+        await self.make_cache().generate(params(), generator)
+
+        self.assertTrue(other.get(params())["metadata"]["cache_hit"])
+        await other.generate(params(), generator)
+        self.assertEqual(generator.calls, 1)
+        self.assertEqual(len(other), 1)
+
+    async def test_store_failure_still_returns_result(self):
+        cache = self.make_cache()
+        generator = PaidGenerator()
+
+        def full(parameters, result):
+            raise OSError(28, "No space left on device")
+
+        cache.put = full
+        with self.assertLogs("skills.content_generator.cache", "ERROR"):
+            result = await cache.generate(params(), generator)
+        self.assertEqual(result["metadata"]["generation_cost_usdc"], 12.5)
+        self.assertEqual((cache.stats["store_errors"], cache.stats["spent_usdc"]), (1, 12.5))
+
+    async def test_age_eviction(self):
+        cache = self.make_cache(max_age=3600)
+        generator = PaidGenerator()
+        await cache.generate(params(), generator)
+        await cache.generate(params(topic="Habesha Kemis"), generator)
+
+        self.clock.now += 1800
+        await cache.generate(params(topic="Habesha Kemis"), generator)
+        self.assertEqual(generator.calls, 2)
+
+        self.clock.now += 1801
+        self.assertEqual(cache.prune(), 2)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(list(self.directory.rglob("*.json")), [])
+        await cache.generate(params(), generator)
+        self.assertEqual(generator.calls, 3)
+
+    async def test_size_eviction_is_least_recently_used(self):
+        generator = PaidGenerator()
+        probe = self.make_cache()
+        probe.put(params(topic="probe"), await generator(params(topic="probe")))
+        entry_size = probe.size_bytes
+        probe.invalidate()
+
+        cache = self.make_cache(max_bytes=int(entry_size * 3.5))
+        for topic in ("a", "b", "c"):
+            await cache.generate(params(topic=topic), generator)
+        await cache.generate(params(topic="a"), generator)  # touch "a"
+        await cache.generate(params(topic="d"), generator)  # evicts "b"
+
+        self.assertEqual(cache.stats["evictions"], 1)
+        self.assertIsNotNone(cache.get(params(topic="a")))
+        self.assertIsNone(cache.get(params(topic="b")))
+        self.assertLessEqual(cache.size_bytes, cache.max_bytes)
+        self.assertEqual(len(list(self.directory.rglob("*.json"))), 3)
+
+    async def test_corrupt_entry_is_a_miss(self):
+        cache = self.make_cache()
+        generator = PaidGenerator()
+        await cache.generate(params(), generator)
+        path = next(self.directory.rglob("*.json"))
+        path.write_text("{not json")
+
+        result = await cache.generate(params(), generator)
+        self.assertEqual(generator.calls, 2)
+        self.assertEqual(result["metadata"]["generation_cost_usdc"], 12.5)
+        self.assertEqual(json.loads(path.read_text())["key"], cache.key(params()))
+
+
+if __name__ == "__main__":
+    unittest.main()
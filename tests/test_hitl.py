@@ -0,0 +1,154 @@
+import unittest
+
+from chimera.hitl import (
+    AUTO_APPROVE,
+    REJECT_RETRY,
+    REVIEW,
+    HITLRouter,
+    KeywordAutomaton,
+    ReviewIndex,
+    band_for,
+)
+
+# Reference: specs/functional.md US-2.1, US-2.2 (HITL review), US-1.2 (HITL queue depth)
+
+
+def result(task_id, confidence, text="New drop this Friday, link in bio", **extra):
+    payload = {
+        "task_id": task_id,
+        "worker_id": "worker-1",
+        "status": "success",
+        "content": {"type": "text", "text": text},
+        "confidence_score": confidence,
+    }
+    payload.update(extra)
+    return payload
+
+
+class RecordingClassifier:
+    def __init__(self, verdicts=None):
+        self.verdicts = verdicts or {}
+        self.seen = []
+
+    def __call__(self, texts):
+        self.seen.append(list(texts))
+        return [self.verdicts.get(text, {}) for text in texts]
+
+
+class TestKeywordAutomaton(unittest.TestCase):
+    """
+    Test multi-keyword matching on token boundaries.
+
+    Reference: specs/technical.md Section 1.2 (sensitive_topics_detected)
+    """
+
+    def test_matches_words_and_phrases(self):
+        automaton = KeywordAutomaton({"a": ["vote", "prime minister"], "b": ["minister of health", "health"]})
+        self.assertEqual(automaton.labels("Go VOTE!"), {"a"})
+        self.assertEqual(automaton.labels("the prime   minister of health spoke"), {"a", "b"})
+        self.assertEqual(automaton.labels("devoted to health-food"), {"b"})  # no "vote" inside "devoted"
+        self.assertEqual(automaton.labels("minister"), set())
+
+    def test_overlapping_keywords_follow_failure_links(self):
+        automaton = KeywordAutomaton({"x": ["a b c"], "y": ["b c d"], "z": ["c"]})
+        self.assertEqual(automaton.labels("a b c d"), {"x", "y", "z"})
+        self.assertEqual(automaton.labels("a b b c d"), {"y", "z"})
+
+
+class TestHITLRouter(unittest.TestCase):
+    """
+    Test confidence banding, sensitive-topic override and prefiltered classification.
+
+    Reference: specs/functional.md US-2.1 (confidence routing), US-2.2 (sensitive topics)
+    """
+
+    def test_confidence_bands(self):
+        self.assertEqual([band_for(c) for c in (0.95, 0.9, 0.8, 0.7, 0.2)],
+                         ["green", "yellow", "yellow", "red", "red"])
+        router = HITLRouter()
+        decisions = router.route_batch([result("g", 0.95), result("y", 0.8), result("r", 0.3)])
+        self.assertEqual([d.action for d in decisions], [AUTO_APPROVE, REVIEW, REJECT_RETRY])
+        self.assertEqual(len(router.index), 1)
+        self.assertEqual(router.depths()["bands"], {"red": 0, "yellow": 1, "green": 0})
+
+    def test_sensitive_topics_always_reviewed(self):
+        router = HITLRouter()
+        decisions = router.route_batch([
+            result("g", 0.99, "This supplement cures anxiety"),
+            result("r", 0.4, "Who are you voting for in the election?"),
+            result("w", 0.97, sensitive_topics_detected=["legal_claims"]),  # flagged by the Worker
+        ])
+        self.assertEqual([d.action for d in decisions], [REVIEW] * 3)
+        self.assertEqual(decisions[0].sensitive_topics, ("health_advice",))
+        self.assertEqual(decisions[1].band, "red")
+        self.assertEqual(decisions[2].sensitive_topics, ("legal_claims",))
+        depths = router.depths()
+        self.assertEqual(depths["sensitive"], 3)
+        self.assertEqual(depths["topics"]["politics"], 1)
+
+    def test_classifier_runs_only_on_keyword_candidates(self):
+        flagged = "Buy this token now, guaranteed return"
+        classifier = RecordingClassifier({flagged: {"financial_advice": 0.93, "legal_claims": 0.2}})
+        router = HITLRouter(classifier=classifier)
+        decisions = router.route_batch([
+            result("a", 0.95),
+            result("b", 0.95, flagged),
+            result("c", 0.95, "Our new lip gloss shade is out"),
+            result("d", 0.95, "Vote for your favourite colour"),  # keyword hit, classifier says no
+        ])
+        self.assertEqual(classifier.seen, [[flagged, "Vote for your favourite colour"]])
+        self.assertEqual(decisions[1].sensitive_topics, ("financial_advice",))
+        self.assertEqual(decisions[1].keyword_topics, ("financial_advice", "legal_claims"))
+        self.assertEqual(decisions[3].action, AUTO_APPROVE)
+        self.assertEqual(router.stats["classified"], 2)
+
+
+class TestReviewIndex(unittest.TestCase):
+    """
+    Test urgency ordering, removal and live depth counters.
+
+    Reference: specs/functional.md US-1.2 ("HITL queue depth displayed")
+    """
+
+    def test_next_review_is_most_urgent(self):
+        router = HITLRouter()
+        router.route_batch([
+            result("y-high", 0.88),
+            result("y-low", 0.72),
+            result("y-sensitive", 0.89, "Stocks only go up, invest today"),
+            result("r-sensitive", 0.3, "Our lawyer says sue them"),
+            result("y-low-later", 0.72),
+        ])
+        order = []
+        while True:
+            item = router.next_review()
+            if item is None:
+                break
+            order.append(item[1].task_id)
+        self.assertEqual(order, ["r-sensitive", "y-sensitive", "y-low", "y-low-later", "y-high"])
+        self.assertEqual(router.depths()["total"], 0)
+
+    def test_band_filter_remove_and_requeue(self):
+        router = HITLRouter()
+        router.route_batch([result(f"t{i}", 0.75 + i / 100) for i in range(10)])
+        router.route(result("t3", 0.71))  # re-submitted result replaces the queued one
+        self.assertEqual(len(router.index), 10)
+        self.assertTrue(router.index.remove("t0"))
+        self.assertFalse(router.index.remove("t0"))
+        self.assertIsNone(router.next_review("green"))
+        self.assertEqual(router.index.peek("yellow")[1].task_id, "t3")
+        self.assertEqual(router.next_review("yellow")[1].confidence_score, 0.71)
+        self.assertEqual(router.depths()["bands"]["yellow"], 8)
+
+    def test_tombstones_are_compacted(self):
+        index = ReviewIndex()
+        router = HITLRouter(index=index)
+        router.route_batch([result(f"t{i}", 0.8) for i in range(500)])
+        for i in range(400):
+            index.remove(f"t{i}")
+        self.assertLessEqual(len(index._heaps["yellow"]), 2 * 100 + 1)
+        self.assertEqual(index.pop()[1].task_id, "t400")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+import asyncio
+import sys
+import unittest
+
+from chimera.mcp_client import MCPClientPool, MCPError, ServerBusy, stdio_connector
+from chimera.mcp_stub import StubMCPServer
+from chimera.metrics import LatencyHistogram
+from skills.trend_fetcher import fetch_trends_async
+
+# Reference: specs/_meta.md Section 2.3 (MCP Abstraction), specs/technical.md Section 3
+
+
+# Answers every request, then ignores stdin EOF the way a hung server would.
+STUBBORN_SERVER = """
+import json, sys, time
+for line in sys.stdin:
+    message = json.loads(line)
+    if "id" in message:
+        result = {"serverInfo": {"name": "stubborn"}, "contents": [{"text": "{}"}]}
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+time.sleep(60)
+"""
+
+
+# Pings the client and asks it for something it does not offer, then answers the call.
+PINGING_SERVER = """
+import json, sys
+replies = []
+for line in sys.stdin:
+    message = json.loads(line)
+    if "id" not in message:
+        continue
+    if "method" not in message:
+        replies.append(message)
+        if len(replies) == 2:
+            text = json.dumps(sorted(replies, key=lambda m: m["id"]))
+            print(json.dumps({"jsonrpc": "2.0", "id": pending, "result": {"contents": [{"text": text}]}}), flush=True)
+        continue
+    if message["method"] == "initialize":
+        print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": {}}), flush=True)
+    elif message["method"] == "resources/read":
+        pending = message["id"]
+        print(json.dumps({"jsonrpc": "2.0", "id": "s1", "method": "ping"}), flush=True)
+        print(json.dumps({"jsonrpc": "2.0", "id": "s2", "method": "sampling/createMessage", "params": {}}), flush=True)
+"""
+
+
+def news(uri):
+    return {"trends": [{"topic": "Sustainable Fashion", "engagement_score": 0.87, "relevance_score": 0.92}], "uri": uri}
+
+
+class TestMCPClientPool(unittest.IsolatedAsyncioTestCase):
+    """
+    Test session reuse, multiplexing, limits and backpressure against the stub server.
+
+    Reference: specs/technical.md Section 3 (MCP Resource URI Patterns)
+    """
+
+    async def asyncSetUp(self):
+        self.gate = asyncio.Event()
+
+        async def slow_post(text):
+            await self.gate.wait()
+            return {"posted": text}
+
+        def fail():
+            raise RuntimeError("rate limited by platform")
+
+        self.server = StubMCPServer(tools={"post_tweet": slow_post, "fail": fail}, resources=news, latency=0.005)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.stop()
+
+    def pool(self, **kwargs):
+        return MCPClientPool({"news": self.server.connector(), "twitter": self.server.connector()}, **kwargs)
+
+    async def test_concurrent_reads_share_one_session(self):
+        async with self.pool(streams_per_session=64) as pool:
+            results = await asyncio.gather(*(pool.read_resource(f"mcp://news/ethiopia/fashion/trends?hours={i}") for i in range(50)))
+        self.assertEqual(results[7]["uri"], "mcp://news/ethiopia/fashion/trends?hours=7")
+        self.assertEqual(self.server.stats["handshakes"], 1)
+        self.assertGreater(self.server.stats["max_concurrent"], 10)
+
+    async def test_opens_more_sessions_only_when_streams_are_full(self):
+        async with self.pool(streams_per_session=2, max_sessions=3) as pool:
+            await asyncio.gather(*(pool.read_resource("mcp://news/x/latest?limit=1") for _ in range(12)))
+            self.assertEqual(pool.metrics()["news"]["sessions"], 3)
+        self.assertEqual(self.server.stats["handshakes"], 3)
+
+    async def test_concurrency_limit_per_server(self):
+        async with self.pool(max_concurrency=4) as pool:
+            await asyncio.gather(*(pool.read_resource("mcp://news/x/latest?limit=1") for _ in range(20)))
+        self.assertLessEqual(self.server.stats["max_concurrent"], 4)
+
+    async def test_backpressure_rejects_beyond_pending_limit(self):
+        async with self.pool(max_concurrency=1, max_pending=1) as pool:
+            first = asyncio.ensure_future(pool.call_tool("twitter", "post_tweet", {"text": "a"}))
+            second = asyncio.ensure_future(pool.call_tool("twitter", "post_tweet", {"text": "b"}))
+            await asyncio.sleep(0.05)
+            with self.assertRaises(ServerBusy):
+                await pool.call_tool("twitter", "post_tweet", {"text": "c"})
+            self.gate.set()
+            results = await asyncio.gather(first, second)
+            self.assertEqual([r["structuredContent"]["posted"] for r in results], ["a", "b"])
+            self.assertEqual(pool.metrics()["twitter"]["rejected"], 1)
+
+    async def test_tool_errors_raise(self):
+        async with self.pool() as pool:
+            with self.assertRaisesRegex(MCPError, "rate limited"):
+                await pool.call_tool("twitter", "fail")
+            with self.assertRaises(MCPError) as ctx:
+                await pool.call_tool("twitter", "missing")
+            self.assertEqual(ctx.exception.code, -32601)
+            with self.assertRaises(MCPError):
+                await pool.read_resource("mcp://unknown/thing")
+
+    async def test_reads_reconnect_after_server_drop(self):
+        async with self.pool() as pool:
+            await pool.read_resource("mcp://news/x/latest?limit=1")
+            self.server.drop_connections()
+            await asyncio.sleep(0.01)
+            result = await pool.read_resource("mcp://news/x/latest?limit=2")
+            self.assertEqual(result["uri"], "mcp://news/x/latest?limit=2")
+        self.assertEqual(self.server.stats["handshakes"], 2)
+
+    async def test_latency_histograms_per_method(self):
+        async with self.pool() as pool:
+            await asyncio.gather(*(pool.read_resource("mcp://news/x/latest?limit=1") for _ in range(10)))
+            latency = pool.metrics()["news"]["latency"]["resources/read"]
+        self.assertEqual(latency["count"], 10)
+        self.assertGreaterEqual(latency["p99"], 0.005)
+
+    async def test_pool_is_a_trend_fetcher_reader(self):
+        request = {"skill_name": "trend_fetcher", "parameters": {"region": "ethiopia", "category": "fashion"}}
+        async with self.pool() as pool:
+            output = await fetch_trends_async(request, reader=pool.read_resource)
+        self.assertEqual(output["trends"][0]["topic"], "Sustainable Fashion")
+
+    async def test_failing_listener_does_not_break_the_session(self):
+        received = []
+        async with self.pool() as pool:
+            pool.on_notification(lambda server, method, params: 1 / 0)
+            pool.on_notification(lambda server, method, params: received.append(params["uri"]))
+            await pool.subscribe_resource("mcp://news/x/latest")
+            with self.assertLogs("chimera.mcp_client", "ERROR"):
+                await self.server.notify_updated("mcp://news/x/latest")
+                await asyncio.sleep(0.02)
+            result = await pool.read_resource("mcp://news/x/latest?limit=1")
+        self.assertEqual(received, ["mcp://news/x/latest"])
+        self.assertEqual(result["uri"], "mcp://news/x/latest?limit=1")
+
+    async def test_stdio_server_is_reaped_on_close(self):
+        pool = MCPClientPool({"stubborn": stdio_connector(sys.executable, "-c", STUBBORN_SERVER, exit_timeout=0.2)})
+        self.assertEqual(await pool.read_resource("mcp://stubborn/x"), {})
+        process, _ = pool._servers["stubborn"].sessions[0]._process
+        await pool.close()
+        self.assertIsNotNone(process.returncode)  # terminated after ignoring EOF
+
+
+    async def test_answers_server_requests(self):
+        async with MCPClientPool({"pinger": stdio_connector(sys.executable, "-c", PINGING_SERVER, exit_timeout=0.2)}) as pool:
+            ping, other = await pool.read_resource("mcp://pinger/x")
+        self.assertEqual(ping, {"jsonrpc": "2.0", "id": "s1", "result": {}})
+        self.assertEqual(other["id"], "s2")
+        self.assertEqual(other["error"]["code"], -32601)
+
+    async def test_closed_pool_does_not_reconnect(self):
+        disconnects = []
+        pool = self.pool()
+        pool.on_disconnect(disconnects.append)
+        await pool.read_resource("mcp://news/x/latest?limit=1")
+        await pool.close()
+        await asyncio.sleep(0.01)
+        self.assertEqual(disconnects, [])
+        with self.assertRaisesRegex(ConnectionError, "closed"):
+            await pool.read_resource("mcp://news/x/latest?limit=1")
+        self.assertEqual(self.server.stats["handshakes"], 1)
+
+    async def test_disconnect_listeners_hear_dropped_sessions(self):
+        disconnects = []
+        async with self.pool() as pool:
+            pool.on_disconnect(disconnects.append)
+            await pool.read_resource("mcp://news/x/latest?limit=1")
+            self.server.drop_connections()
+            await asyncio.sleep(0.01)
+        self.assertEqual(disconnects, ["news"])
+
+
+class TestLatencyHistogram(unittest.TestCase):
+    """
+    Test bucketed percentiles.
+
+    Reference: specs/_meta.md Section 3.1 (Scalability)
+    """
+
+    def test_percentiles_within_one_bucket(self):
+        histogram = LatencyHistogram()
+        for i in range(1, 1001):
+            histogram.observe(i / 1000.0)
+        self.assertAlmostEqual(histogram.percentile(50), 0.5, delta=0.5 * 0.25)
+        self.assertAlmostEqual(histogram.percentile(99), 0.99, delta=0.99 * 0.25)
+        self.assertEqual(histogram.percentile(100), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
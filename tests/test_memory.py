@@ -0,0 +1,119 @@
+import unittest
+
+from chimera.memory import TieredMemory
+from chimera.redis_store import InMemoryRedis
+from helpers import FakeClock, T0
+
+# Reference: specs/functional.md FR 1.1 (Hierarchical Memory Retrieval)
+
+
+class TestEpisodicTier(unittest.TestCase):
+    """
+    Test the L1 cache over chimera:memory:{agent_id}:episodic.
+
+    Reference: specs/technical.md Section 2.3 (episodic_memory, episodic_ttl 3600)
+    """
+
+    def setUp(self):
+        self.clock = FakeClock(T0)
+        self.redis = InMemoryRedis(clock=self.clock)
+        self.memory = TieredMemory(self.redis, max_staleness=5, clock=self.clock)
+
+    def test_write_through_serves_from_l1(self):
+        self.memory.recent("a")
+        self.memory.write_episodic("a", {"text": "hello"})
+        before = self.redis.round_trips
+        self.assertEqual([e["text"] for e in self.memory.recent("a")], ["hello"])
+        self.assertEqual(self.redis.round_trips, before)
+        self.assertEqual(self.redis.ttl("chimera:memory:a:episodic"), 3600)
+
+    def test_other_workers_writes_are_merged_as_delta(self):
+        other = TieredMemory(self.redis, clock=self.clock)
+        self.memory.write_episodic("a", {"text": "1"})
+        self.memory.recent("a")
+        other.write_episodic("a", {"text": "2"})
+        other.write_episodic("a", {"text": "3"})
+        self.assertEqual(len(self.memory.recent("a")), 1)  # still fresh in L1
+        self.clock.now += 6
+        self.assertEqual([e["text"] for e in self.memory.recent("a")], ["3", "2", "1"])
+        self.assertEqual(self.memory.stats["episodic_deltas"], 1)
+
+    def test_revalidation_without_changes(self):
+        self.memory.write_episodic("a", {"text": "1"})
+        self.memory.recent("a")
+        self.clock.now += 6
+        self.memory.recent("a")
+        self.assertEqual(self.memory.stats["episodic_revalidated"], 1)
+
+    def test_large_gap_refetches(self):
+        self.memory.recent("a")
+        other = TieredMemory(self.redis, clock=self.clock)
+        for i in range(20):
+            other.write_episodic("a", {"text": str(i)})
+        self.clock.now += 6
+        self.assertEqual(len(self.memory.recent("a")), 20)
+        self.assertEqual(self.memory.stats["episodic_misses"], 2)
+
+    def test_window_filters_old_entries(self):
+        self.memory.write_episodic("a", {"text": "old", "timestamp": self.clock.now - 7200})
+        self.memory.write_episodic("a", {"text": "new"})
+        self.assertEqual([e["text"] for e in self.memory.recent("a")], ["new"])
+        self.assertEqual(len(self.memory.recent("a", hours=3)), 2)
+
+    def test_callers_get_copies_of_entries(self):
+        written = self.memory.write_episodic("a", {"text": "hello", "tags": ["greeting"]})
+        written["text"] = "MUTATED"
+        first = self.memory.recent("a")
+        first[0]["tags"].append("MUTATED")
+        self.assertEqual(self.memory.recent("a"), [{"text": "hello", "tags": ["greeting"], "timestamp": T0}])
+
+    def test_agents_are_lru_bounded(self):
+        memory = TieredMemory(self.redis, max_agents=2, clock=self.clock)
+        for agent in ("a", "b", "c"):
+            memory.recent(agent)
+        self.assertEqual(memory.metrics()["episodic_agents"], 2)
+        self.assertEqual(memory.stats["evictions"], 1)
+
+
+class TestSemanticTier(unittest.TestCase):
+    """
+    Test cached mcp://memory/{agent_id}/semantic queries.
+
+    Reference: specs/technical.md Section 3 (memory_semantic resource), Section 2.2 (AgentMemory)
+    """
+
+    def setUp(self):
+        self.clock = FakeClock(T0)
+        self.uris = []
+
+        def reader(uri):
+            self.uris.append(uri)
+            return {"memories": [{"content": f"memory for {uri}"}]}
+
+        self.memory = TieredMemory(InMemoryRedis(), semantic_reader=reader, semantic_ttl=60, clock=self.clock)
+
+    def test_query_is_cached_and_normalized(self):
+        first = self.memory.semantic("a", "Habesha  Kemis", limit=3)
+        self.assertEqual(self.memory.semantic("a", "habesha kemis", limit=3), first)
+        self.assertEqual(self.uris, ["mcp://memory/a/semantic?query=Habesha%20%20Kemis&limit=3"])
+        self.assertEqual(self.memory.metrics()["semantic_hit_rate"], 0.5)
+        first[0]["content"] = "MUTATED"
+        first.clear()  # callers get copies; the cached entry is untouched
+        (cached,) = self.memory.semantic("a", "habesha kemis", limit=3)
+        self.assertNotEqual(cached["content"], "MUTATED")
+
+    def test_ttl_and_invalidation(self):
+        self.memory.semantic("a", "denim")
+        self.clock.now += 61
+        self.memory.semantic("a", "denim")
+        self.memory.invalidate("a")
+        self.memory.semantic("a", "denim")
+        self.assertEqual(len(self.uris), 3)
+
+    def test_requires_reader(self):
+        with self.assertRaises(RuntimeError):
+            TieredMemory(InMemoryRedis()).semantic("a", "denim")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,157 @@
+import json
+import subprocess
+import sys
+import unittest
+import uuid
+from pathlib import Path
+
+from chimera.models import (
+    MAGIC,
+    AgentTask,
+    CodecError,
+    TaskResult,
+    decode,
+    encode,
+    from_json,
+    loads,
+    to_json,
+)
+
+# Reference: specs/technical.md Section 1.1 (AgentTask), Section 1.2 (TaskResult)
+
+
+def task_dict(**overrides):
+    task = {
+        "task_id": str(uuid.uuid4()),
+        "task_type": "generate_content",
+        "priority": "high",
+        "context": {
+            "goal_description": "Post a teaser for Friday's drop — ቡና ceremony vibe",
+            "persona_constraints": ["warm", "no slang"],
+            "required_resources": ["mcp://twitter/mentions/123"],
+            "budget_limit": 2.5,
+        },
+        "assigned_worker_id": "worker-7",
+        "created_at": "2026-02-04T10:00:00Z",
+        "status": "pending",
+        "state_version": "42",
+    }
+    task.update(overrides)
+    return task
+
+
+def result_dict(**overrides):
+    result = {
+        "task_id": str(uuid.uuid4()),
+        "worker_id": "worker-7",
+        "result_type": "content",
+        "content": {"text": "Friday. Addis. You know the drill ☕", "platform": "instagram"},
+        "confidence_score": 0.87,
+        "reasoning_trace": "Matched persona tone; avoided pricing claims.",
+        "created_at": "2026-02-04T10:00:05Z",
+        "sensitive_topics_detected": ["health_advice", "legal_claims"],
+    }
+    result.update(overrides)
+    return result
+
+
+class TestModels(unittest.TestCase):
+    """
+    Test dict round trips of the slotted models.
+
+    Reference: specs/technical.md Section 1 (API Contracts)
+    """
+
+    def test_dict_round_trip_keeps_unknown_keys(self):
+        data = task_dict(context={"goal_description": "g", "campaign_id": "c-1"}, trace_id="t-9")
+        task = AgentTask.from_dict(data)
+        self.assertEqual(task.to_dict(), data)
+        self.assertEqual(task.context_extra, {"campaign_id": "c-1"})
+        self.assertFalse(hasattr(task, "__dict__"))
+
+        result = result_dict(status="success", metadata={"generation_cost_usdc": 0.04})
+        self.assertEqual(TaskResult.from_dict(result).to_dict(), result)
+
+    def test_task_id_is_packed(self):
+        task = AgentTask.from_dict(task_dict())
+        self.assertEqual(len(task._id), 16)
+        task.task_id = "not-a-uuid"
+        self.assertEqual(task.task_id, "not-a-uuid")
+        upper = str(uuid.uuid4()).upper()
+        task.task_id = upper  # only canonical spellings are packed, so ids round-trip exactly
+        self.assertEqual(task.task_id, upper)
+
+
+class TestBinaryCodec(unittest.TestCase):
+    """
+    Test the versioned binary frames and the JSON fallback.
+
+    Reference: specs/technical.md Section 2.3 (task and review queues)
+    """
+
+    def test_round_trip(self):
+        for data in (task_dict(), task_dict(assigned_worker_id=None, context={"goal_description": ""}),
+                     task_dict(task_id="legacy-7", task_type="translate", status="paused", extra_key=[1, 2])):
+            frame = encode(AgentTask.from_dict(data))
+            self.assertEqual(frame[:2], MAGIC)
+            self.assertEqual(decode(frame).to_dict(), data)
+
+        for data in (result_dict(), result_dict(result_type="error", content=None, reasoning_trace=None),
+                     result_dict(worker_id=str(uuid.uuid4()), result_type="custom", metadata={"a": 1})):
+            data = {k: v for k, v in data.items() if v is not None}
+            self.assertEqual(decode(encode(TaskResult.from_dict(data))).to_dict(), data)
+
+    def test_frames_are_smaller_than_json(self):
+        for model in (AgentTask.from_dict(task_dict()), TaskResult.from_dict(result_dict())):
+            self.assertLess(len(encode(model)), 0.7 * len(to_json(model).encode()))
+
+    def test_content_and_trace_decode_lazily(self):
+        frame = encode(TaskResult.from_dict(result_dict()))
+        result = decode(frame)
+        self.assertIsInstance(result._content_raw, memoryview)
+        self.assertIs(result._content_raw.obj, frame)  # a slice of the frame, not a copy
+        self.assertEqual(result.confidence_score, 0.87)
+        self.assertIsNone(result._content)
+
+        self.assertEqual(encode(result), frame)  # forwarded untouched
+        self.assertEqual(result.content["platform"], "instagram")
+        self.assertIsNone(result._content_raw)
+        result.content["platform"] = "threads"
+        result.reasoning_trace = "edited"
+        again = decode(encode(result))
+        self.assertEqual((again.content["platform"], again.reasoning_trace), ("threads", "edited"))
+
+    def test_rejects_bad_frames(self):
+        frame = encode(TaskResult.from_dict(result_dict()))
+        with self.assertRaises(CodecError):
+            decode(frame[:-3])
+        with self.assertRaises(CodecError):
+            decode(frame + b"\x00")
+        with self.assertRaises(CodecError):
+            decode(frame[:2] + b"\x09" + frame[3:])  # unknown wire version
+        with self.assertRaises(CodecError):
+            decode(b"{}" + frame[2:])
+        with self.assertRaises(CodecError):
+            encode(TaskResult.from_dict(result_dict(sensitive_topics_detected=["gossip"])))
+
+    def test_json_fallback_and_autodetect(self):
+        task = AgentTask.from_dict(task_dict())
+        result = TaskResult.from_dict(result_dict())
+        self.assertEqual(json.loads(to_json(task)), task.to_dict())
+        self.assertIn("\n", to_json(result, indent=2))
+        self.assertEqual(from_json(to_json(result)), result)
+        for payload in (to_json(task), to_json(task).encode(), encode(task), bytearray(encode(task))):
+            self.assertEqual(loads(payload), task)
+        self.assertIsInstance(loads(encode(result)), TaskResult)
+
+
+    def test_import_stays_light(self):
+        """Every Planner/Worker hop imports the codec; it must not pull in the HITL router or numpy."""
+        code = "import sys, chimera.models; print(sorted({'chimera.hitl', 'numpy'} & set(sys.modules)))"
+        out = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).resolve().parents[1],
+                             capture_output=True, text=True, check=True).stdout
+        self.assertEqual(out.strip(), "[]")
+
+
+if __name__ == '__main__':
+    unittest.main()
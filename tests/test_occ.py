@@ -0,0 +1,128 @@
+import threading
+import unittest
+
+from chimera.occ import CommitEngine, Proposal
+from chimera.redis_store import InMemoryRedis
+
+# Reference: specs/functional.md FR 6.1 (Optimistic Concurrency Control)
+
+
+class RacingRedis(InMemoryRedis):
+    """Another Judge bumps the version between every WATCH and EXEC."""
+
+    def pipeline(self, transaction=True):
+        pipe = super().pipeline(transaction)
+        multi = pipe.multi
+
+        def racing_multi():
+            self.incr("chimera:state:a:version")
+            multi()
+
+        pipe.multi = racing_multi
+        return pipe
+
+
+class TestCommitEngine(unittest.TestCase):
+    """
+    Test batched compare-and-set commits.
+
+    Reference: specs/technical.md Section 2.3 (chimera:state:{agent_id}:version)
+    """
+
+    def setUp(self):
+        self.redis = InMemoryRedis()
+        self.engine = CommitEngine(self.redis)
+
+    def test_batch_commits_with_one_version_bump(self):
+        outcome = self.engine.commit("a", [
+            Proposal("t1", 0, {"posts_today": 1}),
+            Proposal("t2", 0, {"last_reply_id": "c9"}),
+        ])
+        self.assertEqual(outcome.committed, ["t1", "t2"])
+        self.assertEqual(outcome.version, 1)
+        self.assertEqual(self.redis.get("chimera:state:a:version"), "1")
+        self.assertEqual(self.engine.read_state("a"), (1, {"posts_today": 1, "last_reply_id": "c9"}))
+        self.assertFalse(self.redis.exists("chimera:state:a:lock"))
+
+    def test_stale_version_without_field_conflict_commits(self):
+        self.engine.commit("a", [Proposal("t1", 0, {"posts_today": 1})])
+        outcome = self.engine.commit("a", [Proposal("t2", 0, {"followers": 10}, reads=("persona",))])
+        self.assertEqual(outcome.committed, ["t2"])
+        self.assertEqual(self.engine.conflict_rate, 0.0)
+
+    def test_field_conflict_is_rejected_without_revalidator(self):
+        self.engine.commit("a", [Proposal("t1", 0, {"posts_today": 1})])
+        outcome = self.engine.commit("a", [Proposal("t2", 0, {"posts_today": 1})])
+        self.assertEqual(outcome.rejected, ["t2"])
+        self.assertEqual(self.engine.read_state("a", ["posts_today"]), (1, {"posts_today": 1}))
+        self.assertEqual(self.engine.stats["conflicts"], 1)
+
+    def test_read_conflict(self):
+        self.engine.commit("a", [Proposal("t1", 0, {"persona": "v2"})])
+        outcome = self.engine.commit("a", [Proposal("t2", 0, {"draft": "hi"}, reads=("persona",))])
+        self.assertEqual(outcome.rejected, ["t2"])
+
+    def test_intra_batch_conflict_keeps_first_writer(self):
+        outcome = self.engine.commit("a", [
+            Proposal("t1", 0, {"posts_today": 1}),
+            Proposal("t2", 0, {"posts_today": 1}),
+            Proposal("t3", 0, {"other": True}),
+        ])
+        self.assertEqual(outcome.committed, ["t1", "t3"])
+        self.assertEqual(outcome.rejected, ["t2"])
+
+    def test_only_conflicting_results_are_revalidated(self):
+        seen = []
+
+        def revalidate(proposal, fresh):
+            seen.append((proposal.task_id, fresh))
+            return {"posts_today": fresh["posts_today"] + 1}
+
+        engine = CommitEngine(self.redis, revalidate=revalidate)
+        outcome = engine.commit("a", [
+            Proposal("t1", 0, {"posts_today": 1}),
+            Proposal("t2", 0, {"posts_today": 1}, reads=("posts_today",)),
+            Proposal("t3", 0, {"followers": 5}),
+        ])
+        self.assertEqual(outcome.committed, ["t1", "t3", "t2"])
+        self.assertEqual(seen, [("t2", {"posts_today": 1})])
+        self.assertEqual(outcome.rounds, 2)
+        self.assertEqual(engine.read_state("a", ["posts_today"]), (2, {"posts_today": 2}))
+
+    def test_revalidator_can_decline(self):
+        engine = CommitEngine(self.redis, revalidate=lambda proposal, fresh: None)
+        engine.commit("a", [Proposal("t1", 0, {"x": 1})])
+        self.assertEqual(engine.commit("a", [Proposal("t2", 0, {"x": 2})]).rejected, ["t2"])
+
+    def test_future_base_version_conflicts(self):
+        self.assertEqual(self.engine.commit("a", [Proposal("t1", 7, {"x": 1})]).rejected, ["t1"])
+
+    def test_lost_races_are_capped(self):
+        engine = CommitEngine(RacingRedis(), max_cas_retries=5)
+        outcome = engine.commit("a", [Proposal("t1", 0, {"x": 1})])
+        self.assertEqual((outcome.committed, outcome.rejected), ([], ["t1"]))
+        self.assertEqual(engine.stats["cas_retries"], 6)
+
+    def test_concurrent_judges_never_lose_updates(self):
+        def revalidate(proposal, fresh):
+            return {"counter": (fresh["counter"] or 0) + 1}
+
+        engines = [CommitEngine(self.redis, revalidate=revalidate, max_rounds=1000, max_cas_retries=1000) for _ in range(4)]
+
+        def judge(engine, n):
+            for i in range(50):
+                version, state = engine.read_state("a", ["counter"])
+                engine.commit("a", [Proposal(f"{n}-{i}", version, {"counter": state.get("counter", 0) + 1},
+                                             reads=("counter",))])
+
+        threads = [threading.Thread(target=judge, args=(engine, n)) for n, engine in enumerate(engines)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(self.engine.read_state("a", ["counter"])[1], {"counter": 200})
+        self.assertEqual(sum(e.stats["rejected"] for e in engines), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
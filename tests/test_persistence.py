@@ -0,0 +1,271 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+
+from chimera.persistence import BacklogFull, PostgresBackend, SQLiteBackend, WriteBehindStore
+
+# Reference: specs/technical.md Section 2.1 (PostgreSQL Schema)
+
+
+def result_row(n, **overrides):
+    row = {
+        "id": f"result-{n}",
+        "task_id": f"task-{n}",
+        "worker_id": "worker-7",
+        "result_type": "content",
+        "content": {"text": f"post {n}", "platform": "instagram"},
+        "confidence_score": 0.9,
+        "reasoning_trace": "on persona",
+        "sensitive_topics_detected": ["health_advice"],
+        "created_at": "2026-02-04T10:00:05Z",
+    }
+    row.update(overrides)
+    return row
+
+
+class FlakyBackend:
+    """Fails the next `failures` writes, optionally after committing them."""
+
+    def __init__(self, backend, failures=1, commit_first=False):
+        self.backend = backend
+        self.failures = failures
+        self.commit_first = commit_first
+
+    def write(self, batches):
+        if self.failures:
+            self.failures -= 1
+            if self.commit_first:
+                self.backend.write(batches)
+            raise ConnectionError("database went away")
+        self.backend.write(batches)
+
+
+class RecordingBackend(FlakyBackend):
+    """Records the table order of every write it is asked to make."""
+
+    def __init__(self, backend, failures=0):
+        super().__init__(backend, failures)
+        self.orders = []
+
+    def write(self, batches):
+        self.orders.append(list(batches))
+        super().write(batches)
+
+
+class PoisonBackend(FlakyBackend):
+    """Rejects any write holding a row whose id is in `poison`, like a constraint violation would."""
+
+    def __init__(self, backend, poison, failures=0):
+        super().__init__(backend, failures)
+        self.poison = set(poison)
+        self.writes = 0
+
+    def write(self, batches):
+        self.writes += 1
+        if not self.failures and any(row[0] in self.poison for rows in batches.values() for row in rows):
+            raise sqlite3.IntegrityError("CHECK constraint failed: confidence_score")
+        super().write(batches)
+
+
+class TestWriteBehindStore(unittest.TestCase):
+    """
+    Test batching, upserts, retries and backpressure.
+
+    Reference: specs/technical.md Section 2.1 (task_results, hitl_reviews, transactions)
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.backend = SQLiteBackend()
+
+    def store(self, backend=None, **kwargs):
+        return WriteBehindStore(backend or self.backend, self.tmp.name, **kwargs)
+
+    def test_flush_writes_one_transaction(self):
+        store = self.store()
+        for n in range(50):
+            store.write("task_results", [result_row(n)])
+        store.write("hitl_reviews", [{"id": "review-1", "task_result_id": "result-3", "decision": "approve"}])
+        self.assertEqual((store.buffered, self.backend.count("task_results")), (51, 0))
+        self.assertEqual(store.flush(), 51)
+        self.assertEqual(self.backend.transactions, 1)
+        self.assertEqual(self.backend.count("task_results"), 50)
+        self.assertEqual(self.backend.fetch("task_results", "result-7")["content"]["text"], "post 7")
+        self.assertEqual(self.backend.fetch("task_results", "result-7")["sensitive_topics_detected"],
+                         ["health_advice"])
+        self.assertEqual(store.flush(), 0)
+        self.assertEqual(len(store.journal.segments()), 1)  # flushed segments are gone
+
+    def test_status_changes_upsert(self):
+        store = self.store()
+        store.write("transactions", [{"id": "tx-1", "status": "pending", "amount_usdc": "2.50"}])
+        store.write("transactions", [{"id": "tx-1", "status": "confirmed", "amount_usdc": "2.50"}])
+        store.flush()
+        store.write("transactions", [{"id": "tx-1", "status": "failed", "amount_usdc": "2.50"}])
+        store.write("task_results", [result_row(1), result_row(1, confidence_score=0.1)])  # append-only: first wins
+        store.flush()
+        self.assertEqual(self.backend.fetch("transactions", "tx-1")["status"], "failed")
+        self.assertEqual(self.backend.fetch("task_results", "result-1")["confidence_score"], 0.9)
+
+    def test_flushes_on_size_and_time(self):
+        store = self.store(max_batch=20, flush_interval=30).start()
+        store.write("task_results", [result_row(n) for n in range(25)])
+        for _ in range(200):
+            if self.backend.count("task_results") == 25:
+                break
+            time.sleep(0.01)
+        self.assertEqual(self.backend.count("task_results"), 25)
+        store.close()
+
+        store = self.store(flush_interval=0.02).start()
+        store.write("task_results", [result_row(99)])
+        time.sleep(0.2)
+        self.assertEqual(self.backend.count("task_results"), 26)
+        store.close()
+
+    def test_failed_flush_keeps_rows(self):
+        store = self.store(FlakyBackend(self.backend, failures=1))
+        store.write("task_results", [result_row(n) for n in range(3)])
+        with self.assertRaises(ConnectionError):
+            store.flush()
+        store.write("task_results", [result_row(3)])
+        self.assertEqual(store.buffered, 4)
+        self.assertEqual(store.flush(), 4)
+        self.assertEqual(self.backend.count("task_results"), 4)
+        self.assertEqual(store.stats["flush_errors"], 1)
+
+    def test_batches_are_written_parents_first(self):
+        backend = RecordingBackend(self.backend, failures=1)
+        store = self.store(backend)
+        store.write("agent_tasks", [{"id": "task-1", "status": "complete"}])
+        with self.assertRaises(ConnectionError):
+            store.flush()
+        store.write("hitl_reviews", [{"id": "review-1", "task_result_id": "result-1", "decision": "approve"}])
+        store.write("task_results", [result_row(1, task_id="task-1")])
+        store.flush()
+        self.assertEqual(backend.orders, [["agent_tasks"], ["agent_tasks", "task_results", "hitl_reviews"]])
+        statements = PostgresBackend(connection=None).statements(
+            {"task_results": [("r1",) + (None,) * 8], "agent_tasks": [("t1",) + (None,) * 9]})
+        self.assertEqual([sql.split()[2] for sql, _ in statements], ["agent_tasks", "task_results"])
+
+    def test_rejected_rows_are_dead_lettered(self):
+        backend = PoisonBackend(self.backend, {"result-3"}, failures=1)
+        store = self.store(backend)
+        store.write("task_results", [result_row(n) for n in range(8)])
+        with self.assertRaises(ConnectionError):  # an outage is retried whole, not bisected
+            store.flush()
+        self.assertEqual((backend.writes, store.stats["isolations"]), (1, 0))
+
+        self.assertEqual(store.flush(), 7)
+        self.assertEqual(self.backend.count("task_results"), 7)
+        self.assertIsNone(self.backend.fetch("task_results", "result-3"))
+        self.assertEqual(backend.writes, 1 + 7)  # the batch, then halves of 4, 2 and 1 rows
+        (table, row, error), = store.dead_letters()
+        self.assertEqual((table, row["id"], row["content"]["text"]), ("task_results", "result-3", "post 3"))
+        self.assertTrue(error.startswith("IntegrityError: CHECK constraint failed"))
+        self.assertEqual((store.buffered, store.stats["dead_lettered"]), (0, 1))
+
+        store.write("task_results", [result_row(8)])  # later rows are not held up behind it
+        self.assertEqual(store.flush(), 1)
+        self.assertEqual(len(store.journal.segments()), 1)
+
+        recovered = self.store()  # dead letters outlive the process and are not replayed
+        self.assertEqual(recovered.stats["recovered"], 0)
+        self.assertEqual(len(recovered.dead_letters()), 1)
+
+    def test_backpressure(self):
+        store = self.store(max_batch=2, max_buffered=4)
+        store.write("task_results", [result_row(n) for n in range(4)])
+        with self.assertRaises(BacklogFull):
+            store.write("task_results", [result_row(4)], timeout=0.05)
+
+        writer = threading.Thread(target=store.write, args=("task_results", [result_row(5)]))
+        writer.start()
+        time.sleep(0.05)
+        self.assertTrue(writer.is_alive())  # blocked until the database catches up
+        store.flush()
+        writer.join(1)
+        self.assertFalse(writer.is_alive())
+        self.assertEqual(store.buffered, 1)
+        self.assertEqual(store.stats["backpressure_waits"], 2)
+
+    def test_rejects_bad_rows(self):
+        store = self.store()
+        with self.assertRaises(ValueError):
+            store.write("agent_memories", [{"id": "m1"}])
+        with self.assertRaises(ValueError):
+            store.write("task_results", [{"confidence_score": 0.5}])
+        with self.assertRaises(ValueError):
+            store.write("task_results", [result_row(1, confidence=0.5)])
+        self.assertEqual(store.buffered, 0)
+
+
+class TestCrashRecovery(unittest.TestCase):
+    """
+    Test that acknowledged rows survive a crash.
+
+    Reference: specs/technical.md Section 2.1 (PostgreSQL is the system of record)
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.backend = SQLiteBackend()
+
+    def test_unflushed_rows_are_replayed(self):
+        store = WriteBehindStore(self.backend, self.tmp.name)
+        store.write("task_results", [result_row(n) for n in range(10)])
+        store.write("agent_tasks", [{"id": "task-1", "status": "pending"}, {"id": "task-1", "status": "complete"}])
+        store.journal.close()  # the process dies here
+        with open(store.journal.segments()[-1], "a") as f:
+            f.write('1234abcd ["task_results",["torn')  # a write cut short
+
+        recovered = WriteBehindStore(self.backend, self.tmp.name)
+        self.assertEqual(recovered.stats["recovered"], 12)
+        recovered.close()
+        self.assertEqual(self.backend.count("task_results"), 10)
+        self.assertEqual(self.backend.fetch("agent_tasks", "task-1")["status"], "complete")
+        self.assertEqual(len(os.listdir(self.tmp.name)), 1)
+
+    def test_replay_after_commit_is_idempotent(self):
+        # The database committed, then the process died before dropping the segment.
+        store = WriteBehindStore(FlakyBackend(self.backend, commit_first=True), self.tmp.name)
+        store.write("task_results", [result_row(n) for n in range(5)])
+        with self.assertRaises(ConnectionError):
+            store.flush()
+        store.journal.close()
+
+        recovered = WriteBehindStore(self.backend, self.tmp.name)
+        self.assertEqual(recovered.stats["recovered"], 5)
+        recovered.close()
+        self.assertEqual(self.backend.count("task_results"), 5)
+
+
+class TestPostgresBackend(unittest.TestCase):
+    """
+    Test the multi-row insert statements.
+
+    Reference: specs/technical.md Section 2.1 (PostgreSQL Schema)
+    """
+
+    def test_statements(self):
+        backend = PostgresBackend(connection=None, page_size=2)
+        rows = [(f"r{n}", None, None, "content", {"text": "hi"}, 0.5, None, ["legal_claims"], None) for n in range(3)]
+        statements = list(backend.statements({"task_results": rows}))
+        self.assertEqual(len(statements), 2)
+        sql, params = statements[0]
+        self.assertTrue(sql.startswith("INSERT INTO task_results (id, task_id,"))
+        self.assertEqual(sql.count("%s::jsonb"), 2)
+        self.assertTrue(sql.endswith("ON CONFLICT (id) DO NOTHING"))
+        self.assertEqual(len(params), 18)
+        self.assertEqual((params[4], params[7]), ('{"text": "hi"}', ["legal_claims"]))
+        sql, _ = next(backend.statements({"agent_tasks": [("t1",) + (None,) * 9]}))
+        self.assertIn("DO UPDATE SET agent_id = excluded.agent_id", sql)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from chimera import persona as persona_module
+from chimera.persona import PersonaError, PersonaStore, parse_soul_md
+from skills.engagement_manager import ContextBuilder
+
+# Reference: specs/functional.md FR 1.0, specs/technical.md Section 4.1 (SOUL.md Frontmatter Schema)
+
+SOUL_MD = """---
+name: "Zara"
+id: "agent-{n}"
+version: "1.0.0"
+voice_traits:
+  - "Witty"
+  - "Empathetic"
+directives:
+  - "Never discuss politics"  # hard constraint
+core_beliefs:
+  - "Sustainability-focused"
+governance_model: "Human-Reviewed"
+---
+
+# Backstory
+Grew up around Merkato's textile stalls.
+"""
+
+
+class TestParsing(unittest.TestCase):
+    """
+    Test SOUL.md frontmatter and body parsing.
+
+    Reference: specs/technical.md Section 4.1 (Agent Configuration)
+    """
+
+    def test_parses_schema_fields(self):
+        persona = parse_soul_md(SOUL_MD.format(n=1).encode())
+        self.assertEqual(persona.name, "Zara")
+        self.assertEqual(persona.id, "agent-1")
+        self.assertEqual(persona.voice_traits, ("Witty", "Empathetic"))
+        self.assertEqual(persona.directives, ("Never discuss politics",))
+        self.assertTrue(persona.backstory.startswith("# Backstory"))
+        self.assertEqual(len(persona.soul_md_hash), 64)
+
+    def test_fallback_parser_matches_yaml(self):
+        data = SOUL_MD.format(n=1).encode()
+        with mock.patch.object(persona_module, "yaml", None):
+            fallback = parse_soul_md(data)
+        self.assertEqual(fallback, parse_soul_md(data))
+
+    def test_rejects_missing_fields_and_frontmatter(self):
+        with self.assertRaises(PersonaError):
+            parse_soul_md(b"# no frontmatter")
+        with self.assertRaises(PersonaError):
+            parse_soul_md(b"---\nname: x\n---\nbody")
+
+    def test_persona_feeds_context_builder(self):
+        persona = parse_soul_md(SOUL_MD.format(n=1).encode())
+        packed = ContextBuilder().build(persona, {"persona_constraints": ["Witty"], "context": {}})
+        self.assertEqual(packed.prefix.soul_md_hash, persona.soul_md_hash)
+        self.assertEqual(packed.context_used["soul_md_sections"], ["backstory", "voice_traits", "core_beliefs", "directives"])
+
+
+class TestPersonaStore(unittest.TestCase):
+    """
+    Test hash-keyed sharing and hot reload.
+
+    Reference: specs/functional.md FR 1.0 (Version-controlled for GitOps management)
+    """
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.store = PersonaStore()
+
+    def tearDown(self):
+        self.store.stop()
+        self.tmp.cleanup()
+
+    def write(self, name, text):
+        path = self.root / name / "SOUL.md"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text(text)
+        return path
+
+    def bump(self, path, text):
+        stat = path.stat()
+        path.write_text(text)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    def test_identical_files_share_one_persona(self):
+        a = self.write("a", SOUL_MD.format(n="shared"))
+        b = self.write("b", SOUL_MD.format(n="shared"))
+        c = self.write("c", SOUL_MD.format(n=3))
+        loaded = self.store.load_many([a, b, c])
+        self.assertIs(loaded[a.resolve()], loaded[b.resolve()])
+        self.assertEqual((len(self.store), self.store.unique, self.store.stats["parses"]), (3, 2, 2))
+
+    def test_refresh_reparses_only_changed_files(self):
+        a = self.write("a", SOUL_MD.format(n=1))
+        b = self.write("b", SOUL_MD.format(n=2))
+        self.store.load_many([a, b])
+        self.assertEqual(self.store.refresh(), [])
+        self.assertEqual(self.store.stats["reads"], 2)
+
+        changes = []
+        self.store.subscribe(lambda path, old, new: changes.append((path, old.version, new.version)))
+        self.bump(a, SOUL_MD.format(n=1).replace("1.0.0", "1.1.0"))
+        self.assertEqual(self.store.refresh(), [a.resolve()])
+        self.assertEqual(changes, [(a.resolve(), "1.0.0", "1.1.0")])
+        self.assertEqual(self.store.stats["parses"], 3)
+        self.assertEqual(self.store.unique, 2)  # the 1.0.0 persona was released
+
+    def test_touch_without_content_change_is_not_a_reload(self):
+        a = self.write("a", SOUL_MD.format(n=1))
+        first = self.store.load(a)
+        self.bump(a, SOUL_MD.format(n=1))
+        self.assertEqual(self.store.refresh(), [])
+        self.assertIs(self.store.get(a), first)
+        self.assertEqual(self.store.stats["parses"], 1)
+
+    def test_broken_update_keeps_last_good_persona(self):
+        a = self.write("a", SOUL_MD.format(n=1))
+        good = self.store.load(a)
+        self.bump(a, "not a soul file")
+        self.assertEqual(self.store.refresh(), [])
+        self.assertIs(self.store.get(a), good)
+        self.assertEqual(self.store.stats["errors"], 1)
+
+    def test_failing_listener_and_unreadable_file(self):
+        a = self.write("a", SOUL_MD.format(n=1))
+        b = self.write("b", SOUL_MD.format(n=2))
+        self.store.load_many([a, b])
+        changes = []
+
+        def broken(path, old, new):
+            raise RuntimeError("listener bug")
+
+        self.store.subscribe(broken)
+        self.store.subscribe(lambda path, old, new: changes.append(path))
+        self.bump(a, SOUL_MD.format(n=1).replace("1.0.0", "1.1.0"))
+        self.bump(b, SOUL_MD.format(n=2).replace("1.0.0", "1.1.0"))
+        real_read = Path.read_bytes
+
+        def read_bytes(path):
+            if path == b.resolve():
+                raise PermissionError(13, "Permission denied", str(path))
+            return real_read(path)
+
+        with mock.patch.object(Path, "read_bytes", read_bytes), self.assertLogs("chimera.persona", "WARNING"):
+            self.assertEqual(self.store.refresh(), [a.resolve()])
+        self.assertEqual(changes, [a.resolve()])
+        self.assertEqual(self.store.get(b).version, "1.0.0")
+        self.assertEqual((self.store.stats["listener_errors"], self.store.stats["errors"]), (1, 1))
+        self.assertEqual(self.store.refresh(), [b.resolve()])
+
+    def test_deleted_file_is_forgotten(self):
+        a = self.write("a", SOUL_MD.format(n=1))
+        self.store.load(a)
+        removed = []
+        self.store.subscribe(lambda path, old, new: removed.append(new))
+        a.unlink()
+        self.assertEqual(self.store.refresh(), [a.resolve()])
+        self.assertEqual((removed, len(self.store), self.store.unique), ([None], 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
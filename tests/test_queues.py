@@ -0,0 +1,187 @@
+import threading
+import unittest
+import uuid
+
+from chimera.queues import ReviewQueue, TaskQueue
+from chimera.redis_store import InMemoryRedis
+from helpers import FakeClock, T0
+
+# Reference: specs/technical.md Section 2.3 (Redis Schema), specs/functional.md FR 6.0
+
+
+def task(n, **extra):
+    return {"task_id": str(uuid.UUID(int=n)), "task_type": "reply_comment", "priority": "high", **extra}
+
+
+class TestTaskQueueBatching(unittest.TestCase):
+    """
+    Test batched enqueue / claim over the spec key layout.
+
+    Reference: specs/technical.md Section 2.3 (chimera:tasks:{agent_id}:pending)
+    """
+
+    def setUp(self):
+        self.redis = InMemoryRedis()
+        self.queue = TaskQueue(self.redis)
+
+    def test_fifo_batch_claim(self):
+        self.queue.enqueue("agent-1", [task(i) for i in range(5)])
+        self.assertEqual(self.queue.depth("agent-1"), 5)
+        claimed = self.queue.claim("agent-1", "worker-1", count=3)
+        self.assertEqual([t["task_id"] for t in claimed], [task(i)["task_id"] for i in range(3)])
+        self.assertEqual(self.queue.depth("agent-1"), 2)
+        self.assertEqual(self.queue.in_flight("agent-1"), 3)
+
+    def test_spec_keys_are_used(self):
+        self.queue.enqueue("agent-1", [task(1)])
+        self.assertEqual(self.redis.keys("chimera:tasks:agent-1:*"), ["chimera:tasks:agent-1:pending"])
+        self.queue.claim("agent-1", "worker-1")
+        tracking = self.redis.hgetall(f"chimera:tasks:agent-1:{task(1)['task_id']}")
+        self.assertEqual(tracking["worker_id"], "worker-1")
+        self.assertIn("started_at", tracking)
+
+    def test_enqueue_many_is_one_round_trip(self):
+        before = self.redis.round_trips
+        lengths = self.queue.enqueue_many({"a": [task(1), task(2)], "b": [task(3)], "c": []})
+        self.assertEqual(self.redis.round_trips - before, 1)
+        self.assertEqual(lengths, {"a": 2, "b": 1})
+
+    def test_claim_round_trips_do_not_scale_with_batch(self):
+        self.queue.enqueue("agent-1", [task(i) for i in range(100)])
+        before = self.redis.round_trips
+        self.assertEqual(len(self.queue.claim("agent-1", "w", count=100)), 100)
+        self.assertLessEqual(self.redis.round_trips - before, 3)
+
+    def test_items_require_task_id(self):
+        with self.assertRaises(ValueError):
+            self.queue.enqueue("agent-1", [{"task_type": "reply_comment"}])
+
+    def test_concurrent_workers_never_share_items(self):
+        self.queue.enqueue("agent-1", [task(i) for i in range(500)])
+        seen, lock = [], threading.Lock()
+
+        def worker(name):
+            while True:
+                batch = self.queue.claim("agent-1", name, count=7)
+                if not batch:
+                    return
+                with lock:
+                    seen.extend(t["task_id"] for t in batch)
+
+        threads = [threading.Thread(target=worker, args=(f"w{i}",)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(seen), 500)
+        self.assertEqual(len(set(seen)), 500)
+
+
+class TestTaskQueueVisibility(unittest.TestCase):
+    """
+    Test blocking claims, acks, visibility timeouts and dead-lettering.
+
+    Reference: specs/technical.md Section 2.3 (chimera:tasks:{agent_id}:{task_id} hash)
+    """
+
+    def setUp(self):
+        self.clock = FakeClock(T0)
+        self.redis = InMemoryRedis()
+        self.queue = TaskQueue(self.redis, visibility_timeout=30, max_deliveries=2, clock=self.clock)
+
+    def test_ack_clears_tracking(self):
+        self.queue.enqueue("a", [task(1), task(2)])
+        claimed = self.queue.claim("a", "w", count=2)
+        self.assertEqual(self.queue.ack("a", [t["task_id"] for t in claimed]), 2)
+        self.assertEqual(self.queue.in_flight("a"), 0)
+        self.assertEqual(self.redis.keys("chimera:tasks:a:*"), [])
+
+    def test_expired_items_are_redelivered_first(self):
+        self.queue.enqueue("a", [task(1), task(2)])
+        self.queue.claim("a", "w1")
+        self.clock.now += 31
+        self.assertEqual(self.queue.requeue_expired("a"), {"requeued": 1, "dead_lettered": 0})
+        self.assertEqual(self.queue.claim("a", "w2")[0]["task_id"], task(1)["task_id"])
+
+    def test_touch_extends_visibility(self):
+        self.queue.enqueue("a", [task(1)])
+        self.queue.claim("a", "w1")
+        self.clock.now += 20
+        self.assertEqual(self.queue.touch("a", [task(1)["task_id"], task(9)["task_id"]]), 1)
+        self.clock.now += 20
+        self.assertEqual(self.queue.requeue_expired("a"), {"requeued": 0, "dead_lettered": 0})
+        self.assertEqual(self.queue.in_flight("a"), 1)
+
+    def test_dead_letter_after_max_deliveries(self):
+        self.queue.enqueue("a", [task(1)])
+        for _ in range(2):
+            self.queue.claim("a", "w")
+            self.clock.now += 31
+            result = self.queue.requeue_expired("a")
+        self.assertEqual(result, {"requeued": 0, "dead_lettered": 1})
+        (letter,) = self.queue.dead_letters("a")
+        self.assertEqual(letter["item"]["task_id"], task(1)["task_id"])
+        self.assertEqual(letter["reason"], "max_deliveries_exceeded")
+        self.assertEqual(letter["deliveries"], 2)
+        self.assertEqual(self.queue.depth("a"), 0)
+
+    def test_nack_without_requeue_dead_letters(self):
+        self.queue.enqueue("a", [task(1)])
+        self.queue.claim("a", "w")
+        self.assertEqual(self.queue.nack("a", [task(1)["task_id"]], requeue=False, reason="invalid_payload"),
+                         {"requeued": 0, "dead_lettered": 1})
+        self.assertEqual(self.queue.dead_letters("a")[0]["reason"], "invalid_payload")
+        self.assertEqual(self.queue.replay_dead("a"), 1)
+        self.assertEqual(self.queue.claim("a", "w")[0]["task_id"], task(1)["task_id"])
+
+    def test_malformed_payloads_are_dead_lettered(self):
+        pending = self.queue.pending_key("a")
+        self.redis.lpush(pending, "{not json", '{"task_type":"reply_comment"}')
+        self.queue.enqueue("a", [task(1), task(2)])
+        self.assertEqual([t["task_id"] for t in self.queue.claim("a", "w", count=3)], [task(1)["task_id"]])
+        self.assertEqual([t["task_id"] for t in self.queue.claim("a", "w", count=3)], [task(2)["task_id"]])
+        letters = self.queue.dead_letters("a")
+        self.assertEqual([letter["payload"] for letter in letters], ['{"task_type":"reply_comment"}', "{not json"])
+        self.assertEqual({letter["reason"] for letter in letters}, {"malformed_payload"})
+        self.assertEqual(self.queue.claim("a", "w"), [])
+        self.assertEqual(self.queue.replay_dead("a"), 2)
+        self.assertEqual(self.redis.lrange(pending, 0, -1), ['{"task_type":"reply_comment"}', "{not json"])
+
+    def test_release_ignores_acked_items(self):
+        self.queue.enqueue("a", [task(1)])
+        self.queue.claim("a", "w")
+        self.queue.ack("a", [task(1)["task_id"]])
+        self.assertEqual(self.queue.nack("a", [task(1)["task_id"]]), {"requeued": 0, "dead_lettered": 0})
+        self.assertEqual(self.queue.depth("a"), 0)
+
+    def test_blocking_claim(self):
+        threading.Timer(0.05, self.queue.enqueue, args=("a", [task(1)])).start()
+        claimed = self.queue.claim("a", "w", count=5, block=2)
+        self.assertEqual([t["task_id"] for t in claimed], [task(1)["task_id"]])
+        self.assertEqual(self.queue.claim("a", "w", block=0.05), [])
+
+
+class TestReviewQueue(unittest.TestCase):
+    """
+    Test the Worker → Judge handoff.
+
+    Reference: specs/functional.md FR 6.0 (Worker pushes to ReviewQueue, Judge polls it)
+    """
+
+    def test_complete_task_and_submit_result_atomically(self):
+        redis = InMemoryRedis()
+        tasks, reviews = TaskQueue(redis), ReviewQueue(redis)
+        tasks.enqueue("a", [task(1)])
+        (claimed,) = tasks.claim("a", "w")
+        result = {"task_id": claimed["task_id"], "worker_id": "w", "result_type": "content", "confidence_score": 0.9}
+        with redis.pipeline() as pipe:
+            reviews.enqueue("a", [result], pipe=pipe)
+            tasks.ack("a", [claimed["task_id"]], pipe=pipe)
+            pipe.execute()
+        self.assertEqual(redis.llen("chimera:reviews:a:pending"), 1)
+        self.assertEqual(tasks.in_flight("a"), 0)
+        self.assertEqual(reviews.claim("a", "judge-1"), [result])
+
+
+if __name__ == '__main__':
+    unittest.main()
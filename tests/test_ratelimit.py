@@ -0,0 +1,152 @@
+import asyncio
+import time
+import unittest
+
+from chimera.ratelimit import Quota, RateLimiter, gcra_slots
+from chimera.redis_store import InMemoryRedis
+from helpers import FakeClock, T0
+
+# Reference: specs/functional.md FR 4.0 (MCP tools, rate limiting)
+
+
+class FakeMCP:
+    def __init__(self):
+        self.calls = []
+
+    async def call_tool(self, server, name, arguments=None):
+        self.calls.append((server, name, arguments))
+        return {"ok": True}
+
+
+class TestGcra(unittest.TestCase):
+    """
+    Test slot arithmetic.
+
+    Reference: specs/functional.md FR 4.0 (rate limiting)
+    """
+
+    def test_slots(self):
+        self.assertEqual(gcra_slots(0.0, 100.0, 3, 2.0, 0.0), ([100.0, 102.0, 104.0], 106.0))
+        self.assertEqual(gcra_slots(110.0, 100.0, 1, 2.0, 0.0), ([110.0], 112.0))
+        # burst 3: the first three go back to back, then one per interval
+        self.assertEqual(gcra_slots(0.0, 100.0, 5, 2.0, 4.0)[0], [100.0, 100.0, 100.0, 102.0, 104.0])
+
+
+class TestRateLimiter(unittest.TestCase):
+    """
+    Test scheduling, sharing across processes and the local slot cache.
+
+    Reference: specs/functional.md FR 4.0 (MCP tools, rate limiting)
+    """
+
+    def setUp(self):
+        self.clock = FakeClock(T0)
+        self.redis = InMemoryRedis(clock=self.clock)
+        self.quotas = {
+            "twitter.post_tweet": Quota(10, 10, bucket="twitter.tweets"),
+            "twitter.reply_tweet": Quota(10, 10, bucket="twitter.tweets"),
+            "instagram.publish_media": Quota(2, 60),
+        }
+
+    def limiter(self, **kwargs):
+        kwargs.setdefault("margin", 0.0)
+        return RateLimiter(self.redis, self.quotas, clock=self.clock, **kwargs)
+
+    def test_calls_are_scheduled_not_rejected(self):
+        rl = self.limiter()
+        slots = [rl.reserve("twitter.post_tweet", "@chimera") for _ in range(25)]
+        self.assertEqual(slots, [T0 + n for n in range(25)])
+        self.assertEqual(rl.next_slot("twitter.post_tweet", "@chimera"), T0 + 25)
+        self.assertEqual(rl.reserve("twitter.post_tweet", "@other"), T0)  # accounts are independent
+
+    def test_processes_share_the_quota(self):
+        limiters = [self.limiter() for _ in range(4)]
+        slots = []
+        for step in range(40):
+            self.clock.now = T0 + step * 0.1
+            slots.append(limiters[step % 4].reserve("twitter.post_tweet"))
+        self.assertEqual(len(set(slots)), 40)
+        slots.sort()
+        for first, last in zip(slots, slots[10:]):
+            self.assertGreaterEqual(last - first, 10)  # never more than 10 in any 10 s
+
+    def test_posts_and_replies_share_a_bucket(self):
+        rl = self.limiter()
+        self.assertEqual(rl.reserve("twitter.post_tweet"), T0)
+        self.assertEqual(rl.reserve("twitter.reply_tweet"), T0 + 1)
+        self.assertEqual(rl.reserve("instagram.publish_media"), T0)
+        self.assertEqual(rl.reserve("instagram.publish_media"), T0 + 30)
+
+    def test_unknown_tools_are_unlimited(self):
+        rl = self.limiter()
+        self.assertEqual([rl.reserve("web.search") for _ in range(3)], [T0] * 3)
+        self.assertEqual((rl.stats["unlimited"], rl.stats["fetches"]), (3, 0))
+
+    def test_burst_fills_local_cache(self):
+        rl = self.limiter(prefetch_window=5.0)
+        for _ in range(20):
+            rl.reserve("twitter.post_tweet")
+        self.assertEqual(rl.stats["reserved"], 20)
+        self.assertLess(rl.stats["fetches"], 10)
+        self.assertEqual(rl.stats["local"], 20 - rl.stats["fetches"])
+        self.assertEqual(rl.stats["resets"], 1)  # only the first fetch found the bucket idle
+
+        round_trips = self.redis.round_trips
+        self.clock.now = T0 + 1.5
+        rl.reserve("twitter.post_tweet")  # busy bucket: one INCRBYFLOAT at most
+        self.assertLessEqual(self.redis.round_trips - round_trips, 1)
+
+    def test_stale_slots_are_dropped_and_unused_given_back(self):
+        rl = self.limiter(prefetch_window=5.0)
+        for _ in range(4):
+            rl.reserve("twitter.post_tweet")
+        cached = len(rl._buckets[("twitter.tweets", "default")].slots)
+        self.assertGreater(cached, 0)
+
+        self.clock.now = T0 + 100
+        self.assertEqual(rl.reserve("twitter.post_tweet"), T0 + 100)
+        self.assertEqual(rl.stats["wasted"], cached)  # never used late
+
+        for _ in range(3):
+            rl.reserve("twitter.post_tweet")
+        rl.close()
+        self.assertGreater(rl.stats["returned"], 0)
+        other = self.limiter()
+        self.assertEqual(other.reserve("twitter.post_tweet"), T0 + 104)
+
+    def test_give_back_skipped_after_other_reservations(self):
+        rl = self.limiter(prefetch_window=5.0)
+        for _ in range(4):
+            rl.reserve("twitter.post_tweet")
+        other = self.limiter()
+        later = other.reserve("twitter.post_tweet")
+        rl.close()
+        self.assertEqual(rl.stats["returned"], 0)
+        self.assertGreater(other.reserve("twitter.post_tweet"), later)
+
+    def test_rejects_bad_config(self):
+        with self.assertRaises(ValueError):
+            RateLimiter(self.redis, {"x.y": Quota(0, 10)})
+        with self.assertRaises(ValueError):
+            RateLimiter(self.redis, max_block=0)
+
+
+class TestAcquire(unittest.IsolatedAsyncioTestCase):
+    """
+    Test that tool calls wait for their slot.
+
+    Reference: specs/functional.md FR 4.0 (MCP tools)
+    """
+
+    async def test_call_tool_waits(self):
+        rl = RateLimiter(InMemoryRedis(), {"twitter.post_tweet": Quota(20, 1)}, margin=0.0)
+        mcp = FakeMCP()
+        start = time.monotonic()
+        await asyncio.gather(*(rl.call_tool(mcp, "twitter", "post_tweet", {"text": f"t{n}"}) for n in range(5)))
+        self.assertGreaterEqual(time.monotonic() - start, 0.15)
+        self.assertEqual(len(mcp.calls), 5)
+        self.assertEqual(await rl.acquire("web.search"), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
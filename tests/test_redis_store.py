@@ -0,0 +1,124 @@
+import threading
+import time
+import unittest
+
+from chimera.redis_store import InMemoryRedis, ResponseError, WatchError
+from helpers import FakeClock
+
+# Reference: specs/technical.md Section 2.3 (Redis Schema)
+
+
+class TestInMemoryRedisCommands(unittest.TestCase):
+    """
+    Test the redis-py compatible command subset.
+
+    Reference: specs/technical.md Section 2.3 (lists, hashes, counters, expiring keys)
+    """
+
+    def setUp(self):
+        self.clock = FakeClock(1_000.0)
+        self.r = InMemoryRedis(clock=self.clock)
+
+    def test_list_fifo_with_lpush_rpop(self):
+        self.assertEqual(self.r.lpush("q", "a", "b", "c"), 3)
+        self.assertEqual(self.r.lrange("q", 0, -1), ["c", "b", "a"])
+        self.assertEqual(self.r.rpop("q"), "a")
+        self.assertEqual(self.r.rpop("q", 5), ["b", "c"])
+        self.assertEqual(self.r.exists("q"), 0)
+
+    def test_lrange_and_ltrim_tail(self):
+        self.r.rpush("q", *range(10))
+        self.assertEqual(self.r.lrange("q", -3, -1), ["7", "8", "9"])
+        self.assertEqual(self.r.lrange("q", 2, 4), ["2", "3", "4"])
+        self.r.ltrim("q", 0, -4)
+        self.assertEqual(self.r.lrange("q", 0, -1), [str(i) for i in range(7)])
+        self.r.ltrim("q", 0, -8)
+        self.assertEqual(self.r.llen("q"), 0)
+
+    def test_hash_and_counters(self):
+        self.r.hset("h", mapping={"a": 1, "b": "x"})
+        self.assertEqual(self.r.hgetall("h"), {"a": "1", "b": "x"})
+        self.assertEqual(self.r.hincrby("h", "a", 2), 3)
+        self.assertEqual(self.r.hmget("h", ["a", "zz"]), ["3", None])
+        self.assertEqual(self.r.incrbyfloat("spend", 1.5), 1.5)
+        self.assertEqual(self.r.get("spend"), "1.5")
+        self.assertEqual(self.r.incr("n"), 1)
+
+    def test_sorted_set_ranges(self):
+        self.r.zadd("z", {"a": 3, "b": 1, "c": 2})
+        self.assertEqual(self.r.zrangebyscore("z", "-inf", 2), ["b", "c"])
+        self.assertEqual(self.r.zrangebyscore("z", "(1", "+inf", start=0, num=1), ["c"])
+        self.assertEqual(self.r.zadd("z", {"a": 9, "d": 1}, xx=True, ch=True), 1)
+        self.assertIsNone(self.r.zscore("z", "d"))
+
+    def test_expiry(self):
+        self.r.set("lock", "w1", ex=10, nx=True)
+        self.assertIsNone(self.r.set("lock", "w2", nx=True))
+        self.clock.now += 10
+        self.assertIsNone(self.r.get("lock"))
+        self.assertTrue(self.r.set("lock", "w2", nx=True))
+        self.assertEqual(self.r.ttl("lock"), -1)
+
+    def test_wrong_type(self):
+        self.r.lpush("q", "a")
+        with self.assertRaises(ResponseError):
+            self.r.hset("q", "f", "v")
+
+    def test_blmove_waits_for_push(self):
+        def producer():
+            time.sleep(0.05)
+            self.r.lpush("q", "job")
+
+        threading.Thread(target=producer).start()
+        self.assertEqual(self.r.blmove("q", "q", 2, "RIGHT", "RIGHT"), "job")
+        self.assertEqual(self.r.llen("q"), 1)
+        self.assertIsNone(self.r.blmove("empty", "empty", 0.05))
+
+
+class TestInMemoryRedisPipelines(unittest.TestCase):
+    """
+    Test MULTI/EXEC batching and WATCH conflicts.
+
+    Reference: specs/functional.md FR 6.1 (Optimistic Concurrency Control)
+    """
+
+    def setUp(self):
+        self.r = InMemoryRedis()
+
+    def test_pipeline_is_one_round_trip(self):
+        before = self.r.round_trips
+        with self.r.pipeline(transaction=False) as pipe:
+            pipe.lpush("a", 1).lpush("b", 2).hset("h", "f", "v")
+            self.assertEqual(pipe.execute(), [1, 1, 1])
+        self.assertEqual(self.r.round_trips - before, 1)
+
+    def test_watch_detects_concurrent_write(self):
+        self.r.set("version", "1")
+        with self.r.pipeline() as pipe:
+            pipe.watch("version")
+            self.assertEqual(pipe.get("version"), "1")
+            self.r.set("version", "2")
+            pipe.multi()
+            pipe.set("version", "3")
+            with self.assertRaises(WatchError):
+                pipe.execute()
+        self.assertEqual(self.r.get("version"), "2")
+
+    def test_watch_succeeds_without_conflict(self):
+        with self.r.pipeline() as pipe:
+            pipe.watch("version")
+            pipe.multi()
+            pipe.set("version", "1")
+            self.assertEqual(pipe.execute(), [True])
+
+    def test_errors_are_raised_after_execution(self):
+        self.r.lpush("q", "a")
+        with self.r.pipeline() as pipe:
+            pipe.set("x", "1").hset("q", "f", "v")
+            with self.assertRaises(ResponseError):
+                pipe.execute()
+        self.assertEqual(self.r.get("x"), "1")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,184 @@
+import asyncio
+import tempfile
+import time
+import unittest
+
+from chimera.queues import ReviewQueue
+from chimera.redis_store import InMemoryRedis
+from skills.content_generator import GenerationCache, RenderPipeline, RenderQueueFull, TierConfig, review_queue_callback
+
+# Reference: specs/functional.md FR 3.2 (Hybrid Video Rendering Strategy), FR 6.0, skills/content_generator/README.md
+
+
+class Renderer:
+    """Fake video tool: sleeps `delay`, tracks concurrency and start times."""
+
+    def __init__(self, delay=0.05, fail_topics=()):
+        self.delay = delay
+        self.fail_topics = set(fail_topics)
+        self.active = 0
+        self.max_active = 0
+        self.starts = []
+
+    async def __call__(self, parameters):
+        self.starts.append(time.monotonic())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if parameters["topic"] in self.fail_topics:
+                raise TimeoutError("runway render timed out")
+            return {
+                "content": {
+                    "text": parameters["topic"],
+                    "image_url": None,
+                    "video_url": f"https://cdn.chimera.ai/generated/{parameters['tier']}/{len(self.starts)}.mp4",
+                    "platform": parameters["platform"],
+                    "disclosure_level": "automated",
+                },
+                "metadata": {
+                    "generated_at": "2026-02-04T10:05:00Z",
+                    "generation_cost_usdc": 12.5 if parameters["tier"] == "hero" else 1.5,
+                    "character_consistency_score": 0.93,
+                    "brand_alignment_score": 0.9,
+                },
+            }
+        finally:
+            self.active -= 1
+
+
+def video(topic, tier="daily"):
+    return {"content_type": "video", "platform": "tiktok", "topic": topic, "tier": tier,
+            "character_reference_id": "agent-123-character-lora", "budget_limit_usdc": 25.0}
+
+
+class TestRenderPipeline(unittest.IsolatedAsyncioTestCase):
+    """
+    Test job handles, per-tier scheduling and the ReviewQueue handoff.
+
+    Reference: specs/functional.md FR 3.2 (Tier 1 Image-to-Video, Tier 2 Text-to-Video)
+    """
+
+    async def test_submit_returns_handle_immediately(self):
+        daily = Renderer(delay=0.05)
+        pipeline = RenderPipeline({"daily": daily})
+        finished = []
+        pipeline.on_complete(finished.append)
+
+        job = pipeline.submit(video("Habesha Kemis"), task_id="task-1", agent_id="agent-123")
+        self.assertEqual(job.to_dict()["status"], "queued")
+        self.assertEqual(job.task_id, "task-1")
+        self.assertIs(pipeline.get(job.job_id), job)
+
+        result = await job.wait()
+        self.assertEqual(job.status, "complete")
+        self.assertTrue(result["content"]["video_url"].endswith(".mp4"))
+        self.assertEqual(finished, [job])
+        await pipeline.close()
+
+    async def test_tier1_renders_in_parallel(self):
+        daily = Renderer(delay=0.1)
+        pipeline = RenderPipeline({"daily": daily}, tiers={"daily": TierConfig(concurrency=8)})
+        start = time.monotonic()
+        jobs = [pipeline.submit(video(f"topic {i}")) for i in range(16)]
+        await asyncio.gather(*(job.wait() for job in jobs))
+
+        self.assertEqual(daily.max_active, 8)
+        self.assertLess(time.monotonic() - start, 0.6)  # 2 waves, not 16 sequential renders
+        self.assertEqual(pipeline.stats["completed"], 16)
+        await pipeline.close()
+
+    async def test_tier2_is_rate_limited_without_blocking_tier1(self):
+        daily, hero = Renderer(delay=0.01), Renderer(delay=0.01)
+        pipeline = RenderPipeline(
+            {"daily": daily, "hero": hero},
+            tiers={"daily": TierConfig(concurrency=4), "hero": TierConfig(concurrency=2, rate=10.0, burst=1)},
+        )
+        hero_jobs = [pipeline.submit(video(f"hero {i}", tier="hero")) for i in range(4)]
+        daily_jobs = [pipeline.submit(video(f"daily {i}")) for i in range(4)]
+
+        await asyncio.gather(*(job.wait() for job in daily_jobs))
+        self.assertLessEqual(sum(job.done() for job in hero_jobs), 2)  # daily finished while hero waits for tokens
+
+        await asyncio.gather(*(job.wait() for job in hero_jobs))
+        gaps = [b - a for a, b in zip(hero.starts, hero.starts[1:])]
+        self.assertTrue(all(gap >= 0.08 for gap in gaps), gaps)
+        self.assertGreater(pipeline.metrics()["hero"]["queue_wait"]["max"], 0.2)
+        await pipeline.close()
+
+    async def test_failed_render(self):
+        pipeline = RenderPipeline({"daily": Renderer(fail_topics={"broken"})})
+        job = pipeline.submit(video("broken"))
+        with self.assertRaises(TimeoutError):
+            await job.wait()
+        self.assertEqual(job.status, "failed")
+        self.assertIn("timed out", job.to_dict()["error"])
+        self.assertEqual(pipeline.stats["failed"], 1)
+        await pipeline.close()
+
+    async def test_queue_bound_and_cancel(self):
+        pipeline = RenderPipeline(
+            {"hero": Renderer(delay=0.05)},
+            tiers={"hero": TierConfig(concurrency=1, max_queued=2)},
+        )
+        first = pipeline.submit(video("a", tier="hero"))
+        await asyncio.sleep(0)  # first starts rendering
+        queued = [pipeline.submit(video(t, tier="hero")) for t in ("b", "c")]
+        with self.assertRaises(RenderQueueFull):
+            pipeline.submit(video("d", tier="hero"))
+        self.assertEqual(pipeline.stats["rejected"], 1)
+
+        self.assertTrue(pipeline.cancel(queued[0].job_id))
+        self.assertFalse(pipeline.cancel(first.job_id))  # already rendering
+        with self.assertRaises(asyncio.CancelledError):
+            await queued[0].wait()
+        await pipeline.join()
+        self.assertEqual([j.status for j in (first, *queued)], ["complete", "cancelled", "complete"])
+        with self.assertRaises(ValueError):
+            pipeline.submit(video("x", tier="daily"))  # no daily renderer configured
+        await pipeline.close()
+
+    async def test_completion_pushes_task_results_to_review_queue(self):
+        redis = InMemoryRedis()
+        reviews = ReviewQueue(redis)
+        pipeline = RenderPipeline({"daily": Renderer(fail_topics={"broken"})})
+        pipeline.on_complete(review_queue_callback(reviews, worker_id="worker-7"))
+        ok = pipeline.submit(video("Habesha Kemis"), task_id="11111111-1111-4111-8111-111111111111", agent_id="agent-123")
+        bad = pipeline.submit(video("broken"), task_id="22222222-2222-4222-8222-222222222222", agent_id="agent-123")
+        await pipeline.join()
+
+        claimed = {r["task_id"]: r for r in reviews.claim("agent-123", "judge-1", count=10)}
+        self.assertEqual(set(claimed), {ok.task_id, bad.task_id})
+        result = claimed[ok.task_id]
+        self.assertEqual(result["result_type"], "content")
+        self.assertEqual(result["worker_id"], "worker-7")
+        self.assertEqual(result["confidence_score"], 0.93)
+        self.assertIn("video_url", result["content"])
+        self.assertNotIn("image_url", result["content"])  # null fields are omitted per the TaskResult schema
+        self.assertIn("Tier 1", result["reasoning_trace"])
+        self.assertEqual(claimed[bad.task_id]["result_type"], "error")
+        await pipeline.close()
+
+    async def test_identical_renders_share_one_generation(self):
+        hero = Renderer(delay=0.05)
+        with tempfile.TemporaryDirectory() as directory:
+            pipeline = RenderPipeline({"hero": hero}, tiers={"hero": TierConfig(concurrency=4)},
+                                      cache=GenerationCache(directory))
+            jobs = [pipeline.submit(video("Launch film", tier="hero")) for _ in range(3)]
+            results = await asyncio.gather(*(job.wait() for job in jobs))
+            await pipeline.close()
+        self.assertEqual(len(hero.starts), 1)
+        self.assertEqual(sorted(r["metadata"]["generation_cost_usdc"] for r in results), [0.0, 0.0, 12.5])
+
+    async def test_close_without_drain_cancels_queued(self):
+        pipeline = RenderPipeline({"daily": Renderer(delay=0.05)}, tiers={"daily": TierConfig(concurrency=1)})
+        jobs = [pipeline.submit(video(f"t{i}")) for i in range(3)]
+        await asyncio.sleep(0.01)
+        await pipeline.close(drain=False)
+        self.assertEqual([job.status for job in jobs], ["cancelled"] * 3)
+        with self.assertRaises(RuntimeError):
+            pipeline.submit(video("late"))
+
+
+if __name__ == "__main__":
+    unittest.main()
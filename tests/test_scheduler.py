@@ -0,0 +1,104 @@
+import unittest
+from collections import Counter
+
+from chimera.scheduler import FairScheduler
+from helpers import FakeClock
+
+# Reference: specs/technical.md Section 1.1 (AgentTask priority), specs/functional.md FR 6.0
+
+
+def task(priority="medium", task_type="fetch_trends", n=0):
+    return {"task_id": f"t{n}", "task_type": task_type, "priority": priority}
+
+
+class TestPriorityLanes(unittest.TestCase):
+    """
+    Test strict priority between lanes and aging.
+
+    Reference: specs/technical.md Section 1.1 (priority: high/medium/low)
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.scheduler = FairScheduler(aging_seconds=10, clock=self.clock)
+
+    def test_high_lane_first(self):
+        self.scheduler.submit("a", task("low", n=1))
+        self.scheduler.submit("a", task("medium", n=2))
+        self.scheduler.submit("b", task("high", "reply_comment", n=3))
+        order = [t["task_id"] for _, t in self.scheduler.next_batch(3)]
+        self.assertEqual(order, ["t3", "t2", "t1"])
+        self.assertIsNone(self.scheduler.next())
+
+    def test_aging_promotes_starved_work(self):
+        self.scheduler.submit("quiet", task("low", n=0))
+        self.scheduler.submit_many("busy", [task("high", "reply_comment", n=i) for i in range(1, 100)])
+        self.scheduler.next_batch(5)
+        self.clock.now = 10
+        self.assertEqual(self.scheduler.next_batch(5)[-1][0], "busy")
+        self.assertEqual(self.scheduler.depth(), {"high": 89, "medium": 1, "low": 0})
+        self.clock.now = 20
+        # Now in the high lane, the quiet agent gets its fair turn at once.
+        self.assertIn("t0", [t["task_id"] for _, t in self.scheduler.next_batch(2)])
+        self.assertEqual(self.scheduler.stats["promoted"], 2)
+
+    def test_promotion_keeps_agent_order(self):
+        self.scheduler.submit_many("a", [task("low", n=i) for i in range(5)])
+        self.clock.now = 10
+        self.assertEqual([t["task_id"] for _, t in self.scheduler.next_batch(5)], [f"t{i}" for i in range(5)])
+
+    def test_unknown_priority(self):
+        with self.assertRaises(ValueError):
+            self.scheduler.submit("a", task("urgent"))
+
+    def test_wait_stats_per_original_priority(self):
+        self.scheduler.submit("a", task("high", n=1))
+        self.scheduler.submit("a", task("low", n=2))
+        self.clock.now = 4
+        self.scheduler.next_batch(2)
+        stats = self.scheduler.wait_stats()
+        self.assertEqual(stats["high"]["count"], 1)
+        self.assertEqual(stats["high"]["p99"], 4)
+        self.assertEqual(stats["low"]["p50"], 4)
+        self.assertEqual(stats["medium"]["count"], 0)
+
+
+class TestFairShare(unittest.TestCase):
+    """
+    Test weighted fair queuing across agent_ids inside a lane.
+
+    Reference: specs/functional.md FR 6.0 (Worker Pool shared by all agents)
+    """
+
+    def test_noisy_agent_gets_equal_share(self):
+        scheduler = FairScheduler()
+        scheduler.submit_many("noisy", [task("low", n=i) for i in range(1000)])
+        for agent in ("a", "b", "c"):
+            scheduler.submit_many(agent, [task("low", n=i) for i in range(10)])
+        served = Counter(agent for agent, _ in scheduler.next_batch(40))
+        self.assertEqual(served, Counter({"noisy": 10, "a": 10, "b": 10, "c": 10}))
+
+    def test_weights_and_costs(self):
+        scheduler = FairScheduler(agent_weights={"vip": 3.0}, task_costs={"generate_content": 2.0})
+        scheduler.submit_many("vip", [task(n=i) for i in range(100)])
+        scheduler.submit_many("std", [task(n=i) for i in range(100)])
+        scheduler.submit_many("video", [task(task_type="generate_content", n=i) for i in range(100)])
+        served = Counter(agent for agent, _ in scheduler.next_batch(90))
+        self.assertEqual(served, Counter({"vip": 60, "std": 20, "video": 10}))
+
+    def test_returning_agent_does_not_bank_credit(self):
+        scheduler = FairScheduler()
+        scheduler.submit_many("a", [task(n=i) for i in range(50)])
+        scheduler.next_batch(40)
+        scheduler.submit_many("b", [task(n=i) for i in range(50)])
+        served = Counter(agent for agent, _ in scheduler.next_batch(10))
+        self.assertEqual(served, Counter({"a": 5, "b": 5}))
+
+    def test_fifo_within_agent(self):
+        scheduler = FairScheduler()
+        scheduler.submit_many("a", [task(n=i) for i in range(5)])
+        self.assertEqual([t["task_id"] for _, t in scheduler.next_batch(5)], [f"t{i}" for i in range(5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,252 @@
+import unittest
+import json
+import tempfile
+from pathlib import Path
+
+from skills.schema_registry import (
+    CompiledValidator,
+    SchemaRegistry,
+    SchemaValidationError,
+)
+
+# Reference: skills/*/input_schema.json, skills/*/output_schema.json
+SKILLS_DIR = Path(__file__).parent.parent / "skills"
+
+
+class TestSchemaRegistryInputContracts(unittest.TestCase):
+    """
+    Test compiled input validators against the skill contracts.
+
+    Reference: skills/README.md (Input/Output Contracts), specs/technical.md Section 1
+    """
+
+    def setUp(self):
+        self.registry = SchemaRegistry(SKILLS_DIR)
+
+    def test_trend_fetcher_valid_input(self):
+        """
+        Reference: skills/trend_fetcher/input_schema.json
+        """
+        payload = {
+            "skill_name": "trend_fetcher",
+            "parameters": {
+                "region": "ethiopia",
+                "category": "fashion",
+                "timeframe_hours": 24,
+                "relevance_threshold": 0.75
+            }
+        }
+        self.assertIs(self.registry.validate_input("trend_fetcher", payload), payload)
+
+    def test_trend_fetcher_missing_required_fields(self):
+        """
+        Reference: skills/trend_fetcher/input_schema.json
+        Required: skill_name, parameters.region, parameters.category
+        """
+        with self.assertRaises(SchemaValidationError) as ctx:
+            self.registry.validate_input("trend_fetcher", {
+                "skill_name": "trend_fetcher",
+                "parameters": {"category": "fashion"}
+            })
+        self.assertEqual(ctx.exception.errors, ["parameters.region: required property is missing"])
+
+    def test_trend_fetcher_out_of_range_values(self):
+        """
+        Reference: skills/trend_fetcher/input_schema.json
+        Constraints: timeframe_hours (1-168), relevance_threshold (0.0-1.0)
+        """
+        validator = self.registry.get("trend_fetcher", "input")
+        errors = validator.iter_errors({
+            "skill_name": "trend_fetcher",
+            "parameters": {
+                "region": "ethiopia",
+                "category": "fashion",
+                "timeframe_hours": 200,
+                "relevance_threshold": 1.5
+            }
+        })
+        self.assertEqual(len(errors), 2)
+        self.assertIn("parameters.timeframe_hours", errors[0])
+        self.assertIn("parameters.relevance_threshold", errors[1])
+
+    def test_trend_fetcher_type_validation(self):
+        """
+        Reference: skills/trend_fetcher/input_schema.json
+        region must be a string; booleans are not integers
+        """
+        validator = self.registry.get("trend_fetcher", "input")
+        self.assertFalse(validator.is_valid({
+            "skill_name": "trend_fetcher",
+            "parameters": {"region": 123, "category": "fashion"}
+        }))
+        self.assertFalse(validator.is_valid({
+            "skill_name": "trend_fetcher",
+            "parameters": {"region": "ethiopia", "category": "fashion", "timeframe_hours": True}
+        }))
+
+    def test_content_generator_enum_validation(self):
+        """
+        Reference: skills/content_generator/input_schema.json
+        Enums: content_type, platform, tier
+        """
+        validator = self.registry.get("content_generator", "input")
+        errors = validator.iter_errors({
+            "skill_name": "content_generator",
+            "parameters": {
+                "content_type": "invalid_type",
+                "platform": "myspace",
+                "topic": "Test",
+                "tier": "daily"
+            }
+        })
+        self.assertEqual(len(errors), 2)
+
+    def test_engagement_manager_enum_validation(self):
+        """
+        Reference: skills/engagement_manager/input_schema.json
+        Enums: interaction_type (reply|comment|dm|like), platform (twitter|instagram|threads)
+        """
+        validator = self.registry.get("engagement_manager", "input")
+        base = {
+            "skill_name": "engagement_manager",
+            "parameters": {
+                "interaction_type": "reply",
+                "platform": "twitter",
+                "target_content_id": "tweet-123456",
+                "target_user_id": "user-789",
+                "persona_constraints": ["Witty"]
+            }
+        }
+        self.assertTrue(validator.is_valid(base))
+        base["parameters"]["interaction_type"] = "retweet"
+        self.assertFalse(validator.is_valid(base))
+
+    def test_wrong_skill_name(self):
+        """
+        Reference: skills/*/input_schema.json (skill_name const)
+        """
+        validator = self.registry.get("trend_fetcher", "input")
+        self.assertFalse(validator.is_valid({
+            "skill_name": "content_generator",
+            "parameters": {"region": "ethiopia", "category": "fashion"}
+        }))
+
+
+class TestSchemaRegistryOutputContracts(unittest.TestCase):
+    """
+    Test compiled output validators.
+
+    Reference: skills/*/output_schema.json
+    """
+
+    def setUp(self):
+        self.registry = SchemaRegistry(SKILLS_DIR)
+
+    def test_trend_fetcher_output(self):
+        """
+        Reference: skills/trend_fetcher/output_schema.json
+        Sources must match "^mcp://", fetched_at must be ISO 8601
+        """
+        output = {
+            "trends": [
+                {
+                    "topic": "Sustainable Fashion",
+                    "engagement_score": 0.87,
+                    "growth_rate": "+15%",
+                    "sources": ["mcp://news/ethiopia/fashion/trends"],
+                    "relevance_score": 0.92
+                }
+            ],
+            "metadata": {
+                "fetched_at": "2026-02-04T10:00:00Z",
+                "source_count": 1,
+                "confidence": 0.89
+            }
+        }
+        self.assertIs(self.registry.validate_output("trend_fetcher", output), output)
+
+        output["trends"][0]["sources"] = ["news://ethiopia/fashion"]
+        output["metadata"]["fetched_at"] = "yesterday"
+        errors = self.registry.get("trend_fetcher", "output").iter_errors(output)
+        self.assertEqual(len(errors), 2)
+        self.assertTrue(errors[0].startswith("trends[0].sources[0]"))
+
+    def test_content_generator_nullable_urls(self):
+        """
+        Reference: skills/content_generator/output_schema.json
+        image_url/video_url are ["string", "null"]; text maxLength 280
+        """
+        output = {
+            "content": {
+                "text": "Sustainable fashion is the future!",
+                "image_url": "https://cdn.chimera.ai/generated/agent-123/image-456.jpg",
+                "video_url": None,
+                "platform": "instagram",
+                "disclosure_level": "automated"
+            },
+            "metadata": {
+                "generated_at": "2026-02-04T10:05:00Z",
+                "generation_cost_usdc": 12.50,
+                "character_consistency_score": 0.95,
+                "brand_alignment_score": 0.91
+            }
+        }
+        validator = self.registry.get("content_generator", "output")
+        self.assertTrue(validator.is_valid(output))
+        output["content"]["text"] = "x" * 281
+        self.assertFalse(validator.is_valid(output))
+
+
+class TestSchemaRegistryCaching(unittest.TestCase):
+    """
+    Test that schemas are loaded once and support batch validation.
+
+    Reference: skills/README.md (Validate schemas before skill execution)
+    """
+
+    def test_validator_is_cached(self):
+        registry = SchemaRegistry(SKILLS_DIR)
+        self.assertIs(registry.get("trend_fetcher"), registry.get("trend_fetcher"))
+        self.assertIsNot(registry.get("trend_fetcher", "input"), registry.get("trend_fetcher", "output"))
+
+    def test_schema_file_read_once(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            skill_dir = Path(tmp) / "demo"
+            skill_dir.mkdir()
+            schema_path = skill_dir / "input_schema.json"
+            schema_path.write_text(json.dumps({"type": "object", "required": ["a"]}))
+            registry = SchemaRegistry(Path(tmp))
+            validator = registry.get("demo")
+            schema_path.unlink()
+            self.assertIs(registry.get("demo"), validator)
+            self.assertEqual(registry.skills(), [])
+
+    def test_validate_many(self):
+        registry = SchemaRegistry(SKILLS_DIR)
+        payloads = [
+            {"skill_name": "trend_fetcher", "parameters": {"region": "ethiopia", "category": "fashion"}},
+            {"skill_name": "trend_fetcher", "parameters": {"region": "ethiopia"}},
+            {"skill_name": "trend_fetcher", "parameters": {"region": "kenya", "category": "tech", "timeframe_hours": 0}},
+        ]
+        results = registry.validate_many("trend_fetcher", payloads)
+        self.assertEqual([len(r) for r in results], [0, 1, 1])
+
+    def test_preload_compiles_all_skills(self):
+        registry = SchemaRegistry(SKILLS_DIR)
+        registry.preload()
+        self.assertEqual(len(registry._validators), 2 * len(registry.skills()))
+
+    def test_error_response_shape(self):
+        """
+        Reference: skills/README.md (Error Handling)
+        """
+        validator = CompiledValidator({"title": "demo", "type": "object", "required": ["a"]})
+        with self.assertRaises(SchemaValidationError) as ctx:
+            validator.validate({})
+        response = ctx.exception.to_error_response()
+        self.assertEqual(response["error"]["code"], "SCHEMA_VALIDATION_ERROR")
+        self.assertEqual(response["error"]["details"]["errors"], ["a: required property is missing"])
+
+
+if __name__ == '__main__':
+    unittest.main()
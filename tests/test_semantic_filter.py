@@ -0,0 +1,112 @@
+import unittest
+
+import numpy as np
+
+from chimera.semantic_filter import HashingEmbedder, SemanticFilter, tokenize
+
+# Reference: specs/functional.md FR 2.1 (Semantic Filtering & Relevance Scoring)
+
+INTERESTS = [
+    "sustainable fashion trends in ethiopia",
+    "handmade ethiopian textiles and habesha kemis",
+]
+
+
+class TestHashingEmbedder(unittest.TestCase):
+    """
+    Test the default batch embedder.
+
+    Reference: specs/functional.md FR 2.1 (Semantic Filter)
+    """
+
+    def test_rows_are_unit_length(self):
+        matrix = HashingEmbedder(dim=64)(["Sustainable fashion", "Ethiopian textiles, handmade"])
+        self.assertEqual(matrix.shape, (2, 64))
+        self.assertEqual(matrix.dtype, np.float32)
+        np.testing.assert_allclose(np.linalg.norm(matrix, axis=1), 1.0, rtol=1e-5)
+
+    def test_embedding_is_deterministic_and_case_insensitive(self):
+        embedder = HashingEmbedder()
+        np.testing.assert_array_equal(embedder(["Habesha Kemis"]), embedder(["habesha kemis"]))
+
+    def test_empty_text_embeds_to_zero(self):
+        self.assertFalse(HashingEmbedder()([""]).any())
+
+    def test_tokenize(self):
+        self.assertEqual(tokenize("Habesha-Kemis, 2026!"), ["habesha", "kemis", "2026"])
+
+
+class TestSemanticFilter(unittest.TestCase):
+    """
+    Test batch scoring, lexical prefilter and threshold masking.
+
+    Reference: specs/functional.md FR 2.1 (threshold e.g. 0.75; only content above it triggers a Task)
+    """
+
+    def setUp(self):
+        self.filter = SemanticFilter(INTERESTS)
+
+    def test_scores_are_bounded_and_ordered(self):
+        scores = self.filter.score([
+            "Sustainable fashion trends in Ethiopia",
+            "Fashion week in Paris opens",
+            "Crypto prices surge overnight",
+        ])
+        self.assertEqual(scores.shape, (3,))
+        self.assertTrue(((scores >= 0.0) & (scores <= 1.0)).all())
+        self.assertGreater(scores[0], 0.99)
+        self.assertGreater(scores[0], scores[1])
+        self.assertGreater(scores[1], scores[2])
+
+    def test_prefilter_skips_embedding(self):
+        calls = []
+
+        def embedder(texts):
+            calls.append(list(texts))
+            return HashingEmbedder()(texts)
+
+        semantic = SemanticFilter(INTERESTS, embedder=embedder)
+        scores = semantic.score(["Crypto prices surge", "The market is open", "Habesha kemis revival"])
+        self.assertEqual(calls[-1], ["Habesha kemis revival"])
+        self.assertEqual(scores[0], 0.0)
+        self.assertEqual(scores[1], 0.0)
+        self.assertEqual(semantic.stats["prefiltered"], 2)
+
+    def test_prefilter_matches_unfiltered_scores_for_survivors(self):
+        texts = ["Ethiopian textiles", "Sports results", "Handmade fashion"]
+        unfiltered = SemanticFilter(INTERESTS, prefilter=False).score(texts)
+        filtered = self.filter.score(texts)
+        np.testing.assert_allclose(filtered[[0, 2]], unfiltered[[0, 2]])
+
+    def test_mask_applies_threshold(self):
+        texts = ["sustainable fashion trends in ethiopia", "fashion"]
+        np.testing.assert_array_equal(self.filter.mask(texts), [True, False])
+        np.testing.assert_array_equal(self.filter.mask(texts, threshold=0.0), [True, True])
+
+    def test_select_returns_items_with_scores(self):
+        items = [
+            {"id": 1, "text": "Crypto prices surge"},
+            {"id": 2, "text": "Handmade Ethiopian textiles and Habesha kemis"},
+        ]
+        selected = self.filter.select(items, text_of=lambda item: item["text"])
+        self.assertEqual([item["id"] for item, _ in selected], [2])
+        self.assertGreaterEqual(selected[0][1], 0.75)
+        self.assertEqual(self.filter.stats["passed"], 1)
+
+    def test_empty_batch(self):
+        self.assertEqual(self.filter.score([]).shape, (0,))
+        self.assertEqual(self.filter.select([]), [])
+
+    def test_custom_embedder_rows_are_normalized(self):
+        semantic = SemanticFilter(["a"], embedder=lambda texts: np.full((len(texts), 4), 3.0), prefilter=False)
+        np.testing.assert_allclose(semantic.score(["x", "y"]), [1.0, 1.0], rtol=1e-6)
+
+    def test_invalid_configuration(self):
+        with self.assertRaises(ValueError):
+            SemanticFilter([])
+        with self.assertRaises(ValueError):
+            SemanticFilter(INTERESTS, threshold=1.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+import asyncio
+import unittest
+
+from chimera.mcp_client import MCPClientPool
+from chimera.mcp_stub import StubMCPServer
+from chimera.subscriptions import NOT_MODIFIED, ResourceMonitor, canonical_uri
+from helpers import FakeClock
+
+# Reference: specs/functional.md FR 2.0 (Active Resource Monitoring)
+
+NEWS = "mcp://news/ethiopia/fashion/trends?hours=24"
+
+
+class FeedReader:
+    """Resource whose items are appended by the test; counts reads per URI."""
+
+    def __init__(self):
+        self.items = {}
+        self.reads = {}
+
+    def add(self, uri, *ids):
+        self.items.setdefault(uri, []).extend({"id": i, "text": f"item {i}"} for i in ids)
+
+    def __call__(self, uri):
+        self.reads[uri] = self.reads.get(uri, 0) + 1
+        return {"items": list(self.items.get(uri, []))}
+
+
+class TestResourceMonitor(unittest.IsolatedAsyncioTestCase):
+    """
+    Test URI grouping, new-item fan-out and adaptive intervals.
+
+    Reference: specs/functional.md FR 2.0 (Planner Agent subscribes to resource updates)
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.reader = FeedReader()
+        self.monitor = ResourceMonitor(self.reader, min_interval=5, base_interval=30, max_interval=300,
+                                       jitter=0, clock=self.clock)
+        self.received = {}
+
+    def collect(self, agent_id):
+        def callback(uri, items):
+            self.received.setdefault(agent_id, []).extend(item["id"] for item in items)
+        return callback
+
+    async def advance(self, seconds):
+        target = self.clock.now + seconds
+        while True:
+            due = self.monitor.next_due()
+            if due is None or due > target:
+                break
+            self.clock.now = max(self.clock.now, due)
+            await self.monitor.poll_due()
+        self.clock.now = target
+
+    async def test_identical_uris_are_read_once_and_fanned_out(self):
+        self.reader.add(canonical_uri(NEWS), 1, 2)
+        for i in range(100):
+            uri = NEWS if i % 2 else "MCP://News/ethiopia/fashion/trends?hours=24"
+            self.monitor.subscribe(f"agent-{i}", uri, self.collect(f"agent-{i}"))
+        self.assertEqual(len(self.monitor), 1)
+        await self.monitor.poll_due()
+        self.assertEqual(sum(self.reader.reads.values()), 1)
+        self.assertEqual(self.received["agent-0"], [1, 2])
+        self.assertEqual(self.monitor.stats["deliveries"], 100)
+
+    async def test_only_new_items_are_delivered(self):
+        uri = canonical_uri(NEWS)
+        self.reader.add(uri, 1)
+        self.monitor.subscribe("a", NEWS, self.collect("a"))
+        await self.monitor.poll_due()
+        self.reader.add(uri, 2)
+        await self.advance(30)
+        await self.advance(300)
+        self.assertEqual(self.received["a"], [1, 2])
+        self.assertGreaterEqual(self.monitor.stats["unchanged"], 1)
+
+    async def test_idle_backs_off_and_activity_speeds_up(self):
+        uri = canonical_uri(NEWS)
+        self.monitor.subscribe("a", NEWS, self.collect("a"))
+        await self.advance(3600)
+        idle_reads = self.reader.reads[uri]
+        self.assertLess(idle_reads, 3600 / 30)
+        self.assertEqual(self.monitor.resources()[uri]["interval"], 300)
+
+        for n in range(10):
+            self.reader.add(uri, n)
+            await self.advance(60)
+        self.assertLessEqual(self.monitor.resources()[uri]["interval"], 60)
+
+    async def test_subscriber_max_interval_caps_backoff(self):
+        self.monitor.subscribe("a", NEWS, self.collect("a"))
+        self.monitor.subscribe("b", NEWS, self.collect("b"), max_interval=60)
+        await self.advance(1800)
+        self.assertEqual(self.monitor.resources()[canonical_uri(NEWS)]["interval"], 60)
+
+    async def test_unsubscribe_stops_polling_when_last_subscriber_leaves(self):
+        first = self.monitor.subscribe("a", NEWS, self.collect("a"))
+        second = self.monitor.subscribe("b", NEWS, self.collect("b"))
+        self.monitor.unsubscribe(first)
+        self.assertEqual(len(self.monitor), 1)
+        self.monitor.unsubscribe(second)
+        self.assertEqual(len(self.monitor), 0)
+        self.assertIsNone(self.monitor.next_due())
+
+    async def test_conditional_reads_send_etag(self):
+        seen = []
+
+        def reader(uri, etag):
+            seen.append(etag)
+            return NOT_MODIFIED if etag == "v1" else {"etag": "v1", "items": [{"id": 1}]}
+
+        monitor = ResourceMonitor(reader, conditional=True, jitter=0, clock=self.clock)
+        monitor.subscribe("a", NEWS, self.collect("a"))
+        await monitor.poll_due()
+        self.clock.now += 30
+        await monitor.poll_due()
+        self.assertEqual(seen, [None, "v1"])
+        self.assertEqual(monitor.stats["not_modified"], 1)
+
+    async def test_failed_upstream_subscribe_is_retried_with_backoff(self):
+        attempts = []
+
+        async def subscribe_upstream(uri):
+            attempts.append(self.clock.now)
+            if len(attempts) < 3:
+                raise ConnectionError("server restarting")
+            return True
+
+        monitor = ResourceMonitor(self.reader, min_interval=5, base_interval=30, max_interval=300, jitter=0,
+                                  subscribe_upstream=subscribe_upstream, clock=self.clock)
+        monitor.subscribe("a", NEWS, self.collect("a"))
+        for now in (0, 1, 5, 6, 15):
+            self.clock.now = now
+            await monitor.poll_due()
+        self.assertEqual(attempts, [0, 5, 15])  # 5 s, then 10 s
+        self.assertTrue(monitor.resources()[canonical_uri(NEWS)]["pushed"])
+        self.assertEqual(monitor.stats["subscribe_errors"], 2)
+
+    async def test_failing_callback_does_not_block_others(self):
+        self.reader.add(canonical_uri(NEWS), 1)
+
+        def broken(uri, items):
+            raise RuntimeError("planner down")
+
+        self.monitor.subscribe("bad", NEWS, broken)
+        self.monitor.subscribe("good", NEWS, self.collect("good"))
+        await self.monitor.poll_due()
+        self.assertEqual(self.received["good"], [1])
+        self.assertEqual(self.monitor.stats["callback_errors"], 1)
+
+
+class TestPushSubscriptions(unittest.IsolatedAsyncioTestCase):
+    """
+    Test MCP resources/subscribe through the client pool.
+
+    Reference: specs/_meta.md Section 2.3 (MCP Abstraction)
+    """
+
+    async def test_push_notifications_trigger_reads(self):
+        items = [{"id": 1}]
+        server = StubMCPServer(resources=lambda uri: {"items": list(items)})
+        await server.start()
+        pool = MCPClientPool({"news": server.connector()})
+        monitor = ResourceMonitor.for_pool(pool, min_interval=5, base_interval=30, max_interval=300)
+        received = []
+        monitor.subscribe("a", NEWS, lambda uri, new: received.extend(i["id"] for i in new))
+        stop = asyncio.Event()
+        runner = asyncio.ensure_future(monitor.run(stop))
+        try:
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if received:
+                    break
+            self.assertTrue(monitor.resources()[canonical_uri(NEWS)]["pushed"])
+            items.append({"id": 2})
+            await server.notify_updated(canonical_uri(NEWS))
+            for _ in range(100):
+                await asyncio.sleep(0.01)
+                if len(received) == 2:
+                    break
+            self.assertEqual(received, [1, 2])
+            self.assertEqual(monitor.stats["push_updates"], 1)
+        finally:
+            stop.set()
+            await runner
+            await pool.close()
+            await server.stop()
+
+    async def test_reconnect_resubscribes(self):
+        items = [{"id": 1}]
+        server = StubMCPServer(resources=lambda uri: {"items": list(items)})
+        await server.start()
+        pool = MCPClientPool({"news": server.connector()})
+        monitor = ResourceMonitor.for_pool(pool, min_interval=5, base_interval=30, max_interval=300)
+        received = []
+        monitor.subscribe("a", NEWS, lambda uri, new: received.extend(i["id"] for i in new))
+        try:
+            await monitor.poll_due()
+            self.assertTrue(monitor.resources()[canonical_uri(NEWS)]["pushed"])
+            items.append({"id": 2})
+            server.drop_connections()  # the update is lost with the session
+            await asyncio.sleep(0.01)
+            self.assertFalse(monitor.resources()[canonical_uri(NEWS)]["pushed"])
+
+            await monitor.poll_due()  # reads at once and re-subscribes over a new session
+            self.assertEqual(received, [1, 2])
+            self.assertTrue(monitor.resources()[canonical_uri(NEWS)]["pushed"])
+            items.append({"id": 3})
+            self.assertEqual(await server.notify_updated(canonical_uri(NEWS)), 1)
+        finally:
+            await pool.close()
+            await server.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
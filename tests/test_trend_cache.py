@@ -0,0 +1,191 @@
+import unittest
+import asyncio
+from collections import Counter
+
+from helpers import FakeClock
+from skills.trend_fetcher import TrendCache, fetch_trends, fetch_trends_async, fetch_trends_batch_async
+
+# Reference: skills/trend_fetcher/README.md, skills/trend_fetcher/output_schema.json (metadata.fetched_at)
+
+
+class CountingNewsResource:
+    """Async MCP news resource that counts reads per URI."""
+
+    def __init__(self, delay=0.0, fail=False):
+        self.delay = delay
+        self.fail = fail
+        self.reads = Counter()
+        self.version = 0
+
+    async def __call__(self, uri):
+        self.reads[uri] += 1
+        self.version += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("news server unavailable")
+        return {
+            "trends": [
+                {"topic": "Sustainable Fashion", "engagement_score": 0.87, "relevance_score": 0.92},
+                {"topic": "Habesha Kemis", "engagement_score": 0.64, "relevance_score": 0.81},
+                {"topic": f"Version {self.version}", "engagement_score": 0.5, "relevance_score": 0.6},
+            ]
+        }
+
+
+def make_request(region="ethiopia", category="fashion", hours=24, threshold=0.75):
+    return {
+        "skill_name": "trend_fetcher",
+        "parameters": {
+            "region": region,
+            "category": category,
+            "timeframe_hours": hours,
+            "relevance_threshold": threshold
+        }
+    }
+
+
+URI = "mcp://news/ethiopia/fashion/trends?hours=24"
+
+
+class TestTrendCache(unittest.IsolatedAsyncioTestCase):
+    """
+    Test TTL, stale-while-revalidate, LRU and single-flight behaviour.
+
+    Reference: skills/trend_fetcher/README.md (Implementation Notes)
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = TrendCache(max_entries=2, clock=self.clock)
+        self.reader = CountingNewsResource()
+
+    async def fetch(self, **kwargs):
+        return await fetch_trends_async(make_request(**kwargs), reader=self.reader, cache=self.cache)
+
+    async def test_fresh_hit_reuses_fetched_at(self):
+        first = await self.fetch()
+        self.clock.now += 10
+        second = await self.fetch(region="Ethiopia ")
+        self.assertEqual(self.reader.reads[URI], 1)
+        self.assertEqual(first, second)
+        self.assertEqual(self.cache.stats["hits"], 1)
+
+    async def test_ttl_scales_with_timeframe(self):
+        self.assertLess(self.cache.ttl_for(1), self.cache.ttl_for(24))
+        self.assertLess(self.cache.ttl_for(24), self.cache.ttl_for(168))
+        self.assertEqual(self.cache.ttl_for(1), self.cache.min_ttl)
+
+    async def test_higher_threshold_served_from_cache(self):
+        """
+        Reference: skills/trend_fetcher/input_schema.json (relevance_threshold)
+        """
+        low = await self.fetch(threshold=0.5)
+        high = await self.fetch(threshold=0.9)
+        self.assertEqual(self.reader.reads[URI], 1)
+        self.assertEqual(len(low["trends"]), 3)
+        self.assertEqual([t["topic"] for t in high["trends"]], ["Sustainable Fashion"])
+
+    async def test_stale_while_revalidate(self):
+        first = await self.fetch(threshold=0.5)
+        self.clock.now += self.cache.ttl_for(24) + 1
+        stale = await self.fetch(threshold=0.5)
+        self.assertEqual(stale, first)
+        self.assertEqual(self.cache.stats["stale_hits"], 1)
+
+        await self.cache.drain()
+        self.assertEqual(self.reader.reads[URI], 2)
+        refreshed = await self.fetch(threshold=0.5)
+        self.assertIn("Version 2", [t["topic"] for t in refreshed["trends"]])
+
+    async def test_stale_refresh_is_single_flight(self):
+        await self.fetch()
+        self.clock.now += self.cache.ttl_for(24) + 1
+        self.reader.delay = 0.01
+        await asyncio.gather(*(self.fetch() for _ in range(5)))
+        await self.cache.drain()
+        self.assertEqual(self.reader.reads[URI], 2)
+        self.assertEqual(self.cache.stats["refreshes"], 1)
+
+    async def test_failed_refresh_keeps_stale_entry(self):
+        first = await self.fetch()
+        self.clock.now += self.cache.ttl_for(24) + 1
+        self.reader.fail = True
+        await self.fetch()
+        await self.cache.drain()
+        self.assertEqual(await self.fetch(), first)
+
+    async def test_expired_entry_is_refetched(self):
+        await self.fetch()
+        ttl = self.cache.ttl_for(24)
+        self.clock.now += ttl * (1 + self.cache.stale_factor) + 1
+        await self.fetch()
+        self.assertEqual(self.reader.reads[URI], 2)
+        self.assertEqual(self.cache.stats["misses"], 2)
+
+    async def test_concurrent_misses_trigger_one_fetch(self):
+        self.reader.delay = 0.01
+        results = await asyncio.gather(*(self.fetch() for _ in range(10)))
+        self.assertEqual(self.reader.reads[URI], 1)
+        self.assertEqual(self.cache.stats["coalesced"], 9)
+        self.assertTrue(all(r == results[0] for r in results))
+
+    async def test_concurrent_miss_failure_propagates(self):
+        self.reader.delay = 0.01
+        self.reader.fail = True
+        results = await asyncio.gather(*(self.fetch() for _ in range(3)), return_exceptions=True)
+        self.assertTrue(all(isinstance(r, ConnectionError) for r in results))
+        self.assertEqual(self.reader.reads[URI], 1)
+        self.assertEqual(len(self.cache), 0)
+
+    async def test_cancelled_leader_hands_load_to_waiters(self):
+        self.reader.delay = 0.01
+        leader = asyncio.ensure_future(self.fetch())
+        await asyncio.sleep(0)
+        waiters = [asyncio.ensure_future(self.fetch()) for _ in range(3)]
+        await asyncio.sleep(0)
+        leader.cancel()
+        results = await asyncio.gather(*waiters)
+        self.assertTrue(leader.cancelled())
+        self.assertTrue(all(r == results[0] for r in results))
+        self.assertEqual(self.reader.reads[URI], 2)  # one waiter reloaded, the others joined it
+
+    async def test_lru_eviction(self):
+        await self.fetch(region="ethiopia")
+        await self.fetch(region="kenya")
+        await self.fetch(region="ethiopia")
+        await self.fetch(region="ghana")
+        self.assertEqual(len(self.cache), 2)
+        self.assertIsNone(self.cache.peek(("kenya", "fashion", 24)))
+        self.assertIsNotNone(self.cache.peek(("ethiopia", "fashion", 24)))
+        self.assertEqual(self.cache.stats["evictions"], 1)
+
+    async def test_batch_uses_cache(self):
+        await self.fetch()
+        results = await fetch_trends_batch_async(
+            [make_request(), make_request(region="kenya")], reader=self.reader, cache=self.cache
+        )
+        self.assertEqual(self.reader.reads[URI], 1)
+        self.assertEqual(self.reader.reads["mcp://news/kenya/fashion/trends?hours=24"], 1)
+        self.assertEqual(len(results), 2)
+
+
+class TestTrendCacheSync(unittest.TestCase):
+    """
+    Test the cache through the synchronous entry point.
+
+    Reference: skills/trend_fetcher/README.md (Implementation Notes)
+    """
+
+    def test_stale_entry_reloaded_in_foreground(self):
+        clock = FakeClock()
+        cache = TrendCache(clock=clock)
+        reader = CountingNewsResource()
+        fetch_trends(make_request(threshold=0.5), reader=reader, cache=cache)
+        clock.now += cache.ttl_for(24) + 1
+        result = fetch_trends(make_request(threshold=0.5), reader=reader, cache=cache)
+        self.assertIn("Version 2", [t["topic"] for t in result["trends"]])
+        self.assertEqual((reader.reads[URI], cache.stats["stale_hits"]), (2, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,163 @@
+import unittest
+import asyncio
+from collections import Counter
+
+from skills.trend_fetcher import fetch_trends_batch, fetch_trends_batch_async
+
+# Reference: skills/trend_fetcher/README.md, specs/technical.md Section 3 (news_trends URI)
+
+RAW_TRENDS = {
+    "trends": [
+        {"topic": "Sustainable Fashion", "engagement_score": 0.87, "relevance_score": 0.92, "growth_rate": "+15%"},
+        {"topic": "Habesha Kemis", "engagement_score": 0.64, "relevance_score": 0.81},
+        {"topic": "Fast Fashion Backlash", "engagement_score": 0.55, "relevance_score": 0.42},
+        {"topic": "Denim Revival", "engagement_score": 0.71, "relevance_score": 0.97},
+    ]
+}
+
+
+def make_request(region, category, hours=24, threshold=0.75):
+    return {
+        "skill_name": "trend_fetcher",
+        "parameters": {
+            "region": region,
+            "category": category,
+            "timeframe_hours": hours,
+            "relevance_threshold": threshold
+        }
+    }
+
+
+class StubNewsResource:
+    """Async MCP resource reader that records reads and peak concurrency."""
+
+    def __init__(self, delay=0.01, fail_on=()):
+        self.delay = delay
+        self.fail_on = set(fail_on)
+        self.reads = Counter()
+        self.in_flight = 0
+        self.peak = 0
+
+    async def __call__(self, uri):
+        self.reads[uri] += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if uri in self.fail_on:
+                raise ConnectionError("news server unavailable")
+            return RAW_TRENDS
+        finally:
+            self.in_flight -= 1
+
+
+class TestFetchTrendsBatch(unittest.TestCase):
+    """
+    Test the batch trend_fetcher API.
+
+    Reference: skills/trend_fetcher/output_schema.json
+    Each result sorted by relevance_score and filtered by relevance_threshold
+    """
+
+    def test_deduplicates_resource_reads(self):
+        """
+        Requests differing only in casing or relevance_threshold share one read of
+        mcp://news/{region}/{category}/trends?hours={n}.
+        """
+        reader = StubNewsResource()
+        requests = [
+            make_request("ethiopia", "fashion"),
+            make_request("Ethiopia", "Fashion "),
+            make_request("ethiopia", "fashion", threshold=0.9),
+            make_request("ethiopia", "fashion", hours=4),
+            make_request("kenya", "fashion"),
+        ]
+        results = fetch_trends_batch(requests, reader=reader)
+
+        self.assertEqual(len(results), 5)
+        self.assertEqual(reader.reads, Counter({
+            "mcp://news/ethiopia/fashion/trends?hours=24": 1,
+            "mcp://news/ethiopia/fashion/trends?hours=4": 1,
+            "mcp://news/kenya/fashion/trends?hours=24": 1,
+        }))
+
+    def test_results_follow_output_contract(self):
+        """
+        Reference: skills/trend_fetcher/output_schema.json
+        """
+        reader = StubNewsResource()
+        results = fetch_trends_batch(
+            [make_request("ethiopia", "fashion", threshold=0.8), make_request("ethiopia", "fashion", threshold=0.95)],
+            reader=reader,
+        )
+        low, high = results
+        self.assertEqual([t["topic"] for t in low["trends"]], ["Denim Revival", "Sustainable Fashion", "Habesha Kemis"])
+        self.assertEqual([t["topic"] for t in high["trends"]], ["Denim Revival"])
+        for result in results:
+            scores = [t["relevance_score"] for t in result["trends"]]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+            self.assertEqual(result["metadata"]["source_count"], 1)
+            self.assertEqual(result["trends"][0]["sources"], ["mcp://news/ethiopia/fashion/trends?hours=24"])
+
+    def test_identical_requests_get_independent_results(self):
+        reader = StubNewsResource()
+        first, second = fetch_trends_batch([make_request("ethiopia", "fashion")] * 2, reader=reader)
+        self.assertEqual(first, second)
+        first["trends"][0]["sources"].append("mcp://twitter/trends/ethiopia")
+        self.assertNotEqual(first, second)
+
+    def test_concurrency_cap(self):
+        reader = StubNewsResource(delay=0.02)
+        requests = [make_request(f"region-{i}", "fashion") for i in range(20)]
+        fetch_trends_batch(requests, reader=reader, max_concurrency=4)
+        self.assertEqual(len(reader.reads), 20)
+        self.assertEqual(reader.peak, 4)
+
+    def test_invalid_and_failed_requests_do_not_fail_batch(self):
+        """
+        Reference: skills/README.md (Error Handling)
+        """
+        reader = StubNewsResource(fail_on={"mcp://news/kenya/fashion/trends?hours=24"})
+        results = fetch_trends_batch(
+            [
+                make_request("ethiopia", "fashion"),
+                make_request("ethiopia", "fashion", hours=500),
+                make_request("kenya", "fashion"),
+            ],
+            reader=reader,
+        )
+        self.assertIn("trends", results[0])
+        self.assertEqual(results[1]["error"]["code"], "SCHEMA_VALIDATION_ERROR")
+        self.assertEqual(results[2]["error"]["code"], "RESOURCE_FETCH_ERROR")
+        self.assertNotIn("mcp://news/ethiopia/fashion/trends?hours=500", reader.reads)
+
+    def test_malformed_payload_fails_only_its_slots(self):
+        """
+        Reference: skills/README.md (Error Handling)
+        """
+        broken = {"trends": [{"topic": "Denim Revival", "relevance_score": 0.97}]}  # no engagement_score
+
+        async def reader(uri):
+            return broken if "kenya" in uri else RAW_TRENDS
+
+        results = fetch_trends_batch(
+            [make_request("kenya", "fashion"), make_request("ethiopia", "fashion"), make_request("kenya", "fashion", threshold=0.8)],
+            reader=reader,
+        )
+        self.assertEqual(results[0]["error"]["code"], "RESOURCE_FORMAT_ERROR")
+        self.assertEqual(results[0]["error"]["details"], {"resource": "mcp://news/kenya/fashion/trends?hours=24"})
+        self.assertEqual(len(results[1]["trends"]), 3)
+        self.assertEqual(results[2]["error"]["code"], "RESOURCE_FORMAT_ERROR")
+
+    def test_async_entry_point(self):
+        reader = StubNewsResource()
+        results = asyncio.run(fetch_trends_batch_async([make_request("ethiopia", "fashion")], reader=reader))
+        self.assertEqual(len(results[0]["trends"]), 3)
+
+    def test_rejects_invalid_concurrency(self):
+        with self.assertRaises(ValueError):
+            fetch_trends_batch([], reader=StubNewsResource(), max_concurrency=0)
+
+
+if __name__ == '__main__':
+    unittest.main()
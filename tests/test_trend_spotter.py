@@ -0,0 +1,168 @@
+import unittest
+
+from helpers import T0
+from skills.trend_fetcher import fetch_trends
+from skills.trend_fetcher.spotter import TrendSpotter
+
+# Reference: specs/functional.md FR 2.2 (Trend Detection)
+
+
+def item(topic, ts, relevance=0.8, engagement=0.6, source=None):
+    entry = {"topic": topic, "timestamp": ts, "relevance_score": relevance, "engagement_score": engagement}
+    if source:
+        entry["source"] = source
+    return entry
+
+
+class TestTrendSpotterWindow(unittest.TestCase):
+    """
+    Test sliding-window bookkeeping.
+
+    Reference: specs/functional.md FR 2.2 (Analyzes News Resources over time intervals, e.g. 4 hours)
+    """
+
+    def setUp(self):
+        self.spotter = TrendSpotter(window_hours=4, bucket_seconds=300, alert_min_items=1000)
+
+    def test_scores_are_window_means(self):
+        self.spotter.ingest(item("Sustainable Fashion", T0, relevance=0.9, engagement=0.5))
+        self.spotter.ingest(item("sustainable fashion ", T0 + 60, relevance=0.7, engagement=0.7))
+        (trend,) = self.spotter.top_k(5)
+        self.assertEqual(trend["topic"], "Sustainable Fashion")
+        self.assertEqual(trend["item_count"], 2)
+        self.assertAlmostEqual(trend["relevance_score"], 0.8)
+        self.assertAlmostEqual(trend["engagement_score"], 0.6)
+
+    def test_items_expire_out_of_window(self):
+        self.spotter.ingest(item("Old Topic", T0))
+        self.spotter.ingest(item("New Topic", T0 + 3 * 3600))
+        self.assertEqual(len(self.spotter), 2)
+        self.spotter.advance(T0 + 4 * 3600 + 600)
+        self.assertEqual([t["topic"] for t in self.spotter.top_k(5)], ["New Topic"])
+        self.assertEqual(len(self.spotter), 1)
+
+    def test_partial_expiry_updates_scores(self):
+        self.spotter.ingest(item("Denim", T0, relevance=0.2))
+        self.spotter.ingest(item("Denim", T0 + 2 * 3600, relevance=1.0))
+        self.spotter.advance(T0 + 4 * 3600 + 600)
+        (trend,) = self.spotter.top_k(1)
+        self.assertEqual(trend["item_count"], 1)
+        self.assertAlmostEqual(trend["relevance_score"], 1.0)
+
+    def test_late_items_outside_window_are_dropped(self):
+        self.spotter.ingest(item("Denim", T0 + 5 * 3600))
+        self.assertIsNone(self.spotter.ingest(item("Denim", T0)))
+        self.assertEqual(self.spotter.items_dropped, 1)
+        self.assertEqual(self.spotter.top_k(1)[0]["item_count"], 1)
+
+    def test_memory_is_constant_per_topic(self):
+        for i in range(5000):
+            self.spotter.ingest(item("Denim", T0 + i * 10))
+        state = self.spotter._topics["denim"]
+        self.assertEqual(len(state.counts), self.spotter.buckets)
+        self.assertLessEqual(len(self.spotter._wheel), self.spotter.buckets + 1)
+
+
+class TestTrendSpotterRanking(unittest.TestCase):
+    """
+    Test top-k queries by relevance_score / engagement_score.
+
+    Reference: skills/trend_fetcher/output_schema.json (sorted by relevance_score)
+    """
+
+    def setUp(self):
+        self.spotter = TrendSpotter(alert_min_items=1000)
+        for i, (topic, rel, eng) in enumerate([
+            ("A", 0.9, 0.1), ("B", 0.5, 0.9), ("C", 0.7, 0.5), ("D", 0.3, 0.3),
+        ]):
+            self.spotter.ingest(item(topic, T0 + i, relevance=rel, engagement=eng))
+
+    def test_top_k_by_relevance(self):
+        self.assertEqual([t["topic"] for t in self.spotter.top_k(3)], ["A", "C", "B"])
+
+    def test_top_k_by_engagement(self):
+        self.assertEqual([t["topic"] for t in self.spotter.top_k(2, by="engagement_score")], ["B", "C"])
+
+    def test_updates_reorder_index(self):
+        for i in range(10):
+            self.spotter.ingest(item("D", T0 + 10 + i, relevance=1.0))
+        self.assertEqual(self.spotter.top_k(1)[0]["topic"], "D")
+        # Repeated queries are stable (valid entries are pushed back).
+        self.assertEqual(self.spotter.top_k(4), self.spotter.top_k(4))
+
+    def test_expired_topic_reingested(self):
+        spotter = TrendSpotter(window_hours=1, bucket_seconds=300, alert_min_items=1000)
+        spotter.ingest(item("A", T0, relevance=0.99))
+        spotter.advance(T0 + 2 * 3600)
+        self.assertEqual(len(spotter), 0)
+        spotter.ingest(item("A", T0 + 2 * 3600, relevance=0.1))
+        spotter.ingest(item("C", T0 + 2 * 3600 + 1, relevance=0.6))
+        self.assertEqual([(t["topic"], t["relevance_score"]) for t in spotter.top_k(2)], [("C", 0.6), ("A", 0.1)])
+
+    def test_unknown_score_field(self):
+        with self.assertRaises(ValueError):
+            self.spotter.top_k(1, by="growth_rate")
+
+    def test_heap_compaction(self):
+        for i in range(2000):
+            self.spotter.ingest(item("A", T0 + 10 + i))
+        self.assertLessEqual(len(self.spotter._heaps["relevance_score"]), 4 * len(self.spotter) + 65)
+        self.assertEqual(len(self.spotter.top_k(10)), 4)
+
+    def test_serves_trend_fetcher(self):
+        """
+        Reference: skills/trend_fetcher/input_schema.json, output_schema.json
+        """
+        result = fetch_trends(
+            {"skill_name": "trend_fetcher", "parameters": {"region": "ethiopia", "category": "fashion"}},
+            reader=lambda uri: self.spotter.resource_payload(),
+        )
+        self.assertEqual([t["topic"] for t in result["trends"]], ["A"])
+
+
+class TestTrendSpotterAlerts(unittest.TestCase):
+    """
+    Test Trend Alert emission.
+
+    Reference: specs/functional.md FR 2.2 (Generates "Trend Alert" fed to Planner context)
+    """
+
+    def setUp(self):
+        self.received = []
+        self.spotter = TrendSpotter(alert_min_items=10, alert_relevance=0.75, alert_growth=0.5,
+                                    on_alert=self.received.append)
+
+    def test_alert_fires_once_on_crossing(self):
+        alerts = self.spotter.ingest_many([
+            item("Habesha Kemis", T0 + i, relevance=0.9, source="mcp://news/ethiopia/fashion/trends")
+            for i in range(30)
+        ])
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(self.received, alerts)
+        alert = alerts[0]
+        self.assertEqual(alert["type"], "trend_alert")
+        self.assertEqual(alert["trend"]["item_count"], 10)
+        self.assertEqual(alert["trend"]["sources"], ["mcp://news/ethiopia/fashion/trends"])
+        self.assertTrue(alert["trend"]["growth_rate"].startswith("+"))
+
+    def test_low_relevance_topics_never_alert(self):
+        alerts = self.spotter.ingest_many([item("Noise", T0 + i, relevance=0.2) for i in range(50)])
+        self.assertEqual(alerts, [])
+
+    def test_growth_settles_for_steady_topic(self):
+        spotter = TrendSpotter(alert_min_items=10, alert_growth=0.5)
+        # One item every 5 minutes for 16 hours: the arrival rate is flat.
+        spotter.ingest_many([item("Steady", T0 + i * 300, relevance=0.9) for i in range(192)])
+        self.assertLess(abs(spotter.growth(spotter._topics["steady"])), 0.1)
+
+    def test_alert_rearms_after_falling_below(self):
+        self.spotter.ingest_many([item("Denim", T0 + i, relevance=0.9) for i in range(15)])
+        self.spotter.advance(T0 + 5 * 3600)
+        self.assertEqual(len(self.spotter), 0)
+        alerts = self.spotter.ingest_many([item("Denim", T0 + 5 * 3600 + i, relevance=0.9) for i in range(15)])
+        self.assertEqual(len(alerts), 1)
+        self.assertEqual(len(self.received), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
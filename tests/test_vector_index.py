@@ -0,0 +1,130 @@
+import tempfile
+import unittest
+
+import numpy as np
+
+from chimera.memory import TieredMemory
+from chimera.redis_store import InMemoryRedis
+from chimera.vector_index import IVFIndex
+
+# Reference: specs/technical.md Section 2.2 (AgentMemory), Section 3 (memory_semantic)
+
+
+def clustered(n, dim=16, centers=20, seed=0):
+    rng = np.random.default_rng(seed)
+    means = rng.normal(size=(centers, dim))
+    return (means[rng.integers(0, centers, n)] + 0.3 * rng.normal(size=(n, dim))).astype(np.float32)
+
+
+class TestExactSearch(unittest.TestCase):
+    """
+    Test the untrained (exact) path and the memory resource contract.
+
+    Reference: specs/technical.md Section 3 (mcp://memory/{agent_id}/semantic)
+    """
+
+    def setUp(self):
+        self.index = IVFIndex(dim=256)
+        self.index.add_many(
+            ["a", "a", "b"],
+            [
+                {"memory_id": "m1", "content": "sneaker drop in addis ababa"},
+                {"memory_id": "m2", "content": "coffee ceremony traditions"},
+                {"memory_id": "m3", "content": "sneaker resale prices"},
+            ],
+        )
+
+    def test_query_filters_by_agent(self):
+        memories = self.index.query("a", "sneaker drop", limit=5)
+        self.assertEqual([m["memory_id"] for m in memories], ["m1", "m2"])
+        self.assertTrue(all(m["agent_id"] == "a" for m in memories))
+        self.assertGreater(memories[0]["score"], memories[1]["score"])
+
+    def test_unknown_agent_returns_nothing(self):
+        self.assertEqual(self.index.query("zz", "sneaker"), [])
+
+    def test_read_resource_is_a_semantic_reader(self):
+        result = self.index.read_resource("mcp://memory/b/semantic?query=sneaker%20resale&limit=1")
+        self.assertEqual([m["memory_id"] for m in result["memories"]], ["m3"])
+        memory = TieredMemory(InMemoryRedis(), semantic_reader=self.index.read_resource)
+        self.assertEqual(memory.semantic("b", "sneaker resale", limit=1)[0]["memory_id"], "m3")
+
+    def test_rejects_other_resources(self):
+        with self.assertRaises(ValueError):
+            self.index.read_resource("mcp://memory/a/episodic?query=x")
+
+
+class TestIVF(unittest.TestCase):
+    """
+    Test trained search, incremental inserts and persistence.
+
+    Reference: specs/functional.md FR 1.1 (Hierarchical Memory Retrieval)
+    """
+
+    def test_trains_at_threshold_and_keeps_recall(self):
+        data = clustered(3000)
+        index = IVFIndex(dim=16, nprobe=8, train_threshold=2000)
+        index.add_many(["a"] * 1500, [{"i": i} for i in range(1500)], data[:1500])
+        self.assertFalse(index.trained)
+        index.add_many(["a"] * 1500, [{"i": i} for i in range(1500, 3000)], data[1500:])
+        self.assertTrue(index.trained)
+
+        normalized = data / np.linalg.norm(data, axis=1, keepdims=True)
+        hits = 0
+        for q in data[:50]:
+            exact = set(np.argsort(-(normalized @ (q / np.linalg.norm(q))))[:10])
+            ids, _ = index.search(q, 10)
+            hits += len(exact & set(ids.tolist()))
+        self.assertGreater(hits / 500, 0.9)
+
+    def test_incremental_inserts_after_training_are_searchable(self):
+        data = clustered(1200)
+        index = IVFIndex(dim=16, train_threshold=1000)
+        index.add_many(["a"] * 1000, [{} for _ in range(1000)], data[:1000])
+        row = index.add("a", {"memory_id": "new"}, data[1100] * 5)
+        ids, scores = index.search(data[1100], 1)
+        self.assertEqual(ids[0], row)
+        self.assertAlmostEqual(float(scores[0]), 1.0, places=5)
+
+    def test_agent_filter_on_trained_index(self):
+        data = clustered(2000)
+        agents = ["big"] * 1990 + ["small"] * 10
+        index = IVFIndex(dim=16, nprobe=2, train_threshold=1000)
+        index.add_many(agents, [{"n": i} for i in range(2000)], data)
+        ids, _ = index.search(data[0], 20, agent_id="small")
+        self.assertEqual(sorted(ids.tolist()), list(range(1990, 2000)))
+        ids, _ = index.search(data[0], 20, agent_id="big")
+        self.assertTrue(all(i < 1990 for i in ids))
+
+    def test_reopens_from_disk(self):
+        data = clustered(1500)
+        with tempfile.TemporaryDirectory() as path:
+            index = IVFIndex(path, dim=16, train_threshold=1000)
+            index.add_many(["a"] * 1500, [{"n": i} for i in range(1500)], data)
+            expected = index.search(data[7], 5)[0].tolist()
+            del index
+
+            reopened = IVFIndex(path, dim=16)
+            self.assertEqual(len(reopened), 1500)
+            self.assertTrue(reopened.trained)
+            self.assertEqual(reopened.search(data[7], 5)[0].tolist(), expected)
+            row = reopened.add("b", {"n": "late"}, data[7])
+            self.assertEqual(reopened.search(data[7], 5, agent_id="b")[0].tolist(), [row])
+            with self.assertRaises(ValueError):
+                IVFIndex(path, dim=32)
+
+    def test_single_inserts_batch_the_metadata_write(self):
+        data = clustered(10)
+        with tempfile.TemporaryDirectory() as path:
+            index = IVFIndex(path, dim=16, flush_every=4)
+            for i in range(6):
+                index.add("a", {"n": i}, data[i])
+            self.assertEqual(len(IVFIndex(path, dim=16)), 4)  # last write at 4 rows
+            index.close()
+            reopened = IVFIndex(path, dim=16)
+            self.assertEqual(len(reopened), 6)
+            self.assertEqual(reopened.search(data[5], 1)[0].tolist(), [5])
+
+
+if __name__ == "__main__":
+    unittest.main()
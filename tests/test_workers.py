@@ -0,0 +1,127 @@
+import asyncio
+import os
+import tempfile
+import unittest
+
+from chimera.workers import ScalingPolicy, TaskFailed, WorkerPool
+from helpers import FakeClock
+
+# Reference: specs/functional.md FR 6.0 (Worker Pool)
+
+
+# Handlers run in worker processes, so they live at module level.
+
+async def double(task):
+    await asyncio.sleep(task.get("sleep", 0))
+    if task.get("fail"):
+        raise ValueError("bad input")
+    return task["n"] * 2
+
+
+def crash_once(task):
+    """Kills its worker the first time it sees a task, succeeds afterwards."""
+    marker = os.path.join(task["dir"], str(task["n"]))
+    if task.get("always") or not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(1)
+    return task["n"]
+
+
+class TestScalingPolicy(unittest.TestCase):
+    """
+    Test the target worker count.
+
+    Reference: specs/functional.md FR 6.0 ("Scalable stateless containers")
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.policy = ScalingPolicy(min_workers=1, max_workers=6, slots_per_worker=4, target_latency=1.0,
+                                    scale_down_after=10, clock=self.clock)
+
+    def test_grows_with_queue_depth(self):
+        self.assertEqual(self.policy.decide(1, queue_depth=0, in_flight=3, latency_p90=0.1), 1)
+        self.assertEqual(self.policy.decide(1, queue_depth=9, in_flight=4, latency_p90=0.1), 4)
+        self.assertEqual(self.policy.decide(4, queue_depth=500, in_flight=16, latency_p90=0.1), 6)
+
+    def test_grows_when_latency_misses_target(self):
+        # Demand fits in two workers' slots, but tasks are slow: spread them out.
+        self.assertEqual(self.policy.decide(2, queue_depth=0, in_flight=6, latency_p90=3.0), 3)
+        self.assertEqual(self.policy.decide(2, queue_depth=0, in_flight=2, latency_p90=3.0), 2)
+
+    def test_shrinks_one_step_after_delay(self):
+        self.assertEqual(self.policy.decide(4, 0, 0, 0.1), 4)
+        self.clock.now = 9
+        self.assertEqual(self.policy.decide(4, 0, 0, 0.1), 4)
+        self.clock.now = 10
+        self.assertEqual(self.policy.decide(4, 0, 0, 0.1), 3)
+        self.assertEqual(self.policy.decide(3, 0, 0, 0.1), 3)
+        self.policy.decide(3, 0, 12, 0.1)  # demand came back: the timer restarts
+        self.clock.now = 25
+        self.assertEqual(self.policy.decide(3, 0, 0, 0.1), 3)
+        self.clock.now = 35
+        self.assertEqual(self.policy.decide(3, 0, 0, 0.1), 2)
+        self.clock.now = 100
+        self.assertEqual(self.policy.decide(1, 0, 0, 0.1), 1)
+
+    def test_rejects_bad_bounds(self):
+        with self.assertRaises(ValueError):
+            ScalingPolicy(min_workers=3, max_workers=2)
+        with self.assertRaises(ValueError):
+            ScalingPolicy(slots_per_worker=0)
+
+
+class TestWorkerPool(unittest.IsolatedAsyncioTestCase):
+    """
+    Test the process pool end to end.
+
+    Reference: specs/functional.md FR 6.0 (Worker Pool pops tasks, executes, pushes results)
+    """
+
+    def pool(self, handler, **kwargs):
+        policy = ScalingPolicy(min_workers=1, max_workers=3, slots_per_worker=2, scale_down_after=0.1)
+        return WorkerPool(handler, policy, control_interval=0.02, **kwargs)
+
+    async def test_results_and_errors(self):
+        async with self.pool(double) as pool:
+            results = await asyncio.gather(*(pool.submit({"n": n}) for n in range(10)))
+            self.assertEqual(results, [n * 2 for n in range(10)])
+            with self.assertRaisesRegex(TaskFailed, "ValueError: bad input"):
+                await pool.submit({"n": 1, "fail": True})
+        with self.assertRaises(RuntimeError):
+            pool.submit({"n": 1})
+
+    async def test_scales_up_under_load_and_back_down(self):
+        async with self.pool(double) as pool:
+            futures = [pool.submit({"n": n, "sleep": 0.1}) for n in range(12)]
+            self.assertEqual(pool.status()["queue_depth"], 10)  # one worker, two slots
+            await asyncio.gather(*futures)
+            self.assertEqual(pool.stats["peak_workers"], 3)
+            for _ in range(200):
+                if pool.workers == 1 and len(pool._workers) == 1:
+                    break
+                await asyncio.sleep(0.02)
+            self.assertEqual(pool.workers, 1)
+            self.assertEqual(pool.status()["state"], "sleeping")
+        self.assertEqual(pool.stats["scaled_down"], 2)
+
+    async def test_close_drains_submitted_tasks(self):
+        pool = self.pool(double)
+        await pool.start()
+        futures = [pool.submit({"n": n, "sleep": 0.05}) for n in range(8)]
+        await pool.close()
+        self.assertEqual([f.result() for f in futures], [n * 2 for n in range(8)])
+        self.assertEqual(pool._workers, {})
+
+    async def test_crashed_worker_tasks_are_redelivered(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            async with self.pool(crash_once, max_deliveries=2) as pool:
+                self.assertEqual(await pool.submit({"n": 7, "dir": tmp}), 7)
+                with self.assertRaisesRegex(TaskFailed, "died 2 times"):
+                    await pool.submit({"n": 8, "dir": tmp, "always": True})
+            self.assertEqual(pool.stats["crashed"], 3)
+            self.assertEqual(pool.stats["redelivered"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()